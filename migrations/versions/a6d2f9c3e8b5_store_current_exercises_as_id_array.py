@@ -0,0 +1,58 @@
+"""
+store current exercises as an id array on users
+
+Revision ID: a6d2f9c3e8b5
+Revises: b4c8e2f6a1d3
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "a6d2f9c3e8b5"
+down_revision: str | Sequence[str] | None = "b4c8e2f6a1d3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "current_exercise_ids", postgresql.ARRAY(sa.Integer()), server_default="{}", nullable=False,
+        ),
+    )
+    op.execute("""
+        UPDATE users
+        SET current_exercise_ids = shown.ids
+        FROM (
+            SELECT user_id, array_agg(exercise_id ORDER BY exercise_id) AS ids
+            FROM user_current_exercises
+            GROUP BY user_id
+        ) AS shown
+        WHERE users.id = shown.user_id
+    """)
+    op.drop_table("user_current_exercises")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        "user_current_exercises",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("exercise_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercises.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "exercise_id"),
+    )
+    op.execute("""
+        INSERT INTO user_current_exercises (user_id, exercise_id)
+        SELECT DISTINCT users.id, shown.exercise_id
+        FROM users, unnest(users.current_exercise_ids) AS shown(exercise_id)
+        JOIN exercises ON exercises.id = shown.exercise_id
+    """)
+    op.drop_column("users", "current_exercise_ids")
@@ -0,0 +1,59 @@
+"""
+add user_seen_groups projection maintained by a trigger on user_answers
+
+Revision ID: b4c8e2f6a1d3
+Revises: f3b8d1e6a2c4
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.models.user_seen_group_model import (  # type: ignore[missing-import]
+    DROP_SEEN_GROUP_FUNCTION,
+    DROP_SEEN_GROUP_TRIGGER,
+    TRACK_SEEN_GROUP_FUNCTION,
+    TRACK_SEEN_GROUP_TRIGGER,
+)
+
+revision: str = "b4c8e2f6a1d3"
+down_revision: str | Sequence[str] | None = "f3b8d1e6a2c4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_seen_groups",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("group_id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "group_id", name="uq_user_seen_groups_user_group"),
+    )
+    op.create_index(op.f("ix_user_seen_groups_id"), "user_seen_groups", ["id"])
+
+    op.execute("""
+        INSERT INTO user_seen_groups (user_id, group_id)
+        SELECT DISTINCT user_answers.user_id, exercises.group_id
+        FROM user_answers
+        JOIN exercises ON exercises.id = user_answers.exercise_id
+        WHERE exercises.group_id IS NOT NULL
+    """)
+
+    op.execute(TRACK_SEEN_GROUP_FUNCTION)
+    op.execute(TRACK_SEEN_GROUP_TRIGGER)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(DROP_SEEN_GROUP_TRIGGER)
+    op.execute(DROP_SEEN_GROUP_FUNCTION)
+    op.drop_index(op.f("ix_user_seen_groups_id"), table_name="user_seen_groups")
+    op.drop_table("user_seen_groups")
@@ -0,0 +1,49 @@
+"""
+add user_answer_summaries for compacted answer history
+
+Revision ID: c8e4f1a7d2b9
+Revises: a6d2f9c3e8b5
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c8e4f1a7d2b9"
+down_revision: str | Sequence[str] | None = "a6d2f9c3e8b5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_answer_summaries",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("exercise_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("n_correct", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("n_wrong", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_solve_time", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("first_answered_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_answered_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercises.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id", "exercise_id", "category_id", name="uq_user_answer_summaries_user_exercise_category",
+        ),
+    )
+    op.create_index(op.f("ix_user_answer_summaries_id"), "user_answer_summaries", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_user_answer_summaries_id"), table_name="user_answer_summaries")
+    op.drop_table("user_answer_summaries")
@@ -0,0 +1,65 @@
+"""
+add user_exercise_schedules and category selection strategy
+
+Revision ID: d7e3b5a1c9f2
+Revises: c4f2a8b91d3e
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d7e3b5a1c9f2"
+down_revision: str | Sequence[str] | None = "c4f2a8b91d3e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "categories",
+        sa.Column(
+            "selection_strategy",
+            sa.Enum("THOMPSON", "SPACED_REPETITION", name="selection_strategy_enum", native_enum=False, length=32),
+            server_default="THOMPSON",
+            nullable=False,
+        ),
+    )
+
+    op.create_table(
+        "user_exercise_schedules",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("exercise_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("repetitions", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("ease_factor", sa.Float(), server_default="2.5", nullable=False),
+        sa.Column("interval_days", sa.Float(), server_default="0", nullable=False),
+        sa.Column("lapses", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("due_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_reviewed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercises.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "exercise_id", name="uq_user_exercise_schedules_user_exercise"),
+    )
+    op.create_index(op.f("ix_user_exercise_schedules_id"), "user_exercise_schedules", ["id"])
+    op.create_index(
+        "ix_user_exercise_schedules_user_category_due",
+        "user_exercise_schedules",
+        ["user_id", "category_id", "due_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_user_exercise_schedules_user_category_due", table_name="user_exercise_schedules")
+    op.drop_index(op.f("ix_user_exercise_schedules_id"), table_name="user_exercise_schedules")
+    op.drop_table("user_exercise_schedules")
+    op.drop_column("categories", "selection_strategy")
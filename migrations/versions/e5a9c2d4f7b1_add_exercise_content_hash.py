@@ -0,0 +1,46 @@
+"""
+add exercises.content_hash for import deduplication
+
+Revision ID: e5a9c2d4f7b1
+Revises: d7e3b5a1c9f2
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e5a9c2d4f7b1"
+down_revision: str | Sequence[str] | None = "d7e3b5a1c9f2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("exercises", sa.Column("content_hash", sa.String(length=32), nullable=True))
+    op.execute("UPDATE exercises SET content_hash = md5(content::text)")
+    # Уже существующие дубли не удаляем (на них ссылаются ответы) — хэш сохраняется лишь за первым
+    op.execute(
+        """
+        UPDATE exercises e SET content_hash = NULL
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY category_id, content_hash ORDER BY id) AS rn
+            FROM exercises
+        ) d
+        WHERE e.id = d.id AND d.rn > 1
+        """,
+    )
+    op.create_index(
+        "uq_exercises_category_content_hash",
+        "exercises",
+        ["category_id", "content_hash"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_exercises_category_content_hash", table_name="exercises")
+    op.drop_column("exercises", "content_hash")
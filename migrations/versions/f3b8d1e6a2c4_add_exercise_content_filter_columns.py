@@ -0,0 +1,66 @@
+"""
+add generated columns and indexes for exercise content filters
+
+Revision ID: f3b8d1e6a2c4
+Revises: e5a9c2d4f7b1
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "f3b8d1e6a2c4"
+down_revision: str | Sequence[str] | None = "e5a9c2d4f7b1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "exercises",
+        sa.Column("particle", sa.Text(), sa.Computed("content ->> 'particle'", persisted=True), nullable=True),
+    )
+    op.add_column(
+        "exercises",
+        sa.Column(
+            "has_corrected_sentence",
+            sa.Boolean(),
+            sa.Computed("(content ->> 'corrected_sentence') IS NOT NULL", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "exercises",
+        sa.Column(
+            "has_incorrect_answer",
+            sa.Boolean(),
+            sa.Computed("(content ->> 'incorrect_answer') IS NOT NULL", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_exercises_category_particle_answer", "exercises", ["category_id", "particle", "answer"])
+    op.create_index(
+        "ix_exercises_category_corrected_sentence",
+        "exercises",
+        ["category_id"],
+        postgresql_where=sa.text("has_corrected_sentence"),
+    )
+    op.create_index(
+        "ix_exercises_category_incorrect_answer",
+        "exercises",
+        ["category_id"],
+        postgresql_where=sa.text("has_incorrect_answer"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_exercises_category_incorrect_answer", table_name="exercises")
+    op.drop_index("ix_exercises_category_corrected_sentence", table_name="exercises")
+    op.drop_index("ix_exercises_category_particle_answer", table_name="exercises")
+    op.drop_column("exercises", "has_incorrect_answer")
+    op.drop_column("exercises", "has_corrected_sentence")
+    op.drop_column("exercises", "particle")
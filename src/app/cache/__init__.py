@@ -0,0 +1,25 @@
+"""Двухуровневый кэш: LRU/TTL в памяти процесса (L1) поверх Redis (L2).
+
+`CacheManager` (APP scope) раздаёт пространства имён; `namespace.cache(kind, serializer)` —
+типизированный вид на пространство, `@cached` — то же декоратором. Одновременные промахи по ключу
+ждут одну загрузку, `namespace.invalidate()` сбрасывает пространство у всех воркеров.
+"""
+from .decorator import cached
+from .local import LocalCache
+from .manager import CacheManager
+from .namespace import Cache, Namespace
+from .serializers import JsonSerializer, MsgpackSerializer, PydanticSerializer, Serializer
+from .single_flight import SingleFlight
+
+__all__ = [
+    "Cache",
+    "CacheManager",
+    "JsonSerializer",
+    "LocalCache",
+    "MsgpackSerializer",
+    "Namespace",
+    "PydanticSerializer",
+    "Serializer",
+    "SingleFlight",
+    "cached",
+]
@@ -0,0 +1,34 @@
+import functools
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from app.cache.namespace import Cache
+
+
+def default_key(*args: object, **kwargs: object) -> str:
+    return ":".join([*map(str, args), *(f"{name}={value}" for name, value in sorted(kwargs.items()))])
+
+
+def cached[**P, R](
+        cache: Cache[R] | Callable[[Any], Cache[R]],
+        key: Callable[P, Hashable] | None = None,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Кэширует результат корутины через `Cache.get_or_load`.
+
+    Для методов `cache` — функция от self (`lambda self: self._roots`): кэш создаётся в __init__
+    из внедрённого `CacheManager`, а self в ключ по умолчанию не попадает. `key` получает те же
+    аргументы, что и функция; по умолчанию ключ — аргументы через двоеточие.
+    """
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if isinstance(cache, Cache):
+                target = cache
+                cache_key = key(*args, **kwargs) if key is not None else default_key(*args, **kwargs)
+            else:
+                target = cache(args[0])
+                cache_key = key(*args, **kwargs) if key is not None else default_key(*args[1:], **kwargs)
+            return await target.get_or_load(cache_key, lambda: func(*args, **kwargs))
+        return wrapper
+
+    return decorator
@@ -0,0 +1,44 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+# Отличает «нет в кэше» от закэшированного None
+MISSING: Any = object()
+
+
+class LocalCache:
+    """Первый уровень: LRU на maxsize записей с TTL, в памяти процесса."""
+
+    def __init__(self, maxsize: int, ttl: float | None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:  # noqa: ANN401
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: object, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
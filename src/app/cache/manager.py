@@ -0,0 +1,112 @@
+import asyncio
+import json
+import uuid
+from typing import Any
+
+from loguru import logger
+from redis.asyncio.client import PubSub, Redis
+from redis.exceptions import RedisError
+
+from app.cache.namespace import Namespace, cache_errors
+from app.config import cache_settings
+
+# Пауза перед переподпиской, если соединение pub/sub оборвалось
+RESUBSCRIBE_DELAY = 1.0
+
+
+class CacheManager:
+    """Пространства имён кэша процесса и их инвалидация между воркерами (APP scope).
+
+    Инвалидации публикуются в канал `channel` сообщениями JSON: `{"ns", "version"}` — новая
+    версия пространства, `{"ns", "kind", "key"}` — удалённый ключ. Слушатель (`start`) применяет
+    чужие сообщения к первому уровню. Если он не запущен или сообщение потерялось, первый уровень
+    всё равно догонит версию за `VERSION_CHECK_INTERVAL`, а удалённый ключ — за TTL записи.
+    """
+
+    def __init__(
+            self,
+            redis: Redis,
+            *,
+            channel: str = cache_settings.CHANNEL,
+            maxsize: int = cache_settings.L1_MAXSIZE,
+            version_check_interval: float = cache_settings.VERSION_CHECK_INTERVAL,
+    ) -> None:
+        self.redis = redis
+        self.channel = channel
+        self._maxsize = maxsize
+        self._version_check_interval = version_check_interval
+        self._namespaces: dict[str, Namespace] = {}
+        # Свои сообщения слушатель пропускает: они уже применены при публикации
+        self._origin = uuid.uuid4().hex
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task[None] | None = None
+
+    def namespace(self, name: str) -> Namespace:
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            namespace = Namespace(
+                name, self, maxsize=self._maxsize, version_check_interval=self._version_check_interval,
+            )
+            self._namespaces[name] = namespace
+        return namespace
+
+    async def invalidate(self, *names: str) -> dict[str, int]:
+        """Поднимает версии пространств; возвращает новые версии по именам."""
+        return {name: await self.namespace(name).invalidate() for name in names}
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        try:
+            await self.redis.publish(self.channel, json.dumps({**message, "origin": self._origin}))
+        except RedisError as e:
+            cache_errors.inc(namespace=message["ns"])
+            logger.warning("Cache invalidation publish failed for {}: {}", message["ns"], e)
+
+    def apply(self, message: dict[str, Any]) -> None:
+        namespace = self._namespaces.get(message.get("ns", ""))
+        if namespace is None or message.get("origin") == self._origin:
+            return
+        if "version" in message:
+            # Запоздавшее сообщение про старую версию (гонка двух инвалидаций) ничего не откатывает
+            if namespace.version is None or message["version"] > namespace.version:
+                namespace.apply_version(message["version"])
+        elif "key" in message:
+            namespace.local.pop((message["kind"], message["key"]))
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._pubsub = await self._subscribe()
+            self._listener = asyncio.create_task(self._listen(), name="cache-invalidation-listener")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def _subscribe(self) -> PubSub:
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        return pubsub
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if self._pubsub is None:
+                    self._pubsub = await self._subscribe()
+                    # Пока подписки не было, сообщения могли пройти мимо: версии перечитаются сразу
+                    for namespace in self._namespaces.values():
+                        namespace.expire_version()
+                async for raw in self._pubsub.listen():
+                    try:
+                        self.apply(json.loads(raw["data"]))
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning("Malformed cache invalidation message: {!r}", raw["data"])
+            except RedisError as e:
+                logger.warning("Cache invalidation listener lost Redis: {}", e)
+                if self._pubsub is not None:
+                    await self._pubsub.aclose()
+                    self._pubsub = None
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
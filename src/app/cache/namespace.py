@@ -0,0 +1,227 @@
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any, cast
+
+from loguru import logger
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.cache.local import MISSING, LocalCache
+from app.cache.serializers import Serializer
+from app.cache.single_flight import SingleFlight
+from app.metrics import counter, gauge
+
+if TYPE_CHECKING:
+    from app.cache.manager import CacheManager
+
+KEY_PREFIX = "cache"
+
+cache_requests = counter("cache_requests_total", "Cache lookups, by tier that answered", ("namespace", "result"))
+cache_loads = counter("cache_loads_total", "Loader calls after a miss in both tiers", ("namespace",))
+cache_coalesced = counter(
+    "cache_coalesced_total", "Misses that waited for a load already in flight", ("namespace",),
+)
+cache_errors = counter("cache_redis_errors_total", "Redis failures; the cache fell back to the loader", ("namespace",))
+cache_hit_ratio = gauge("cache_hit_ratio", "Share of lookups answered by L1 or L2", ("namespace",))
+
+
+def version_key(namespace: str) -> str:
+    return f"{KEY_PREFIX}:{namespace}:version"
+
+
+class Namespace:
+    """Группа записей с общей версией: invalidate() одной командой делает старые записи недостижимыми.
+
+    Версия лежит в Redis и входит в ключи второго уровня. Процесс перечитывает её не чаще раза в
+    `version_check_interval` секунд, а об инвалидации узнаёт сразу через pub/sub менеджера;
+    смена версии очищает первый уровень. Старые ключи Redis не удаляются, а истекают по TTL.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            manager: "CacheManager",
+            *,
+            maxsize: int,
+            version_check_interval: float,
+    ) -> None:
+        self.name = name
+        self._manager = manager
+        self.local = LocalCache(maxsize, ttl=None)
+        self.version: int | None = None
+        self._checked_at = float("-inf")
+        self._version_check_interval = version_check_interval
+        self._caches: dict[str, Cache[Any]] = {}
+        self._hits = 0
+        self._requests = 0
+
+    @property
+    def redis(self) -> Redis:
+        return self._manager.redis
+
+    def cache[T](
+            self,
+            kind: str,
+            serializer: Serializer[T] | None,
+            *,
+            local_ttl: float | None = 60.0,
+            remote_ttl: int | None = 3600,
+    ) -> "Cache[T]":
+        """Типизированный вид на пространство; повторный вызов с тем же kind возвращает тот же объект.
+
+        `remote_ttl=None` — только первый уровень, без Redis; тогда сериализатор не нужен (None),
+        и в кэше можно держать объекты процесса (индексы, сжатые структуры).
+        """
+        existing = self._caches.get(kind)
+        if existing is None:
+            existing = Cache(self, kind, serializer, local_ttl=local_ttl, remote_ttl=remote_ttl)
+            self._caches[kind] = existing
+        return cast("Cache[T]", existing)
+
+    def apply_version(self, version: int) -> None:
+        if version != self.version:
+            self.local.clear()
+            self.version = version
+        self._checked_at = time.monotonic()
+
+    def expire_version(self) -> None:
+        """Следующее обращение перечитает версию из Redis."""
+        self._checked_at = float("-inf")
+
+    async def current_version(self) -> int:
+        if time.monotonic() - self._checked_at >= self._version_check_interval:
+            try:
+                raw = await self.redis.get(version_key(self.name))
+            except RedisError as e:
+                cache_errors.inc(namespace=self.name)
+                logger.warning("Cache version read failed for {}: {}", self.name, e)
+                # Без Redis живём на последней известной версии до следующей проверки
+                self._checked_at = time.monotonic()
+                return self.version or 0
+            self.apply_version(int(raw) if raw is not None else 0)
+        return cast("int", self.version)
+
+    async def invalidate(self) -> int:
+        """Новая версия пространства у всех воркеров; возвращает её."""
+        version = await self.redis.incr(version_key(self.name))
+        self.apply_version(version)
+        await self.publish({"version": version})
+        return version
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        await self._manager.publish({"ns": self.name, **message})
+
+    def record(self, result: str) -> None:
+        self._requests += 1
+        if result != "miss":
+            self._hits += 1
+        cache_requests.inc(namespace=self.name, result=result)
+        cache_hit_ratio.set(self._hits / self._requests, namespace=self.name)
+
+
+class Cache[T]:
+    """Записи одного вида (`kind`) в пространстве имён.
+
+    Первый уровень отдаёт всем вызывающим один и тот же объект: менять полученные значения нельзя.
+    """
+
+    def __init__(
+            self,
+            namespace: Namespace,
+            kind: str,
+            serializer: Serializer[T] | None,
+            *,
+            local_ttl: float | None,
+            remote_ttl: int | None,
+    ) -> None:
+        if serializer is None and remote_ttl is not None:
+            msg = f"Cache {namespace.name}:{kind} needs a serializer to use Redis"
+            raise ValueError(msg)
+        self.namespace = namespace
+        self.kind = kind
+        self.serializer = serializer
+        self.local_ttl = local_ttl
+        self.remote_ttl = remote_ttl
+        self._flights = SingleFlight()
+
+    def _remote_key(self, version: int, key: str) -> str:
+        return f"{KEY_PREFIX}:{self.namespace.name}:{version}:{self.kind}:{key}"
+
+    async def get(self, key: Hashable) -> T | None:
+        """Значение без загрузки: L1, затем L2; None — нет ни там, ни там."""
+        value = await self._lookup(str(key), await self.namespace.current_version())
+        return None if value is MISSING else value
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        """Значение из кэша или loader() с записью в оба уровня; промахи по ключу схлопываются.
+
+        None от loader возвращается, но не кэшируется: «не найдено» не должно залипать.
+        """
+        str_key = str(key)
+        version = await self.namespace.current_version()
+        value = await self._lookup(str_key, version)
+        if value is not MISSING:
+            return value
+        if self._flights.is_loading((version, str_key)):
+            cache_coalesced.inc(namespace=self.namespace.name)
+        return await self._flights.do((version, str_key), lambda: self._load(str_key, version, loader))
+
+    async def set(self, key: Hashable, value: T) -> None:
+        version = await self.namespace.current_version()
+        await self._store(str(key), version, value)
+
+    async def delete(self, key: Hashable) -> None:
+        """Удаляет запись из Redis и из первого уровня всех воркеров."""
+        str_key = str(key)
+        version = await self.namespace.current_version()
+        self.namespace.local.pop((self.kind, str_key))
+        if self.remote_ttl is not None:
+            try:
+                await self.namespace.redis.delete(self._remote_key(version, str_key))
+            except RedisError as e:
+                cache_errors.inc(namespace=self.namespace.name)
+                logger.warning("Cache delete failed for {}:{}: {}", self.namespace.name, str_key, e)
+        await self.namespace.publish({"kind": self.kind, "key": str_key})
+
+    async def _lookup(self, key: str, version: int) -> Any:  # noqa: ANN401
+        value = self.namespace.local.get((self.kind, key))
+        if value is not MISSING:
+            self.namespace.record("l1_hit")
+            return value
+        if self.serializer is not None and self.remote_ttl is not None:
+            try:
+                raw = cast("bytes | None", await self.namespace.redis.get(self._remote_key(version, key)))
+            except RedisError as e:
+                cache_errors.inc(namespace=self.namespace.name)
+                logger.warning("Cache read failed for {}:{}: {}", self.namespace.name, key, e)
+                raw = None
+            if raw is not None:
+                value = self.serializer.loads(raw)
+                self._put_local(key, version, value)
+                self.namespace.record("l2_hit")
+                return value
+        self.namespace.record("miss")
+        return MISSING
+
+    async def _load(self, key: str, version: int, loader: Callable[[], Awaitable[T]]) -> T:
+        cache_loads.inc(namespace=self.namespace.name)
+        value = await loader()
+        if value is not None:
+            await self._store(key, version, value)
+        return value
+
+    async def _store(self, key: str, version: int, value: T) -> None:
+        self._put_local(key, version, value)
+        if self.serializer is None or self.remote_ttl is None:
+            return
+        try:
+            raw = self.serializer.dumps(value)
+            await self.namespace.redis.set(self._remote_key(version, key), raw, ex=self.remote_ttl)
+        except RedisError as e:
+            cache_errors.inc(namespace=self.namespace.name)
+            logger.warning("Cache write failed for {}:{}: {}", self.namespace.name, key, e)
+
+    def _put_local(self, key: str, version: int, value: object) -> None:
+        # Загрузка, начатая до инвалидации, не кладёт в L1 значение старой версии
+        if version == self.namespace.version:
+            self.namespace.local.put((self.kind, key), value, self.local_ttl)
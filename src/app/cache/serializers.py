@@ -0,0 +1,45 @@
+"""Сериализаторы значений второго уровня кэша (Redis): объект ↔ bytes."""
+import json
+from typing import Any, Protocol, cast
+
+import msgpack
+from pydantic import TypeAdapter
+
+
+class Serializer[T](Protocol):
+    def dumps(self, value: T) -> bytes: ...
+
+    def loads(self, raw: bytes) -> T: ...
+
+
+class JsonSerializer:
+    """Словари, списки и скаляры."""
+
+    def dumps(self, value: Any) -> bytes:  # noqa: ANN401
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(self, raw: bytes) -> Any:  # noqa: ANN401
+        return json.loads(raw)
+
+
+class MsgpackSerializer:
+    """То же, что JSON, но компактнее; кортежи возвращаются списками."""
+
+    def dumps(self, value: Any) -> bytes:  # noqa: ANN401
+        return cast("bytes", msgpack.packb(value))
+
+    def loads(self, raw: bytes) -> Any:  # noqa: ANN401
+        return msgpack.unpackb(raw)
+
+
+class PydanticSerializer[T]:
+    """Любой тип, который понимает pydantic: DTO, list[DTO], dict[int, DTO]."""
+
+    def __init__(self, type_: type[T] | Any) -> None:  # noqa: ANN401
+        self._adapter: TypeAdapter[T] = TypeAdapter(type_)
+
+    def dumps(self, value: T) -> bytes:
+        return self._adapter.dump_json(value)
+
+    def loads(self, raw: bytes) -> T:
+        return self._adapter.validate_json(raw)
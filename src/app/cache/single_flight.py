@@ -0,0 +1,59 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, cast
+
+
+@dataclass(frozen=True, slots=True)
+class _Failed:
+    error: Exception
+
+
+# Загружавший отменён: ждущие повторяют загрузку сами
+_ABANDONED = object()
+
+
+class SingleFlight:
+    """Одновременные промахи по одному ключу ждут одну загрузку.
+
+    Загрузка идёт в задаче первого промахнувшегося, на его ресурсах (сессия запроса): отдельной
+    задачи, которая пережила бы отменённый запрос и его закрытую сессию, нет. Если первого
+    отменили, загрузку начинает заново один из ждущих. Исключение загрузки получает каждый
+    ждущий; следующий промах начнёт загрузку заново.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def is_loading(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do[T](self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        while (flight := self._inflight.get(key)) is not None:
+            # shield: отмена одного ждущего не трогает общий future
+            outcome = await asyncio.shield(flight)
+            if outcome is _ABANDONED:
+                continue
+            if isinstance(outcome, _Failed):
+                raise outcome.error
+            return cast("T", outcome)
+
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[key] = flight
+        try:
+            value = await load()
+        except Exception as e:
+            flight.set_result(_Failed(e))
+            raise
+        except BaseException:
+            # Отмена (или выход процесса) загружавшего — не ошибка загрузки
+            flight.set_result(_ABANDONED)
+            raise
+        else:
+            flight.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
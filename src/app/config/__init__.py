@@ -1,11 +1,27 @@
+from .answer_compaction_config import answer_compaction_settings
+from .cache_config import cache_settings
 from .config import settings
 from .database_config import database_settings
+from .duplicate_callback_config import duplicate_callback_settings
+from .exam_pool_config import exam_pool_settings
+from .fsm_storage_config import fsm_storage_settings
 from .logging_config import setup_logging
 from .redis_config import redis_settings
+from .scheduler_config import scheduler_settings
+from .telegram_session_config import telegram_session_settings
+from .update_scheduler_config import update_scheduler_settings
 
 __all__ = [
+    "answer_compaction_settings",
+    "cache_settings",
     "database_settings",
+    "duplicate_callback_settings",
+    "exam_pool_settings",
+    "fsm_storage_settings",
     "redis_settings",
+    "scheduler_settings",
     "settings",
     "setup_logging",
+    "telegram_session_settings",
+    "update_scheduler_settings",
 ]
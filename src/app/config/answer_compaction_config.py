@@ -0,0 +1,20 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AnswerCompactionSettings(BaseSettings):
+    """Свёртка холодной истории user_answers (см. app.jobs.compact_answers)."""
+    model_config = SettingsConfigDict(env_prefix="ANSWER_COMPACTION_")
+
+    ENABLED: bool = True
+    # Ответы моложе срока не трогаются; недельный рейтинг читает user_answers от начала недели,
+    # поэтому меньше 8 дней нельзя
+    RETENTION_DAYS: int = Field(default=30, ge=8)
+    # Юзеров на один statement и транзакцию
+    USERS_PER_BATCH: int = 200
+    # Cron в UTC, после ночной пересборки рейтингов
+    CRON: str = "0 2 * * *"
+    TIMEOUT: float = 1800.0
+
+
+answer_compaction_settings = AnswerCompactionSettings()
@@ -0,0 +1,15 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class CacheSettings(BaseSettings):
+    """Двухуровневый кэш `app.cache`: память процесса + Redis."""
+    model_config = SettingsConfigDict(env_prefix="CACHE_")
+
+    # Записей первого уровня на пространство имён
+    L1_MAXSIZE: int = 10_000
+    # Как часто перечитывать версию пространства, если сообщение pub/sub потерялось
+    VERSION_CHECK_INTERVAL: float = 5.0
+    CHANNEL: str = "cache:invalidate"
+
+
+cache_settings = CacheSettings()
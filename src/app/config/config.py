@@ -1,9 +1,16 @@
+from pathlib import Path
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     BOT_TOKEN: SecretStr
+    # Маркер готовности для healthcheck: появляется после прогрева, исчезает при остановке
+    READY_FILE: Path = Path("run/bot.ready")
+    # /metrics и /health; без порта HTTP-сервер метрик не поднимается
+    METRICS_HOST: str = "0.0.0.0"  # noqa: S104
+    METRICS_PORT: int | None = None
 
 
 settings = Settings()  # type: ignore[call-arg]
@@ -13,5 +13,16 @@ class DatabaseSettings(BaseSettings):
     DRIVER: str = "postgresql+asyncpg"
     POOL_SIZE: int = 5
 
+    REPLICA_HOST: str | None = None
+    REPLICA_PORT: int = 5432
+    REPLICA_POOL_SIZE: int = 5
+    STICKY_PRIMARY_SECONDS: float = 5.0
+
+    PARALLEL_READS: int = 4
+    PARALLEL_READS_PER_UPDATE: int = 2
+
+    # Горячие выборки готовым SQL на asyncpg вместо ORM (см. fast_selection_repository)
+    FAST_PATH: bool = True
+
 
 database_settings = DatabaseSettings()  # type: ignore[call-arg]
@@ -0,0 +1,12 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DuplicateCallbackSettings(BaseSettings):
+    """Защита от повторных нажатий кнопок (см. bot.middlewares.DuplicateCallbackMiddleware)."""
+    model_config = SettingsConfigDict(env_prefix="DEDUP_")
+
+    # Сколько держать в Redis отметку про нажатую кнопку ответа
+    ANSWER_TTL_MS: int = 600_000
+
+
+duplicate_callback_settings = DuplicateCallbackSettings()
@@ -0,0 +1,20 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ExamPoolSettings(BaseSettings):
+    """Пул заранее собранных экзаменационных вариантов (см. ExamVariantPool)."""
+    model_config = SettingsConfigDict(env_prefix="EXAM_POOL_")
+
+    ENABLED: bool = True
+    # Сколько вариантов держать на категорию и сколько досоздавать за один проход продюсера
+    DEPTH: int = 20
+    REFILL_BATCH: int = 5
+    REFILL_INTERVAL: float = 5.0
+    # Сколько вариантов снимать из пула за запрос, чтобы выбрать наименее знакомый юзеру
+    CANDIDATES: int = 3
+    # Если уже виденных юзером упражнений в лучшем варианте больше MAX_SEEN, задание собирается вживую
+    MAX_SEEN: int = 0
+    TTL_SECONDS: int = 86_400
+
+
+exam_pool_settings = ExamPoolSettings()
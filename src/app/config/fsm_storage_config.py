@@ -0,0 +1,14 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class FsmStorageSettings(BaseSettings):
+    """FSM-хранилище бота (см. bot.fsm_storage)."""
+    model_config = SettingsConfigDict(env_prefix="FSM_")
+
+    # Ключ юзера истекает после стольких секунд без записей; None — хранить вечно
+    IDLE_TTL: int | None = 30 * 24 * 3600
+    # Короткие имена ключей и полей; смена настройки начинает состояние всех чатов заново
+    COMPACT_KEYS: bool = True
+
+
+fsm_storage_settings = FsmStorageSettings()
@@ -0,0 +1,16 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class SchedulerSettings(BaseSettings):
+    """Фоновые задачи бота (см. app.scheduler и app.jobs.schedule)."""
+    model_config = SettingsConfigDict(env_prefix="SCHEDULER_")
+
+    ENABLED: bool = True
+    # Cron в UTC; по умолчанию ночью по Москве, когда нагрузка минимальна
+    LEADERBOARD_REBUILD_CRON: str = "30 1 * * *"
+    LEADERBOARD_REBUILD_TIMEOUT: float = 600.0
+    # Разброс старта задач между воркерами, секунды
+    JITTER: float = 1.0
+
+
+scheduler_settings = SchedulerSettings()
@@ -0,0 +1,21 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class TelegramSessionSettings(BaseSettings):
+    """Ограничение запросов к Bot API (см. bot.telegram_session.RateLimitedSession)."""
+    model_config = SettingsConfigDict(env_prefix="TG_SESSION_")
+
+    ENABLED: bool = True
+    # Запросов в секунду и размер пачки: на бота целиком, на личный чат, на группу (20 в минуту)
+    GLOBAL_RATE: float = 30.0
+    GLOBAL_BURST: int = 30
+    CHAT_RATE: float = 3.0
+    CHAT_BURST: int = 10
+    GROUP_RATE: float = 20 / 60
+    GROUP_BURST: int = 5
+    # Повторы после 429; при retry_after длиннее MAX_RETRY_AFTER ошибка сразу уходит обработчику
+    MAX_RETRIES: int = 3
+    MAX_RETRY_AFTER: float = 30.0
+
+
+telegram_session_settings = TelegramSessionSettings()
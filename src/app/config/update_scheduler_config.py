@@ -0,0 +1,14 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class UpdateSchedulerSettings(BaseSettings):
+    """Очередь апдейтов по чатам (см. bot.middlewares.UpdateSchedulerMiddleware)."""
+    model_config = SettingsConfigDict(env_prefix="UPDATES_")
+
+    # Сколько чатов обрабатывается одновременно; держать порядка DB_POOL_SIZE, иначе апдейты ждут соединение
+    MAX_CONCURRENT_CHATS: int = 8
+    # Повторное нажатие той же кнопки, пока первое ещё в очереди чата, отбрасывается
+    COALESCE_CALLBACKS: bool = True
+
+
+update_scheduler_settings = UpdateSchedulerSettings()
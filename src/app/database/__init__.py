@@ -1,9 +1,31 @@
 from .base_model import BaseDBModel
-from .connection import async_engine, close_db, get_session
+from .concurrent_reads import ConcurrentReads, ReadSlots
+from .connection import (
+    async_engine,
+    async_session_factory,
+    close_db,
+    get_session,
+    replica_engine,
+    replica_session_factory,
+)
+from .read_session import ReadSession, StickyPrimary, has_writes
+from .redis_client import close_redis, redis_client
+from .unit_of_work import UnitOfWork
 
 __all__ = [
     "BaseDBModel",
+    "ConcurrentReads",
+    "ReadSession",
+    "ReadSlots",
+    "StickyPrimary",
+    "UnitOfWork",
     "async_engine",
+    "async_session_factory",
     "close_db",
+    "close_redis",
     "get_session",
+    "has_writes",
+    "redis_client",
+    "replica_engine",
+    "replica_session_factory",
 ]
@@ -0,0 +1,64 @@
+"""Параллельные независимые чтения.
+
+Одна `AsyncSession` не умеет выполнять запросы одновременно, поэтому независимые чтения
+апдейта (сводка и разбивка статистики, страты экзаменационного задания) шли друг за другом.
+`ConcurrentReads.gather` запускает их в `asyncio.TaskGroup`, каждое — на своей короткоживущей
+сессии из пула. Изменения, накопленные в сессии апдейта, такие чтения не видят, поэтому
+годятся они только для запросов, которым эти изменения не нужны. Если апдейт уже отправил
+записи (flush), чтения идут по очереди на его собственной сессии (`update_session`): иначе
+выбор задания после ответа не увидел бы только что записанные ответы.
+
+Пул общий, поэтому параллелизм ограничен дважды: на апдейт (`per_update`) и на процесс
+(`ReadSlots`) — чтобы ни один апдейт и ни всплеск апдейтов не выбрали все соединения.
+"""
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, overload
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.read_session import ReadSession, has_flushed_writes
+
+type ReadCall[T] = Callable[[ReadSession], Awaitable[T]]
+
+
+class ReadSlots(asyncio.Semaphore):
+    """Общий на процесс лимит соединений, одновременно занятых параллельными чтениями."""
+
+
+class ConcurrentReads:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        slots: ReadSlots,
+        *, per_update: int,
+        update_session: ReadSession | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._slots = slots
+        self._per_update = asyncio.Semaphore(per_update)
+        self._update_session = update_session
+
+    @overload
+    async def gather[T1, T2](self, first: ReadCall[T1], second: ReadCall[T2], /) -> tuple[T1, T2]: ...
+
+    @overload
+    async def gather[T](self, *calls: ReadCall[T]) -> tuple[T, ...]: ...
+
+    async def gather(self, *calls: ReadCall[Any]) -> tuple[Any, ...]:
+        """Выполняет чтения параллельно и возвращает результаты в порядке вызовов.
+
+        Первая ошибка отменяет остальные чтения и пробрасывается как есть, без ExceptionGroup.
+        """
+        if self._update_session is not None and has_flushed_writes(self._update_session.primary):
+            return tuple([await call(self._update_session) for call in calls])
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(self._run(call)) for call in calls]
+        except ExceptionGroup as e:
+            raise e.exceptions[0] from e
+        return tuple(task.result() for task in tasks)
+
+    async def _run[T](self, call: ReadCall[T]) -> T:
+        async with self._per_update, self._slots, self._session_factory() as session:
+            return await call(ReadSession(session))
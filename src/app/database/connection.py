@@ -3,7 +3,7 @@ from contextlib import asynccontextmanager
 
 from loguru import logger
 from sqlalchemy import URL
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import database_settings
 
@@ -24,12 +24,31 @@ async_engine = create_async_engine(
     pool_pre_ping=True,
 )
 
+# Без autoflush: изменения апдейта копятся в сессии и уходят одним flush на commit (см. UnitOfWork)
 async_session_factory = async_sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
     expire_on_commit=False,
+    autoflush=False,
 )
 
+replica_engine: AsyncEngine | None = None
+replica_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+if database_settings.REPLICA_HOST:
+    replica_engine = create_async_engine(
+        database_url.set(host=database_settings.REPLICA_HOST, port=database_settings.REPLICA_PORT),
+        echo=False,
+        future=True,
+        pool_size=database_settings.REPLICA_POOL_SIZE,
+        pool_pre_ping=True,
+    )
+    replica_session_factory = async_sessionmaker(
+        bind=replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
 
 @asynccontextmanager
 async def get_session() -> AsyncGenerator[AsyncSession]:
@@ -46,4 +65,6 @@ async def get_session() -> AsyncGenerator[AsyncSession]:
 
 async def close_db() -> None:
     await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.success("Database connection closed successfully")
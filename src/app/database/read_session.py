@@ -0,0 +1,145 @@
+"""Маршрутизация read-only запросов на реплику.
+
+`ReadSession` — фасад над основной сессией запроса и (опционально) сессией реплики.
+Чтения идут в реплику, пока запрос ничего не записал; после первой записи и в течение
+«липкого» окна после коммита с записью (`StickyPrimary`) — в основную БД, чтобы выборка
+видела только что сохранённые ответы. Без реплики фасад всегда работает с основной сессией.
+
+Окно хранится в Redis, поэтому его видят все воркеры бота. Внутри апдейта primary видит только
+записи, ушедшие flush (сессия без autoflush): чтения, которым нужны свежие записи, идут после
+`UnitOfWork.flush`.
+"""
+from collections.abc import Sequence
+from typing import Any
+
+from loguru import logger
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import Executable, event
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncResult, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.identity import IdentityMap
+
+_HAS_WRITES_KEY = "has_writes"
+STICKY_KEY_PREFIX = "sticky"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_session_writes(session: Session, _flush_context: Any) -> None:  # noqa: ANN401
+    session.info[_HAS_WRITES_KEY] = True
+
+
+def has_writes(session: AsyncSession) -> bool:
+    """True, если сессия уже что-то записала (flush) или держит несохранённые изменения."""
+    return bool(session.info.get(_HAS_WRITES_KEY) or session.new or session.dirty or session.deleted)
+
+
+def has_flushed_writes(session: AsyncSession) -> bool:
+    """True, если сессия уже отправила записи в БД: другие сессии их не видят до коммита."""
+    return bool(session.info.get(_HAS_WRITES_KEY))
+
+
+class StickyPrimary:
+    """Окно read-your-writes: после записи чтения пользователя `window` секунд идут в primary.
+
+    Окно — ключ `sticky:<user_id>` с PX в Redis, общий для всех воркеров. Если Redis недоступен,
+    пользователь считается липким: чтение из primary всегда корректно, только дороже.
+    """
+
+    def __init__(self, redis: Redis, window: float) -> None:
+        self._redis = redis
+        self._window_ms = int(window * 1000)
+
+    async def mark(self, key: int | None) -> None:
+        if key is None or self._window_ms <= 0:
+            return
+        try:
+            await self._redis.set(f"{STICKY_KEY_PREFIX}:{key}", 1, px=self._window_ms)
+        except RedisError as e:
+            logger.warning("Sticky primary mark failed for user_id={}: {}", key, e)
+
+    async def is_sticky(self, key: int | None) -> bool:
+        if key is None or self._window_ms <= 0:
+            return False
+        try:
+            return bool(await self._redis.exists(f"{STICKY_KEY_PREFIX}:{key}"))
+        except RedisError as e:
+            logger.warning("Sticky primary check failed for user_id={}: {}", key, e)
+            return True
+
+
+class ReadSession:
+    """Сессия для чтения каталога и статистики.
+
+    Маршрут выбирается на каждый вызов: реплика — только если она настроена, пользователь вне
+    липкого окна и основная сессия запроса ещё ничего не записала. Записи всегда идут в primary.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncSession,
+        replica_factory: async_sessionmaker[AsyncSession] | None = None,
+        *, sticky: bool = False,
+    ) -> None:
+        self._primary = primary
+        self._replica_factory = replica_factory
+        self._sticky = sticky
+        self._replica: AsyncSession | None = None
+
+    @property
+    def primary(self) -> AsyncSession:
+        return self._primary
+
+    @property
+    def sticky(self) -> bool:
+        return self._sticky
+
+    @property
+    def current(self) -> AsyncSession:
+        """Сессия, в которую уйдёт следующий read-запрос."""
+        if self._replica_factory is None or self._sticky or has_writes(self._primary):
+            return self._primary
+        if self._replica is None:
+            self._replica = self._replica_factory()
+        return self._replica
+
+    @property
+    def identity_map(self) -> IdentityMap:
+        return self.current.identity_map
+
+    async def execute(
+        self, statement: Executable, params: Any = None, **kwargs: Any,  # noqa: ANN401
+    ) -> Result[*tuple[Any, ...]]:
+        return await self.current.execute(statement, params, **kwargs)
+
+    async def stream(
+        self, statement: Executable, params: Any = None, **kwargs: Any,  # noqa: ANN401
+    ) -> AsyncResult[*tuple[Any, ...]]:
+        return await self.current.stream(statement, params, **kwargs)
+
+    async def connection(self) -> AsyncConnection:
+        return await self.current.connection()
+
+    async def get[T](self, entity: type[T], ident: Any, **kwargs: Any) -> T | None:  # noqa: ANN401
+        return await self.current.get(entity, ident, **kwargs)
+
+    def add(self, instance: object) -> None:
+        self._primary.add(instance)
+
+    async def delete(self, instance: object) -> None:
+        await self._primary.delete(instance)
+
+    async def refresh(self, instance: object) -> None:
+        await self._primary.refresh(instance)
+
+    async def flush(self, objects: Sequence[Any] | None = None) -> None:
+        await self._primary.flush(objects)
+
+    async def commit(self) -> None:
+        await self._primary.commit()
+
+    async def close(self) -> None:
+        if self._replica is not None:
+            await self._replica.close()
+            self._replica = None
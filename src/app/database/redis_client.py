@@ -0,0 +1,17 @@
+from loguru import logger
+from redis.asyncio.client import Redis
+
+from app.config import redis_settings
+
+redis_client = Redis(
+    host=redis_settings.HOST,
+    port=redis_settings.PORT,
+    username=redis_settings.USERNAME,
+    password=redis_settings.PASSWORD.get_secret_value(),
+    db=redis_settings.DB,
+)
+
+
+async def close_redis() -> None:
+    await redis_client.aclose()
+    logger.success("Redis connection closed successfully")
@@ -0,0 +1,42 @@
+"""Единица работы на один апдейт.
+
+Сессия запроса создаётся без autoflush: сервисы и репозитории только меняют ORM-объекты
+(`add`, присваивания), а в БД всё уходит одним flush внутри `UnitOfWork.commit`. Так апдейт
+стоит одну пачку DML вместо flush после каждого шага, а однотипные INSERT (например, ответы
+на все упражнения экзаменационного задания) склеиваются insertmanyvalues в один запрос.
+
+Исключение — чтения, которым нужны записи этого же апдейта: после ответа выбор следующего
+задания должен видеть только что записанные ответы и расписание SM-2, поэтому обработчик
+ответа делает `UnitOfWork.flush` перед выбором (ответы всё так же уходят одной пачкой).
+
+Побочные эффекты вне БД (очки рейтинга в Redis) регистрируются через `after_commit` и
+применяются только после успешного коммита: откат апдейта не оставляет их без ответов в БД.
+"""
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._after_commit: list[Callable[[], Awaitable[None]]] = []
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Выполнит `callback` после успешного commit; если коммит упал, колбэк отбрасывается.
+
+        Транзакция к этому моменту уже зафиксирована, поэтому колбэк сам обрабатывает свои ошибки.
+        """
+        self._after_commit.append(callback)
+
+    async def flush(self) -> None:
+        """Отправляет накопленные изменения, не завершая транзакцию: следующие чтения их увидят."""
+        await self._session.flush()
+
+    async def commit(self) -> None:
+        """Отправляет накопленные изменения одним flush, фиксирует транзакцию и запускает after_commit."""
+        callbacks, self._after_commit = self._after_commit, []
+        await self._session.commit()
+        for callback in callbacks:
+            await callback()
+
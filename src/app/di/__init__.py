@@ -1,5 +1,7 @@
+from .background import background_request
 from .providers import AppProvider
 
 __all__ = [
     "AppProvider",
+    "background_request",
 ]
@@ -0,0 +1,15 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from aiogram.types import TelegramObject
+from dishka import AsyncContainer
+
+
+@asynccontextmanager
+async def background_request(container: AsyncContainer) -> AsyncIterator[AsyncContainer]:
+    """REQUEST-скоуп вне апдейта (прогрев, фоновые задачи): те же сервисы, что у апдейта.
+
+    Событие пустое — у него нет юзера, поэтому липкое окно primary не проверяется и не ставится.
+    """
+    async with container(context={TelegramObject: TelegramObject()}) as request_container:
+        yield request_container
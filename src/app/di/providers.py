@@ -1,44 +1,133 @@
 from collections.abc import AsyncGenerator
 
+from aiogram.types import TelegramObject
 from dishka import Provider, Scope, provide
+from redis.asyncio.client import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_session
+from app.cache import CacheManager
+from app.config import database_settings
+from app.database import (
+    ConcurrentReads,
+    ReadSession,
+    ReadSlots,
+    StickyPrimary,
+    UnitOfWork,
+    async_session_factory,
+    get_session,
+    has_writes,
+    redis_client,
+    replica_session_factory,
+)
 from app.processors import ProcessorFactory
 from app.repositories import (
     CategoryRepository,
     ExerciseRepository,
+    FastExerciseRepository,
+    FastUserAnswerRepository,
     UserAnswerRepository,
     UserCategoryStatRepository,
+    UserExerciseScheduleRepository,
     UserRepository,
     UserStatRepository,
 )
+from app.services.catalog_service import CatalogService
 from app.services.category_service import CategoryService
+from app.services.exam_variant_pool import ExamVariantPool
 from app.services.exercise_selector import ExerciseSelector
+from app.services.leaderboard_service import LeaderboardService
+from app.services.recent_exercises_service import RecentExercisesService
 from app.services.stats_service import StatsService
 from app.services.task_service import TaskService
 from app.services.user_service import UserService
 
 
+def _event_user_id(event: TelegramObject) -> int | None:
+    from_user = getattr(event, "from_user", None)
+    return from_user.id if from_user is not None else None
+
+
 class AppProvider(Provider):
     scope = Scope.REQUEST
 
+    @provide(scope=Scope.APP)
+    def get_sticky_primary(self, redis: Redis) -> StickyPrimary:
+        return StickyPrimary(redis, window=database_settings.STICKY_PRIMARY_SECONDS)
+
+    @provide(scope=Scope.APP)
+    def get_read_slots(self) -> ReadSlots:
+        return ReadSlots(database_settings.PARALLEL_READS)
+
+    @provide(scope=Scope.APP)
+    def get_redis(self) -> Redis:
+        return redis_client
+
+    @provide(scope=Scope.APP)
+    def get_cache_manager(self, redis: Redis) -> CacheManager:
+        return CacheManager(redis)
+
     @provide
-    async def get_db_session(self) -> AsyncGenerator[AsyncSession]:
+    async def get_db_session(
+        self, event: TelegramObject, sticky_primary: StickyPrimary,
+    ) -> AsyncGenerator[AsyncSession]:
         async with get_session() as session:
             yield session
+            # Без реплики все чтения и так идут в primary: окно не нужно, Redis не трогаем
+            if replica_session_factory is not None and has_writes(session):
+                await sticky_primary.mark(_event_user_id(event))
+
+    @provide
+    async def get_read_session(
+        self, session: AsyncSession, event: TelegramObject, sticky_primary: StickyPrimary,
+    ) -> AsyncGenerator[ReadSession]:
+        read_session = ReadSession(
+            session,
+            replica_session_factory,
+            sticky=replica_session_factory is not None and await sticky_primary.is_sticky(_event_user_id(event)),
+        )
+        yield read_session
+        await read_session.close()
+
+    @provide
+    def get_concurrent_reads(self, read_slots: ReadSlots, read_session: ReadSession) -> ConcurrentReads:
+        session_factory = async_session_factory
+        if replica_session_factory is not None and not read_session.sticky:
+            session_factory = replica_session_factory
+        return ConcurrentReads(
+            session_factory,
+            read_slots,
+            per_update=database_settings.PARALLEL_READS_PER_UPDATE,
+            update_session=read_session,
+        )
+
+    @provide
+    def get_exercise_repository(self, session: ReadSession) -> ExerciseRepository:
+        if database_settings.FAST_PATH:
+            return FastExerciseRepository(session)
+        return ExerciseRepository(session)
+
+    @provide
+    def get_user_answer_repository(self, session: AsyncSession) -> UserAnswerRepository:
+        if database_settings.FAST_PATH:
+            return FastUserAnswerRepository(session)
+        return UserAnswerRepository(session)
+
+    unit_of_work = provide(UnitOfWork)
 
-    exercise_repository = provide(ExerciseRepository)
     category_repository = provide(CategoryRepository)
     user_repository = provide(UserRepository)
-    user_answer_repository = provide(UserAnswerRepository)
     user_stat_repository = provide(UserStatRepository)
     user_category_stat_repository = provide(UserCategoryStatRepository)
+    user_exercise_schedule_repository = provide(UserExerciseScheduleRepository)
 
+    recent_exercises_service = provide(RecentExercisesService)
     exercise_selector = provide(ExerciseSelector)
     processor_factory = provide(ProcessorFactory)
+    exam_variant_pool = provide(ExamVariantPool)
 
+    catalog_service = provide(CatalogService)
     user_service = provide(UserService)
     category_service = provide(CategoryService)
     task_service = provide(TaskService)
     stats_service = provide(StatsService)
+    leaderboard_service = provide(LeaderboardService)
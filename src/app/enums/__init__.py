@@ -1,5 +1,8 @@
-from .category_enums import HandlerType
+from .category_enums import HandlerType, SelectionStrategy
+from .leaderboard_enums import LeaderboardPeriod
 
 __all__ = [
     "HandlerType",
+    "LeaderboardPeriod",
+    "SelectionStrategy",
 ]
@@ -44,3 +44,8 @@ class HandlerType(StrEnum):
     TASK_24_EXAM = "TASK_24_EXAM"
     TASK_25_EXAM = "TASK_25_EXAM"
     TASK_26_EXAM = "TASK_26_EXAM"
+
+
+class SelectionStrategy(StrEnum):
+    THOMPSON = "THOMPSON"
+    SPACED_REPETITION = "SPACED_REPETITION"
@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class LeaderboardPeriod(StrEnum):
+    WEEK = "week"
+    ALL_TIME = "all"
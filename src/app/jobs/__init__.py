@@ -0,0 +1,13 @@
+from .compact_answers import compact_answers
+from .exam_pool_producer import refill_once
+from .import_exercises import import_exercises
+from .invalidate_cache import invalidate_cache
+from .leaderboard_rebuild import rebuild_leaderboards
+
+__all__ = [
+    "compact_answers",
+    "import_exercises",
+    "invalidate_cache",
+    "rebuild_leaderboards",
+    "refill_once",
+]
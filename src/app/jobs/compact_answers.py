@@ -0,0 +1,61 @@
+"""Свёртка холодной истории ответов: `python -m app.jobs.compact_answers`.
+
+Выборка смотрит только на последние STATS_WINDOW_SIZE ответов на упражнение, а user_answers
+растёт бесконечно, и каждый оконный запрос проходит по всей истории юзера. Задача планировщика
+(`app.jobs.schedule`) раз в ночь переносит ответы старше ANSWER_COMPACTION_RETENTION_DAYS и вне
+окна в `user_answer_summaries` (см. `UserAnswerRepository.compact_history`). Юзеры идут пачками
+по USERS_PER_BATCH, каждая пачка — своя короткая транзакция. `UserStat`/`UserCategoryStat`
+ведутся инкрементально и свёртку не замечают.
+"""
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import answer_compaction_settings, setup_logging
+from app.database import async_session_factory, close_db
+from app.metrics import counter
+from app.repositories import UserAnswerRepository, UserRepository
+from app.services.exercise_selector import STATS_WINDOW_SIZE
+
+compacted_answers = counter("answer_compaction_rows_total", "user_answers rows folded into summaries")
+
+
+async def compact_answers(
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+        *,
+        now: datetime | None = None,
+) -> int:
+    """Один проход по всем юзерам; возвращает, сколько строк user_answers свёрнуто."""
+    before = (now or datetime.now(UTC)) - timedelta(days=answer_compaction_settings.RETENTION_DAYS)
+    total = 0
+    last_user_id = 0
+    while True:
+        async with session_factory() as session:
+            user_ids = await UserRepository(session).get_ids_after(
+                last_user_id, answer_compaction_settings.USERS_PER_BATCH,
+            )
+            if not user_ids:
+                break
+            folded = await UserAnswerRepository(session).compact_history(user_ids, before, STATS_WINDOW_SIZE)
+            await session.commit()
+        last_user_id = user_ids[-1]
+        total += folded
+        compacted_answers.inc(folded)
+    if total:
+        logger.info("Compacted {} user answers older than {}", total, before.date())
+    return total
+
+
+async def main() -> None:
+    setup_logging()
+    logger.info("Compacting cold answer history...")
+    try:
+        await compact_answers()
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""Продюсер пула экзаменационных вариантов (см. `app.services.exam_variant_pool`).
+
+Задача планировщика (`app.jobs.schedule`): раз в EXAM_POOL_REFILL_INTERVAL секунд досоздаёт
+до REFILL_BATCH вариантов в каждой категории, где в пуле меньше DEPTH. Варианты собирает тот же
+create_task, что и вживую, для юзера без истории: выборка для него случайна, а подстройку под
+конкретного юзера делает `ExamVariantPool.take`. `python -m app.jobs.exam_pool_producer` — один
+проход пополнения вручную.
+"""
+import asyncio
+
+from dishka import AsyncContainer, make_async_container
+from dishka.integrations.aiogram import AiogramProvider
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import exam_pool_settings, setup_logging
+from app.database import close_db, close_redis
+from app.di import AppProvider, background_request
+from app.exceptions import TaskForUserNotFoundError
+from app.processors import POOLED_HANDLER_TYPES, ProcessorFactory
+from app.repositories import CategoryRepository
+from app.schemas import CategoryDTO, ExamVariant, TaskResponse, UserWithCategoryDTO
+from app.services.exam_variant_pool import ExamVariantPool, pool_depth, pool_generated, pool_generation_errors
+
+# Юзер без истории ответов: serial-ключи начинаются от 1
+POOL_USER_ID = 0
+
+
+def pool_user(category: CategoryDTO) -> UserWithCategoryDTO:
+    return UserWithCategoryDTO(
+        id=POOL_USER_ID,
+        telegram_id=POOL_USER_ID,
+        username=None,
+        full_name="exam pool",
+        exercise_started_at=None,
+        current_category_id=category.id,
+        current_category=category,
+    )
+
+
+def variant_of(response: TaskResponse) -> ExamVariant:
+    exercise_ids = [response.exercise_ids] if isinstance(response.exercise_ids, int) else response.exercise_ids
+    task_config = response.task_config.model_dump() if response.task_config else {}
+    return ExamVariant(exercise_ids=exercise_ids, task_config=task_config)
+
+
+async def refill_category(category: CategoryDTO, processor_factory: ProcessorFactory, pool: ExamVariantPool) -> int:
+    """Досоздаёт варианты категории до глубины пула (не больше REFILL_BATCH); возвращает их число."""
+    if category.handler_type is None:
+        return 0
+    depth = await pool.depth(category.id)
+    missing = min(exam_pool_settings.REFILL_BATCH, exam_pool_settings.DEPTH - depth)
+    processor = processor_factory.get_processor(category.handler_type)
+    user = pool_user(category)
+
+    variants: list[ExamVariant] = []
+    for _ in range(missing):
+        try:
+            variants.append(variant_of(await processor.create_task(user)))
+        except TaskForUserNotFoundError:
+            # Банк категории меньше одного варианта: дальше будет то же самое
+            pool_generation_errors.inc(category=category.id)
+            logger.debug("Not enough exercises to pre-generate a variant for category_id={}", category.id)
+            break
+    if variants:
+        depth = await pool.put(category.id, variants)
+        pool_generated.inc(len(variants), category=category.id)
+    pool_depth.set(depth, category=category.id)
+    return len(variants)
+
+
+async def refill_once(container: AsyncContainer) -> int:
+    """Один проход по всем экзаменам с пулом; возвращает, сколько вариантов добавлено."""
+    generated = 0
+    async with background_request(container) as request_container:
+        session = await request_container.get(AsyncSession)
+        processor_factory = await request_container.get(ProcessorFactory)
+        pool = await request_container.get(ExamVariantPool)
+        categories = await (await request_container.get(CategoryRepository)).get_by_handler_types(POOLED_HANDLER_TYPES)
+        for category in categories:
+            # Одна сломанная категория не останавливает пополнение остальных
+            try:
+                generated += await refill_category(CategoryDTO.from_orm_obj(category), processor_factory, pool)
+            except Exception:
+                pool_generation_errors.inc(category=category.id)
+                logger.exception("Exam pool refill failed for category_id={}", category.id)
+            # Упражнения вариантов больше не нужны: identity map не растёт от прохода к проходу
+            session.expunge_all()
+    if generated:
+        logger.debug("Exam pool refill added {} variants", generated)
+    return generated
+
+
+async def main() -> None:
+    setup_logging()
+    logger.info("Refilling exam variant pools...")
+    container = make_async_container(AppProvider(), AiogramProvider())
+    try:
+        generated = await refill_once(container)
+        logger.info("Added {} variants", generated)
+    finally:
+        await container.close()
+        await close_redis()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""Импорт упражнений из JSONL: `python -m app.jobs.import_exercises bank.jsonl [--batch-size N] [--workers N]`.
+
+Формат строки — `ExerciseImportRecord`: category_id, content, answer, explanation, group_id, order_index,
+is_active. Повторный импорт того же файла идемпотентен: упражнения сопоставляются по хэшу content.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from loguru import logger
+
+from app.cache import CacheManager
+from app.config import setup_logging
+from app.database import ReadSession, close_db, close_redis, get_session, redis_client
+from app.repositories import CategoryRepository, ExerciseImportRepository
+from app.schemas import ExerciseImportReport
+from app.services.catalog_service import CatalogService
+from app.services.exercise_import_service import DEFAULT_BATCH_SIZE, ExerciseImportService
+
+
+async def import_exercises(
+    path: Path,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int | None = None,
+    dry_run: bool = False,
+) -> ExerciseImportReport:
+    async with get_session() as session:
+        service = ExerciseImportService(
+            import_repository=ExerciseImportRepository(session),
+            category_repository=CategoryRepository(ReadSession(session)),
+            catalog_service=CatalogService(CacheManager(redis_client)),
+        )
+        return await service.import_file(path, batch_size=batch_size, workers=workers, dry_run=dry_run)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import exercises from a JSONL file")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="validation processes (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, do not write to the database")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = _parse_args()
+    setup_logging()
+    try:
+        report = await import_exercises(
+            args.path, batch_size=args.batch_size, workers=args.workers, dry_run=args.dry_run,
+        )
+    finally:
+        await close_redis()
+        await close_db()
+
+    for issue in report.issues:
+        logger.warning("Line {}: {}", issue.line_no, issue.message)
+    if report.invalid > len(report.issues):
+        logger.warning("... and {} more invalid lines", report.invalid - len(report.issues))
+    if report.catalog_version is not None:
+        logger.info("Catalog version bumped to {}", report.catalog_version)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+"""Сброс пространств кэша у всех воркеров: `python -m app.jobs.invalidate_cache categories [...]`.
+
+Нужен после правок, которые идут мимо кода бота: например, админ поменял дерево категорий в базе.
+"""
+import argparse
+import asyncio
+
+from loguru import logger
+
+from app.cache import CacheManager
+from app.config import setup_logging
+from app.database import close_redis, redis_client
+
+
+async def invalidate_cache(*namespaces: str) -> dict[str, int]:
+    return await CacheManager(redis_client).invalidate(*namespaces)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Invalidate cache namespaces on every worker")
+    parser.add_argument("namespaces", nargs="+")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = _parse_args()
+    setup_logging()
+    try:
+        versions = await invalidate_cache(*args.namespaces)
+    finally:
+        await close_redis()
+    for namespace, version in versions.items():
+        logger.info("Cache namespace {} bumped to version {}", namespace, version)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+"""Пересборка Redis-рейтингов из БД: `python -m app.jobs.leaderboard_rebuild`."""
+import asyncio
+
+from dishka import AsyncContainer, make_async_container
+from dishka.integrations.aiogram import AiogramProvider
+from loguru import logger
+
+from app.config import setup_logging
+from app.database import close_db, close_redis
+from app.di import AppProvider, background_request
+from app.services.leaderboard_service import LeaderboardService
+
+
+async def rebuild_leaderboards(container: AsyncContainer) -> None:
+    async with background_request(container) as request_container:
+        await (await request_container.get(LeaderboardService)).rebuild()
+
+
+async def main() -> None:
+    setup_logging()
+    logger.info("Rebuilding leaderboards...")
+    container = make_async_container(AppProvider(), AiogramProvider())
+    try:
+        await rebuild_leaderboards(container)
+    finally:
+        await container.close()
+        await close_redis()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+"""Фоновые задачи бота: что и по какому расписанию запускает планировщик из start_bot."""
+from functools import partial
+
+from dishka import AsyncContainer
+from redis.asyncio.client import Redis
+
+from app.config import answer_compaction_settings, exam_pool_settings, scheduler_settings
+from app.jobs.compact_answers import compact_answers
+from app.jobs.exam_pool_producer import refill_once
+from app.jobs.leaderboard_rebuild import rebuild_leaderboards
+from app.scheduler import Cron, Interval, Job, Scheduler
+
+EXAM_POOL_REFILL_TIMEOUT = 60.0
+
+
+async def build_scheduler(container: AsyncContainer) -> Scheduler:
+    redis = await container.get(Redis)
+    scheduler = Scheduler(redis)
+
+    if exam_pool_settings.ENABLED:
+        scheduler.add(Job(
+            name="exam_pool_refill",
+            func=partial(refill_once, container),
+            schedule=Interval(exam_pool_settings.REFILL_INTERVAL),
+            jitter=scheduler_settings.JITTER,
+            timeout=EXAM_POOL_REFILL_TIMEOUT,
+            lease=exam_pool_settings.REFILL_INTERVAL + EXAM_POOL_REFILL_TIMEOUT,
+            run_on_start=True,
+        ))
+
+    scheduler.add(Job(
+        name="leaderboard_rebuild",
+        func=partial(rebuild_leaderboards, container),
+        schedule=Cron(scheduler_settings.LEADERBOARD_REBUILD_CRON),
+        jitter=scheduler_settings.JITTER,
+        timeout=scheduler_settings.LEADERBOARD_REBUILD_TIMEOUT,
+        lease=scheduler_settings.LEADERBOARD_REBUILD_TIMEOUT,
+    ))
+
+    if answer_compaction_settings.ENABLED:
+        scheduler.add(Job(
+            name="answer_compaction",
+            func=compact_answers,
+            schedule=Cron(answer_compaction_settings.CRON),
+            jitter=scheduler_settings.JITTER,
+            timeout=answer_compaction_settings.TIMEOUT,
+            lease=answer_compaction_settings.TIMEOUT,
+        ))
+    return scheduler
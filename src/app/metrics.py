@@ -0,0 +1,122 @@
+"""Метрики процесса: счётчики и gauge в памяти, отдаются в текстовом формате Prometheus.
+
+Метрики объявляются на уровне модуля, который их пишет (`counter(...)`, `gauge(...)`), и живут в
+общем `REGISTRY`. `start_metrics_server` поднимает aiohttp-эндпоинты `/metrics` и `/health`
+(aiohttp уже приходит с aiogram); без METRICS_PORT сервер не запускается, а счётчики просто копятся.
+"""
+from collections.abc import Callable
+
+from aiohttp import web
+from loguru import logger
+
+type LabelValues = tuple[str, ...]
+
+
+class _Metric:
+    kind: str
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[LabelValues, float] = {}
+
+    def _key(self, labels: dict[str, str | int]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            msg = f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            raise ValueError(msg)
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def value(self, **labels: str | int) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> dict[LabelValues, float]:
+        return dict(self._values)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str | int) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str | int) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str | int) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str | int) -> None:
+        self.inc(-amount, **labels)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register[M: _Metric](self, metric: M) -> M:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                msg = f"Metric {metric.name} is already registered with another type or labels"
+                raise ValueError(msg)
+            return existing  # type: ignore[return-value]
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for label_values, value in sorted(metric.samples().items()):
+                labels = ",".join(
+                    f'{name}="{_escape(label)}"' for name, label in zip(metric.labelnames, label_values, strict=True)
+                )
+                lines.append(f"{metric.name}{{{labels}}} {value:g}" if labels else f"{metric.name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def metrics_app(is_ready: Callable[[], bool], registry: MetricsRegistry = REGISTRY) -> web.Application:
+    async def metrics(_request: web.Request) -> web.Response:
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
+
+    async def health(_request: web.Request) -> web.Response:
+        return web.Response(text="ok" if is_ready() else "warming up", status=200 if is_ready() else 503)
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    app.router.add_get("/health", health)
+    return app
+
+
+async def start_metrics_server(host: str, port: int, is_ready: Callable[[], bool]) -> web.AppRunner:
+    runner = web.AppRunner(metrics_app(is_ready), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Metrics server listening on {}:{}", host, port)
+    return runner
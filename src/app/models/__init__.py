@@ -1,8 +1,11 @@
 from .category_model import Category
 from .exercise_model import Exercise
 from .user_answer_model import UserAnswer
+from .user_answer_summary_model import UserAnswerSummary
 from .user_category_stat_model import UserCategoryStat
+from .user_exercise_schedule_model import UserExerciseSchedule
 from .user_model import User
+from .user_seen_group_model import UserSeenGroup
 from .user_stat_model import UserStat
 
 __all__ = [
@@ -10,6 +13,9 @@ __all__ = [
     "Exercise",
     "User",
     "UserAnswer",
+    "UserAnswerSummary",
     "UserCategoryStat",
+    "UserExerciseSchedule",
+    "UserSeenGroup",
     "UserStat",
 ]
@@ -5,7 +5,7 @@ from sqlalchemy import Enum as SqlEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import BaseDBModel
-from app.enums import HandlerType
+from app.enums import HandlerType, SelectionStrategy
 
 if TYPE_CHECKING:
     from app.models import Exercise, UserAnswer
@@ -19,6 +19,13 @@ class Category(BaseDBModel):
         default=None,
     )
 
+    selection_strategy: Mapped[SelectionStrategy] = mapped_column(
+        SqlEnum(SelectionStrategy, name="selection_strategy_enum", native_enum=False, length=32),
+        default=SelectionStrategy.THOMPSON,
+        server_default=SelectionStrategy.THOMPSON.value,
+        nullable=False,
+    )
+
     is_ege_task: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
 
     parent_id: Mapped[int | None] = mapped_column(ForeignKey("categories.id"), index=True, nullable=True)
@@ -1,7 +1,7 @@
 import uuid
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import Boolean, ForeignKey, String, Text
+from sqlalchemy import Boolean, Computed, ForeignKey, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,10 +20,27 @@ class Exercise(BaseDBModel):
     content: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
 
     answer: Mapped[str] = mapped_column(String(256), nullable=True)
-    explanation: Mapped[str] = mapped_column(Text, nullable=True)
+    # Разбор нужен только в результате проверки ответа: грузится явно
+    # (ExerciseRepository.get_for_answer_check), неявная подгрузка запрещена
+    explanation: Mapped[str] = mapped_column(Text, nullable=True, deferred=True, deferred_raiseload=True)
 
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
+    # Поля content, по которым фильтруют процессоры, — stored generated columns под индексы
+    # (см. exercise_filters); пишет их только Postgres, в выборки упражнений они не грузятся
+    particle: Mapped[str | None] = mapped_column(
+        Text, Computed("content ->> 'particle'", persisted=True), deferred=True,
+    )
+    has_corrected_sentence: Mapped[bool] = mapped_column(
+        Boolean, Computed("(content ->> 'corrected_sentence') IS NOT NULL", persisted=True), deferred=True,
+    )
+    has_incorrect_answer: Mapped[bool] = mapped_column(
+        Boolean, Computed("(content ->> 'incorrect_answer') IS NOT NULL", persisted=True), deferred=True,
+    )
+
+    # md5(content::text) — ключ дедупликации при импорте; NULL, если упражнение добавлено не импортом
+    content_hash: Mapped[str | None] = mapped_column(String(32), default=None, nullable=True)
+
     category: Mapped["Category"] = relationship(
         "Category",
         foreign_keys=[category_id],
@@ -35,5 +52,20 @@ class Exercise(BaseDBModel):
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        Index("uq_exercises_category_content_hash", "category_id", "content_hash", unique=True),
+        Index("ix_exercises_category_particle_answer", "category_id", "particle", "answer"),
+        Index(
+            "ix_exercises_category_corrected_sentence",
+            "category_id",
+            postgresql_where=text("has_corrected_sentence"),
+        ),
+        Index(
+            "ix_exercises_category_incorrect_answer",
+            "category_id",
+            postgresql_where=text("has_incorrect_answer"),
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<Exercise {self.id} (Cat: {self.category_id})>"
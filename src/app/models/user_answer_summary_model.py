@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import BaseDBModel
+
+
+class UserAnswerSummary(BaseDBModel):
+    """Свёртка старых ответов юзера на упражнение в категории (см. app.jobs.compact_answers).
+
+    Сырые строки user_answers старше срока хранения и вне окна статистики выборки удаляются,
+    а их счётчики, суммарное время и первый/последний момент копятся здесь: история
+    ответов = эта строка + оставшиеся user_answers.
+    """
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    exercise_id: Mapped[int] = mapped_column(ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    n_correct: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    n_wrong: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    total_solve_time: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    first_answered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_answered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "exercise_id", "category_id", name="uq_user_answer_summaries_user_exercise_category",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<UserAnswerSummary user={self.user_id} ex={self.exercise_id} cat={self.category_id} "
+            f"correct={self.n_correct} wrong={self.n_wrong}>"
+        )
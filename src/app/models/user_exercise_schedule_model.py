@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import BaseDBModel
+
+
+class UserExerciseSchedule(BaseDBModel):
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    exercise_id: Mapped[int] = mapped_column(ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    repetitions: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    ease_factor: Mapped[float] = mapped_column(Float, default=2.5, server_default="2.5", nullable=False)
+    interval_days: Mapped[float] = mapped_column(Float, default=0.0, server_default="0", nullable=False)
+    lapses: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    due_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_reviewed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "exercise_id", name="uq_user_exercise_schedules_user_exercise"),
+        Index("ix_user_exercise_schedules_user_category_due", "user_id", "category_id", "due_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserExerciseSchedule user={self.user_id} ex={self.exercise_id} due={self.due_at}>"
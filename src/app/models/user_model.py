@@ -1,22 +1,14 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, String, Table
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import BaseDBModel
 
 if TYPE_CHECKING:
-    from app.models import Category, Exercise, UserAnswer
-
-
-user_current_exercises = Table(
-    "user_current_exercises",
-    BaseDBModel.metadata,
-    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
-    Column("exercise_id", ForeignKey("exercises.id", ondelete="CASCADE"), primary_key=True),
-)
+    from app.models import Category, UserAnswer
 
 
 class User(BaseDBModel):
@@ -27,11 +19,11 @@ class User(BaseDBModel):
     exercise_started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     current_task_config: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     current_category_id: Mapped[int | None] = mapped_column(ForeignKey("categories.id"), index=True, nullable=True)
-
-    current_exercises: Mapped[list["Exercise"]] = relationship(
-        "Exercise",
-        secondary=user_current_exercises,
+    # id упражнений текущего задания в порядке показа; сами упражнения грузятся только при проверке ответа
+    current_exercise_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), default=list, server_default="{}", nullable=False,
     )
+
     current_category: Mapped["Category | None"] = relationship(
         "Category",
         foreign_keys=[current_category_id],
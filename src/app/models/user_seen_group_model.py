@@ -0,0 +1,52 @@
+import uuid
+
+from sqlalchemy import DDL, ForeignKey, UniqueConstraint, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import BaseDBModel
+
+
+class UserSeenGroup(BaseDBModel):
+    """Проекция «юзер видел группу упражнений» (в любой категории).
+
+    Заполняется триггером на вставку в user_answers, поэтому проверка «группа уже показана»
+    стоит один lookup по (user_id, group_id), а не скан истории ответов.
+    """
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "group_id", name="uq_user_seen_groups_user_group"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserSeenGroup user={self.user_id} group={self.group_id}>"
+
+
+TRACK_SEEN_GROUP_FUNCTION = """
+    CREATE OR REPLACE FUNCTION track_user_seen_group() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO user_seen_groups (user_id, group_id)
+        SELECT NEW.user_id, exercises.group_id
+        FROM exercises
+        WHERE exercises.id = NEW.exercise_id AND exercises.group_id IS NOT NULL
+        ON CONFLICT ON CONSTRAINT uq_user_seen_groups_user_group DO NOTHING;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+TRACK_SEEN_GROUP_TRIGGER = """
+    CREATE TRIGGER trg_user_answers_seen_group
+    AFTER INSERT ON user_answers
+    FOR EACH ROW EXECUTE FUNCTION track_user_seen_group()
+"""
+
+DROP_SEEN_GROUP_TRIGGER = "DROP TRIGGER IF EXISTS trg_user_answers_seen_group ON user_answers"
+DROP_SEEN_GROUP_FUNCTION = "DROP FUNCTION IF EXISTS track_user_seen_group()"
+
+# create_all (тесты, локальная база) создаёт и триггер; в проде тот же SQL выполняет миграция b4c8e2f6a1d3
+event.listen(BaseDBModel.metadata, "after_create", DDL(TRACK_SEEN_GROUP_FUNCTION))
+event.listen(BaseDBModel.metadata, "after_create", DDL(DROP_SEEN_GROUP_TRIGGER))
+event.listen(BaseDBModel.metadata, "after_create", DDL(TRACK_SEEN_GROUP_TRIGGER))
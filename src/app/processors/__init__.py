@@ -1,9 +1,18 @@
-from app.processors._base.base_processor import BaseTaskProcessor
+from app.processors._base.base_processor import BaseTaskProcessor, PooledExamProcessor
 from app.processors._base.interface import TaskProcessor
-from app.processors.factory import ProcessorFactory
+from app.processors.content_schemas import CONTENT_SCHEMA_MAPPING
+from app.processors.factory import (
+    POOLED_HANDLER_TYPES,
+    ProcessorFactory,
+    selection_repositories,
+)
 
 __all__ = [
+    "CONTENT_SCHEMA_MAPPING",
+    "POOLED_HANDLER_TYPES",
     "BaseTaskProcessor",
+    "PooledExamProcessor",
     "ProcessorFactory",
     "TaskProcessor",
+    "selection_repositories",
 ]
@@ -2,6 +2,7 @@ import uuid
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from datetime import UTC, datetime
+from typing import Any
 
 from app.exceptions import (
     InvalidCategoryStructureError,
@@ -14,19 +15,24 @@ from app.processors._base.interface import TaskProcessor
 from app.repositories import ExerciseRepository, UserAnswerRepository
 from app.schemas import CategoryDTO, CheckResult, ExerciseDTO, TaskResponse, UserWithExercisesDTO
 from app.schemas.user_schemas import UserWithCategoryDTO
+from app.services.catalog_service import CatalogService
 from app.services.exercise_selector import ExerciseSelector
 
 
 class BaseTaskProcessor(ABC, TaskProcessor):
+    uses_explanations = True
+
     def __init__(
         self,
         exercise_repository: ExerciseRepository,
         answer_repository: UserAnswerRepository,
         exercise_selector: ExerciseSelector,
+        catalog_service: CatalogService,
     ) -> None:
         self._exercise_repository = exercise_repository
         self._answer_repository = answer_repository
         self._exercise_selector = exercise_selector
+        self._catalog = catalog_service
 
     @abstractmethod
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
@@ -36,6 +42,9 @@ class BaseTaskProcessor(ABC, TaskProcessor):
     async def process_answer(self, user: UserWithExercisesDTO, user_answer: str) -> CheckResult:
         pass
 
+    async def warm_up(self, category: CategoryDTO) -> None:
+        """Builds per-category catalog structures ahead of the first task (startup warm-up)."""
+
     @staticmethod
     def _require_category(user: UserWithCategoryDTO) -> CategoryDTO:
         """Validates that user has a current category and returns it."""
@@ -79,7 +88,7 @@ class BaseTaskProcessor(ABC, TaskProcessor):
             return 0
         return int((datetime.now(UTC) - started).total_seconds())
 
-    def _record_answer(
+    async def _record_answer(
         self,
         user: UserWithExercisesDTO,
         exercise_id: int,
@@ -88,7 +97,7 @@ class BaseTaskProcessor(ABC, TaskProcessor):
         solve_time: int,
         group_id: uuid.UUID | None = None,
     ) -> None:
-        """Creates and adds a UserAnswer record to the repository."""
+        """Creates and adds a UserAnswer record and updates the exercise's review schedule."""
         self._answer_repository.add(UserAnswer(
             is_correct=is_correct,
             user_response=user_response,
@@ -98,6 +107,15 @@ class BaseTaskProcessor(ABC, TaskProcessor):
             category_id=user.current_category_id,
             group_id=group_id,
         ))
+        await self._record_review(user, exercise_id, is_correct=is_correct)
+
+    async def _record_review(self, user: UserWithExercisesDTO, exercise_id: int, *, is_correct: bool) -> None:
+        exercise = next((ex for ex in (user.current_exercises or []) if ex.id == exercise_id), None)
+        if exercise is None:
+            return
+        await self._exercise_selector.record_review(
+            user.id, exercise_id, exercise.category_id, is_correct=is_correct, answered_ids=user.current_exercise_ids,
+        )
 
     @staticmethod
     def _get_ordered_exercises(user: UserWithExercisesDTO, exercise_ids: list[int]) -> list[ExerciseDTO]:
@@ -125,5 +143,14 @@ class BaseTaskProcessor(ABC, TaskProcessor):
             category_id=user.current_category_id,
         )
         self._answer_repository.add(answer)
+        await self._record_review(user, exercise.id, is_correct=is_correct)
 
         return is_correct
+
+
+class PooledExamProcessor(BaseTaskProcessor):
+    """Exam whose tasks ExamVariantPool can serve from pre-generated variants."""
+
+    @abstractmethod
+    def restore_variant(self, exercises: Sequence[Exercise], task_config: dict[str, Any]) -> TaskResponse:
+        """Rebuilds a task from a pre-generated variant: exercises in display order plus its task_config."""
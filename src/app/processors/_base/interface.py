@@ -1,10 +1,15 @@
 from typing import Protocol
 
-from app.schemas import CheckResult, TaskResponse, UserWithExercisesDTO
+from app.schemas import CategoryDTO, CheckResult, TaskResponse, UserWithExercisesDTO
 from app.schemas.user_schemas import UserWithCategoryDTO
 
 
 class TaskProcessor(Protocol):
+    # нужны ли process_answer разборы упражнений (ExerciseDTO.explanation)
+    uses_explanations: bool
+
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse: ...
 
     async def process_answer(self, user: UserWithExercisesDTO, user_answer: str) -> CheckResult: ...
+
+    async def warm_up(self, category: CategoryDTO) -> None: ...
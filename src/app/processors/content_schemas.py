@@ -0,0 +1,66 @@
+"""Схема `Exercise.content` для каждого `HandlerType` — по ней валидируется импорт упражнений."""
+from pydantic import BaseModel
+
+from app.enums import HandlerType
+from app.processors.tasks.task_01 import Task1Content
+from app.processors.tasks.task_02 import Task2Content
+from app.processors.tasks.task_03 import Task3Content
+from app.processors.tasks.task_04 import Task4Content
+from app.processors.tasks.task_05 import Task5Content
+from app.processors.tasks.task_06 import Task6Content
+from app.processors.tasks.task_07 import Task7Content
+from app.processors.tasks.task_08 import Task8Content
+from app.processors.tasks.task_09_12 import TaskN9N12Content
+from app.processors.tasks.task_13 import Task13Content
+from app.processors.tasks.task_14 import Task14DrillContent, Task14ExamContent
+from app.processors.tasks.task_15 import Task15DrillContent, Task15ExamContent
+from app.processors.tasks.task_16 import Task16Content
+from app.processors.tasks.task_17_20 import TaskN17N20Content
+from app.processors.tasks.task_21 import Task21DrillContent, Task21ExamContent
+from app.processors.tasks.task_22 import Task22DrillContent
+from app.processors.tasks.task_23_24 import Task2324Content
+from app.processors.tasks.task_25 import Task25Content
+from app.processors.tasks.task_26 import Task26Content
+
+CONTENT_SCHEMA_MAPPING: dict[HandlerType, type[BaseModel]] = {
+    HandlerType.TASK_1_DRILL: Task1Content,
+    HandlerType.TASK_2_DRILL: Task2Content,
+    HandlerType.TASK_3_EXAM: Task3Content,
+    HandlerType.TASK_4_DRILL: Task4Content,
+    HandlerType.TASK_4_EXAM: Task4Content,
+    HandlerType.TASK_5_DRILL: Task5Content,
+    HandlerType.TASK_5_EXAM: Task5Content,
+    HandlerType.TASK_6_EXAM: Task6Content,
+    HandlerType.TASK_7_DRILL: Task7Content,
+    HandlerType.TASK_7_EXAM: Task7Content,
+    HandlerType.TASK_8_DRILL: Task8Content,
+    HandlerType.TASK_8_EXAM: Task8Content,
+    HandlerType.TASK_9_DRILL: TaskN9N12Content,
+    HandlerType.TASK_9_EXAM: TaskN9N12Content,
+    HandlerType.TASK_10_DRILL: TaskN9N12Content,
+    HandlerType.TASK_10_EXAM: TaskN9N12Content,
+    HandlerType.TASK_11_DRILL: TaskN9N12Content,
+    HandlerType.TASK_11_EXAM: TaskN9N12Content,
+    HandlerType.TASK_12_DRILL: TaskN9N12Content,
+    HandlerType.TASK_12_EXAM: TaskN9N12Content,
+    HandlerType.TASK_13_DRILL: Task13Content,
+    HandlerType.TASK_13_EXAM: Task13Content,
+    HandlerType.TASK_14_DRILL: Task14DrillContent,
+    HandlerType.TASK_14_EXAM: Task14ExamContent,
+    HandlerType.TASK_15_DRILL: Task15DrillContent,
+    HandlerType.TASK_15_EXAM: Task15ExamContent,
+    HandlerType.TASK_16_DRILL: Task16Content,
+    HandlerType.TASK_16_EXAM: Task16Content,
+    HandlerType.TASK_17_EXAM: TaskN17N20Content,
+    HandlerType.TASK_18_EXAM: TaskN17N20Content,
+    HandlerType.TASK_19_EXAM: TaskN17N20Content,
+    HandlerType.TASK_20_EXAM: TaskN17N20Content,
+    HandlerType.TASK_21_DRILL: Task21DrillContent,
+    HandlerType.TASK_21_EXAM: Task21ExamContent,
+    HandlerType.TASK_22_DRILL: Task22DrillContent,
+    HandlerType.TASK_22_EXAM: Task22DrillContent,
+    HandlerType.TASK_23_EXAM: Task2324Content,
+    HandlerType.TASK_24_EXAM: Task2324Content,
+    HandlerType.TASK_25_EXAM: Task25Content,
+    HandlerType.TASK_26_EXAM: Task26Content,
+}
@@ -1,7 +1,11 @@
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import database_settings
+from app.database import ReadSession
 from app.enums import HandlerType
 from app.exceptions import ProcessorNotFoundError
+from app.processors._base.base_processor import PooledExamProcessor
 from app.processors._base.interface import TaskProcessor
 from app.processors.tasks.generic import SkipProcessor, SoonProcessor
 from app.processors.tasks.task_01 import Task1DrillProcessor
@@ -37,7 +41,13 @@ from app.processors.tasks.task_22 import Task22DrillProcessor, Task22ExamProcess
 from app.processors.tasks.task_23_24 import Task23ExamProcessor, Task24ExamProcessor
 from app.processors.tasks.task_25 import Task25ExamProcessor
 from app.processors.tasks.task_26 import Task26ExamProcessor
-from app.repositories import ExerciseRepository, UserAnswerRepository
+from app.repositories import (
+    ExerciseRepository,
+    FastExerciseRepository,
+    FastUserAnswerRepository,
+    UserAnswerRepository,
+)
+from app.services.catalog_service import CatalogService
 from app.services.exercise_selector import ExerciseSelector
 
 PROCESSOR_MAPPING = {
@@ -85,6 +95,12 @@ PROCESSOR_MAPPING = {
     HandlerType.SOON: SoonProcessor,
 }
 
+# Экзамены, которые ExamVariantPool может выдавать из заранее собранных вариантов
+POOLED_HANDLER_TYPES = frozenset(
+    handler_type for handler_type, processor_cls in PROCESSOR_MAPPING.items()
+    if issubclass(processor_cls, PooledExamProcessor)
+)
+
 
 class ProcessorFactory:
     def __init__(
@@ -92,10 +108,12 @@ class ProcessorFactory:
         exercise_repository: ExerciseRepository,
         answer_repository: UserAnswerRepository,
         exercise_selector: ExerciseSelector,
+        catalog_service: CatalogService,
     ) -> None:
         self._exercise_repository = exercise_repository
         self._answer_repository = answer_repository
         self._exercise_selector = exercise_selector
+        self._catalog_service = catalog_service
 
     def get_processor(self, handler_type: HandlerType) -> TaskProcessor:
         processor_cls = PROCESSOR_MAPPING.get(handler_type)
@@ -108,4 +126,13 @@ class ProcessorFactory:
             exercise_repository=self._exercise_repository,
             answer_repository=self._answer_repository,
             exercise_selector=self._exercise_selector,
+            catalog_service=self._catalog_service,
         )
+
+
+def selection_repositories(
+    session: AsyncSession, read_session: ReadSession,
+) -> tuple[ExerciseRepository, UserAnswerRepository]:
+    if database_settings.FAST_PATH:
+        return FastExerciseRepository(read_session), FastUserAnswerRepository(session)
+    return ExerciseRepository(read_session), UserAnswerRepository(session)
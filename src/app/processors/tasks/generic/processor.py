@@ -6,6 +6,8 @@ from app.schemas.user_schemas import UserWithCategoryDTO
 class SkipProcessor(BaseTaskProcessor):
     """Процессор для пропуска заданий."""
 
+    uses_explanations = False
+
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
         return TaskResponse(
             task_ui=TaskUI(view=TaskView(heading="Пропуск", instruction="Это задание пропускается.")),
@@ -19,6 +21,8 @@ class SkipProcessor(BaseTaskProcessor):
 class SoonProcessor(BaseTaskProcessor):
     """Процессор для заданий в разработке."""
 
+    uses_explanations = False
+
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
         return TaskResponse(
             task_ui=TaskUI(view=TaskView(heading="В разработке", instruction="Это задание скоро появится.")),
@@ -22,6 +22,7 @@ class Task1DrillProcessor(BaseTaskProcessor):
     - Регистр игнорируется
     """
 
+    uses_explanations = False
     _formatter = Task1Formatter()
 
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
@@ -43,7 +44,7 @@ class Task1DrillProcessor(BaseTaskProcessor):
         is_correct = any(check_answer(user_answer, correct_ans) for correct_ans in correct_answers)
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task1Content.model_validate(exercise.content)
         return CheckResult(
@@ -37,7 +37,7 @@ class Task3ExamProcessor(BaseTaskProcessor):
         is_correct = extract_sorted_digits(user_answer) == extract_sorted_digits(exercise.answer)
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         return CheckResult(
             is_correct=is_correct,
@@ -132,7 +132,7 @@ class Task4ExamProcessor(BaseTaskProcessor):
             user_selected_word = i in user_selected
             word_answer_is_correct = word_is_correct == user_selected_word
 
-            self._record_answer(user, exercise.id, word_answer_is_correct, user_answer, solve_time, group_id)
+            await self._record_answer(user, exercise.id, word_answer_is_correct, user_answer, solve_time, group_id)
             explanations.append(exercise.explanation or "")
 
         correct_numbers = "".join(str(i) for i in sorted(correct_indices))
@@ -1,3 +1,4 @@
+from .conflict_index import WordConflictIndex
 from .formatter import Task5Formatter
 from .processor import Task5DrillProcessor, Task5ExamProcessor
 from .schemas import Task5Content, Task5ExamConfig, Task5Paronym
@@ -9,4 +10,5 @@ __all__ = [
     "Task5ExamProcessor",
     "Task5Formatter",
     "Task5Paronym",
+    "WordConflictIndex",
 ]
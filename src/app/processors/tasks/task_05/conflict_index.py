@@ -0,0 +1,64 @@
+"""Индекс пересечений паронимов категории 5 для сборки экзамена без повторяющихся слов.
+
+Строится один раз на версию каталога из (id, content['words']) активных упражнений: для каждого
+слова — список упражнений, где оно встречается. Выборка идёт жадно по кандидатам, отсортированным
+по весу юзера (непоказанные выше всех, между собой — в случайном порядке): взятое упражнение
+блокирует всех соседей по словам. Если жадный проход упёрся в конфликты, он повторяется
+на случайном порядке, поэтому экзамен собирается всегда, когда в категории есть хотя бы
+несколько попарно непересекающихся упражнений.
+"""
+import math
+import random
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Self
+
+_RANDOM_RETRIES = 3
+
+
+@dataclass(frozen=True, slots=True)
+class WordConflictIndex:
+    words: Mapping[int, frozenset[str]]
+    # слово -> упражнения, в которых оно встречается
+    by_word: Mapping[str, tuple[int, ...]]
+
+    @classmethod
+    def build(cls, entries: Iterable[tuple[int, Sequence[str]]]) -> Self:
+        """entries — (exercise_id, content['words'])."""
+        words: dict[int, frozenset[str]] = {}
+        by_word: dict[str, list[int]] = defaultdict(list)
+        for exercise_id, exercise_words in entries:
+            words[exercise_id] = frozenset(exercise_words)
+            for word in words[exercise_id]:
+                by_word[word].append(exercise_id)
+        return cls(words=words, by_word={word: tuple(ids) for word, ids in by_word.items()})
+
+    def sample(self, count: int, weights: Mapping[int, float]) -> list[int] | None:
+        """count попарно непересекающихся по словам упражнений; None, если столько не набрать.
+
+        weights — вес показанных юзеру упражнений (Thompson), непоказанных в weights нет — они
+        считаются приоритетнее любых показанных.
+        """
+        if len(self.words) < count:
+            return None
+        order = sorted(self.words, key=lambda eid: (weights.get(eid, math.inf), random.random()), reverse=True)
+        for _ in range(_RANDOM_RETRIES + 1):
+            picked = self._greedy(order, count)
+            if picked is not None:
+                return picked
+            random.shuffle(order)
+        return None
+
+    def _greedy(self, order: Sequence[int], count: int) -> list[int] | None:
+        picked: list[int] = []
+        blocked: set[int] = set()
+        for exercise_id in order:
+            if exercise_id in blocked:
+                continue
+            picked.append(exercise_id)
+            if len(picked) == count:
+                return picked
+            for word in self.words[exercise_id]:
+                blocked.update(self.by_word[word])
+        return None
@@ -11,6 +11,7 @@ from app.exceptions import (
 from app.models import Exercise
 from app.processors import BaseTaskProcessor
 from app.schemas import (
+    CategoryDTO,
     CheckResult,
     ExerciseDTO,
     TaskOption,
@@ -21,11 +22,11 @@ from app.schemas import (
 )
 from app.utils import check_answer
 
+from .conflict_index import WordConflictIndex
 from .formatter import Task5Formatter
 from .schemas import Task5Content, Task5ExamConfig
 
 EXAM_SENTENCES_COUNT = 5
-EXAM_INITIAL_POOL_SIZE = 50
 
 
 class Task5DrillProcessor(BaseTaskProcessor):
@@ -34,6 +35,7 @@ class Task5DrillProcessor(BaseTaskProcessor):
     Пользователь должен выбрать подходящий по смыслу пароним для предложения.
     """
 
+    uses_explanations = False
     _formatter = Task5Formatter()
 
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
@@ -82,30 +84,9 @@ class Task5ExamProcessor(BaseTaskProcessor):
     Пользователь должен ввести правильное слово для предложения с ошибкой.
     """
 
+    uses_explanations = False
     _formatter = Task5Formatter()
 
-    @staticmethod
-    def _select_exercises_without_word_overlap(
-        exercises: Sequence[Exercise],
-        limit: int,
-    ) -> list[Exercise]:
-        """Выбирает упражнения без пересечения слов в поле content['words']."""
-        selected: list[Exercise] = []
-        used_words: set[str] = set()
-
-        for exercise in exercises:
-            content = Task5Content.model_validate(exercise.content)
-            words = set(content.words)
-
-            if not words & used_words:
-                selected.append(exercise)
-                used_words.update(words)
-
-                if len(selected) == limit:
-                    break
-
-        return selected
-
     @staticmethod
     def _shown_pairs(exercises: Sequence[Exercise | ExerciseDTO], wrong_index: int) -> list[tuple[str, str]]:
         """Для каждого предложения — (шаблон, показанное слово): неверное для wrong_index, иначе верное."""
@@ -123,11 +104,16 @@ class Task5ExamProcessor(BaseTaskProcessor):
 
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
         parent_id = self._require_parent_category_id(user)
-        exercises_pool = await self._fetch_exercises(parent_id, user.id, EXAM_INITIAL_POOL_SIZE)
+        index = await self._conflict_index(parent_id)
+        weights = await self._exercise_selector.get_thompson_weights(parent_id, user.id)
+        picked_ids = index.sample(EXAM_SENTENCES_COUNT, weights)
+        if picked_ids is None:
+            raise TaskForUserNotFoundError(user.id)
 
-        exercises = self._select_exercises_without_word_overlap(exercises_pool, EXAM_SENTENCES_COUNT)
-        if len(exercises) < EXAM_SENTENCES_COUNT:
+        by_id = {ex.id: ex for ex in await self._exercise_repository.get_by_ids(picked_ids)}
+        if len(by_id) < len(picked_ids):
             raise TaskForUserNotFoundError(user.id)
+        exercises = [by_id[eid] for eid in picked_ids]
 
         wrong_sentence_index = random.randint(0, EXAM_SENTENCES_COUNT - 1)
         shown = self._shown_pairs(exercises, wrong_sentence_index)
@@ -142,6 +128,17 @@ class Task5ExamProcessor(BaseTaskProcessor):
             ),
         )
 
+    async def warm_up(self, category: CategoryDTO) -> None:
+        if category.parent_id is not None:
+            await self._conflict_index(category.parent_id)
+
+    async def _conflict_index(self, category_id: int) -> WordConflictIndex:
+        async def build() -> WordConflictIndex:
+            rows = await self._exercise_repository.get_answer_content_pairs(category_id, "words")
+            return WordConflictIndex.build((row.id, row.value or ()) for row in rows)
+
+        return await self._catalog.get_or_build(("task5_word_conflicts", category_id), build)
+
     async def process_answer(self, user: UserWithExercisesDTO, user_answer: str) -> CheckResult:
         if not user.current_exercises or len(user.current_exercises) != EXAM_SENTENCES_COUNT:
             raise InvalidExerciseCountError(EXAM_SENTENCES_COUNT, len(user.current_exercises or []))
@@ -168,7 +165,7 @@ class Task5ExamProcessor(BaseTaskProcessor):
         )
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, wrong_exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, wrong_exercise.id, is_correct, user_answer, solve_time)
 
         return CheckResult(
             is_correct=is_correct,
@@ -47,7 +47,7 @@ class Task6ExamProcessor(BaseTaskProcessor):
         is_correct = any(check_answer(user_answer, correct_ans) for correct_ans in correct_answers)
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task6Content.model_validate(exercise.content)
         return CheckResult(
@@ -79,7 +79,7 @@ class Task7DrillProcessor(BaseTaskProcessor):
         )
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task7Content.model_validate(exercise.content)
         return CheckResult(
@@ -173,7 +173,7 @@ class Task7ExamProcessor(BaseTaskProcessor):
         )
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, wrong_exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, wrong_exercise.id, is_correct, user_answer, solve_time)
 
         wrong_content = Task7Content.model_validate(wrong_exercise.content)
         return CheckResult(
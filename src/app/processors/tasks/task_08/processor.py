@@ -1,5 +1,7 @@
 import random
 import uuid
+from collections.abc import Sequence
+from typing import Any
 
 from app.exceptions import (
     InvalidExerciseCountError,
@@ -7,7 +9,8 @@ from app.exceptions import (
     NoCurrentExercisesError,
     TaskForUserNotFoundError,
 )
-from app.processors import BaseTaskProcessor
+from app.models import Exercise
+from app.processors import BaseTaskProcessor, PooledExamProcessor
 from app.repositories.exercise_filters import answer_ne
 from app.schemas import CheckResult, TaskResponse, TaskUI, UserWithExercisesDTO
 from app.schemas.user_schemas import UserWithCategoryDTO
@@ -62,7 +65,7 @@ class Task8DrillProcessor(BaseTaskProcessor):
         is_correct = user_answer == exercise.answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task8Content.model_validate(exercise.content)
         return CheckResult(
@@ -78,7 +81,7 @@ class Task8DrillProcessor(BaseTaskProcessor):
         )
 
 
-class Task8ExamProcessor(BaseTaskProcessor):
+class Task8ExamProcessor(PooledExamProcessor):
     """Процессор для экзаменационного режима задания 8.
 
     Показывает 9 предложений (5 с ошибками + 4 без) и 5 типов ошибок (А-Д).
@@ -90,22 +93,22 @@ class Task8ExamProcessor(BaseTaskProcessor):
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
         parent_id = self._require_parent_category_id(user)
 
-        error_exercises = list(await self._exercise_selector.select_smart_distinct_answer(
-            category_id=parent_id,
-            user_id=user.id,
-            limit=EXAM_ERROR_COUNT,
-            filters=[answer_ne(NO_ERROR_ANSWER)],
-        ))
-        if len(error_exercises) < EXAM_ERROR_COUNT:
-            raise TaskForUserNotFoundError(user.id)
-
-        correct_exercises = list(await self._exercise_selector.select_by_answer(
-            category_id=parent_id,
-            user_id=user.id,
-            answer=NO_ERROR_ANSWER,
-            limit=EXAM_CORRECT_COUNT,
-        ))
-        if len(correct_exercises) < EXAM_CORRECT_COUNT:
+        error_selection, correct_selection = await self._exercise_selector.select_concurrently(
+            lambda selector: selector.select_smart_distinct_answer(
+                category_id=parent_id,
+                user_id=user.id,
+                limit=EXAM_ERROR_COUNT,
+                filters=[answer_ne(NO_ERROR_ANSWER)],
+            ),
+            lambda selector: selector.select_by_answer(
+                category_id=parent_id,
+                user_id=user.id,
+                answer=NO_ERROR_ANSWER,
+                limit=EXAM_CORRECT_COUNT,
+            ),
+        )
+        error_exercises, correct_exercises = list(error_selection), list(correct_selection)
+        if len(error_exercises) < EXAM_ERROR_COUNT or len(correct_exercises) < EXAM_CORRECT_COUNT:
             raise TaskForUserNotFoundError(user.id)
 
         all_exercises = error_exercises + correct_exercises
@@ -114,15 +117,21 @@ class Task8ExamProcessor(BaseTaskProcessor):
         error_type_order = [ex.answer for ex in error_exercises]
         random.shuffle(error_type_order)
 
-        sentences = [Task8Content.model_validate(ex.content).sentence for ex in all_exercises]
-        exercise_ids = [ex.id for ex in all_exercises]
+        config = Task8ExamConfig(
+            exercise_ids=[ex.id for ex in all_exercises],
+            error_type_order=error_type_order,
+        )
+        return self._task_response(all_exercises, config)
+
+    def restore_variant(self, exercises: Sequence[Exercise], task_config: dict[str, Any]) -> TaskResponse:
+        return self._task_response(exercises, Task8ExamConfig.model_validate(task_config))
+
+    def _task_response(self, exercises: Sequence[Exercise], config: Task8ExamConfig) -> TaskResponse:
+        sentences = [Task8Content.model_validate(ex.content).sentence for ex in exercises]
         return TaskResponse(
-            task_ui=TaskUI(view=self._formatter.condition(error_type_order, sentences), options=None),
-            exercise_ids=exercise_ids,
-            task_config=Task8ExamConfig(
-                exercise_ids=exercise_ids,
-                error_type_order=error_type_order,
-            ),
+            task_ui=TaskUI(view=self._formatter.condition(config.error_type_order, sentences), options=None),
+            exercise_ids=config.exercise_ids,
+            task_config=config,
         )
 
     async def process_answer(self, user: UserWithExercisesDTO, user_answer: str) -> CheckResult:
@@ -155,7 +164,7 @@ class Task8ExamProcessor(BaseTaskProcessor):
                 word_correct = len(user_digits) > error_idx and user_digits[error_idx] == str(i)
             else:
                 word_correct = i not in user_selected
-            self._record_answer(user, exercise.id, word_correct, user_answer, solve_time, group_id)
+            await self._record_answer(user, exercise.id, word_correct, user_answer, solve_time, group_id)
 
         letters = []
         for error_idx, error_type in enumerate(config.error_type_order):
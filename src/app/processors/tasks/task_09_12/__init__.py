@@ -1,3 +1,4 @@
+from .confusion_index import ConfusionIndex
 from .formatter import N9N12Row, N9N12Word, TaskN9N12Formatter
 from .processor import (
     Task9DrillProcessor,
@@ -12,6 +13,7 @@ from .processor import (
 from .schemas import TaskN9N12Content, TaskN9N12ExamConfig
 
 __all__ = [
+    "ConfusionIndex",
     "N9N12Row",
     "N9N12Word",
     "Task9DrillProcessor",
@@ -0,0 +1,148 @@
+"""Индекс «путающих» букв категории 9–12 для сборки неправильных рядов экзамена.
+
+Строится один раз на версию каталога из (id, answer, incorrect_letter) активных упражнений и
+хранит только id. Ряд собирается вокруг одной буквы L: упражнения с ответом L и упражнения,
+где L — ошибочный вариант (а верная буква другая). Кандидаты внутри списка выбираются турниром:
+случайная выборка фиксированного размера, победитель — с наибольшим весом юзера (непоказанные
+выше всех). Поэтому сборка ряда не зависит от размера категории.
+"""
+import math
+import random
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Self
+
+_TOURNAMENT_SIZE = 8
+_WORDS_PER_ROW_2 = 2
+_ROW_3_STRATEGIES = ((2, 1), (1, 2), (0, 3))
+
+
+@dataclass(frozen=True, slots=True)
+class ConfusionIndex:
+    answers: Mapping[int, str]
+    by_answer: Mapping[str, tuple[int, ...]]
+    # буква L -> упражнения, где L — ошибочный вариант при другом верном ответе
+    confusers: Mapping[str, tuple[int, ...]]
+    pairs: Mapping[tuple[str, str], tuple[int, ...]]
+
+    @classmethod
+    def build(cls, entries: Iterable[tuple[int, str, str]]) -> Self:
+        """entries — (exercise_id, answer, incorrect_letter)."""
+        answers: dict[int, str] = {}
+        pairs: dict[tuple[str, str], list[int]] = defaultdict(list)
+        for exercise_id, answer, incorrect_letter in entries:
+            answers[exercise_id] = answer
+            pairs[answer, incorrect_letter].append(exercise_id)
+
+        by_answer: dict[str, list[int]] = defaultdict(list)
+        confusers: dict[str, list[int]] = defaultdict(list)
+        for (answer, incorrect_letter), ids in pairs.items():
+            by_answer[answer].extend(ids)
+            if incorrect_letter != answer:
+                confusers[incorrect_letter].extend(ids)
+
+        return cls(
+            answers=answers,
+            by_answer={letter: tuple(ids) for letter, ids in by_answer.items()},
+            confusers={letter: tuple(ids) for letter, ids in confusers.items()},
+            pairs={pair: tuple(ids) for pair, ids in pairs.items()},
+        )
+
+    def build_wrong_rows(
+        self,
+        wrong_count: int,
+        words_per_row: int,
+        weights: Mapping[int, float],
+        used_ids: set[int],
+    ) -> list[list[int]]:
+        """До wrong_count неправильных рядов (id упражнений); used_ids дополняется выбранными.
+
+        weights — вес показанных юзеру упражнений (Thompson), непоказанных в weights нет — они
+        считаются приоритетнее любых показанных.
+        """
+        rows: list[list[int]] = []
+        for _ in range(wrong_count):
+            row = (
+                self._confusing_row_2(weights, used_ids) if words_per_row == _WORDS_PER_ROW_2
+                else self._confusing_row_3(weights, used_ids)
+            )
+            if row is None:
+                row = self._fallback_row(words_per_row, weights, used_ids)
+            if row is None:
+                break
+            random.shuffle(row)
+            rows.append(row)
+            used_ids.update(row)
+        return rows
+
+    def _confusing_row_2(self, weights: Mapping[int, float], used_ids: set[int]) -> list[int] | None:
+        """word1.answer = L, word2.incorrect_letter = L."""
+        letters = [letter for letter in self.by_answer if letter in self.confusers]
+        random.shuffle(letters)
+        for letter in letters:
+            correct = _pick(self.by_answer[letter], 1, weights, used_ids)
+            confuse = _pick(self.confusers[letter], 1, weights, used_ids)
+            if correct and confuse:
+                return correct + confuse
+        return None
+
+    def _confusing_row_3(self, weights: Mapping[int, float], used_ids: set[int]) -> list[int] | None:
+        """Комбинации вокруг одной буквы: (2 с ответом L + 1 путающее), (1 + 2) или (0 + 3)."""
+        letters = list(self.confusers)
+        random.shuffle(letters)
+        for letter in letters:
+            strategies = list(_ROW_3_STRATEGIES)
+            random.shuffle(strategies)
+            for n_correct, n_confuse in strategies:
+                correct = _pick(self.by_answer.get(letter, ()), n_correct, weights, used_ids)
+                confuse = _pick(self.confusers[letter], n_confuse, weights, used_ids)
+                if correct is None or confuse is None:
+                    continue
+                row = correct + confuse
+                if len({self.answers[eid] for eid in row}) > 1:
+                    return row
+        return None
+
+    def _fallback_row(
+        self, words_per_row: int, weights: Mapping[int, float], used_ids: set[int],
+    ) -> list[int] | None:
+        """Путающей комбинации нет — любые слова, среди которых минимум два разных ответа."""
+        letters = list(self.by_answer)
+        random.shuffle(letters)
+        row: list[int] = []
+        taken = set(used_ids)
+        for letter in letters:
+            picked = _pick(self.by_answer[letter], 1, weights, taken)
+            if picked:
+                row += picked
+                taken.update(picked)
+            if len(row) == _WORDS_PER_ROW_2:
+                break
+        if len(row) < _WORDS_PER_ROW_2:
+            return None
+        for letter in letters:
+            if len(row) == words_per_row:
+                break
+            picked = _pick(self.by_answer[letter], 1, weights, taken)
+            if picked:
+                row += picked
+                taken.update(picked)
+        return row if len(row) == words_per_row else None
+
+
+def _pick(
+    candidates: Sequence[int], n: int, weights: Mapping[int, float], used_ids: set[int],
+) -> list[int] | None:
+    """n лучших по весу из случайной выборки candidates без used_ids; None, если столько не набрать.
+
+    Выборка берётся с запасом на len(used_ids), поэтому свободные кандидаты находятся всегда, когда они есть.
+    """
+    if n == 0:
+        return []
+    sample_size = min(len(candidates), max(_TOURNAMENT_SIZE, n) + len(used_ids))
+    pool = [eid for eid in random.sample(candidates, sample_size) if eid not in used_ids]
+    if len(pool) < n:
+        return None
+    pool.sort(key=lambda eid: weights.get(eid, math.inf), reverse=True)
+    return pool[:n]
@@ -1,6 +1,7 @@
 import random
 import uuid
-from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any
 
 from app.exceptions import (
     InvalidExerciseCountError,
@@ -9,8 +10,9 @@ from app.exceptions import (
     TaskForUserNotFoundError,
 )
 from app.models import Exercise
-from app.processors import BaseTaskProcessor
+from app.processors import BaseTaskProcessor, PooledExamProcessor
 from app.schemas import (
+    CategoryDTO,
     CheckResult,
     ExerciseDTO,
     TaskOption,
@@ -21,12 +23,12 @@ from app.schemas import (
 )
 from app.utils import check_answer, extract_sorted_digits
 
+from .confusion_index import ConfusionIndex
 from .formatter import N9N12Row, N9N12Word, TaskN9N12Formatter
 from .schemas import TaskN9N12Content, TaskN9N12ExamConfig
 
 EXAM_ROWS = 5
 CORRECT_COUNT_WEIGHTS = [4, 4, 1]
-_WORDS_PER_ROW_2 = 2
 
 
 def _word_display(word: str, letter: str) -> str:
@@ -34,114 +36,18 @@ def _word_display(word: str, letter: str) -> str:
     return word.replace("{letter}", letter)
 
 
-def _word_of(exercise: Exercise | ExerciseDTO) -> N9N12Word:
+def _word_of(exercise: Exercise | ExerciseDTO, *, explained: bool = True) -> N9N12Word:
+    """explained=False — для условия: разбор там не показывается и при выборке не грузится."""
     content = TaskN9N12Content.model_validate(exercise.content)
     return N9N12Word(
         template=content.word,
         answer_letter=exercise.answer,
         context_before=content.context_before,
         context_after=content.context_after,
-        explanation=exercise.explanation or "",
+        explanation=(exercise.explanation or "") if explained else "",
     )
 
 
-def _get_incorrect_letter(ex: Exercise) -> str:
-    """Извлекает incorrect_letter из content упражнения."""
-    content = TaskN9N12Content.model_validate(ex.content)
-    return content.incorrect_letter
-
-
-def _build_confusing_row_2(
-    by_answer: dict[str, list[Exercise]],
-    by_incorrect: dict[str, list[Exercise]],
-    used_ids: set[int],
-) -> list[Exercise] | None:
-    """2-word wrong row: word1.answer=A, word2.incorrect_letter=A (answer≠A)."""
-    letters = list(by_answer.keys())
-    random.shuffle(letters)
-
-    for letter in letters:
-        cands_correct = [e for e in by_answer[letter] if e.id not in used_ids]
-        cands_confuse = [e for e in by_incorrect[letter]
-                         if e.id not in used_ids and e.answer != letter]
-        if cands_correct and cands_confuse:
-            row = [cands_correct[0], cands_confuse[0]]
-            random.shuffle(row)
-            return row
-
-    all_remaining = [e for exs in by_answer.values() for e in exs if e.id not in used_ids]
-    random.shuffle(all_remaining)
-    for i, ex1 in enumerate(all_remaining):
-        for ex2 in all_remaining[i + 1:]:
-            if ex1.answer != ex2.answer:
-                row = [ex1, ex2]
-                random.shuffle(row)
-                return row
-    return None
-
-
-def _build_confusing_row_3(
-    by_answer: dict[str, list[Exercise]],
-    by_incorrect: dict[str, list[Exercise]],
-    used_ids: set[int],
-) -> list[Exercise] | None:
-    """3-word wrong row: путающие комбинации вокруг одной буквы."""
-    letters = list(by_incorrect.keys())
-    random.shuffle(letters)
-
-    for letter in letters:
-        cands_correct = [e for e in by_answer.get(letter, []) if e.id not in used_ids]
-        cands_confuse = [e for e in by_incorrect[letter]
-                         if e.id not in used_ids and e.answer != letter]
-
-        strategies = [(2, 1), (1, 2), (0, 3)]
-        random.shuffle(strategies)
-
-        for n_c, n_i in strategies:
-            if len(cands_correct) >= n_c and len(cands_confuse) >= n_i:
-                row = cands_correct[:n_c] + cands_confuse[:n_i]
-                if len({e.answer for e in row}) > 1:
-                    random.shuffle(row)
-                    return row
-
-    all_remaining = [e for exs in by_answer.values() for e in exs if e.id not in used_ids]
-    random.shuffle(all_remaining)
-    for i in range(len(all_remaining) - 2):
-        triple = all_remaining[i:i + 3]
-        if len({e.answer for e in triple}) > 1:
-            random.shuffle(triple)
-            return triple
-    return None
-
-
-def _build_wrong_rows(
-    wrong_count: int,
-    words_per_row: int,
-    remaining: list[Exercise],
-) -> list[list[Exercise]]:
-    """Строит неправильные ряды для экзамена из оставшихся упражнений."""
-    by_answer: dict[str, list[Exercise]] = defaultdict(list)
-    by_incorrect: dict[str, list[Exercise]] = defaultdict(list)
-
-    for ex in remaining:
-        by_answer[ex.answer].append(ex)
-        by_incorrect[_get_incorrect_letter(ex)].append(ex)
-
-    rows: list[list[Exercise]] = []
-    used_ids: set[int] = set()
-
-    builder = _build_confusing_row_2 if words_per_row == _WORDS_PER_ROW_2 else _build_confusing_row_3
-
-    for _ in range(wrong_count):
-        row = builder(by_answer, by_incorrect, used_ids)
-        if row is None:
-            break
-        rows.append(row)
-        used_ids.update(e.id for e in row)
-
-    return rows
-
-
 class _BaseN9N12DrillProcessor(BaseTaskProcessor):
     _formatter: TaskN9N12Formatter
 
@@ -158,7 +64,7 @@ class _BaseN9N12DrillProcessor(BaseTaskProcessor):
         random.shuffle(options)
 
         return TaskResponse(
-            task_ui=TaskUI(view=self._formatter.drill_condition(_word_of(exercise)), options=options),
+            task_ui=TaskUI(view=self._formatter.drill_condition(_word_of(exercise, explained=False)), options=options),
             exercise_ids=exercise.id,
         )
 
@@ -175,7 +81,7 @@ class _BaseN9N12DrillProcessor(BaseTaskProcessor):
         )
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         return CheckResult(
             is_correct=is_correct,
@@ -185,7 +91,7 @@ class _BaseN9N12DrillProcessor(BaseTaskProcessor):
         )
 
 
-class _BaseN9N12ExamProcessor(BaseTaskProcessor):
+class _BaseN9N12ExamProcessor(PooledExamProcessor):
     WORDS_PER_ROW: int
     _formatter: TaskN9N12Formatter
 
@@ -206,31 +112,55 @@ class _BaseN9N12ExamProcessor(BaseTaskProcessor):
             raise TaskForUserNotFoundError(user.id)
 
         used_ids = {e.id for row in correct_rows for e in row}
-        wrong_pool = list(await self._fetch_exercises(parent_id, user.id, wrong_count * wpr * 5))
-        remaining = [ex for ex in wrong_pool if ex.id not in used_ids]
+        index = await self._confusion_index(parent_id)
+        weights = await self._exercise_selector.get_thompson_weights(parent_id, user.id)
+        wrong_id_rows = index.build_wrong_rows(wrong_count, wpr, weights, used_ids)
+        if len(wrong_id_rows) < wrong_count:
+            raise TaskForUserNotFoundError(user.id)
 
-        wrong_rows = _build_wrong_rows(wrong_count, wpr, remaining)
-        if len(wrong_rows) < wrong_count:
+        wrong_ids = [eid for row in wrong_id_rows for eid in row]
+        by_id = {ex.id: ex for ex in await self._exercise_repository.get_by_ids(wrong_ids)}
+        if len(by_id) < len(wrong_ids):
             raise TaskForUserNotFoundError(user.id)
+        wrong_rows = [[by_id[eid] for eid in row] for row in wrong_id_rows]
 
         tagged = [(row, True) for row in correct_rows] + [(row, False) for row in wrong_rows]
         random.shuffle(tagged)
 
-        all_rows = [row for row, _ in tagged]
-        correct_row_indices = [i for i, (_, is_corr) in enumerate(tagged) if is_corr]
+        exercises = [ex for row, _ in tagged for ex in row]
+        config = TaskN9N12ExamConfig(
+            exercise_ids=[ex.id for ex in exercises],
+            correct_row_indices=[i for i, (_, is_corr) in enumerate(tagged) if is_corr],
+            words_per_row=wpr,
+        )
+        return self._task_response(exercises, config)
+
+    def restore_variant(self, exercises: Sequence[Exercise], task_config: dict[str, Any]) -> TaskResponse:
+        return self._task_response(exercises, TaskN9N12ExamConfig.model_validate(task_config))
 
-        rows = [N9N12Row(words=[_word_of(ex) for ex in row]) for row in all_rows]
-        exercise_ids = [ex.id for row in all_rows for ex in row]
+    def _task_response(self, exercises: Sequence[Exercise], config: TaskN9N12ExamConfig) -> TaskResponse:
+        wpr = config.words_per_row
+        rows = [
+            N9N12Row(words=[_word_of(ex, explained=False) for ex in exercises[start:start + wpr]])
+            for start in range(0, len(exercises), wpr)
+        ]
         return TaskResponse(
             task_ui=TaskUI(view=self._formatter.condition(rows), options=None),
-            exercise_ids=exercise_ids,
-            task_config=TaskN9N12ExamConfig(
-                exercise_ids=exercise_ids,
-                correct_row_indices=correct_row_indices,
-                words_per_row=wpr,
-            ),
+            exercise_ids=config.exercise_ids,
+            task_config=config,
         )
 
+    async def warm_up(self, category: CategoryDTO) -> None:
+        if category.parent_id is not None:
+            await self._confusion_index(category.parent_id)
+
+    async def _confusion_index(self, category_id: int) -> ConfusionIndex:
+        async def build() -> ConfusionIndex:
+            rows = await self._exercise_repository.get_answer_content_pairs(category_id, "incorrect_letter")
+            return ConfusionIndex.build((row.id, row.answer, row.value) for row in rows)
+
+        return await self._catalog.get_or_build(("n9n12_confusion", category_id), build)
+
     async def process_answer(self, user: UserWithExercisesDTO, user_answer: str) -> CheckResult:
         total_expected = EXAM_ROWS * self.WORDS_PER_ROW
         if not user.current_exercises or len(user.current_exercises) != total_expected:
@@ -259,7 +189,7 @@ class _BaseN9N12ExamProcessor(BaseTaskProcessor):
 
             rows.append(N9N12Row(words=[_word_of(ex) for ex in row_exs], wrong=not row_right))
             for ex in row_exs:
-                self._record_answer(user, ex.id, row_right, user_answer, solve_time, group_id)
+                await self._record_answer(user, ex.id, row_right, user_answer, solve_time, group_id)
 
         return CheckResult(
             is_correct=is_correct,
@@ -1,5 +1,7 @@
 import random
 import uuid
+from collections.abc import Sequence
+from typing import Any
 
 from app.exceptions import (
     InvalidExerciseCountError,
@@ -8,7 +10,7 @@ from app.exceptions import (
     TaskForUserNotFoundError,
 )
 from app.models import Exercise
-from app.processors import BaseTaskProcessor
+from app.processors import BaseTaskProcessor, PooledExamProcessor
 from app.schemas import CheckResult, TaskOption, TaskResponse, TaskUI, UserWithExercisesDTO
 from app.schemas.user_schemas import UserWithCategoryDTO
 from app.utils import extract_sorted_digits
@@ -56,7 +58,7 @@ class Task13DrillProcessor(BaseTaskProcessor):
         is_correct = user_answer == exercise.answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task13Content.model_validate(exercise.content)
         return CheckResult(
@@ -71,7 +73,7 @@ class Task13DrillProcessor(BaseTaskProcessor):
         )
 
 
-class Task13ExamProcessor(BaseTaskProcessor):
+class Task13ExamProcessor(PooledExamProcessor):
     _formatter = Task13Formatter()
 
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
@@ -96,22 +98,26 @@ class Task13ExamProcessor(BaseTaskProcessor):
             raise TaskForUserNotFoundError(user.id)
 
         random.shuffle(all_exs)
-        correct_indices = [i for i, ex in enumerate(all_exs) if ex.answer == answer_type]
+        config = Task13ExamConfig(
+            exercise_ids=[ex.id for ex in all_exs],
+            correct_indices=[i for i, ex in enumerate(all_exs) if ex.answer == answer_type],
+            answer_type=answer_type,
+            mode=mode,
+        )
+        return self._task_response(all_exs, config)
+
+    def restore_variant(self, exercises: Sequence[Exercise], task_config: dict[str, Any]) -> TaskResponse:
+        return self._task_response(exercises, Task13ExamConfig.model_validate(task_config))
 
-        sentences = [Task13Content.model_validate(ex.content).sentence for ex in all_exs]
-        exercise_ids = [ex.id for ex in all_exs]
+    def _task_response(self, exercises: Sequence[Exercise], config: Task13ExamConfig) -> TaskResponse:
+        sentences = [Task13Content.model_validate(ex.content).sentence for ex in exercises]
         return TaskResponse(
             task_ui=TaskUI(
-                view=self._formatter.condition(mode=mode, answer_type=answer_type, sentences=sentences),
+                view=self._formatter.condition(mode=config.mode, answer_type=config.answer_type, sentences=sentences),
                 options=None,
             ),
-            exercise_ids=exercise_ids,
-            task_config=Task13ExamConfig(
-                exercise_ids=exercise_ids,
-                correct_indices=correct_indices,
-                answer_type=answer_type,
-                mode=mode,
-            ),
+            exercise_ids=config.exercise_ids,
+            task_config=config,
         )
 
     async def _fetch_ne_exercises(
@@ -223,7 +229,7 @@ class Task13ExamProcessor(BaseTaskProcessor):
                 explanation=ex.explanation or "",
                 wrong=not sentence_right,
             ))
-            self._record_answer(user, ex.id, sentence_right, user_answer, solve_time, group_id)
+            await self._record_answer(user, ex.id, sentence_right, user_answer, solve_time, group_id)
 
         return CheckResult(
             is_correct=is_correct,
@@ -61,7 +61,7 @@ class Task14DrillProcessor(BaseTaskProcessor):
         is_correct = user_answer == exercise.answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task14DrillContent.model_validate(exercise.content)
         return CheckResult(
@@ -93,18 +93,21 @@ class Task14ExamProcessor(BaseTaskProcessor):
         correct_count = random.choices([2, 3, 4], weights=CORRECT_COUNT_WEIGHTS)[0]
         wrong_count = EXAM_SENTENCES - correct_count
 
-        correct_exs = list(await self._exercise_selector.select_smart_by_group(
-            category_id=category_id,
-            user_id=user.id,
-            limit=correct_count,
-            filters=[answer_eq(answer_type)],
-        ))
-        wrong_exs = list(await self._exercise_selector.select_smart_by_group(
-            category_id=category_id,
-            user_id=user.id,
-            limit=wrong_count,
-            filters=[answer_ne(answer_type)],
-        ))
+        correct_selection, wrong_selection = await self._exercise_selector.select_concurrently(
+            lambda selector: selector.select_smart_by_group(
+                category_id=category_id,
+                user_id=user.id,
+                limit=correct_count,
+                filters=[answer_eq(answer_type)],
+            ),
+            lambda selector: selector.select_smart_by_group(
+                category_id=category_id,
+                user_id=user.id,
+                limit=wrong_count,
+                filters=[answer_ne(answer_type)],
+            ),
+        )
+        correct_exs, wrong_exs = list(correct_selection), list(wrong_selection)
         if len(correct_exs) < correct_count or len(wrong_exs) < wrong_count:
             raise TaskForUserNotFoundError(user.id)
 
@@ -156,7 +159,7 @@ class Task14ExamProcessor(BaseTaskProcessor):
                 explanation=ex.explanation or "",
                 wrong=not sentence_right,
             ))
-            self._record_answer(user, ex.id, sentence_right, user_answer, solve_time, group_id)
+            await self._record_answer(user, ex.id, sentence_right, user_answer, solve_time, group_id)
 
         return CheckResult(
             is_correct=is_correct,
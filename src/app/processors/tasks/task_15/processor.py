@@ -45,7 +45,7 @@ class Task15DrillProcessor(BaseTaskProcessor):
         is_correct = user_answer == exercise.answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task15DrillContent.model_validate(exercise.content)
         return CheckResult(
@@ -108,7 +108,7 @@ class Task15ExamProcessor(BaseTaskProcessor):
         is_correct = user_digits == correct_answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task15ExamContent.model_validate(exercise.content)
         return CheckResult(
@@ -54,7 +54,7 @@ class Task16DrillProcessor(BaseTaskProcessor):
         is_correct = user_answer == exercise.answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task16Content.model_validate(exercise.content)
         return CheckResult(
@@ -140,7 +140,7 @@ class Task16ExamProcessor(BaseTaskProcessor):
                 explanation=ex.explanation or "",
                 wrong=not sentence_right,
             ))
-            self._record_answer(user, ex.id, sentence_right, user_answer, solve_time, group_id)
+            await self._record_answer(user, ex.id, sentence_right, user_answer, solve_time, group_id)
 
         return CheckResult(
             is_correct=is_correct,
@@ -30,7 +30,7 @@ class _BaseTaskN17N20Processor(BaseTaskProcessor):
         is_correct = user_digits == exercise.answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = TaskN17N20Content.model_validate(exercise.content)
         return CheckResult(
@@ -39,7 +39,7 @@ class Task21DrillProcessor(BaseTaskProcessor):
         is_correct = user_answer == exercise.answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task21DrillContent.model_validate(exercise.content)
         return CheckResult(
@@ -91,7 +91,7 @@ class Task21ExamProcessor(BaseTaskProcessor):
         is_correct = user_digits == exercise.answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task21ExamContent.model_validate(exercise.content)
         return CheckResult(
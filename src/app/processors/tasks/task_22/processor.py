@@ -1,8 +1,11 @@
 import random
 import uuid
+from collections.abc import Sequence
+from typing import Any
 
 from app.exceptions import NoCurrentExercisesError, TaskForUserNotFoundError
-from app.processors import BaseTaskProcessor
+from app.models import Exercise
+from app.processors import BaseTaskProcessor, PooledExamProcessor
 from app.schemas import CheckResult, TaskResponse, TaskUI, UserWithExercisesDTO
 from app.schemas.user_schemas import UserWithCategoryDTO
 
@@ -25,6 +28,7 @@ class Task22DrillProcessor(BaseTaskProcessor):
     Ответ — enum-значение выбранного средства.
     """
 
+    uses_explanations = False
     _formatter = Task22Formatter()
 
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
@@ -56,7 +60,7 @@ class Task22DrillProcessor(BaseTaskProcessor):
         is_correct = user_answer in set(found_devices)
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task22DrillContent.model_validate(exercise.content)
         return CheckResult(
@@ -70,7 +74,7 @@ class Task22DrillProcessor(BaseTaskProcessor):
         )
 
 
-class Task22ExamProcessor(BaseTaskProcessor):
+class Task22ExamProcessor(PooledExamProcessor):
     """Экзаменационный режим задания 22.
 
     Показывает 5 предложений (А–Д) и 9 пронумерованных средств (1–9).
@@ -78,6 +82,7 @@ class Task22ExamProcessor(BaseTaskProcessor):
     Ответ проверяется индивидуально для каждого предложения.
     """
 
+    uses_explanations = False
     _formatter = Task22Formatter()
 
     async def create_task(self, user: UserWithCategoryDTO) -> TaskResponse:
@@ -113,15 +118,21 @@ class Task22ExamProcessor(BaseTaskProcessor):
         device_options = correct_devices + distractors
         random.shuffle(device_options)
 
+        config = Task22ExamConfig(exercise_ids=[ex.id for ex in exercises], device_options=device_options)
+        return self._task_response(exercises, config)
+
+    def restore_variant(self, exercises: Sequence[Exercise], task_config: dict[str, Any]) -> TaskResponse:
+        return self._task_response(exercises, Task22ExamConfig.model_validate(task_config))
+
+    def _task_response(self, exercises: Sequence[Exercise], config: Task22ExamConfig) -> TaskResponse:
         sentences = [Task22DrillContent.model_validate(ex.content).sentence for ex in exercises]
-        exercise_ids = [ex.id for ex in exercises]
         return TaskResponse(
             task_ui=TaskUI(
-                view=self._formatter.condition(sentences=sentences, device_options=device_options),
+                view=self._formatter.condition(sentences=sentences, device_options=config.device_options),
                 options=None,
             ),
-            exercise_ids=exercise_ids,
-            task_config=Task22ExamConfig(exercise_ids=exercise_ids, device_options=device_options),
+            exercise_ids=config.exercise_ids,
+            task_config=config,
         )
 
     async def process_answer(self, user: UserWithExercisesDTO, user_answer: str) -> CheckResult:
@@ -160,7 +171,9 @@ class Task22ExamProcessor(BaseTaskProcessor):
             if not is_ex_correct:
                 all_correct = False
             if selected_device:
-                self._record_answer(user, exercise.id, is_ex_correct, selected_device, solve_time, shared_group_id)
+                await self._record_answer(
+                    user, exercise.id, is_ex_correct, selected_device, solve_time, shared_group_id,
+                )
 
             content = Task22DrillContent.model_validate(exercise.content)
             letters.append(Task22Letter(
@@ -63,7 +63,7 @@ class _Task2324BaseProcessor(BaseTaskProcessor):
         user_str = "".join(sorted(user_digits)) or "—"
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task2324Content.model_validate(exercise.content)
         return CheckResult(
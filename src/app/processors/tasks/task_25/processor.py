@@ -35,7 +35,7 @@ class Task25ExamProcessor(BaseTaskProcessor):
         is_correct = any(check_answer(user_answer, opt) for opt in correct_options)
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task25Content.model_validate(exercise.content)
         return CheckResult(
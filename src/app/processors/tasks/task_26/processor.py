@@ -35,7 +35,7 @@ class Task26ExamProcessor(BaseTaskProcessor):
         is_correct = user_clean == exercise.answer
 
         solve_time = self._compute_solve_time(user)
-        self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
+        await self._record_answer(user, exercise.id, is_correct, user_answer, solve_time)
 
         content = Task26Content.model_validate(exercise.content)
         return CheckResult(
@@ -1,18 +1,26 @@
 from .base_repository import BaseRepository
 from .category_repository import CategoryRepository
 from .exercise_filters import answer_eq, answer_ne, content_eq, content_exists
+from .exercise_import_repository import ExerciseImportRepository, StagedExercise
 from .exercise_repository import ExerciseRepository
+from .fast_selection_repository import FastExerciseRepository, FastUserAnswerRepository
 from .user_answer_repository import UserAnswerRepository
 from .user_category_stat_repository import UserCategoryStatRepository
+from .user_exercise_schedule_repository import UserExerciseScheduleRepository
 from .user_repository import UserRepository
 from .user_stat_repository import UserStatRepository
 
 __all__ = [
     "BaseRepository",
     "CategoryRepository",
+    "ExerciseImportRepository",
     "ExerciseRepository",
+    "FastExerciseRepository",
+    "FastUserAnswerRepository",
+    "StagedExercise",
     "UserAnswerRepository",
     "UserCategoryStatRepository",
+    "UserExerciseScheduleRepository",
     "UserRepository",
     "UserStatRepository",
     "answer_eq",
@@ -3,13 +3,13 @@ from collections.abc import Sequence
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import BaseDBModel
+from app.database import BaseDBModel, ReadSession
 
 
 class BaseRepository[ModelType: BaseDBModel]:
     model: type[ModelType]
 
-    def __init__(self, session: AsyncSession, model: type[ModelType]) -> None:
+    def __init__(self, session: AsyncSession | ReadSession, model: type[ModelType]) -> None:
         self.session = session
         self.model = model
 
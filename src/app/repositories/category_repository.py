@@ -1,15 +1,16 @@
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, union
+from sqlalchemy.orm import aliased, selectinload
 
+from app.database import ReadSession
+from app.enums import HandlerType
 from app.models import Category
 from app.repositories import BaseRepository
 
 
 class CategoryRepository(BaseRepository[Category]):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: ReadSession) -> None:
         super().__init__(session, Category)
 
     async def get_roots(self) -> Sequence[Category]:
@@ -30,6 +31,17 @@ class CategoryRepository(BaseRepository[Category]):
         result = await self.session.execute(statement)
         return result.scalars().first()
 
+    async def get_by_handler_types(self, handler_types: Collection[HandlerType]) -> Sequence[Category]:
+        if not handler_types:
+            return []
+        statement = (
+            select(Category)
+            .where(Category.handler_type.in_(handler_types))
+            .order_by(Category.id.asc())
+        )
+        result = await self.session.execute(statement)
+        return result.scalars().all()
+
     async def get_by_id_with_tree(self, category_id: int) -> Sequence[Category]:
         top_q = (
             select(Category)
@@ -54,3 +66,31 @@ class CategoryRepository(BaseRepository[Category]):
 
         result = await self.session.execute(statement)
         return result.scalars().all()
+
+    async def get_ege_task_map(self) -> dict[int, int]:
+        """Отображение category_id -> id задания ЕГЭ для всех категорий внутри заданий."""
+        tree = (
+            select(Category.id, Category.id.label("ege_task_id"))
+            .where(Category.is_ege_task.is_(True))
+            .cte("ege_tree", recursive=True)
+        )
+        child = aliased(Category)
+        tree = tree.union_all(
+            select(child.id, tree.c.ege_task_id)
+            .join(tree, child.parent_id == tree.c.id),
+        )
+        result = await self.session.execute(select(tree.c.id, tree.c.ege_task_id))
+        return {row.id: row.ege_task_id for row in result}
+
+    async def get_content_handler_types(self) -> dict[int, set[HandlerType]]:
+        """Для каждой категории — HandlerType'ы, которые читают её упражнения: свой и дочерних категорий."""
+        own = select(Category.id.label("owner_id"), Category.handler_type)
+        children = (
+            select(Category.parent_id.label("owner_id"), Category.handler_type)
+            .where(Category.parent_id.is_not(None))
+        )
+        result = await self.session.execute(union(own, children))
+        handler_types: dict[int, set[HandlerType]] = {}
+        for row in result:
+            handler_types.setdefault(row.owner_id, set()).add(HandlerType(row.handler_type))
+        return handler_types
@@ -1,7 +1,18 @@
 from sqlalchemy import ColumnElement
+from sqlalchemy.orm import InstrumentedAttribute
 
 from app.models import Exercise
 
+# Поля content, вынесенные в индексируемые generated columns. Для фильтра по JSONB-выражению
+# подходящих индексов нет и планировщик сканирует всю категорию, поэтому фильтры идут в колонку
+_CONTENT_VALUE_COLUMNS: dict[str, InstrumentedAttribute[str | None]] = {
+    "particle": Exercise.particle,
+}
+_CONTENT_PRESENCE_COLUMNS: dict[str, InstrumentedAttribute[bool]] = {
+    "corrected_sentence": Exercise.has_corrected_sentence,
+    "incorrect_answer": Exercise.has_incorrect_answer,
+}
+
 
 def answer_eq(answer: str) -> ColumnElement[bool]:
     return Exercise.answer == answer
@@ -12,8 +23,15 @@ def answer_ne(answer: str) -> ColumnElement[bool]:
 
 
 def content_exists(field: str) -> ColumnElement[bool]:
+    if field in _CONTENT_PRESENCE_COLUMNS:
+        # Голая колонка — ровно предикат частичного индекса ix_exercises_category_<field>
+        return _CONTENT_PRESENCE_COLUMNS[field].expression
+    if field in _CONTENT_VALUE_COLUMNS:
+        return _CONTENT_VALUE_COLUMNS[field].isnot(None)
     return Exercise.content[field].as_string().isnot(None)
 
 
 def content_eq(field: str, value: str) -> ColumnElement[bool]:
+    if field in _CONTENT_VALUE_COLUMNS:
+        return _CONTENT_VALUE_COLUMNS[field] == value
     return Exercise.content[field].as_string() == value
@@ -0,0 +1,92 @@
+"""Пакетная загрузка упражнений: COPY во временную staging-таблицу и один `INSERT … ON CONFLICT`."""
+from collections.abc import Sequence
+from typing import NamedTuple, cast
+from uuid import UUID
+
+from asyncpg import Connection
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Exercise
+from app.repositories import BaseRepository
+
+STAGING_TABLE = "exercise_import_staging"
+
+_CREATE_STAGING = text("""
+    CREATE TEMP TABLE IF NOT EXISTS exercise_import_staging (
+        line_no integer NOT NULL,
+        category_id integer NOT NULL,
+        group_id uuid,
+        order_index integer,
+        content jsonb NOT NULL,
+        answer text,
+        explanation text,
+        is_active boolean NOT NULL
+    )
+""")
+
+# DISTINCT ON схлопывает дубли внутри пачки (побеждает последняя строка файла): ON CONFLICT
+# не может обновить одну строку дважды. Хэш считается от jsonb::text — канонического вида,
+# не зависящего от порядка ключей и пробелов в исходном JSON.
+_MERGE_STAGING = text("""
+    WITH batch AS (
+        SELECT DISTINCT ON (category_id, md5(content::text))
+            category_id, group_id, order_index, content, md5(content::text) AS content_hash,
+            answer, explanation, is_active
+        FROM exercise_import_staging
+        ORDER BY category_id, md5(content::text), line_no DESC
+    )
+    INSERT INTO exercises (
+        category_id, group_id, order_index, content, content_hash, answer, explanation, is_active
+    )
+    SELECT category_id, group_id, order_index, content, content_hash, answer, explanation, is_active
+    FROM batch
+    ON CONFLICT (category_id, content_hash) DO UPDATE SET
+        group_id = EXCLUDED.group_id,
+        order_index = EXCLUDED.order_index,
+        answer = EXCLUDED.answer,
+        explanation = EXCLUDED.explanation,
+        is_active = EXCLUDED.is_active,
+        updated_at = now()
+    WHERE (exercises.group_id, exercises.order_index, exercises.answer, exercises.explanation, exercises.is_active)
+        IS DISTINCT FROM
+        (EXCLUDED.group_id, EXCLUDED.order_index, EXCLUDED.answer, EXCLUDED.explanation, EXCLUDED.is_active)
+    RETURNING (xmax = 0) AS inserted
+""")
+
+
+class StagedExercise(NamedTuple):
+    """Строка staging-таблицы; content — уже сериализованный JSON."""
+    line_no: int
+    category_id: int
+    group_id: UUID | None
+    order_index: int | None
+    content: str
+    answer: str | None
+    explanation: str | None
+    is_active: bool
+
+
+class ExerciseImportRepository(BaseRepository[Exercise]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session, Exercise)
+        self._primary = session
+
+    async def stage(self, rows: Sequence[StagedExercise]) -> None:
+        """Очищает staging-таблицу (создаёт при первом вызове на соединении) и заливает в неё rows через COPY."""
+        await self.session.execute(_CREATE_STAGING)
+        await self.session.execute(text("TRUNCATE exercise_import_staging"))
+        connection = await self._driver_connection()
+        await connection.copy_records_to_table(STAGING_TABLE, records=rows, columns=StagedExercise._fields)
+
+    async def merge_staged(self) -> tuple[int, int]:
+        """Переносит staging в exercises. Возвращает (вставлено, обновлено); неизменённые строки не трогаются."""
+        result = await self.session.execute(_MERGE_STAGING)
+        flags = result.scalars().all()
+        inserted = sum(flags)
+        return inserted, len(flags) - inserted
+
+    async def _driver_connection(self) -> Connection:
+        connection = await self._primary.connection()
+        raw = await connection.get_raw_connection()
+        return cast("Connection", raw.driver_connection)
@@ -1,16 +1,42 @@
 from collections.abc import Sequence
 
-from sqlalchemy import String, case, func, or_, select, text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, String, and_, case, func, or_, select, text
+from sqlalchemy.orm import load_only, undefer
 
-from app.models import Exercise, UserAnswer
+from app.database import ReadSession
+from app.models import Exercise, UserAnswer, UserSeenGroup
 from app.repositories import BaseRepository
 
+# Колонки, которых хватает для выбора кандидатов: content и explanation догружаются только для победителей
+SELECTION_STUB_COLUMNS = (Exercise.id, Exercise.category_id, Exercise.group_id, Exercise.answer)
+
 
 class ExerciseRepository(BaseRepository[Exercise]):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: ReadSession) -> None:
         super().__init__(session, Exercise)
 
+    async def get_stubs_by_ids(self, ids: Sequence[int]) -> Sequence[Exercise]:
+        """Упражнения с загруженными только SELECTION_STUB_COLUMNS — для отбора кандидатов."""
+        if not ids:
+            return []
+        statement = select(Exercise).where(Exercise.id.in_(ids)).options(load_only(*SELECTION_STUB_COLUMNS))
+        result = await self.session.execute(statement)
+        return result.scalars().all()
+
+    async def get_for_answer_check(self, ids: Sequence[int], *, with_explanations: bool) -> list[Exercise]:
+        """Текущие упражнения юзера одним запросом, в порядке ids; пропавшие из каталога пропускаются.
+
+        Разбор (отложенная колонка) догружается только для процессоров, которые его показывают.
+        """
+        if not ids:
+            return []
+        statement = select(Exercise).where(Exercise.id.in_(ids))
+        if with_explanations:
+            statement = statement.options(undefer(Exercise.explanation))
+        result = await self.session.execute(statement)
+        by_id = {exercise.id: exercise for exercise in result.scalars()}
+        return [by_id[eid] for eid in ids if eid in by_id]
+
     async def get_random_unseen(
             self,
             category_id: int,
@@ -240,6 +266,90 @@ class ExerciseRepository(BaseRepository[Exercise]):
         result = await self.session.execute(statement)
         return result.scalars().all()
 
+    async def get_group_candidates(
+        self,
+        category_id: int,
+        user_id: int,
+        window_size: int = 5,
+        filters: list | None = None,
+    ) -> Sequence[Row]:
+        """По одному случайному упражнению на каждую группу категории — одним запросом.
+
+        Каждая строка: (Exercise, seen, exercise_id [=group_id], n_correct, n_wrong,
+        avg_solve_time, last_attempt_at). seen берётся из user_seen_groups (lookup по
+        (user_id, group_id) на группу), статистика — по последним window_size ответам
+        на каждое упражнение группы во всех категориях и только для показанных групп;
+        у непоказанных она NULL. Упражнения без group_id не возвращаются.
+        Exercise загружен без content (SELECTION_STUB_COLUMNS) — победителей догружает get_by_ids.
+        """
+        candidates_q = (
+            select(Exercise.id, Exercise.group_id)
+            .where(
+                Exercise.category_id == category_id,
+                Exercise.is_active.is_(True),
+                Exercise.group_id.isnot(None),
+            )
+            .distinct(Exercise.group_id)
+            .order_by(Exercise.group_id, func.random())
+        )
+        if filters:
+            candidates_q = candidates_q.where(*filters)
+        candidates = candidates_q.subquery()
+
+        seen_on = and_(UserSeenGroup.user_id == user_id, UserSeenGroup.group_id == candidates.c.group_id)
+        seen_groups = (
+            select(candidates.c.group_id)
+            .join(UserSeenGroup, seen_on)
+        ).subquery()
+
+        group_exercises = (
+            select(Exercise.id.label("exercise_id"), Exercise.group_id)
+            .join(seen_groups, Exercise.group_id == seen_groups.c.group_id)
+            .where(Exercise.is_active.is_(True))
+        ).subquery()
+
+        rn = func.row_number().over(
+            partition_by=UserAnswer.exercise_id,
+            order_by=(UserAnswer.created_at.desc(), UserAnswer.id.desc()),
+        ).label("rn")
+        ranked = (
+            select(group_exercises.c.group_id, UserAnswer.is_correct, UserAnswer.solve_time, UserAnswer.created_at, rn)
+            .select_from(UserAnswer)
+            .join(group_exercises, UserAnswer.exercise_id == group_exercises.c.exercise_id)
+            .where(UserAnswer.user_id == user_id)
+        ).subquery()
+
+        stats = (
+            select(
+                ranked.c.group_id,
+                func.sum(case((ranked.c.is_correct, 1), else_=0)).label("n_correct"),
+                func.sum(case((~ranked.c.is_correct, 1), else_=0)).label("n_wrong"),
+                func.avg(ranked.c.solve_time).label("avg_solve_time"),
+                func.max(ranked.c.created_at).label("last_attempt_at"),
+            )
+            .where(ranked.c.rn <= window_size)
+            .group_by(ranked.c.group_id)
+        ).subquery()
+
+        statement = (
+            select(
+                Exercise,
+                UserSeenGroup.id.isnot(None).label("seen"),
+                candidates.c.group_id.label("exercise_id"),
+                stats.c.n_correct,
+                stats.c.n_wrong,
+                stats.c.avg_solve_time,
+                stats.c.last_attempt_at,
+            )
+            .join(candidates, Exercise.id == candidates.c.id)
+            .outerjoin(UserSeenGroup, seen_on)
+            .outerjoin(stats, stats.c.group_id == candidates.c.group_id)
+            .options(load_only(*SELECTION_STUB_COLUMNS))
+        )
+
+        result = await self.session.execute(statement)
+        return result.all()
+
     async def get_exercises_by_answers_unseen_first(
         self,
         category_id: int,
@@ -252,6 +362,7 @@ class ExerciseRepository(BaseRepository[Exercise]):
 
         Returns up to per_answer_limit exercises per answer,
         with unseen exercises prioritized over seen ones.
+        Only SELECTION_STUB_COLUMNS are loaded: hydrate the picked ones with get_by_ids.
         """
         if not answers:
             return []
@@ -290,7 +401,23 @@ class ExerciseRepository(BaseRepository[Exercise]):
             select(Exercise)
             .join(inner_sq, Exercise.id == inner_sq.c.id)
             .where(inner_sq.c.rn <= per_answer_limit)
+            .options(load_only(*SELECTION_STUB_COLUMNS))
         )
 
         result = await self.session.execute(statement)
         return result.scalars().all()
+
+    async def get_answer_content_pairs(self, category_id: int, field: str) -> Sequence[Row]:
+        """(id, answer, content[field]) активных упражнений категории — сырьё для индексов каталога.
+
+        value — уже разобранное JSON-значение поля (строка, список и т.п.).
+        """
+        statement = (
+            select(Exercise.id, Exercise.answer, Exercise.content[field].label("value"))
+            .where(
+                Exercise.category_id == category_id,
+                Exercise.is_active.is_(True),
+            )
+        )
+        result = await self.session.execute(statement)
+        return result.all()
@@ -0,0 +1,177 @@
+"""Быстрый путь горячих выборок: готовый SQL прямо на asyncpg-соединении сессии.
+
+В профилях get_random_unseen / get_exercise_stats / get_answer_group_stats время уходит не в
+Postgres, а в ORM: компиляция запроса, сборка `Row`, вставка `Exercise` в identity map. Здесь те же
+запросы записаны строками SQL; prepared statements для них держит кэш asyncpg на соединении, а
+строки приходят лёгкими записями со слотами и теми же атрибутами. Вызовы с ORM-фильтрами
+(exercise_filters) идут обычным путём. Соединение берётся у сессии: запрос видит транзакцию апдейта.
+
+Совпадение результатов с ORM-реализацией проверяет tests/repositories/test_fast_selection_repository.py.
+"""
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, NamedTuple, cast
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import ReadSession
+from app.models import Exercise
+from app.repositories.exercise_repository import ExerciseRepository
+from app.repositories.user_answer_repository import UserAnswerRepository
+
+_EXERCISE_COLUMNS = "e.id, e.category_id, e.group_id, e.order_index, e.content, e.answer, e.is_active"
+
+RANDOM_UNSEEN_SQL = f"""
+SELECT {_EXERCISE_COLUMNS}
+FROM exercises AS e
+WHERE e.category_id = $1 AND e.is_active IS true
+  AND e.id NOT IN (SELECT DISTINCT a.exercise_id FROM user_answers AS a WHERE a.user_id = $2)
+ORDER BY random()
+LIMIT $3
+"""  # noqa: S608 - в SQL только константы модуля
+
+RANDOM_UNSEEN_DISTINCT_ANSWER_SQL = f"""
+SELECT DISTINCT ON (e.answer) {_EXERCISE_COLUMNS}
+FROM exercises AS e
+WHERE e.category_id = $1 AND e.is_active IS true
+  AND e.id NOT IN (SELECT DISTINCT a.exercise_id FROM user_answers AS a WHERE a.user_id = $2)
+ORDER BY e.answer, random()
+LIMIT $3
+"""  # noqa: S608 - в SQL только константы модуля
+
+_RANKED_ANSWERS_SQL = """
+SELECT a.exercise_id, a.is_correct, a.solve_time, a.created_at,
+       row_number() OVER (PARTITION BY a.exercise_id ORDER BY a.created_at DESC, a.id DESC) AS rn
+FROM user_answers AS a
+JOIN exercises AS e ON e.id = a.exercise_id
+WHERE a.user_id = $1 AND e.category_id = $2
+"""
+
+EXERCISE_STATS_SQL = f"""
+SELECT ranked.exercise_id,
+       sum(CASE WHEN ranked.is_correct THEN 1 ELSE 0 END) AS n_correct,
+       sum(CASE WHEN NOT ranked.is_correct THEN 1 ELSE 0 END) AS n_wrong,
+       avg(ranked.solve_time) AS avg_solve_time,
+       max(ranked.created_at) AS last_attempt_at
+FROM ({_RANKED_ANSWERS_SQL}) AS ranked
+WHERE ranked.rn <= $3
+GROUP BY ranked.exercise_id
+"""  # noqa: S608 - в SQL только константы модуля
+
+ANSWER_GROUP_STATS_SQL = f"""
+SELECT pool.answer, pool.total, pool.unseen_count,
+       coalesce(stats.n_correct, 0) AS n_correct,
+       coalesce(stats.n_wrong, 0) AS n_wrong,
+       stats.avg_solve_time,
+       stats.last_attempt_at
+FROM (
+    SELECT e.answer, count(*) AS total,
+           sum(CASE WHEN answered.exercise_id IS NULL THEN 1 ELSE 0 END) AS unseen_count
+    FROM exercises AS e
+    LEFT OUTER JOIN (SELECT DISTINCT exercise_id FROM user_answers WHERE user_id = $1) AS answered
+        ON e.id = answered.exercise_id
+    WHERE e.category_id = $2 AND e.is_active IS true
+    GROUP BY e.answer
+    HAVING count(*) >= $3
+) AS pool
+LEFT OUTER JOIN (
+    SELECT e.answer,
+           sum(CASE WHEN ranked.is_correct THEN 1 ELSE 0 END) AS n_correct,
+           sum(CASE WHEN NOT ranked.is_correct THEN 1 ELSE 0 END) AS n_wrong,
+           avg(ranked.solve_time) AS avg_solve_time,
+           max(ranked.created_at) AS last_attempt_at
+    FROM ({_RANKED_ANSWERS_SQL}) AS ranked
+    JOIN exercises AS e ON e.id = ranked.exercise_id
+    WHERE ranked.rn <= $4 AND e.category_id = $2
+    GROUP BY e.answer
+) AS stats ON pool.answer = stats.answer
+"""  # noqa: S608 - в SQL только константы модуля
+
+
+@dataclass(slots=True, eq=False)
+class ExerciseRecord:
+    """Колонки Exercise, которые читают процессоры; explanation и generated-колонки не грузятся."""
+    id: int
+    category_id: int
+    group_id: uuid.UUID | None
+    order_index: int | None
+    content: dict[str, Any]
+    answer: str
+    is_active: bool
+
+
+class ExerciseStats(NamedTuple):
+    exercise_id: int
+    n_correct: int
+    n_wrong: int
+    avg_solve_time: Decimal | None
+    last_attempt_at: datetime
+
+
+class AnswerGroupStats(NamedTuple):
+    answer: str
+    total: int
+    unseen_count: int
+    n_correct: int
+    n_wrong: int
+    avg_solve_time: Decimal | None
+    last_attempt_at: datetime | None
+
+
+async def _fetch(session: AsyncSession | ReadSession, sql: str, *args: object) -> list[Any]:
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    return await raw_connection.driver_connection.fetch(sql, *args)  # type: ignore[union-attr]
+
+
+class FastExerciseRepository(ExerciseRepository):
+    def __init__(self, session: ReadSession) -> None:
+        super().__init__(session)
+        # Записи быстрого пути не попадают в identity map; start_task находит их здесь, без запроса
+        self._served: dict[int, ExerciseRecord] = {}
+
+    def get_many_from_cache(self, obj_ids: Sequence[int]) -> list[Exercise]:
+        cached: dict[int, Any] = {ex.id: ex for ex in super().get_many_from_cache(obj_ids)}
+        for obj_id in obj_ids:
+            if obj_id not in cached and obj_id in self._served:
+                cached[obj_id] = self._served[obj_id]
+        return [cached[obj_id] for obj_id in obj_ids if obj_id in cached]
+
+    async def get_random_unseen(
+            self,
+            category_id: int,
+            user_id: int,
+            limit: int,
+            filters: list | None = None,
+            *, distinct_on_answer: bool = False,
+    ) -> Sequence[Exercise]:
+        if filters:
+            return await super().get_random_unseen(
+                category_id, user_id, limit, filters, distinct_on_answer=distinct_on_answer,
+            )
+        sql = RANDOM_UNSEEN_DISTINCT_ANSWER_SQL if distinct_on_answer else RANDOM_UNSEEN_SQL
+        records = [ExerciseRecord(*row) for row in await _fetch(self.session, sql, category_id, user_id, limit)]
+        self._served.update((record.id, record) for record in records)
+        # Потребители выборки читают только колонки: запись подменяет Exercise по атрибутам
+        return cast("Sequence[Exercise]", records)
+
+
+class FastUserAnswerRepository(UserAnswerRepository):
+    async def get_exercise_stats(
+        self, user_id: int, category_id: int, window_size: int = 5,
+        filters: list | None = None,
+    ) -> Sequence[Row]:
+        if filters:
+            return await super().get_exercise_stats(user_id, category_id, window_size, filters)
+        rows = await _fetch(self.session, EXERCISE_STATS_SQL, user_id, category_id, window_size)
+        return cast("Sequence[Row]", list(map(ExerciseStats._make, rows)))
+
+    async def get_answer_group_stats(
+        self, user_id: int, category_id: int, min_group_size: int, window_size: int = 5,
+    ) -> Sequence[Row]:
+        rows = await _fetch(self.session, ANSWER_GROUP_STATS_SQL, user_id, category_id, min_group_size, window_size)
+        return cast("Sequence[Row]", list(map(AnswerGroupStats._make, rows)))
@@ -1,10 +1,12 @@
 
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 
-from sqlalchemy import Row, case, distinct, func, select
+from sqlalchemy import Row, String, case, delete, distinct, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Exercise, UserAnswer
+from app.models import Exercise, UserAnswer, UserAnswerSummary
 from app.repositories import BaseRepository
 
 
@@ -23,6 +25,46 @@ class UserAnswerRepository(BaseRepository[UserAnswer]):
         result = await self.session.execute(statement)
         return set(result.scalars().all())
 
+    async def get_answered_among(self, user_id: int, exercise_ids: Sequence[int]) -> set[int]:
+        """Какие из exercise_ids юзер уже решал (в любой категории)."""
+        if not exercise_ids:
+            return set()
+        statement = (
+            select(distinct(UserAnswer.exercise_id))
+            .where(
+                UserAnswer.user_id == user_id,
+                UserAnswer.exercise_id.in_(exercise_ids),
+            )
+        )
+        result = await self.session.execute(statement)
+        return set(result.scalars().all())
+
+    async def stream_correct_checks(
+        self, since: datetime | None = None, batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Серверный курсор по (user_id, category_id, n_correct) пачками по batch_size строк.
+
+        Ответы одной проверки (общий group_id) считаются одним ответом, верным — если
+        верны все строки группы: так счёт совпадает с инкрементами `UserStat.total_correct`.
+        """
+        check_key = func.coalesce(UserAnswer.group_id.cast(String), UserAnswer.id.cast(String))
+        checks = (
+            select(UserAnswer.user_id, UserAnswer.category_id)
+            .group_by(UserAnswer.user_id, UserAnswer.category_id, check_key)
+            .having(func.bool_and(UserAnswer.is_correct))
+        )
+        if since is not None:
+            checks = checks.where(UserAnswer.created_at >= since)
+        checks_sq = checks.subquery()
+        statement = (
+            select(checks_sq.c.user_id, checks_sq.c.category_id, func.count().label("n_correct"))
+            .group_by(checks_sq.c.user_id, checks_sq.c.category_id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(statement)
+        async for partition in result.partitions():
+            yield partition
+
     async def get_exercise_stats(
         self, user_id: int, category_id: int, window_size: int = 5,
         filters: list | None = None,
@@ -243,3 +285,89 @@ class UserAnswerRepository(BaseRepository[UserAnswer]):
 
         result = await self.session.execute(statement)
         return result.all()
+
+    async def compact_history(self, user_ids: Sequence[int], before: datetime, keep: int) -> int:
+        """Сворачивает холодные ответы юзеров в UserAnswerSummary и удаляет их; возвращает число строк.
+
+        Холодный ответ старше `before` и не входит ни в `keep` последних ответов юзера на это
+        упражнение в этой категории, ни в `keep` последних ответов в категории. Поэтому окна
+        статистики выборки (последние ответы на упражнение), «решал ли юзер упражнение» в любой
+        категории и свежие ответы (недельный рейтинг) дают тот же результат, что и до свёртки.
+        Один statement: DELETE ... RETURNING и upsert свёртки в общем WITH.
+        """
+        if not user_ids:
+            return 0
+        newest_first = (UserAnswer.created_at.desc(), UserAnswer.id.desc())
+        ranked = (
+            select(
+                UserAnswer.id,
+                UserAnswer.created_at,
+                func.row_number().over(
+                    partition_by=(UserAnswer.user_id, UserAnswer.exercise_id, UserAnswer.category_id),
+                    order_by=newest_first,
+                ).label("rn_exercise"),
+                func.row_number().over(
+                    partition_by=(UserAnswer.user_id, UserAnswer.category_id),
+                    order_by=newest_first,
+                ).label("rn_category"),
+            )
+            .where(UserAnswer.user_id.in_(user_ids))
+        ).subquery()
+        cold_ids = select(ranked.c.id).where(
+            ranked.c.created_at < before,
+            ranked.c.rn_exercise > keep,
+            ranked.c.rn_category > keep,
+        )
+
+        deleted = (
+            delete(UserAnswer)
+            .where(UserAnswer.id.in_(cold_ids))
+            .returning(
+                UserAnswer.user_id,
+                UserAnswer.exercise_id,
+                UserAnswer.category_id,
+                UserAnswer.is_correct,
+                UserAnswer.solve_time,
+                UserAnswer.created_at,
+            )
+            .cte("deleted")
+        )
+        folded = (
+            select(
+                deleted.c.user_id,
+                deleted.c.exercise_id,
+                deleted.c.category_id,
+                func.sum(case((deleted.c.is_correct, 1), else_=0)),
+                func.sum(case((~deleted.c.is_correct, 1), else_=0)),
+                func.sum(deleted.c.solve_time),
+                func.min(deleted.c.created_at),
+                func.max(deleted.c.created_at),
+            )
+            .group_by(deleted.c.user_id, deleted.c.exercise_id, deleted.c.category_id)
+        )
+        upsert = insert(UserAnswerSummary).from_select(
+            [
+                "user_id", "exercise_id", "category_id", "n_correct", "n_wrong",
+                "total_solve_time", "first_answered_at", "last_answered_at",
+            ],
+            folded,
+        )
+        upsert = upsert.on_conflict_do_update(
+            constraint="uq_user_answer_summaries_user_exercise_category",
+            set_={
+                "n_correct": UserAnswerSummary.n_correct + upsert.excluded.n_correct,
+                "n_wrong": UserAnswerSummary.n_wrong + upsert.excluded.n_wrong,
+                "total_solve_time": UserAnswerSummary.total_solve_time + upsert.excluded.total_solve_time,
+                "first_answered_at": func.least(UserAnswerSummary.first_answered_at, upsert.excluded.first_answered_at),
+                "last_answered_at": func.greatest(UserAnswerSummary.last_answered_at, upsert.excluded.last_answered_at),
+                "updated_at": func.now(),
+            },
+        )
+        # Неиспользуемый CTE SQLAlchemy не рендерит: add_cte оставляет upsert в WITH
+        statement = (
+            select(func.count())
+            .select_from(deleted)
+            .add_cte(upsert.returning(UserAnswerSummary.id).cte("folded"))
+        )
+        result = await self.session.execute(statement)
+        return result.scalar_one()
@@ -1,21 +1,34 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import ReadSession
 from app.models import UserCategoryStat
 from app.repositories import BaseRepository
 
 
 class UserCategoryStatRepository(BaseRepository[UserCategoryStat]):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, read_session: ReadSession) -> None:
         super().__init__(session, UserCategoryStat)
+        self.read_session = read_session
 
     async def get_all_by_user(self, user_id: int) -> Sequence[UserCategoryStat]:
         stmt = select(UserCategoryStat).where(UserCategoryStat.user_id == user_id)
-        result = await self.session.execute(stmt)
+        result = await self.read_session.execute(stmt)
         return result.scalars().all()
 
+    async def stream_total_correct(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """Серверный курсор по (user_id, category_id, total_correct) с ненулевым total_correct."""
+        statement = (
+            select(UserCategoryStat.user_id, UserCategoryStat.category_id, UserCategoryStat.total_correct)
+            .where(UserCategoryStat.total_correct > 0)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.read_session.stream(statement)
+        async for partition in result.partitions():
+            yield partition
+
     async def increment_answer(
         self, user_id: int, category_id: int, *, is_correct: bool, is_new_exercise: bool,
     ) -> None:
@@ -41,5 +54,3 @@ class UserCategoryStatRepository(BaseRepository[UserCategoryStat]):
                 stat.total_correct += 1
             if is_new_exercise:
                 stat.distinct_answered += 1
-
-        await self.session.flush([stat])
@@ -0,0 +1,133 @@
+from collections.abc import Collection, Sequence
+from datetime import datetime
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import ReadSession
+from app.models import Exercise, UserExerciseSchedule
+from app.repositories import BaseRepository
+from app.utils.spaced_repetition import ReviewState, next_due_at, review
+
+
+class UserExerciseScheduleRepository(BaseRepository[UserExerciseSchedule]):
+    def __init__(self, session: AsyncSession, read_session: ReadSession) -> None:
+        super().__init__(session, UserExerciseSchedule)
+        self.read_session = read_session
+
+    async def get_for_exercises(
+        self, user_id: int, exercise_ids: Collection[int],
+    ) -> dict[int, UserExerciseSchedule]:
+        """Расписание юзера по упражнениям одним запросом; упражнений без записи в словаре нет."""
+        if not exercise_ids:
+            return {}
+        stmt = select(UserExerciseSchedule).where(
+            UserExerciseSchedule.user_id == user_id,
+            UserExerciseSchedule.exercise_id.in_(exercise_ids),
+        )
+        result = await self.session.execute(stmt)
+        return {schedule.exercise_id: schedule for schedule in result.scalars()}
+
+    async def record_review(
+        self,
+        user_id: int,
+        exercise_id: int,
+        category_id: int,
+        reviewed_at: datetime,
+        *, is_correct: bool,
+    ) -> UserExerciseSchedule:
+        """Пересчитывает SM-2 состояние упражнения после ответа и сдвигает due_at."""
+        schedules = await self.get_for_exercises(user_id, [exercise_id])
+        return self.apply_review(
+            schedules.get(exercise_id), user_id, exercise_id, category_id, reviewed_at, is_correct=is_correct,
+        )
+
+    def apply_review(
+        self,
+        schedule: UserExerciseSchedule | None,
+        user_id: int,
+        exercise_id: int,
+        category_id: int,
+        reviewed_at: datetime,
+        *, is_correct: bool,
+    ) -> UserExerciseSchedule:
+        """record_review без чтения: `schedule` — уже загруженная запись или None, если её ещё нет."""
+        previous = ReviewState() if schedule is None else ReviewState(
+            repetitions=schedule.repetitions,
+            ease_factor=schedule.ease_factor,
+            interval_days=schedule.interval_days,
+            lapses=schedule.lapses,
+        )
+        state = review(previous, is_correct=is_correct)
+
+        if schedule is None:
+            schedule = UserExerciseSchedule(user_id=user_id, exercise_id=exercise_id, category_id=category_id)
+            self.session.add(schedule)
+        schedule.category_id = category_id
+        schedule.repetitions = state.repetitions
+        schedule.ease_factor = state.ease_factor
+        schedule.interval_days = state.interval_days
+        schedule.lapses = state.lapses
+        schedule.last_reviewed_at = reviewed_at
+        schedule.due_at = next_due_at(state, reviewed_at)
+        return schedule
+
+    async def get_scheduled(
+        self,
+        user_id: int,
+        category_id: int,
+        limit: int,
+        *,
+        due_by: datetime | None = None,
+        exclude_ids: set[int] | None = None,
+        filters: list | None = None,
+    ) -> Sequence[Exercise]:
+        """Упражнения из расписания юзера по возрастанию due_at.
+
+        С due_by — только просроченные к этому моменту. Range scan по
+        (user_id, category_id, due_at), без обхода истории ответов.
+        """
+        statement = (
+            select(Exercise)
+            .join(UserExerciseSchedule, UserExerciseSchedule.exercise_id == Exercise.id)
+            .where(
+                UserExerciseSchedule.user_id == user_id,
+                UserExerciseSchedule.category_id == category_id,
+                Exercise.is_active.is_(True),
+            )
+        )
+        if due_by is not None:
+            statement = statement.where(UserExerciseSchedule.due_at <= due_by)
+        if exclude_ids:
+            statement = statement.where(Exercise.id.notin_(exclude_ids))
+        if filters:
+            statement = statement.where(*filters)
+        statement = statement.order_by(UserExerciseSchedule.due_at).limit(limit)
+        result = await self.read_session.execute(statement)
+        return result.scalars().all()
+
+    async def get_random_unscheduled(
+        self,
+        user_id: int,
+        category_id: int,
+        limit: int,
+        filters: list | None = None,
+    ) -> Sequence[Exercise]:
+        """Случайные активные упражнения категории, которых ещё нет в расписании юзера."""
+        scheduled = exists().where(
+            UserExerciseSchedule.user_id == user_id,
+            UserExerciseSchedule.exercise_id == Exercise.id,
+        )
+        statement = (
+            select(Exercise)
+            .where(
+                Exercise.category_id == category_id,
+                Exercise.is_active.is_(True),
+                ~scheduled,
+            )
+        )
+        if filters:
+            statement = statement.where(*filters)
+        statement = statement.order_by(func.random()).limit(limit)
+        result = await self.read_session.execute(statement)
+        return result.scalars().all()
@@ -1,6 +1,6 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload
 
 from app.models import User
 from app.repositories import BaseRepository
@@ -10,26 +10,17 @@ class UserRepository(BaseRepository[User]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, User)
 
-    async def get_by_telegram_id_with_exercises(self, telegram_id: int) -> User | None:
+    async def get_by_telegram_id_with_category(self, telegram_id: int) -> User | None:
         statement = (
             select(User)
             .where(User.telegram_id == telegram_id)
-            .options(
-                joinedload(User.current_category),
-                selectinload(User.current_exercises),
-            )
+            .options(joinedload(User.current_category))
         )
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_by_id_with_exercises(self, user_id: int) -> User | None:
-        statement = (
-            select(User)
-            .where(User.id == user_id)
-            .options(
-                joinedload(User.current_category),
-                selectinload(User.current_exercises),
-            )
-        )
+    async def get_ids_after(self, after_id: int, limit: int) -> list[int]:
+        """Id юзеров по возрастанию, начиная после after_id: keyset-пачки для фоновых задач."""
+        statement = select(User.id).where(User.id > after_id).order_by(User.id).limit(limit)
         result = await self.session.execute(statement)
-        return result.scalar_one_or_none()
+        return list(result.scalars().all())
@@ -1,24 +1,46 @@
+from collections.abc import AsyncIterator, Sequence
 from datetime import date
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import ReadSession
 from app.models import UserStat
 from app.repositories import BaseRepository
 
 
 class UserStatRepository(BaseRepository[UserStat]):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, read_session: ReadSession) -> None:
         super().__init__(session, UserStat)
+        self.read_session = read_session
+
+    async def get_by_user_id(self, user_id: int) -> UserStat | None:
+        """Read-only выборка для экранов профиля — без создания записи."""
+        stmt = select(UserStat).where(UserStat.user_id == user_id)
+        result = await self.read_session.execute(stmt)
+        return result.scalars().first()
+
+    async def stream_total_correct(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """Серверный курсор по (user_id, total_correct) для юзеров с хотя бы одним верным ответом."""
+        statement = (
+            select(UserStat.user_id, UserStat.total_correct)
+            .where(UserStat.total_correct > 0)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.read_session.stream(statement)
+        async for partition in result.partitions():
+            yield partition
 
     async def get_or_create(self, user_id: int) -> UserStat:
         stmt = select(UserStat).where(UserStat.user_id == user_id)
         result = await self.session.execute(stmt)
         stat = result.scalars().first()
         if stat is None:
-            stat = UserStat(user_id=user_id)
+            stat = UserStat(
+                user_id=user_id, total_answered=0, total_correct=0, current_streak=0, max_streak=0,
+                current_daily_streak=0, max_daily_streak=0,
+            )
             self.session.add(stat)
-            await self.session.flush([stat])
         return stat
 
     async def increment_answer(self, user_id: int, *, is_correct: bool, answer_date: date) -> None:
@@ -46,5 +68,3 @@ class UserStatRepository(BaseRepository[UserStat]):
         stat.max_daily_streak = max(stat.max_daily_streak, stat.current_daily_streak)
 
         stat.last_answer_date = answer_date
-
-        await self.session.flush([stat])
@@ -0,0 +1,220 @@
+"""Планировщик фоновых задач процесса: интервальные и cron-задачи на asyncio.
+
+Каждая задача — свой цикл: ждёт следующего срока расписания (плюс случайный jitter, чтобы воркеры
+не стучались одновременно) и выполняет корутину с таймаутом. Задача с `lease` выполняется одним
+воркером: перед запуском берётся `SET scheduler:lease:{name} NX PX` в Redis, и, пока ключ жив,
+остальные воркеры свои сроки пропускают. Ошибки задачи логируются и не останавливают цикл.
+Время и исход каждого запуска уходят в метрики (`app.metrics`).
+
+Cron — пять полей (минута, час, день месяца, месяц, день недели; 0 и 7 — воскресенье) в UTC,
+с `*`, списками, диапазонами и шагом; как в cron, при заданных днях месяца и недели хватает любого.
+"""
+import asyncio
+import os
+import random
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Protocol
+
+from loguru import logger
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.metrics import counter, gauge
+
+LEASE_KEY_PREFIX = "scheduler:lease"
+# Страховка от выражений, которые никогда не срабатывают (например, 30 февраля)
+_CRON_MAX_STEPS = 100_000
+
+job_runs = counter("scheduler_job_runs_total", "Scheduled job runs, by outcome", ("job", "result"))
+job_duration = counter("scheduler_job_duration_seconds_total", "Time spent in scheduled job runs", ("job",))
+job_last_duration = gauge("scheduler_job_last_duration_seconds", "Duration of the last job run", ("job",))
+job_last_success = gauge(
+    "scheduler_job_last_success_timestamp_seconds", "Unix time of the last successful job run", ("job",),
+)
+
+
+class Schedule(Protocol):
+    def next_run(self, after: datetime) -> datetime: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Interval:
+    """Раз в `seconds` секунд после окончания предыдущего запуска."""
+    seconds: float
+
+    def next_run(self, after: datetime) -> datetime:
+        return after + timedelta(seconds=self.seconds)
+
+
+class Cron:
+    _FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+    def __init__(self, expression: str) -> None:
+        parts = expression.split()
+        if len(parts) != len(self._FIELDS):
+            msg = f"Cron expression needs {len(self._FIELDS)} fields: {expression!r}"
+            raise ValueError(msg)
+        self.expression = expression
+        minutes, hours, days, months, weekdays = (
+            _parse_cron_field(part, low, high) for part, (_, low, high) in zip(parts, self._FIELDS, strict=True)
+        )
+        self._minutes, self._hours, self._days, self._months = minutes, hours, days, months
+        self._weekdays = {day % 7 for day in weekdays}
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"Cron({self.expression!r})"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        # isoweekday: понедельник 1 … воскресенье 7, в cron воскресенье 0
+        day_ok = moment.day in self._days
+        weekday_ok = moment.isoweekday() % 7 in self._weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_run(self, after: datetime) -> datetime:
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(_CRON_MAX_STEPS):
+            if moment.month not in self._months:
+                moment = (moment.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self._hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self._minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        msg = f"Cron expression never fires: {self.expression!r}"
+        raise ValueError(msg)
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> set[int]:
+    values: set[int] = set()
+    for item in field.split(","):
+        spec, _, step_text = item.partition("/")
+        step = int(step_text) if step_text else 1
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start_text, end_text = spec.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(spec)
+            end = high if step_text else start
+        if step < 1 or not low <= start <= end <= high:
+            msg = f"Invalid cron field {field!r} (allowed {low}-{high})"
+            raise ValueError(msg)
+        values.update(range(start, end + 1, step))
+    return values
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """`lease` — секунды single-flight между воркерами (None — запуск на каждом воркере).
+
+    Lease должен покрывать сам запуск и паузу до следующего: тогда воркер, взявший его, продлевает
+    lease каждым запуском, а остальные пропускают сроки, пока он жив.
+    """
+    name: str
+    func: Callable[[], Awaitable[object]]
+    schedule: Schedule
+    jitter: float = 0.0
+    timeout: float | None = None
+    lease: float | None = None
+    run_on_start: bool = False
+
+
+def instance_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Scheduler:
+    def __init__(self, redis: Redis | None = None, *, owner: str | None = None) -> None:
+        self._redis = redis
+        self._owner = owner or instance_id()
+        self._jobs: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def jobs(self) -> list[Job]:
+        return list(self._jobs.values())
+
+    def add(self, job: Job) -> None:
+        if job.name in self._jobs:
+            msg = f"Job {job.name!r} is already scheduled"
+            raise ValueError(msg)
+        if job.lease is not None and self._redis is None:
+            msg = f"Job {job.name!r} needs a lease but the scheduler has no Redis"
+            raise ValueError(msg)
+        self._jobs[job.name] = job
+
+    def start(self) -> None:
+        for job in self._jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"scheduler:{job.name}"))
+        logger.info("Scheduler started with {} jobs: {}", len(self._jobs), ", ".join(self._jobs))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        logger.info("Scheduler stopped")
+
+    async def run_once(self, job: Job) -> str:
+        """Один запуск задачи с учётом lease; возвращает исход (он же label метрики)."""
+        if job.lease is not None and not await self._acquire_lease(job):
+            job_runs.inc(job=job.name, result="skipped")
+            return "skipped"
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(job.timeout):
+                await job.func()
+        except TimeoutError:
+            result = "timeout"
+            logger.error("Scheduled job {} timed out after {}s", job.name, job.timeout)
+        except Exception:
+            result = "error"
+            logger.exception("Scheduled job {} failed", job.name)
+        else:
+            result = "ok"
+            job_last_success.set(time.time(), job=job.name)
+        elapsed = time.perf_counter() - started
+        job_runs.inc(job=job.name, result=result)
+        job_duration.inc(elapsed, job=job.name)
+        job_last_duration.set(elapsed, job=job.name)
+        logger.debug("Scheduled job {} finished: {} in {:.0f}ms", job.name, result, elapsed * 1000)
+        return result
+
+    async def _loop(self, job: Job) -> None:
+        if job.run_on_start:
+            await self.run_once(job)
+        while True:
+            now = datetime.now(UTC)
+            delay = (job.schedule.next_run(now) - now).total_seconds() + random.uniform(0, job.jitter)
+            await asyncio.sleep(max(delay, 0.0))
+            await self.run_once(job)
+
+    async def _acquire_lease(self, job: Job) -> bool:
+        """Lease свободен или уже наш (тогда продлевается): держатель остаётся ведущим, пока жив."""
+        if self._redis is None:
+            return False
+        key = f"{LEASE_KEY_PREFIX}:{job.name}"
+        ttl_ms = int((job.lease or 0) * 1000)
+        try:
+            if await self._redis.set(key, self._owner, nx=True, px=ttl_ms):
+                return True
+            holder = await self._redis.get(key)
+            if holder in {self._owner, self._owner.encode()}:
+                await self._redis.pexpire(key, ttl_ms)
+                return True
+        except RedisError as e:
+            # Без Redis нельзя гарантировать единственный запуск: пропускаем до следующего срока
+            logger.warning("Scheduler lease for {} unavailable: {}", job.name, e)
+        return False
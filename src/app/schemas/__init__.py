@@ -1,5 +1,5 @@
 from .category_schemas import CategoryDTO, CategoryWithChildrenDTO
-from .exercise_schemas import ExerciseDTO
+from .exercise_schemas import ExerciseDTO, ExerciseImportIssue, ExerciseImportRecord, ExerciseImportReport
 from .rich_view import (
     AnswerLine,
     Block,
@@ -12,7 +12,7 @@ from .rich_view import (
     ResultView,
     TaskView,
 )
-from .task_schemas import CheckResult, TaskOption, TaskResponse, TaskUI
+from .task_schemas import CheckResult, ExamVariant, TaskOption, TaskResponse, TaskUI
 from .user_schemas import UserDTO, UserWithCategoryDTO, UserWithExercisesDTO
 
 __all__ = [
@@ -24,7 +24,11 @@ __all__ = [
     "CheckResult",
     "Collapsible",
     "Divider",
+    "ExamVariant",
     "ExerciseDTO",
+    "ExerciseImportIssue",
+    "ExerciseImportRecord",
+    "ExerciseImportReport",
     "NumberedList",
     "Paragraph",
     "Quote",
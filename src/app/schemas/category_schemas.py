@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 
-from app.enums import HandlerType
+from app.enums import HandlerType, SelectionStrategy
 from app.models import Category
 
 
@@ -10,6 +10,7 @@ class CategoryDTO(BaseModel):
     handler_type: HandlerType | None
     parent_id: int | None
     is_ege_task: bool = False
+    selection_strategy: SelectionStrategy = SelectionStrategy.THOMPSON
 
     @classmethod
     def from_orm_obj(cls, orm_obj: Category) -> "CategoryDTO":
@@ -19,6 +20,7 @@ class CategoryDTO(BaseModel):
             handler_type=orm_obj.handler_type,
             parent_id=orm_obj.parent_id,
             is_ege_task=orm_obj.is_ege_task,
+            selection_strategy=orm_obj.selection_strategy,
         )
 
 
@@ -33,5 +35,6 @@ class CategoryWithChildrenDTO(CategoryDTO):
             handler_type=orm_obj.handler_type,
             parent_id=orm_obj.parent_id,
             is_ege_task=orm_obj.is_ege_task,
+            selection_strategy=orm_obj.selection_strategy,
             children=[CategoryDTO.from_orm_obj(child) for child in orm_obj.children],
         )
@@ -1,7 +1,8 @@
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import inspect
 
 from app.models import Exercise
 
@@ -13,7 +14,8 @@ class ExerciseDTO(BaseModel):
     order_index: int | None
     content: dict[str, Any]
     answer: str
-    explanation: str | None
+    # None, пока разбор не подгружен (см. TaskService.check_answer)
+    explanation: str | None = None
     is_active: bool
 
     @classmethod
@@ -25,6 +27,39 @@ class ExerciseDTO(BaseModel):
             order_index=orm_obj.order_index,
             content=orm_obj.content,
             answer=orm_obj.answer,
-            explanation=orm_obj.explanation,
+            explanation=inspect(orm_obj).dict.get("explanation"),
             is_active=orm_obj.is_active,
         )
+
+
+class ExerciseImportRecord(BaseModel):
+    """Строка JSONL-файла импорта; content дополнительно проверяется схемой задания категории."""
+    model_config = ConfigDict(extra="forbid")
+
+    category_id: int
+    content: dict[str, Any]
+    answer: str | None = Field(default=None, max_length=256)
+    explanation: str | None = None
+    group_id: UUID | None = None
+    order_index: int | None = None
+    is_active: bool = True
+
+
+class ExerciseImportIssue(BaseModel):
+    line_no: int
+    message: str
+
+
+class ExerciseImportReport(BaseModel):
+    read: int = 0
+    invalid: int = 0
+    inserted: int = 0
+    updated: int = 0
+    catalog_version: int | None = None
+    elapsed: float = 0.0
+    issues: list[ExerciseImportIssue] = Field(default_factory=list)
+
+    @property
+    def skipped(self) -> int:
+        """Валидные строки без изменений в БД: дубли и уже загруженные упражнения."""
+        return self.read - self.invalid - self.inserted - self.updated
@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.enums import LeaderboardPeriod
+
 
 class ProfileSummaryDTO(BaseModel):
     full_name: str
@@ -21,3 +23,19 @@ class CategoryStatItemDTO(BaseModel):
     total_answered: int
     total_correct: int
     percent: int
+
+
+class LeaderboardEntryDTO(BaseModel):
+    rank: int
+    user_id: int
+    full_name: str
+    score: int
+
+
+class LeaderboardDTO(BaseModel):
+    period: LeaderboardPeriod
+    task_id: int | None
+    task_name: str | None
+    entries: list[LeaderboardEntryDTO]
+    user_rank: int | None
+    user_score: int
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel
 
 from app.schemas.rich_view import ResultView, TaskView
@@ -20,6 +22,12 @@ class TaskResponse(BaseModel):
     task_config: BaseModel | None = None
 
 
+class ExamVariant(BaseModel):
+    """Заранее собранный вариант задания: упражнения в порядке показа и task_config процессора."""
+    exercise_ids: list[int]
+    task_config: dict[str, Any]
+
+
 class CheckResult(BaseModel):
     is_correct: bool
     result_view: ResultView
@@ -16,6 +16,7 @@ class UserDTO(BaseModel):
     exercise_started_at: datetime | None
     current_task_config: dict[str, Any] | None = None
     current_category_id: int | None = None
+    current_exercise_ids: list[int] = Field(default_factory=list)
 
     @classmethod
     def from_orm_obj(cls, orm_obj: User) -> "UserDTO":
@@ -28,6 +29,7 @@ class UserDTO(BaseModel):
             exercise_started_at=orm_obj.exercise_started_at,
             current_task_config=orm_obj.current_task_config,
             current_category_id=orm_obj.current_category_id,
+            current_exercise_ids=list(orm_obj.current_exercise_ids or []),
         )
 
 
@@ -49,24 +51,11 @@ class UserWithCategoryDTO(UserDTO):
 
 
 class UserWithExercisesDTO(UserWithCategoryDTO):
+    """Юзер апдейта. current_exercises заполняет TaskService.check_answer по current_exercise_ids."""
+
     current_exercises: list[ExerciseDTO] | None = None
 
     @classmethod
-    def from_orm_obj(
-            cls,
-            orm_obj: User,
-            *, load_exercises: bool = True,
-            load_category: bool = True,
-    ) -> "UserWithExercisesDTO":
+    def from_orm_obj(cls, orm_obj: User, *, load_category: bool = True) -> "UserWithExercisesDTO":
         user_dto = UserWithCategoryDTO.from_orm_obj(orm_obj, load_category=load_category)
-        current_exercises_dto = None
-
-        if load_exercises and orm_obj.current_exercises:
-            current_exercises_dto = [
-                ExerciseDTO.from_orm_obj(exercise) for exercise in orm_obj.current_exercises
-            ]
-
-        return cls(
-            **user_dto.model_dump(),
-            current_exercises=current_exercises_dto,
-        )
+        return cls(**user_dto.model_dump())
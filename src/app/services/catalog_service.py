@@ -0,0 +1,41 @@
+"""Каталог упражнений: версия банка и кэш производных от банка структур.
+
+Версия каталога — версия пространства кэша `catalog` (`app.cache`). Она растёт при каждом изменении
+банка (импорт) и при `python -m app.jobs.invalidate_cache catalog`. Структуры, которые дорого
+строить на каждый запрос (индексы по категории), лежат в первом уровне этого пространства и
+сбрасываются целиком, как только версия сменилась: у своего воркера сразу, у остальных — по pub/sub
+или не позже чем через `CACHE_VERSION_CHECK_INTERVAL` секунд.
+"""
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, cast
+
+from app.cache import Cache, CacheManager
+from app.cache.namespace import version_key
+
+CATALOG_NAMESPACE = "catalog"
+
+
+class CatalogService:
+    def __init__(self, cache_manager: CacheManager) -> None:
+        self._namespace = cache_manager.namespace(CATALOG_NAMESPACE)
+        # Индексы — объекты процесса: только первый уровень, без TTL и сериализации
+        self._derived: Cache[Any] = self._namespace.cache("derived", None, local_ttl=None, remote_ttl=None)
+
+    async def get_version(self) -> int:
+        version = await self._namespace.redis.get(version_key(CATALOG_NAMESPACE))
+        return int(version) if version is not None else 0
+
+    async def bump_version(self) -> int:
+        """Новая версия каталога у всех воркеров; возвращает её."""
+        return await self._namespace.invalidate()
+
+    async def cached_version(self) -> int:
+        """Версия каталога, известная процессу (см. `Namespace.current_version`)."""
+        return await self._namespace.current_version()
+
+    async def get_or_build[T](self, key: Hashable, builder: Callable[[], Awaitable[T]]) -> T:
+        """Значение из кэша текущей версии каталога или builder() с сохранением в кэш.
+
+        Одновременные промахи по ключу ждут одну сборку.
+        """
+        return cast("T", await self._derived.get_or_load(key, builder))
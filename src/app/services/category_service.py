@@ -1,16 +1,31 @@
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import CacheManager, PydanticSerializer, cached
 from app.exceptions import CategoryNotFoundError
 from app.repositories import CategoryRepository
 from app.schemas import CategoryDTO, CategoryWithChildrenDTO
 
+# Дерево категорий меняется только правками админа: после них `python -m app.jobs.invalidate_cache categories`
+CATEGORIES_NAMESPACE = "categories"
+
 
 class CategoryService:
-    def __init__(self, session: AsyncSession, category_repository: CategoryRepository) -> None:
+    def __init__(
+            self,
+            session: AsyncSession,
+            category_repository: CategoryRepository,
+            cache_manager: CacheManager,
+    ) -> None:
         self._session = session
         self._category_repository = category_repository
+        categories = cache_manager.namespace(CATEGORIES_NAMESPACE)
+        self._roots = categories.cache("roots", PydanticSerializer(list[CategoryDTO]))
+        self._children = categories.cache("children", PydanticSerializer(CategoryWithChildrenDTO))
+        self._tree = categories.cache("tree", PydanticSerializer(list[CategoryDTO]))
+        self._ege_task_map = categories.cache("ege_task_map", PydanticSerializer(dict[int, int]))
 
+    @cached(lambda self: self._roots)
     async def get_root_categories(self) -> list[CategoryDTO]:
         categories = await self._category_repository.get_roots()
         return [
@@ -18,6 +33,7 @@ class CategoryService:
             for category in categories
         ]
 
+    @cached(lambda self: self._children)
     async def get_by_id_with_children(self, category_id: int) -> CategoryWithChildrenDTO:
         category = await self._category_repository.get_by_id_with_children(category_id)
         if category is None:
@@ -25,6 +41,7 @@ class CategoryService:
             raise CategoryNotFoundError(category_id)
         return CategoryWithChildrenDTO.from_orm_obj(category)
 
+    @cached(lambda self: self._tree)
     async def get_by_id_with_tree(self, category_id: int) -> list[CategoryDTO]:
         categories = await self._category_repository.get_by_id_with_tree(category_id)
         if not categories:
@@ -33,3 +50,8 @@ class CategoryService:
             CategoryDTO.from_orm_obj(category)
             for category in categories
         ]
+
+    @cached(lambda self: self._ege_task_map)
+    async def get_ege_task_map(self) -> dict[int, int]:
+        """category_id -> id задания ЕГЭ; одна запись на всё дерево вместо рекурсивного запроса на ответ."""
+        return await self._category_repository.get_ege_task_map()
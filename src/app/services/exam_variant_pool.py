@@ -0,0 +1,140 @@
+"""Пул заранее собранных экзаменационных вариантов в Redis.
+
+Тяжёлые экзамены (8, 9–12, 13, 22) собираются несколькими выборками, пока юзер ждёт. Продюсер
+(`app.jobs.exam_pool_producer`) заранее собирает для каждой такой категории варианты — id упражнений
+в порядке показа и task_config процессора — и кладёт их в список `exam_pool:{catalog_version}:{category_id}`.
+`take` снимает несколько кандидатов, отдаёт тот, где меньше всего уже виденного юзером, остальные
+возвращает в голову списка. Нет подходящего варианта или упражнения пропали из каталога — задание
+собирается вживую. Версия каталога в ключе: после импорта старые пулы просто истекают по TTL.
+"""
+from collections.abc import Sequence
+from typing import cast
+
+from loguru import logger
+from pydantic import ValidationError
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.config import exam_pool_settings
+from app.metrics import counter, gauge
+from app.models import Exercise
+from app.processors import PooledExamProcessor
+from app.repositories import ExerciseRepository, UserAnswerRepository
+from app.schemas import CategoryDTO, ExamVariant, TaskResponse, UserWithCategoryDTO
+from app.services.catalog_service import CatalogService
+from app.services.recent_exercises_service import RecentExercisesService
+
+KEY_PREFIX = "exam_pool"
+
+pool_requests = counter(
+    "exam_pool_requests_total", "Exam tasks requested from the variant pool, by outcome", ("category", "result"),
+)
+pool_generated = counter("exam_pool_generated_total", "Variants added to the pool by the producer", ("category",))
+pool_generation_errors = counter(
+    "exam_pool_generation_errors_total", "Producer attempts that failed to build a variant", ("category",),
+)
+pool_depth = gauge("exam_pool_depth", "Variants waiting in the pool after the last refill", ("category",))
+
+
+def exam_pool_key(catalog_version: int, category_id: int) -> str:
+    return f"{KEY_PREFIX}:{catalog_version}:{category_id}"
+
+
+class ExamVariantPool:
+    def __init__(
+            self,
+            redis: Redis,
+            catalog_service: CatalogService,
+            exercise_repository: ExerciseRepository,
+            answer_repository: UserAnswerRepository,
+            recent_exercises: RecentExercisesService,
+    ) -> None:
+        self._redis = redis
+        self._catalog = catalog_service
+        self._exercise_repository = exercise_repository
+        self._answer_repository = answer_repository
+        self._recent_exercises = recent_exercises
+
+    async def key(self, category_id: int) -> str:
+        return exam_pool_key(await self._catalog.cached_version(), category_id)
+
+    async def depth(self, category_id: int) -> int:
+        return await self._redis.llen(await self.key(category_id))
+
+    async def put(self, category_id: int, variants: Sequence[ExamVariant]) -> int:
+        """Добавляет варианты в хвост пула и продлевает TTL; возвращает новую глубину."""
+        key = await self.key(category_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, *(variant.model_dump_json() for variant in variants))
+            pipe.expire(key, exam_pool_settings.TTL_SECONDS)
+            depth, _ = await pipe.execute()
+        return depth
+
+    async def take(self, user: UserWithCategoryDTO, processor: PooledExamProcessor) -> TaskResponse | None:
+        """Задание из готового варианта или None — тогда вызывающий собирает его через create_task."""
+        category = user.current_category
+        if category is None:
+            return None
+        try:
+            key = await self.key(category.id)
+            raw = cast("list[bytes]", await self._redis.lpop(key, exam_pool_settings.CANDIDATES) or [])
+        except RedisError as e:
+            logger.warning("Exam pool read failed for category_id={}: {}", category.id, e)
+            pool_requests.inc(category=category.id, result="error")
+            return None
+
+        candidates: list[tuple[ExamVariant, bytes]] = []
+        for item in raw:
+            try:
+                candidates.append((ExamVariant.model_validate_json(item), item))
+            except ValidationError:
+                logger.warning("Dropping malformed exam pool entry in category_id={}", category.id)
+        if not candidates:
+            pool_requests.inc(category=category.id, result="empty")
+            return None
+
+        seen = await self._seen_ids(user.id, category, candidates)
+        # sorted стабилен: при равном пересечении раньше идёт вариант, дольше пролежавший в пуле
+        ranked = sorted(candidates, key=lambda candidate: len(seen.intersection(candidate[0].exercise_ids)))
+        best = ranked[0][0]
+        if len(seen.intersection(best.exercise_ids)) > exam_pool_settings.MAX_SEEN:
+            await self._push_back(key, ranked)
+            pool_requests.inc(category=category.id, result="seen")
+            return None
+        await self._push_back(key, ranked[1:])
+
+        exercises = await self._hydrate(best.exercise_ids)
+        if exercises is None:
+            pool_requests.inc(category=category.id, result="stale")
+            return None
+        response = processor.restore_variant(exercises, best.task_config)
+        pool_requests.inc(category=category.id, result="hit")
+        return response
+
+    async def _seen_ids(
+            self, user_id: int, category: CategoryDTO, candidates: list[tuple[ExamVariant, bytes]],
+    ) -> set[int]:
+        """Упражнения кандидатов, которые юзер уже решал, плюс его буфер недавних показов."""
+        ids = {eid for variant, _ in candidates for eid in variant.exercise_ids}
+        seen = await self._answer_repository.get_answered_among(user_id, sorted(ids))
+        # Экзамены берут упражнения из родительской категории, под её id их и пишет буфер recent
+        if category.parent_id is not None:
+            seen.update(await self._recent_exercises.get(user_id, category.parent_id))
+        return seen
+
+    async def _push_back(self, key: str, candidates: Sequence[tuple[ExamVariant, bytes]]) -> None:
+        if not candidates:
+            return
+        try:
+            # LPUSH кладёт по одному в голову: разворот сохраняет исходный порядок кандидатов
+            await self._redis.lpush(key, *(item for _, item in reversed(candidates)))
+        except RedisError as e:
+            logger.warning("Exam pool push back failed for key={}: {}", key, e)
+
+    async def _hydrate(self, exercise_ids: list[int]) -> list[Exercise] | None:
+        """Упражнения варианта в порядке показа; None, если какое-то удалено или выключено."""
+        by_id = {ex.id: ex for ex in await self._exercise_repository.get_by_ids(exercise_ids)}
+        exercises = [by_id.get(eid) for eid in exercise_ids]
+        if any(ex is None or not ex.is_active for ex in exercises):
+            return None
+        return [ex for ex in exercises if ex is not None]
@@ -0,0 +1,169 @@
+"""Импорт банка упражнений из JSONL.
+
+Файл читается потоково пачками по `batch_size` строк. Пачки валидируются в пуле процессов
+(pydantic-схема content для HandlerType категории — CPU-bound), результаты применяются строго
+в порядке файла: COPY в staging-таблицу и `INSERT … ON CONFLICT` по (category_id, content_hash),
+коммит на каждую пачку. В конце растёт версия каталога, чтобы кэши перечитали банк.
+"""
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import batched
+from pathlib import Path
+from typing import TextIO
+
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from app.enums import HandlerType
+from app.processors import CONTENT_SCHEMA_MAPPING
+from app.repositories import CategoryRepository, ExerciseImportRepository, StagedExercise
+from app.schemas import ExerciseImportIssue, ExerciseImportRecord, ExerciseImportReport
+from app.services.catalog_service import CatalogService
+
+DEFAULT_BATCH_SIZE = 5000
+MAX_REPORTED_ISSUES = 100
+
+type ValidatedChunk = tuple[list[StagedExercise], list[ExerciseImportIssue]]
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or '<root>'}: {item['msg']}" for item in error.errors()
+    )
+
+
+def _content_error(content: dict, schemas: Collection[type[BaseModel]]) -> str | None:
+    for schema in schemas:
+        try:
+            schema.model_validate(content)
+        except ValidationError as e:
+            return f"content does not match {schema.__name__}: {_describe(e)}"
+    return None
+
+
+def validate_lines(
+    lines: Sequence[tuple[int, str]],
+    handler_types: Mapping[int, Collection[HandlerType]],
+) -> ValidatedChunk:
+    """Разбирает и валидирует пачку строк. Выполняется в процессе пула, поэтому без доступа к БД.
+
+    content должен подходить под схемы всех HandlerType, читающих упражнения категории: её собственного
+    и дочерних категорий (тренировка и экзамен берут упражнения из общей родительской категории).
+    """
+    rows: list[StagedExercise] = []
+    issues: list[ExerciseImportIssue] = []
+    for line_no, line in lines:
+        try:
+            record = ExerciseImportRecord.model_validate_json(line)
+        except ValidationError as e:
+            issues.append(ExerciseImportIssue(line_no=line_no, message=_describe(e)))
+            continue
+
+        schemas = {
+            CONTENT_SCHEMA_MAPPING[handler_type]
+            for handler_type in handler_types.get(record.category_id, ())
+            if handler_type in CONTENT_SCHEMA_MAPPING
+        }
+        error = (
+            _content_error(record.content, schemas) if schemas
+            else f"category {record.category_id} not found or has no content schema"
+        )
+        if error is not None:
+            issues.append(ExerciseImportIssue(line_no=line_no, message=error))
+            continue
+
+        rows.append(StagedExercise(
+            line_no=line_no,
+            category_id=record.category_id,
+            group_id=record.group_id,
+            order_index=record.order_index,
+            content=json.dumps(record.content, ensure_ascii=False),
+            answer=record.answer,
+            explanation=record.explanation,
+            is_active=record.is_active,
+        ))
+    return rows, issues
+
+
+def _read_chunks(file: TextIO, batch_size: int) -> Iterator[tuple[tuple[int, str], ...]]:
+    numbered = ((line_no, line) for line_no, line in enumerate(file, start=1) if line.strip())
+    return batched(numbered, batch_size, strict=False)
+
+
+class ExerciseImportService:
+    def __init__(
+        self,
+        import_repository: ExerciseImportRepository,
+        category_repository: CategoryRepository,
+        catalog_service: CatalogService,
+    ) -> None:
+        self._import_repo = import_repository
+        self._category_repo = category_repository
+        self._catalog = catalog_service
+
+    async def import_file(
+        self,
+        path: Path,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: int | None = None,
+        dry_run: bool = False,
+    ) -> ExerciseImportReport:
+        """Загружает JSONL-файл. workers=None — по числу CPU, 0 — валидация без пула процессов.
+
+        В очереди не больше workers + 1 пачек: валидация следующих пачек идёт, пока текущая пишется в БД,
+        а память не растёт с размером файла.
+        """
+        started = time.perf_counter()
+        handler_types = await self._category_repo.get_content_handler_types()
+        report = ExerciseImportReport()
+        loop = asyncio.get_running_loop()
+        executor = ProcessPoolExecutor(workers) if workers != 0 else None
+        max_in_flight = (workers or os.cpu_count() or 1) + 1
+
+        try:
+            pending: deque[asyncio.Future[ValidatedChunk]] = deque()
+            with path.open(encoding="utf-8") as file:
+                for chunk in _read_chunks(file, batch_size):
+                    if executor is None:
+                        future = loop.create_future()
+                        future.set_result(validate_lines(chunk, handler_types))
+                    else:
+                        future = loop.run_in_executor(executor, validate_lines, chunk, handler_types)
+                    pending.append(future)
+                    if len(pending) >= max_in_flight:
+                        await self._apply(await pending.popleft(), report, dry_run=dry_run)
+            while pending:
+                await self._apply(await pending.popleft(), report, dry_run=dry_run)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        if report.inserted or report.updated:
+            report.catalog_version = await self._catalog.bump_version()
+        report.elapsed = time.perf_counter() - started
+        logger.info(
+            "Import of {} finished in {:.1f}s: read={}, inserted={}, updated={}, skipped={}, invalid={}",
+            path, report.elapsed, report.read, report.inserted, report.updated, report.skipped, report.invalid,
+        )
+        return report
+
+    async def _apply(self, chunk: ValidatedChunk, report: ExerciseImportReport, *, dry_run: bool) -> None:
+        rows, issues = chunk
+        report.read += len(rows) + len(issues)
+        report.invalid += len(issues)
+        report.issues.extend(issues[:max(MAX_REPORTED_ISSUES - len(report.issues), 0)])
+        if not rows or dry_run:
+            return
+
+        await self._import_repo.stage(rows)
+        inserted, updated = await self._import_repo.merge_staged()
+        await self._import_repo.commit()
+        report.inserted += inserted
+        report.updated += updated
+        logger.debug("Import batch up to line {}: inserted={}, updated={}", rows[-1].line_no, inserted, updated)
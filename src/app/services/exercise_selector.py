@@ -1,12 +1,20 @@
 import math
 import random
 import statistics
-from collections.abc import Container, Sequence
+from collections.abc import Awaitable, Callable, Collection, Container, Sequence
 from datetime import UTC, datetime
 
-from app.models import Exercise
-from app.repositories import ExerciseRepository, UserAnswerRepository
+from app.database import ConcurrentReads, ReadSession
+from app.enums import SelectionStrategy
+from app.models import Exercise, UserExerciseSchedule
+from app.repositories import (
+    CategoryRepository,
+    ExerciseRepository,
+    UserAnswerRepository,
+    UserExerciseScheduleRepository,
+)
 from app.repositories.exercise_filters import answer_eq, answer_ne, content_eq, content_exists
+from app.services.recent_exercises_service import RecentExercisesService
 
 STATS_WINDOW_SIZE = 5
 
@@ -14,11 +22,47 @@ STATS_WINDOW_SIZE = 5
 class ExerciseSelector:
     def __init__(
         self,
+        *,
         exercise_repository: ExerciseRepository,
         answer_repository: UserAnswerRepository,
+        schedule_repository: UserExerciseScheduleRepository,
+        category_repository: CategoryRepository,
+        recent_exercises: RecentExercisesService,
+        concurrent_reads: ConcurrentReads,
     ) -> None:
         self._exercise_repository = exercise_repository
         self._answer_repository = answer_repository
+        self._schedule_repository = schedule_repository
+        self._category_repository = category_repository
+        self._recent_exercises = recent_exercises
+        self._concurrent_reads = concurrent_reads
+        # Стратегия категории на время апдейта: record_review зовётся на каждое упражнение задания
+        self._spaced_categories: dict[int, bool] = {}
+        # Расписания, загруженные за апдейт: ответ на экзамен пересчитывает их все в памяти
+        self._schedules: dict[tuple[int, int], UserExerciseSchedule | None] = {}
+
+    async def select_concurrently(
+        self, *selections: Callable[["ExerciseSelector"], Awaitable[Sequence[Exercise]]],
+    ) -> tuple[Sequence[Exercise], ...]:
+        """Независимые выборки (страты экзаменационного задания) параллельно, каждая на своей сессии.
+
+        Возвращённые упражнения отсоединены от сессии апдейта; start_task перечитает их по id.
+        """
+        return await self._concurrent_reads.gather(
+            *(lambda session, select=select: select(self._on_session(session)) for select in selections),
+        )
+
+    def _on_session(self, session: ReadSession) -> "ExerciseSelector":
+        selector = ExerciseSelector(
+            exercise_repository=type(self._exercise_repository)(session),
+            answer_repository=type(self._answer_repository)(session.primary),
+            schedule_repository=UserExerciseScheduleRepository(session.primary, session),
+            category_repository=CategoryRepository(session),
+            recent_exercises=self._recent_exercises,
+            concurrent_reads=self._concurrent_reads,
+        )
+        selector._spaced_categories = self._spaced_categories
+        return selector
 
     async def select_smart(
             self,
@@ -27,6 +71,9 @@ class ExerciseSelector:
             limit: int = 1,
             filters: list | None = None,
     ) -> Sequence[Exercise]:
+        if await self._uses_spaced_repetition(category_id):
+            return await self._select_spaced(category_id, user_id, limit, filters)
+
         unseen = await self._exercise_repository.get_random_unseen(
             category_id, user_id, limit, filters=filters,
         )
@@ -39,6 +86,72 @@ class ExerciseSelector:
         )
         return [*unseen, *thompson]
 
+    async def record_review(
+        self,
+        user_id: int,
+        exercise_id: int,
+        category_id: int,
+        *, is_correct: bool,
+        answered_ids: Collection[int] = (),
+    ) -> None:
+        """Обновляет расписание повторений, если категория упражнения работает по SM-2.
+
+        `answered_ids` — все упражнения ответа: первый вызов грузит их расписания одним запросом,
+        следующие за тот же апдейт обходятся без чтения.
+        """
+        if not await self._uses_spaced_repetition(category_id):
+            return
+        key = (user_id, exercise_id)
+        if key not in self._schedules:
+            ids = {eid for eid in {exercise_id, *answered_ids} if (user_id, eid) not in self._schedules}
+            loaded = await self._schedule_repository.get_for_exercises(user_id, ids)
+            self._schedules.update({(user_id, eid): loaded.get(eid) for eid in ids})
+        self._schedules[key] = self._schedule_repository.apply_review(
+            self._schedules[key], user_id, exercise_id, category_id, datetime.now(UTC), is_correct=is_correct,
+        )
+
+    async def _uses_spaced_repetition(self, category_id: int) -> bool:
+        if category_id not in self._spaced_categories:
+            category = await self._category_repository.get_by_id(category_id)
+            self._spaced_categories[category_id] = (
+                category is not None and category.selection_strategy == SelectionStrategy.SPACED_REPETITION
+            )
+        return self._spaced_categories[category_id]
+
+    async def _select_spaced(
+        self,
+        category_id: int,
+        user_id: int,
+        limit: int,
+        filters: list | None = None,
+    ) -> Sequence[Exercise]:
+        """Spaced-repetition выборка по расписанию SM-2.
+
+        Phase 1: просроченные повторения (due_at <= now), самые старые первыми.
+        Phase 2: новые упражнения, которых ещё нет в расписании.
+        Phase 3: ближайшие по due_at, если повторять пока нечего.
+        """
+        due = await self._schedule_repository.get_scheduled(
+            user_id, category_id, limit, due_by=datetime.now(UTC), filters=filters,
+        )
+        if len(due) >= limit:
+            return due
+
+        selected = list(due)
+        fresh = await self._schedule_repository.get_random_unscheduled(
+            user_id, category_id, limit - len(selected), filters=filters,
+        )
+        selected.extend(fresh)
+        if len(selected) >= limit:
+            return selected
+
+        upcoming = await self._schedule_repository.get_scheduled(
+            user_id, category_id, limit - len(selected),
+            exclude_ids={ex.id for ex in selected}, filters=filters,
+        )
+        selected.extend(upcoming)
+        return selected
+
     async def select_smart_by_group(
         self,
         category_id: int,
@@ -48,42 +161,52 @@ class ExerciseSelector:
     ) -> Sequence[Exercise]:
         """Smart-select scoring group_id (not individual exercises) using cross-category stats.
 
+        Кандидаты (по одному упражнению на группу) вместе с флагом seen из user_seen_groups
+        и статистикой групп приходят одним запросом, дальше выбор идёт в памяти.
         Phase 1: unseen groups (cross-category check).
-        Phase 2: Thompson on groups with cross-category stats.
-        Fallback: regular Thompson for NULL group_id exercises.
+        Phase 2: Thompson on seen groups with cross-category stats.
+        Fallback: smart selection among NULL group_id exercises.
         """
-        unseen = await self._exercise_repository.get_random_unseen_by_group(
-            category_id, user_id, limit, filters,
+        candidates = await self._exercise_repository.get_group_candidates(
+            category_id, user_id, STATS_WINDOW_SIZE, filters,
         )
-        if len(unseen) >= limit:
-            return unseen
 
-        exclude_groups = {ex.group_id for ex in unseen if ex.group_id is not None}
-        exclude_ids = {ex.id for ex in unseen}
-        selected = list(unseen)
+        unseen = [row.Exercise.id for row in candidates if not row.seen]
+        random.shuffle(unseen)
+        picked_ids = unseen[:limit]
 
-        group_stats = await self._answer_repository.get_group_stats(
-            user_id, category_id, STATS_WINDOW_SIZE, filters,
-        )
-        if group_stats:
-            scored = self._compute_thompson_scores(group_stats, exclude_groups)
-            top_groups = [gid for gid, _ in scored[: limit - len(selected)]]
-            if top_groups:
-                group_exs = await self._exercise_repository.get_random_by_group_ids(
-                    category_id, top_groups, exclude_ids, filters,
-                )
-                selected.extend(group_exs)
+        if len(picked_ids) < limit:
+            seen = {row.exercise_id: row.Exercise.id for row in candidates if row.seen}
+            scored = self._compute_thompson_scores([row for row in candidates if row.last_attempt_at is not None])
+            ranked = [gid for gid, _ in scored]
+            # показанные группы, по которым нет статистики (ответы на неактивные упражнения), — в конец
+            no_stats = list(seen.keys() - set(ranked))
+            random.shuffle(no_stats)
+            picked_ids.extend(seen[gid] for gid in [*ranked, *no_stats][: limit - len(picked_ids)])
 
+        selected = await self._hydrate(picked_ids)
         if len(selected) < limit:
-            remaining = limit - len(selected)
-            all_exclude = {ex.id for ex in selected}
-            thompson = await self._select_thompson(
-                category_id, user_id, remaining, all_exclude, filters,
-            )
-            selected.extend(thompson)
+            selected.extend(await self.select_smart(
+                category_id, user_id, limit - len(selected), [*(filters or []), Exercise.group_id.is_(None)],
+            ))
 
         return selected
 
+    async def get_thompson_weights(self, category_id: int, user_id: int) -> dict[int, float]:
+        """Thompson-скоры показанных юзеру упражнений категории; непоказанных в результате нет.
+
+        Недавно показанные получают отрицательный вес (самые свежие — наименьший), чтобы
+        попадать в выборку последними.
+        """
+        stats_rows = await self._answer_repository.get_exercise_stats(
+            user_id, category_id, window_size=STATS_WINDOW_SIZE,
+        )
+        weights = dict(self._compute_thompson_scores(stats_rows))
+        recent = await self._recent_exercises.get(user_id, category_id)
+        for position, exercise_id in enumerate(recent):
+            weights[exercise_id] = -float(len(recent) - position)
+        return weights
+
     async def select_by_answer(
         self, category_id: int, user_id: int, answer: str, limit: int,
     ) -> Sequence[Exercise]:
@@ -123,7 +246,7 @@ class ExerciseSelector:
         Допускает одинаковые answer в разных группах (если хватает упражнений).
         Phase 1: answer-level stats + eligibility (1 SQL).
         Phase 2: Thompson at answer level (Python).
-        Phase 3: batch fetch exercises unseen-first (1 SQL).
+        Phase 3: batch fetch exercise stubs unseen-first (1 SQL), then hydrate the picked ones (1 SQL).
         """
         answer_stats = await self._answer_repository.get_answer_group_stats(
             user_id, category_id, min_group_size=group_size,
@@ -149,17 +272,18 @@ class ExerciseSelector:
             by_answer.setdefault(ex.answer, []).append(ex)
 
         answer_offset: dict[str, int] = {}
-        groups: list[list[Exercise]] = []
+        id_groups: list[list[int]] = []
         for answer in selected_answers:
             offset = answer_offset.get(answer, 0)
             available = by_answer.get(answer, [])
             group = available[offset:offset + group_size]
             if len(group) < group_size:
                 continue
-            groups.append(group)
+            id_groups.append([ex.id for ex in group])
             answer_offset[answer] = offset + group_size
 
-        return groups
+        hydrated = {ex.id: ex for ex in await self._hydrate([eid for group in id_groups for eid in group])}
+        return [[hydrated[eid] for eid in group] for group in id_groups]
 
     @staticmethod
     def _pick_answers_thompson(
@@ -238,20 +362,28 @@ class ExerciseSelector:
             return selected
 
         scored = self._compute_thompson_scores(stats_rows, exclude_ids)
-        candidate_ids = [eid for eid, _ in scored]
-        candidates = await self._exercise_repository.get_by_ids(candidate_ids)
+        recent = await self._recent_exercises.get(user_id, category_id)
+        candidate_ids = self._demote_recent([eid for eid, _ in scored], recent)
+        candidates = await self._exercise_repository.get_stubs_by_ids(candidate_ids)
         candidates_map = {ex.id: ex for ex in candidates}
 
-        for eid, _ in scored:
+        picked_ids: list[int] = []
+        for eid in candidate_ids:
             ex = candidates_map.get(eid)
             if ex is not None and ex.answer not in seen_answers:
                 seen_answers.add(ex.answer)
-                selected.append(ex)
-                if len(selected) >= limit:
+                picked_ids.append(eid)
+                if len(selected) + len(picked_ids) >= limit:
                     break
 
+        selected.extend(await self._hydrate(picked_ids))
         return selected
 
+    async def _hydrate(self, ids: Sequence[int]) -> list[Exercise]:
+        """Полные упражнения (без explanation) в порядке ids — один запрос только для победителей."""
+        by_id = {ex.id: ex for ex in await self._exercise_repository.get_by_ids(ids)}
+        return [by_id[eid] for eid in ids if eid in by_id]
+
     @staticmethod
     def _compute_thompson_scores(
         stats_rows: Sequence, exclude_ids: Container | None = None,
@@ -304,6 +436,19 @@ class ExerciseSelector:
             return []
 
         scored = self._compute_thompson_scores(stats_rows, exclude_ids)
-        top_ids = [eid for eid, _ in scored[:limit]]
+        recent = await self._recent_exercises.get(user_id, category_id)
+        top_ids = self._demote_recent([eid for eid, _ in scored], recent)[:limit]
+
+        return await self._hydrate(top_ids)
 
-        return await self._exercise_repository.get_by_ids(top_ids)
+    @staticmethod
+    def _demote_recent(ids: list[int], recent: Sequence[int]) -> list[int]:
+        """Переносит недавно показанные в конец, порядок остальных сохраняет.
+
+        Среди недавних раньше идут показанные давнее: если выбирать больше не из чего,
+        повторится самое старое из них.
+        """
+        position = {eid: i for i, eid in enumerate(recent)}
+        fresh = [eid for eid in ids if eid not in position]
+        stale = sorted((eid for eid in ids if eid in position), key=lambda eid: -position[eid])
+        return fresh + stale
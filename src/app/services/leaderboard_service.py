@@ -0,0 +1,204 @@
+"""Рейтинги на Redis sorted sets: очки — число верных ответов.
+
+Ключи: `lb:all:global`, `lb:all:task:{id}`, `lb:week:{YYYY-Www}:global`, `lb:week:{YYYY-Www}:task:{id}`,
+где id — категория задания ЕГЭ. Недельные ключи привязаны к неделе по МСК и истекают через
+`WEEK_KEY_GRACE` после её окончания, поэтому отдельной ротации не требуют.
+
+Очки апдейта копятся в сервисе и уходят в Redis одним pipeline после коммита (`UnitOfWork.after_commit`):
+если транзакция откатится, рейтинг не получит очков за несохранённые ответы.
+"""
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.database import UnitOfWork
+from app.enums import LeaderboardPeriod
+from app.repositories import (
+    CategoryRepository,
+    UserAnswerRepository,
+    UserCategoryStatRepository,
+    UserRepository,
+    UserStatRepository,
+)
+from app.schemas.stats_schemas import LeaderboardDTO, LeaderboardEntryDTO
+from app.services.category_service import CategoryService
+from app.utils.dates import week_start_msk
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from sqlalchemy import Row
+
+KEY_PREFIX = "lb"
+LEADERBOARD_TOP_SIZE = 10
+WEEK_KEY_GRACE = timedelta(days=1)
+_REBUILD_SUFFIX = ":rebuild"
+
+
+def leaderboard_key(period: LeaderboardPeriod, task_id: int | None, now: datetime) -> str:
+    scope = "global" if task_id is None else f"task:{task_id}"
+    if period == LeaderboardPeriod.ALL_TIME:
+        return f"{KEY_PREFIX}:all:{scope}"
+    year, week, _ = week_start_msk(now).isocalendar()
+    return f"{KEY_PREFIX}:week:{year}-W{week:02d}:{scope}"
+
+
+def _week_expire_at(now: datetime) -> datetime:
+    return week_start_msk(now) + timedelta(days=7) + WEEK_KEY_GRACE
+
+
+class LeaderboardService:
+    def __init__(
+        self,
+        *,
+        redis: Redis,
+        category_repository: CategoryRepository,
+        user_repository: UserRepository,
+        user_stat_repository: UserStatRepository,
+        user_category_stat_repository: UserCategoryStatRepository,
+        user_answer_repository: UserAnswerRepository,
+        category_service: CategoryService,
+        unit_of_work: UnitOfWork,
+    ) -> None:
+        self._redis = redis
+        self._category_repo = category_repository
+        self._user_repo = user_repository
+        self._user_stat_repo = user_stat_repository
+        self._user_category_stat_repo = user_category_stat_repository
+        self._user_answer_repo = user_answer_repository
+        self._category_service = category_service
+        self._uow = unit_of_work
+        # (user_id, задание ЕГЭ) -> очки, ещё не отправленные в Redis
+        self._pending: Counter[tuple[int, int | None]] = Counter()
+
+    async def record_answer(self, user_id: int, category_id: int, *, is_correct: bool) -> None:
+        """Засчитывает верный ответ во все рейтинги юзера после коммита апдейта."""
+        if not is_correct:
+            return
+        task_id = (await self._category_service.get_ege_task_map()).get(category_id)
+        if not self._pending:
+            self._uow.after_commit(self._apply_pending)
+        self._pending[user_id, task_id] += 1
+
+    async def _apply_pending(self) -> None:
+        """ZINCRBY накопленных очков. Ошибки Redis не роняют апдейт — их исправит rebuild."""
+        pending, self._pending = self._pending, Counter()
+        now = datetime.now(UTC)
+        week_expire_at = _week_expire_at(now)
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for (user_id, task_id), score in pending.items():
+                    for scope in [None] if task_id is None else [None, task_id]:
+                        pipe.zincrby(leaderboard_key(LeaderboardPeriod.ALL_TIME, scope, now), score, user_id)
+                        week_key = leaderboard_key(LeaderboardPeriod.WEEK, scope, now)
+                        pipe.zincrby(week_key, score, user_id)
+                        pipe.expireat(week_key, week_expire_at)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Leaderboard update failed for user_ids={}: {}", sorted({u for u, _ in pending}), e)
+
+    async def get_leaderboard(
+        self,
+        user_id: int,
+        period: LeaderboardPeriod,
+        task_id: int | None = None,
+        limit: int = LEADERBOARD_TOP_SIZE,
+    ) -> LeaderboardDTO:
+        """Топ рейтинга и место юзера (ZREVRANK, O(log n)) за один round trip."""
+        key = leaderboard_key(period, task_id, datetime.now(UTC))
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrange(key, 0, limit - 1, withscores=True)
+            pipe.zrevrank(key, user_id)
+            pipe.zscore(key, user_id)
+            top, rank, score = await pipe.execute()
+
+        top_ids = [int(member) for member, _ in top]
+        users = {user.id: user for user in await self._user_repo.get_by_ids(top_ids)}
+        entries = [
+            LeaderboardEntryDTO(
+                rank=position,
+                user_id=uid,
+                full_name=users[uid].full_name if uid in users else "—",
+                score=int(member_score),
+            )
+            for position, (uid, (_, member_score)) in enumerate(zip(top_ids, top, strict=True), start=1)
+        ]
+
+        task_name = None
+        if task_id is not None:
+            task = await self._category_repo.get_by_id(task_id)
+            task_name = task.name if task else None
+
+        return LeaderboardDTO(
+            period=period,
+            task_id=task_id,
+            task_name=task_name,
+            entries=entries,
+            user_rank=rank + 1 if rank is not None else None,
+            user_score=int(score or 0),
+        )
+
+    async def rebuild(self, now: datetime | None = None) -> None:
+        """Пересобирает рейтинги из БД и атомарно подменяет ключи.
+
+        All-time — из `user_stats`/`user_category_stats`, текущая неделя — из `user_answers`.
+        Строки читаются серверным курсором пачками и пишутся во временные ключи.
+        """
+        now = now or datetime.now(UTC)
+        ege_task_map = await self._category_repo.get_ege_task_map()
+        built: set[str] = set()
+        leftovers = [key async for key in self._redis.scan_iter(match=f"{KEY_PREFIX}:*{_REBUILD_SUFFIX}")]
+        if leftovers:
+            await self._redis.delete(*leftovers)
+
+        async for rows in self._user_stat_repo.stream_total_correct():
+            async with self._redis.pipeline(transaction=False) as pipe:
+                key = leaderboard_key(LeaderboardPeriod.ALL_TIME, None, now)
+                for row in rows:
+                    pipe.zadd(key + _REBUILD_SUFFIX, {str(row.user_id): row.total_correct})
+                built.add(key)
+                await pipe.execute()
+
+        sources: Sequence[tuple[LeaderboardPeriod, AsyncIterator[Sequence[Row]]]] = (
+            (LeaderboardPeriod.ALL_TIME, self._user_category_stat_repo.stream_total_correct()),
+            (LeaderboardPeriod.WEEK, self._user_answer_repo.stream_correct_checks(since=week_start_msk(now))),
+        )
+        for period, partitions in sources:
+            async for rows in partitions:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for row in rows:
+                        score = row.total_correct if period == LeaderboardPeriod.ALL_TIME else row.n_correct
+                        scopes: list[int | None] = [] if period == LeaderboardPeriod.ALL_TIME else [None]
+                        task_id = ege_task_map.get(row.category_id)
+                        if task_id is not None:
+                            scopes.append(task_id)
+                        for scope in scopes:
+                            key = leaderboard_key(period, scope, now)
+                            pipe.zincrby(key + _REBUILD_SUFFIX, score, row.user_id)
+                            built.add(key)
+                    await pipe.execute()
+
+        await self._swap_rebuilt_keys(built, now)
+        logger.info("Leaderboards rebuilt: {} keys", len(built))
+
+    async def _swap_rebuilt_keys(self, built: set[str], now: datetime) -> None:
+        week_prefix = leaderboard_key(LeaderboardPeriod.WEEK, None, now).removesuffix("global")
+        stale: set[str] = set()
+        for pattern in (f"{KEY_PREFIX}:all:*", f"{week_prefix}*"):
+            async for key in self._redis.scan_iter(match=pattern):
+                stale.add(key.decode() if isinstance(key, bytes) else key)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for key in built:
+                pipe.rename(key + _REBUILD_SUFFIX, key)
+                if key.startswith(week_prefix):
+                    pipe.expireat(key, _week_expire_at(now))
+            for key in stale - built:
+                if not key.endswith(_REBUILD_SUFFIX):
+                    pipe.delete(key)
+            await pipe.execute()
+
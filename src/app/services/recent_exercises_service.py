@@ -0,0 +1,49 @@
+"""Кольцевой буфер недавно показанных упражнений в Redis.
+
+Ключ `recent:{user_id}:{category_id}` — список id, новые слева; LPUSH + LTRIM держат в нём
+последние `RECENT_EXERCISES_LIMIT` показов. Селектор отодвигает эти упражнения в конец
+Thompson-выборки, так что только что решённое не вернётся сразу — без запроса к user_answers.
+"""
+from collections.abc import Iterable
+from datetime import timedelta
+
+from loguru import logger
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+KEY_PREFIX = "recent"
+RECENT_EXERCISES_LIMIT = 20
+RECENT_EXERCISES_TTL = timedelta(days=7)
+
+
+def recent_exercises_key(user_id: int, category_id: int) -> str:
+    return f"{KEY_PREFIX}:{user_id}:{category_id}"
+
+
+class RecentExercisesService:
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+
+    async def push(self, user_id: int, category_id: int, exercise_ids: Iterable[int]) -> None:
+        """Добавляет показанные упражнения в буфер. Ошибки Redis не мешают выдать задание."""
+        ids = list(exercise_ids)
+        if not ids:
+            return
+        key = recent_exercises_key(user_id, category_id)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.lpush(key, *ids)
+                pipe.ltrim(key, 0, RECENT_EXERCISES_LIMIT - 1)
+                pipe.expire(key, RECENT_EXERCISES_TTL)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Recent exercises update failed for user_id={}: {}", user_id, e)
+
+    async def get(self, user_id: int, category_id: int) -> list[int]:
+        """id недавно показанных упражнений, самые свежие первыми; при недоступном Redis — пусто."""
+        try:
+            ids = await self._redis.lrange(recent_exercises_key(user_id, category_id), 0, -1)
+        except RedisError as e:
+            logger.warning("Recent exercises read failed for user_id={}: {}", user_id, e)
+            return []
+        return [int(eid) for eid in ids]
@@ -1,24 +1,20 @@
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
-from app.models import Category, UserCategoryStat
+from app.database import ConcurrentReads, ReadSession
+from app.models import Category, UserCategoryStat, UserStat
 from app.repositories import CategoryRepository, UserAnswerRepository
 from app.repositories.user_category_stat_repository import UserCategoryStatRepository
 from app.repositories.user_stat_repository import UserStatRepository
 from app.schemas.stats_schemas import CategoryStatItemDTO, ProfileSummaryDTO
+from app.services.leaderboard_service import LeaderboardService
+from app.utils.dates import today_msk
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-MSK = timezone(timedelta(hours=3))
-
-
-def _today_msk() -> date:
-    return datetime.now(MSK).date()
-
-
 def _percent(correct: int, total: int) -> int:
     return round(correct * 100 / total) if total > 0 else 0
 
@@ -26,15 +22,20 @@ def _percent(correct: int, total: int) -> int:
 class StatsService:
     def __init__(
         self,
+        *,
         user_stat_repository: UserStatRepository,
         user_category_stat_repository: UserCategoryStatRepository,
         category_repository: CategoryRepository,
         user_answer_repository: UserAnswerRepository,
+        leaderboard_service: LeaderboardService,
+        concurrent_reads: ConcurrentReads,
     ) -> None:
         self._user_stat_repo = user_stat_repository
         self._user_category_stat_repo = user_category_stat_repository
         self._category_repo = category_repository
         self._user_answer_repo = user_answer_repository
+        self._leaderboard_service = leaderboard_service
+        self._concurrent_reads = concurrent_reads
 
     async def record_answer_stats(
         self,
@@ -43,7 +44,7 @@ class StatsService:
         is_correct: bool,  # noqa: FBT001
         exercise_ids: list[int],
     ) -> None:
-        today = _today_msk()
+        today = today_msk()
         await self._user_stat_repo.increment_answer(user_id, is_correct=is_correct, answer_date=today)
 
         answered_ids = await self._user_answer_repo.get_answered_exercise_ids(user_id, category_id)
@@ -52,13 +53,17 @@ class StatsService:
         await self._user_category_stat_repo.increment_answer(
             user_id, category_id, is_correct=is_correct, is_new_exercise=is_new,
         )
+        await self._leaderboard_service.record_answer(user_id, category_id, is_correct=is_correct)
         logger.debug(
             "Stats recorded: user_id={} category_id={} correct={} new_exercise={}",
             user_id, category_id, is_correct, is_new,
         )
 
     async def get_profile_summary(self, user_id: int, full_name: str, registered_at: datetime) -> ProfileSummaryDTO:
-        stat = await self._user_stat_repo.get_or_create(user_id)
+        stat = await self._user_stat_repo.get_by_user_id(user_id) or UserStat(
+            user_id=user_id, total_answered=0, total_correct=0, current_streak=0, max_streak=0,
+            current_daily_streak=0, last_answer_date=None,
+        )
         daily_streak = self._get_actual_daily_streak(stat.current_daily_streak, stat.last_answer_date)
         pct = _percent(stat.total_correct, stat.total_answered)
         return ProfileSummaryDTO(
@@ -72,6 +77,15 @@ class StatsService:
             current_daily_streak=daily_streak,
         )
 
+    async def get_stats_overview(
+        self, user_id: int, full_name: str, registered_at: datetime,
+    ) -> tuple[ProfileSummaryDTO, list[CategoryStatItemDTO]]:
+        """Сводка профиля и статистика по корневым заданиям — параллельно, на отдельных сессиях."""
+        return await self._concurrent_reads.gather(
+            lambda session: self._on_session(session).get_profile_summary(user_id, full_name, registered_at),
+            lambda session: self._on_session(session).get_children_stats(user_id, parent_id=None),
+        )
+
     async def get_children_stats(self, user_id: int, parent_id: int | None) -> list[CategoryStatItemDTO]:
         """Get children of parent with aggregated stats from all leaf descendants."""
         if parent_id is None:
@@ -123,11 +137,21 @@ class StatsService:
         correct = sum(stats_map[lid].total_correct for lid in leaf_ids if lid in stats_map)
         return total, correct
 
+    def _on_session(self, session: ReadSession) -> "StatsService":
+        return StatsService(
+            user_stat_repository=UserStatRepository(session.primary, session),
+            user_category_stat_repository=UserCategoryStatRepository(session.primary, session),
+            category_repository=CategoryRepository(session),
+            user_answer_repository=UserAnswerRepository(session.primary),
+            leaderboard_service=self._leaderboard_service,
+            concurrent_reads=self._concurrent_reads,
+        )
+
     @staticmethod
     def _get_actual_daily_streak(current_daily_streak: int, last_answer_date: date | None) -> int:
         if last_answer_date is None:
             return 0
-        today = _today_msk()
+        today = today_msk()
         delta = (today - last_answer_date).days
         if delta <= 1:
             return current_daily_streak
@@ -2,26 +2,34 @@ from datetime import UTC, datetime
 
 from loguru import logger
 
+from app.config import exam_pool_settings
 from app.exceptions import ExerciseNotFoundError, NoCategoryError, NoHandlerTypeError, UserNotFoundError
-from app.processors import ProcessorFactory
+from app.processors import PooledExamProcessor, ProcessorFactory
 from app.repositories import ExerciseRepository, UserRepository
-from app.schemas import CheckResult, TaskUI, UserWithExercisesDTO
+from app.schemas import CheckResult, ExerciseDTO, TaskUI, UserWithExercisesDTO
 from app.schemas.user_schemas import UserWithCategoryDTO
+from app.services.exam_variant_pool import ExamVariantPool
+from app.services.recent_exercises_service import RecentExercisesService
 from app.services.stats_service import StatsService
 
 
 class TaskService:
     def __init__(
             self,
+            *,
             processor_factory: ProcessorFactory,
             user_repository: UserRepository,
             exercise_repository: ExerciseRepository,
             stats_service: StatsService,
+            recent_exercises: RecentExercisesService,
+            variant_pool: ExamVariantPool,
     ) -> None:
         self._processor_factory = processor_factory
         self._user_repository = user_repository
         self._exercise_repository = exercise_repository
         self._stats_service = stats_service
+        self._recent_exercises = recent_exercises
+        self._variant_pool = variant_pool
 
     async def start_task(self, user: UserWithCategoryDTO) -> TaskUI:
         if not user.current_category:
@@ -33,25 +41,40 @@ class TaskService:
             user.id, user.current_category.name, user.current_category.handler_type,
         )
         processor = self._processor_factory.get_processor(user.current_category.handler_type)
-        task_response = await processor.create_task(user)
+        task_response = None
+        if isinstance(processor, PooledExamProcessor) and exam_pool_settings.ENABLED:
+            task_response = await self._variant_pool.take(user, processor)
+        if task_response is None:
+            task_response = await processor.create_task(user)
 
-        db_user = await self._user_repository.get_by_id_with_exercises(user.id)
+        db_user = await self._user_repository.get_by_id(user.id)
         if not db_user:
             raise UserNotFoundError(user.id)
         exercise_ids = [task_response.exercise_ids] \
             if isinstance(task_response.exercise_ids, int) \
             else task_response.exercise_ids
-        exercises = []
-        for exercise_id in exercise_ids:
-            exercise = await self._exercise_repository.get_by_id(exercise_id)
-            if not exercise:
-                raise ExerciseNotFoundError(exercise_id)
-            exercises.append(exercise)
         now = datetime.now(UTC)
-        db_user.current_exercises = exercises
         db_user.exercise_started_at = now
         db_user.current_task_config = task_response.task_config.model_dump() if task_response.task_config else None
-        await self._user_repository.flush([db_user])
+
+        # Упражнения здесь нужны только ради категорий для буфера recent. Выбранные процессором
+        # лежат в identity map основной сессии, остальные (параллельные чтения) — stub'ы одним запросом
+        exercises_map = {ex.id: ex for ex in self._exercise_repository.get_many_from_cache(exercise_ids)}
+        missing_ids = [eid for eid in exercise_ids if eid not in exercises_map]
+        if missing_ids:
+            exercises_map.update((ex.id, ex) for ex in await self._exercise_repository.get_stubs_by_ids(missing_ids))
+        for exercise_id in exercise_ids:
+            if exercise_id not in exercises_map:
+                raise ExerciseNotFoundError(exercise_id)
+        # Без flush: изменения юзера уйдут в БД одним пакетом на UnitOfWork.commit
+        db_user.current_exercise_ids = exercise_ids
+        user.current_exercise_ids = exercise_ids
+
+        shown_by_category: dict[int, list[int]] = {}
+        for exercise_id in exercise_ids:
+            shown_by_category.setdefault(exercises_map[exercise_id].category_id, []).append(exercise_id)
+        for category_id, shown_ids in shown_by_category.items():
+            await self._recent_exercises.push(user.id, category_id, shown_ids)
 
         logger.info("Task started for user_id={} exercise_ids={}", user.id, exercise_ids)
         return task_response.task_ui
@@ -66,13 +89,14 @@ class TaskService:
         if not user.current_category.handler_type:
             raise NoHandlerTypeError
         processor = self._processor_factory.get_processor(user.current_category.handler_type)
+        await self._load_current_exercises(user, with_explanations=processor.uses_explanations)
         result = await processor.process_answer(user, user_answer)
 
         await self._stats_service.record_answer_stats(
             user_id=user.id,
             category_id=user.current_category.id,
             is_correct=result.is_correct,
-            exercise_ids=[ex.id for ex in (user.current_exercises or [])],
+            exercise_ids=user.current_exercise_ids,
         )
 
         logger.info(
@@ -80,3 +104,10 @@ class TaskService:
             user.id, result.is_correct, user.current_category.name,
         )
         return result
+
+    async def _load_current_exercises(self, user: UserWithExercisesDTO, *, with_explanations: bool) -> None:
+        """Гидратирует текущие упражнения по id: middleware и прочие апдейты их не грузят."""
+        exercises = await self._exercise_repository.get_for_answer_check(
+            user.current_exercise_ids, with_explanations=with_explanations,
+        )
+        user.current_exercises = [ExerciseDTO.from_orm_obj(exercise) for exercise in exercises]
@@ -18,6 +18,9 @@ class UserService:
         self._session = session
         self._user_repository = user_repository
         self._category_repository = category_repository
+        # identity map держит объекты слабо: без этой ссылки select_category и start_task
+        # того же апдейта перечитывали бы юзера из БД
+        self._loaded_user: User | None = None
 
     async def get_user_by_id(self, user_id: int) -> User | None:
         user = await self._user_repository.get_by_id(user_id)
@@ -31,14 +34,15 @@ class UserService:
             tg_username: str | None,
             full_name: str,
     ) -> UserWithExercisesDTO:
-        user = await self._user_repository.get_by_telegram_id_with_exercises(telegram_id)
+        user = await self._user_repository.get_by_telegram_id_with_category(telegram_id)
+        self._loaded_user = user
         if user is None:
             user = await self.create_user(
                 telegram_id=telegram_id,
                 tg_username=tg_username,
                 full_name=full_name,
             )
-            return UserWithExercisesDTO.from_orm_obj(user, load_exercises=False, load_category=False)
+            return UserWithExercisesDTO.from_orm_obj(user, load_category=False)
         is_updated = False
         if user.username != tg_username:
             user.username = tg_username
@@ -74,7 +78,6 @@ class UserService:
         if not db_user:
             raise UserNotFoundError(user.id)
         db_user.current_category_id = category.id
-        await self._session.flush()
 
         user.current_category_id = category.id
         user.current_category = category
@@ -0,0 +1,14 @@
+from datetime import date, datetime, timedelta, timezone
+
+MSK = timezone(timedelta(hours=3))
+
+
+def today_msk() -> date:
+    return datetime.now(MSK).date()
+
+
+def week_start_msk(moment: datetime) -> datetime:
+    """Понедельник 00:00 по МСК недели, в которую попадает moment."""
+    local = moment.astimezone(MSK)
+    monday = local - timedelta(days=local.weekday())
+    return monday.replace(hour=0, minute=0, second=0, microsecond=0)
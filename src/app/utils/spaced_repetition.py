@@ -0,0 +1,58 @@
+"""SM-2: расписание повторений для стратегии `SelectionStrategy.SPACED_REPETITION`.
+
+Состояние памяти по упражнению — число успешных повторений подряд, фактор лёгкости и
+текущий интервал. Верный ответ растягивает интервал (1 день → 6 дней → interval * ease),
+ошибка сбрасывает серию и возвращает упражнение в очередь через `RELEARN_INTERVAL`.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+DEFAULT_EASE_FACTOR = 2.5
+MIN_EASE_FACTOR = 1.3
+FIRST_INTERVAL_DAYS = 1.0
+SECOND_INTERVAL_DAYS = 6.0
+RELEARN_INTERVAL = timedelta(minutes=10)
+
+CORRECT_QUALITY = 4
+WRONG_QUALITY = 1
+_PASS_QUALITY = 3
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    repetitions: int = 0
+    ease_factor: float = DEFAULT_EASE_FACTOR
+    interval_days: float = 0.0
+    lapses: int = 0
+
+
+def review(state: ReviewState, *, is_correct: bool) -> ReviewState:
+    """Возвращает новое состояние памяти после ответа (бинарная оценка: 4 — верно, 1 — ошибка)."""
+    quality = CORRECT_QUALITY if is_correct else WRONG_QUALITY
+    penalty = 5 - quality
+    ease_factor = max(MIN_EASE_FACTOR, state.ease_factor + 0.1 - penalty * (0.08 + penalty * 0.02))
+
+    if quality < _PASS_QUALITY:
+        return ReviewState(
+            repetitions=0,
+            ease_factor=ease_factor,
+            interval_days=RELEARN_INTERVAL / timedelta(days=1),
+            lapses=state.lapses + 1,
+        )
+
+    if state.repetitions == 0:
+        interval_days = FIRST_INTERVAL_DAYS
+    elif state.repetitions == 1:
+        interval_days = SECOND_INTERVAL_DAYS
+    else:
+        interval_days = state.interval_days * state.ease_factor
+    return ReviewState(
+        repetitions=state.repetitions + 1,
+        ease_factor=ease_factor,
+        interval_days=interval_days,
+        lapses=state.lapses,
+    )
+
+
+def next_due_at(state: ReviewState, reviewed_at: datetime) -> datetime:
+    return reviewed_at + timedelta(days=state.interval_days)
@@ -0,0 +1,167 @@
+"""Прогрев процесса до старта polling.
+
+После деплоя первые апдейты платят за холодный старт: пул открывает соединения лениво, кэш
+prepared statements у asyncpg свой на каждом соединении и пуст, а индексы каталога (`CatalogService`)
+строятся на первом задании категории. `warm_up` делает всё это заранее и логирует время этапов;
+`Readiness` поднимает флаг для healthcheck только после прогрева.
+"""
+import asyncio
+import importlib
+import pkgutil
+import time
+from collections.abc import Iterator
+from contextlib import AsyncExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from dishka import AsyncContainer
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.config import database_settings
+from app.database import ReadSession, async_engine, replica_engine
+from app.di import background_request
+from app.processors import ProcessorFactory, selection_repositories
+from app.repositories import (
+    CategoryRepository,
+    UserCategoryStatRepository,
+    UserRepository,
+    UserStatRepository,
+)
+from app.schemas import CategoryDTO
+from app.services.category_service import CategoryService
+from app.services.exercise_selector import STATS_WINDOW_SIZE
+
+# Несуществующий id юзера и категории: serial-ключи начинаются от 1, telegram id положительные
+WARMUP_SENTINEL_ID = 0
+
+
+class Readiness:
+    """Флаг готовности для healthcheck: файл-маркер существует, только пока бот готов принимать апдейты."""
+
+    def __init__(self, marker: Path) -> None:
+        self._marker = marker
+        self._ready = False
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def mark_ready(self) -> None:
+        self._marker.parent.mkdir(parents=True, exist_ok=True)
+        self._marker.touch()
+        self._ready = True
+
+    def mark_not_ready(self) -> None:
+        self._ready = False
+        self._marker.unlink(missing_ok=True)
+
+
+@dataclass
+class WarmupReport:
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total(self) -> float:
+        return sum(self.timings.values())
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    def log(self) -> None:
+        breakdown = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in self.timings.items())
+        logger.info("Warm-up finished in {:.0f}ms: {}", self.total * 1000, breakdown)
+
+
+def import_processor_modules() -> int:
+    """Импортирует все модули процессоров (схемы, форматтеры, индексы); возвращает их число."""
+    package = importlib.import_module("app.processors.tasks")
+    modules = [
+        importlib.import_module(module.name)
+        for module in pkgutil.walk_packages(package.__path__, f"{package.__name__}.")
+    ]
+    return len(modules)
+
+
+async def prime_statements(session: AsyncSession) -> None:
+    """Один раз выполняет горячие запросы репозиториев для несуществующего юзера.
+
+    Строк они не возвращают, но asyncpg готовит statement на соединении сессии, а SQLAlchemy
+    кладёт скомпилированный SQL в кэш — первый настоящий апдейт этого уже не ждёт.
+    """
+    sentinel = WARMUP_SENTINEL_ID
+    read_session = ReadSession(session)
+    category_repository = CategoryRepository(read_session)
+    exercise_repository, answer_repository = selection_repositories(session, read_session)
+
+    await UserRepository(session).get_by_telegram_id_with_category(sentinel)
+    await category_repository.get_roots()
+    await category_repository.get_by_id_with_children(sentinel)
+    await category_repository.get_by_id_with_tree(sentinel)
+    await exercise_repository.get_random_unseen(sentinel, sentinel, limit=1)
+    await exercise_repository.get_for_answer_check([sentinel], with_explanations=True)
+    await answer_repository.get_exercise_stats(sentinel, sentinel, window_size=STATS_WINDOW_SIZE)
+    await answer_repository.get_answered_exercise_ids(sentinel, sentinel)
+    await UserStatRepository(session, read_session).get_by_user_id(sentinel)
+    await UserCategoryStatRepository(session, read_session).get_all_by_user(sentinel)
+
+
+async def load_category_tree(category_service: CategoryService) -> list[CategoryDTO]:
+    """Обходит дерево категорий теми же запросами, что и меню; возвращает все категории."""
+    categories: list[CategoryDTO] = []
+    # Списки сервиса лежат в кэше и общие для всех запросов: обход идёт по копии
+    pending = list(await category_service.get_root_categories())
+    while pending:
+        category = pending.pop()
+        categories.append(category)
+        pending.extend((await category_service.get_by_id_with_children(category.id)).children)
+    return categories
+
+
+async def warm_up_catalog(processor_factory: ProcessorFactory, categories: list[CategoryDTO]) -> None:
+    """Строит индексы каталога, которые процессоры иначе собрали бы на первом задании категории."""
+    for category in categories:
+        if category.handler_type is not None:
+            await processor_factory.get_processor(category.handler_type).warm_up(category)
+
+
+async def _open_connections(stack: AsyncExitStack, engine: AsyncEngine, size: int) -> list[AsyncConnection]:
+    # Соединения держатся открытыми одновременно, иначе пул выдавал бы одно и то же
+    return [await stack.enter_async_context(engine.connect()) for _ in range(size)]
+
+
+async def _prime_connection(connection: AsyncConnection) -> None:
+    async with AsyncSession(bind=connection) as session:
+        await prime_statements(session)
+
+
+async def warm_up(container: AsyncContainer) -> WarmupReport:
+    report = WarmupReport()
+
+    with report.stage("processors"):
+        modules = import_processor_modules()
+    logger.debug("Imported {} processor modules", modules)
+
+    async with AsyncExitStack() as stack:
+        with report.stage("pool"):
+            connections = await _open_connections(stack, async_engine, database_settings.POOL_SIZE)
+            if replica_engine is not None:
+                connections += await _open_connections(stack, replica_engine, database_settings.REPLICA_POOL_SIZE)
+        with report.stage("statements"):
+            await asyncio.gather(*(_prime_connection(connection) for connection in connections))
+
+    async with background_request(container) as request_container:
+        with report.stage("categories"):
+            categories = await load_category_tree(await request_container.get(CategoryService))
+        logger.debug("Loaded {} categories", len(categories))
+
+        with report.stage("catalog"):
+            await warm_up_catalog(await request_container.get(ProcessorFactory), categories)
+
+    report.log()
+    return report
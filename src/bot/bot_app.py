@@ -1,37 +1,61 @@
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.fsm.storage.base import DefaultKeyBuilder
-from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.types import BotCommand
 from dishka import AsyncContainer
 from dishka.integrations.aiogram import setup_dishka
 from loguru import logger
-from redis.asyncio.client import Redis
 
-from app.config import redis_settings, settings
+from app.cache import CacheManager
+from app.config import (
+    duplicate_callback_settings,
+    fsm_storage_settings,
+    scheduler_settings,
+    settings,
+    telegram_session_settings,
+    update_scheduler_settings,
+)
+from app.database import close_db, close_redis, redis_client
+from app.jobs.schedule import build_scheduler
+from bot.callback_datas import SubmitAnswerCallbackData
+from bot.fsm_storage import CompactKeyBuilder, RedisHashStorage
 from bot.handlers import category_router, main_router, profile_router, task_router
-from bot.middlewares import ErrorHandlerMiddleware, MessageManagerMiddleware, UserMiddleware
+from bot.middlewares import (
+    DuplicateCallbackMiddleware,
+    ErrorHandlerMiddleware,
+    MessageManagerMiddleware,
+    UpdateSchedulerMiddleware,
+    UserMiddleware,
+)
+from bot.services.message_manager import BOT_MESSAGES_KEY, USER_MESSAGES_KEY
+from bot.telegram_session import RateLimitedSession
 
 
 async def start_bot(app_container: AsyncContainer) -> None:
-    bot = Bot(token=settings.BOT_TOKEN.get_secret_value(), default=DefaultBotProperties(parse_mode="HTML"))
-    storage = RedisStorage(
-        redis=Redis(
-            host=redis_settings.HOST,
-            port=redis_settings.PORT,
-            username=redis_settings.USERNAME,
-            password=redis_settings.PASSWORD.get_secret_value(),
-            db=redis_settings.DB,
-        ),
-        key_builder=DefaultKeyBuilder(
-            with_destiny=True,
-            with_bot_id=True,
-        ),
+    bot = Bot(
+        token=settings.BOT_TOKEN.get_secret_value(),
+        session=RateLimitedSession() if telegram_session_settings.ENABLED else None,
+        default=DefaultBotProperties(parse_mode="HTML"),
+    )
+    compact = fsm_storage_settings.COMPACT_KEYS
+    storage = RedisHashStorage(
+        redis=redis_client,
+        key_builder=CompactKeyBuilder() if compact else DefaultKeyBuilder(with_destiny=True, with_bot_id=True),
+        idle_ttl=fsm_storage_settings.IDLE_TTL,
+        field_aliases={BOT_MESSAGES_KEY: "b", USER_MESSAGES_KEY: "u"} if compact else None,
     )
     dp = Dispatcher(storage=storage)
+    # Раньше middleware dishka: апдейт ждёт своей очереди, ещё не держа контейнер и сессию
+    dp.update.outer_middleware(UpdateSchedulerMiddleware(
+        update_scheduler_settings.MAX_CONCURRENT_CHATS,
+        coalesce_callbacks=update_scheduler_settings.COALESCE_CALLBACKS,
+    ))
 
     error_middleware = ErrorHandlerMiddleware()
     message_manager_middleware = MessageManagerMiddleware()
+    duplicate_callback_middleware = DuplicateCallbackMiddleware(
+        redis_client, [SubmitAnswerCallbackData], ttl_ms=duplicate_callback_settings.ANSWER_TTL_MS,
+    )
     user_middleware = UserMiddleware()
 
     dp.message.middleware(error_middleware)
@@ -40,6 +64,9 @@ async def start_bot(app_container: AsyncContainer) -> None:
     dp.message.middleware(message_manager_middleware)
     dp.callback_query.middleware(message_manager_middleware)
 
+    # До UserMiddleware: дубль ответа отбрасывается раньше первого запроса в базу
+    dp.callback_query.middleware(duplicate_callback_middleware)
+
     dp.message.middleware(user_middleware)
     dp.callback_query.middleware(user_middleware)
 
@@ -55,10 +82,20 @@ async def start_bot(app_container: AsyncContainer) -> None:
     ]
     await bot.set_my_commands(commands)
 
+    cache_manager = await app_container.get(CacheManager)
+    scheduler = await build_scheduler(app_container) if scheduler_settings.ENABLED else None
     try:
+        await cache_manager.start()
+        if scheduler is not None:
+            scheduler.start()
         logger.info("Bot initialized, starting polling...")
         await dp.start_polling(bot)
     finally:
         logger.info("Shutting down bot...")
+        if scheduler is not None:
+            await scheduler.stop()
+        await cache_manager.stop()
         await app_container.close()
+        await close_redis()
+        await close_db()
         logger.info("Bot stopped")
@@ -1,10 +1,11 @@
 from .category_callback_data import CategoryCallbackData
-from .profile_callback_data import StatsCategoryCallbackData
+from .profile_callback_data import LeaderboardCallbackData, StatsCategoryCallbackData
 from .task_callback_data import GetTaskCallbackData, SubmitAnswerCallbackData
 
 __all__ = [
     "CategoryCallbackData",
     "GetTaskCallbackData",
+    "LeaderboardCallbackData",
     "StatsCategoryCallbackData",
     "SubmitAnswerCallbackData",
 ]
@@ -1,5 +1,12 @@
 from aiogram.filters.callback_data import CallbackData
 
+from app.enums import LeaderboardPeriod
+
 
 class StatsCategoryCallbackData(CallbackData, prefix="sc"):
     category_id: int
+
+
+class LeaderboardCallbackData(CallbackData, prefix="lb"):
+    period: LeaderboardPeriod
+    task_id: int | None = None
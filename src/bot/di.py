@@ -0,0 +1,9 @@
+from dishka import Provider, Scope, provide
+
+from bot.keyboards import CategoryKeyboards
+
+
+class BotProvider(Provider):
+    scope = Scope.REQUEST
+
+    category_keyboards = provide(CategoryKeyboards)
@@ -0,0 +1,154 @@
+"""FSM-хранилище aiogram в Redis-хеше с msgpack-полями.
+
+`RedisStorage` держит данные FSM одной JSON-строкой: каждый `update_data` читает её целиком,
+дописывает и перезаписывает, а ключи без TTL живут вечно. Здесь состояние и данные одного
+чата лежат в одном хеше: поле `STATE_FIELD` — состояние, остальные поля — ключи data, каждое
+значение отдельно упаковано msgpack. `update_data` пишет только переданные поля (HSET) и в том
+же round trip читает итог, любая запись продлевает `idle_ttl` — ключ неактивного юзера истекает.
+
+Сжатие ключей (`CompactKeyBuilder`, `field_aliases`) укорачивает имя хеша и имена полей: на
+миллионе юзеров это десятки мегабайт (см. tests/benchmarks/bench_fsm_storage_memory.py).
+"""
+from collections.abc import Mapping
+from typing import Any, Literal, cast
+
+import msgpack
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import DEFAULT_DESTINY, BaseStorage, KeyBuilder, StateType, StorageKey
+from redis.asyncio.client import Pipeline, Redis
+from redis.typing import EncodableT, FieldT
+
+# Поле состояния; ключи data в коде бота — обычные имена, и «@» среди них не встречается
+STATE_FIELD = "@"
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _base36(value: int) -> str:
+    if value < 0:
+        return "-" + _base36(-value)
+    digits = ""
+    while True:
+        value, remainder = divmod(value, 36)
+        digits = _BASE36[remainder] + digits
+        if not value:
+            return digits
+
+
+class CompactKeyBuilder(KeyBuilder):
+    """`f:<bot>:<chat>[:<thread>]:<user>[:<destiny>]` с id в base36; part не нужен — всё в одном хеше."""
+
+    def __init__(self, prefix: str = "f") -> None:
+        self.prefix = prefix
+
+    def build(self, key: StorageKey, part: Literal["data", "state", "lock"] | None = None) -> str:
+        parts = [self.prefix, _base36(key.bot_id)]
+        if key.business_connection_id:
+            parts.append(key.business_connection_id)
+        parts.append(_base36(key.chat_id))
+        if key.thread_id:
+            parts.append(_base36(key.thread_id))
+        parts.append(_base36(key.user_id))
+        if key.destiny != DEFAULT_DESTINY:
+            parts.append(key.destiny)
+        if part == "lock":
+            parts.append(part)
+        return ":".join(parts)
+
+
+class RedisHashStorage(BaseStorage):
+    def __init__(
+            self,
+            redis: Redis,
+            key_builder: KeyBuilder,
+            *,
+            idle_ttl: int | None = None,
+            field_aliases: Mapping[str, str] | None = None,
+    ) -> None:
+        """`key_builder` вызывается без part: состояние и данные — поля одного хеша.
+
+        `field_aliases` — короткие имена полей в Redis для известных ключей data (`bot_messages` → `b`).
+        """
+        self.redis = redis
+        self.key_builder = key_builder
+        self.idle_ttl = idle_ttl
+        self._to_field = dict(field_aliases or {})
+        self._from_field = {alias: name for name, alias in self._to_field.items()}
+        if len(self._from_field) != len(self._to_field) or STATE_FIELD in self._from_field:
+            msg = "FSM field aliases must be unique and must not clash with the state field"
+            raise ValueError(msg)
+
+    def _key(self, key: StorageKey) -> str:
+        return self.key_builder.build(key)
+
+    def _touch(self, pipe: Pipeline, redis_key: str) -> None:
+        if self.idle_ttl is not None:
+            pipe.expire(redis_key, self.idle_ttl)
+
+    def _decode(self, raw: Mapping[bytes, bytes]) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        for field, value in raw.items():
+            name = field.decode()
+            if name != STATE_FIELD:
+                data[self._from_field.get(name, name)] = msgpack.unpackb(value)
+        return data
+
+    def _encode(self, data: Mapping[str, Any]) -> dict[FieldT, EncodableT]:
+        return {self._to_field.get(name, name): cast("bytes", msgpack.packb(value)) for name, value in data.items()}
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        redis_key = self._key(key)
+        if state is None:
+            await self.redis.hdel(redis_key, STATE_FIELD)
+            return
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(redis_key, STATE_FIELD, cast("str", state.state if isinstance(state, State) else state))
+            self._touch(pipe, redis_key)
+            await pipe.execute()
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        value = await self.redis.hget(self._key(key), STATE_FIELD)
+        if isinstance(value, bytes):
+            return value.decode()
+        return value
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        """Заменяет data целиком; состояние остаётся."""
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+        redis_key = self._key(key)
+        fields = self._encode(data)
+        stale = [
+            field for field in cast("list[bytes]", await self.redis.hkeys(redis_key))
+            if (name := field.decode()) != STATE_FIELD and name not in fields
+        ]
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if stale:
+                pipe.hdel(redis_key, *stale)
+            if fields:
+                pipe.hset(redis_key, mapping=fields)
+                self._touch(pipe, redis_key)
+            await pipe.execute()
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return self._decode(cast("dict[bytes, bytes]", await self.redis.hgetall(self._key(key))))
+
+    async def get_value(self, storage_key: StorageKey, dict_key: str, default: Any | None = None) -> Any | None:  # noqa: ANN401
+        field = self._to_field.get(dict_key, dict_key)
+        value = cast("bytes | None", await self.redis.hget(self._key(storage_key), field))
+        return default if value is None else msgpack.unpackb(value)
+
+    async def update_data(self, key: StorageKey, data: Mapping[str, Any]) -> dict[str, Any]:
+        """Пишет только переданные поля и тем же запросом читает итоговые data."""
+        redis_key = self._key(key)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if data:
+                pipe.hset(redis_key, mapping=self._encode(data))
+                self._touch(pipe, redis_key)
+            pipe.hgetall(redis_key)
+            *_, raw = await pipe.execute()
+        return self._decode(raw)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
@@ -2,15 +2,15 @@ from aiogram import F, Router
 from aiogram.types import CallbackQuery
 from dishka import FromDishka
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import UnitOfWork
 from app.schemas import UserWithExercisesDTO
 from app.services.category_service import CategoryService
 from app.services.task_service import TaskService
 from app.services.user_service import UserService
 from bot.callback_datas import CategoryCallbackData
 from bot.handlers.task_handler import send_new_task
-from bot.keyboards import get_categories_keyboard
+from bot.keyboards import CategoryKeyboards
 from bot.services import MessageManager
 
 router = Router(name="exercise_router")
@@ -20,10 +20,9 @@ router = Router(name="exercise_router")
 async def back_to_main_menu(
         callback_query: CallbackQuery,
         message_manager: MessageManager,
-        category_service: FromDishka[CategoryService],
+        keyboards: FromDishka[CategoryKeyboards],
 ) -> None:
-    categories = await category_service.get_root_categories()
-    await message_manager.edit_message(text="Выберите задание", reply_markup=get_categories_keyboard(categories))
+    await message_manager.edit_message(text="Выберите задание", reply_markup=await keyboards.categories())
     await callback_query.answer()
 
 
@@ -33,22 +32,17 @@ async def category_callback(
         user: UserWithExercisesDTO,
         message_manager: MessageManager,
         callback_data: CategoryCallbackData,
-        session: FromDishka[AsyncSession],
+        uow: FromDishka[UnitOfWork],
         category_service: FromDishka[CategoryService],
+        keyboards: FromDishka[CategoryKeyboards],
         task_service: FromDishka[TaskService],
         user_service: FromDishka[UserService],
 ) -> None:
     logger.debug("User {} selected category_id={}", user.id, callback_data.category_id)
     category = await category_service.get_by_id_with_children(callback_data.category_id)
     if category.children:
-        is_all_button = category.handler_type is not None
         await message_manager.edit_message(
-            text="Выберите подкатегорию",
-            reply_markup=get_categories_keyboard(
-                category.children,
-                current_category_id=category.id if is_all_button else None,
-                back_category_id=category.parent_id or 0,
-            ),
+            text="Выберите подкатегорию", reply_markup=await keyboards.categories(category.id),
         )
     else:
         await message_manager.edit_message(text="Загрузка задания...")
@@ -59,5 +53,5 @@ async def category_callback(
             message_manager=message_manager,
         )
         await message_manager.clear_messages(keep_bot_last=parts_count)
-        await session.commit()
+        await uow.commit()
     await callback_query.answer()
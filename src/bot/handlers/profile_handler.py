@@ -1,15 +1,24 @@
+import html
 from collections.abc import Sequence
+from functools import partial
 
 from aiogram import F, Router
 from aiogram.types import CallbackQuery
 from dishka import FromDishka
 
+from app.enums import LeaderboardPeriod
 from app.schemas import UserWithExercisesDTO
-from app.schemas.stats_schemas import CategoryStatItemDTO, ProfileSummaryDTO
+from app.schemas.stats_schemas import CategoryStatItemDTO, LeaderboardDTO, ProfileSummaryDTO
 from app.services.category_service import CategoryService
+from app.services.leaderboard_service import LeaderboardService
 from app.services.stats_service import StatsService
-from bot.callback_datas import StatsCategoryCallbackData
+from bot.callback_datas import LeaderboardCallbackData, StatsCategoryCallbackData
 from bot.keyboards import (
+    ROOT_CATEGORY_ID,
+    CategoryKeyboards,
+    KeyboardKind,
+    get_ege_task_stats_keyboard,
+    get_leaderboard_keyboard,
     get_profile_keyboard,
     get_stats_back_keyboard,
     get_stats_categories_keyboard,
@@ -76,6 +85,25 @@ def _format_single_stats(name: str, item: CategoryStatItemDTO) -> str:
     return "\n".join(lines)
 
 
+def _format_leaderboard(board: LeaderboardDTO) -> str:
+    period_str = "за неделю" if board.period == LeaderboardPeriod.WEEK else "за всё время"
+    title = f"🏆 <b>Рейтинг {period_str}</b>"
+    if board.task_name:
+        title += f"\n{html.escape(board.task_name)}"
+    lines = [title, ""]
+    lines.extend(
+        f"{entry.rank}. {html.escape(entry.full_name)} — {entry.score}"
+        for entry in board.entries
+    )
+    if not board.entries:
+        lines.append("Пока никто не решал")
+    lines.append("")
+    if board.user_rank is None:
+        lines.append("Вас пока нет в рейтинге")
+    else:
+        lines.append(f"Ваше место: {board.user_rank} (верных: {board.user_score})")
+    return "\n".join(lines)
+
 
 @router.callback_query(F.data == "profile")
 async def show_profile(
@@ -99,15 +127,18 @@ async def show_stats(
     user: UserWithExercisesDTO,
     message_manager: MessageManager,
     stats_service: FromDishka[StatsService],
+    keyboards: FromDishka[CategoryKeyboards],
 ) -> None:
-    summary = await stats_service.get_profile_summary(
+    summary, items = await stats_service.get_stats_overview(
         user_id=user.id,
         full_name=user.full_name,
         registered_at=user.created_at,
     )
-    items = await stats_service.get_children_stats(user.id, parent_id=None)
     text = _format_overview_stats(summary, items)
-    keyboard = get_stats_categories_keyboard(items, back_callback="profile")
+    # Buttons are the root categories: the keyboard does not depend on the user's numbers
+    keyboard = await keyboards.get(
+        ROOT_CATEGORY_ID, KeyboardKind.STATS, lambda: get_stats_categories_keyboard(items, back_callback="profile"),
+    )
     await message_manager.edit_message(text=text, reply_markup=keyboard)
     await callback_query.answer()
 
@@ -120,6 +151,7 @@ async def show_stats_category(
     message_manager: MessageManager,
     stats_service: FromDishka[StatsService],
     category_service: FromDishka[CategoryService],
+    keyboards: FromDishka[CategoryKeyboards],
 ) -> None:
     category = await category_service.get_by_id_with_children(callback_data.category_id)
 
@@ -133,25 +165,45 @@ async def show_stats_category(
         # EGE task — show its aggregated stats, no further buttons
         item = await stats_service.get_category_aggregated_stats(user.id, category.id)
         text = _format_single_stats(category.name, item)
-        keyboard = get_stats_back_keyboard(back_cb)
+        build = partial(get_ege_task_stats_keyboard, category.id, back_cb)
 
     elif not category.children:
         # Leaf non-EGE (edge case) — show its own stats
         item = await stats_service.get_category_aggregated_stats(user.id, category.id)
         text = _format_single_stats(category.name, item)
-        keyboard = get_stats_back_keyboard(back_cb)
+        build = partial(get_stats_back_keyboard, back_cb)
 
     elif all(c.is_ege_task for c in category.children):
         # All children are EGE — terminal view: text only
         items = await stats_service.get_children_stats(user.id, category.id)
         text = _format_stats_list(category.name, items)
-        keyboard = get_stats_back_keyboard(back_cb)
+        build = partial(get_stats_back_keyboard, back_cb)
 
     else:
         # Mix of EGE and non-EGE — show buttons for navigation
         items = await stats_service.get_children_stats(user.id, category.id)
         text = _format_stats_list(category.name, items)
-        keyboard = get_stats_categories_keyboard(items, back_callback=back_cb)
+        build = partial(get_stats_categories_keyboard, items, back_callback=back_cb)
 
+    # The branch and the buttons both follow the category tree, so category_id is a sufficient key
+    keyboard = await keyboards.get(category.id, KeyboardKind.STATS, build)
     await message_manager.edit_message(text=text, reply_markup=keyboard)
     await callback_query.answer()
+
+
+@router.callback_query(LeaderboardCallbackData.filter())
+async def show_leaderboard(
+    callback_query: CallbackQuery,
+    user: UserWithExercisesDTO,
+    callback_data: LeaderboardCallbackData,
+    message_manager: MessageManager,
+    leaderboard_service: FromDishka[LeaderboardService],
+) -> None:
+    board = await leaderboard_service.get_leaderboard(user.id, callback_data.period, callback_data.task_id)
+    if callback_data.task_id is not None:
+        back_cb = StatsCategoryCallbackData(category_id=callback_data.task_id).pack()
+    else:
+        back_cb = "profile"
+    keyboard = get_leaderboard_keyboard(callback_data.period, callback_data.task_id, back_cb)
+    await message_manager.edit_message(text=_format_leaderboard(board), reply_markup=keyboard)
+    await callback_query.answer()
@@ -1,12 +1,15 @@
+import asyncio
+from typing import cast
+
 from aiogram import Router
 from aiogram.types import CallbackQuery, Message
 from dishka import FromDishka
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import UnitOfWork
 from app.exceptions import NoCategoryError, NoHandlerTypeError
 from app.rendering.rich_renderer import RichRenderer
-from app.schemas import CheckResult, UserWithExercisesDTO
+from app.schemas import CategoryDTO, CheckResult, TaskUI, UserWithExercisesDTO
 from app.services.category_service import CategoryService
 from app.services.task_service import TaskService
 from app.services.user_service import UserService
@@ -28,7 +31,7 @@ async def get_task(
         callback_query: CallbackQuery,
         callback_data: GetTaskCallbackData,
         message_manager: MessageManager,
-        session: FromDishka[AsyncSession],
+        uow: FromDishka[UnitOfWork],
         task_service: FromDishka[TaskService],
         user_service: FromDishka[UserService],
         category_service: FromDishka[CategoryService],
@@ -43,17 +46,26 @@ async def get_task(
         message_manager=message_manager,
     )
     await message_manager.clear_messages(keep_bot_last=parts_count)
-    await session.commit()
+    await uow.commit()
     await callback_query.answer()
 
 
 async def send_new_task(user: UserWithExercisesDTO, task_service: TaskService, message_manager: MessageManager) -> int:
+    task = await _select_task(user, task_service)
+    return await _send_task(user, task, message_manager)
+
+
+async def _select_task(user: UserWithExercisesDTO, task_service: TaskService) -> TaskUI:
     if not user.current_category:
         raise NoCategoryError
     if not user.current_category.handler_type:
         raise NoHandlerTypeError
-    task = await task_service.start_task(user)
-    back_category_id = user.current_category.parent_id or 0
+    return await task_service.start_task(user)
+
+
+async def _send_task(user: UserWithExercisesDTO, task: TaskUI, message_manager: MessageManager) -> int:
+    # Категорию уже проверил _select_task
+    back_category_id = cast("CategoryDTO", user.current_category).parent_id or 0
     keyboard = get_task_options_keyboard(
         task.options,
         back_category_id=back_category_id,
@@ -63,21 +75,43 @@ async def send_new_task(user: UserWithExercisesDTO, task_service: TaskService, m
     return 1
 
 
+async def _send_result_and_next_task(
+        user: UserWithExercisesDTO,
+        result: CheckResult,
+        task_service: TaskService,
+        message_manager: MessageManager,
+) -> None:
+    """Следующее задание выбирается в базе, пока результат уходит в Telegram.
+
+    Выбор не зависит от отправки, так что ответ юзеру ждёт max(Telegram, БД), а не их сумму.
+    Задание отправляется только после результата — порядок сообщений в чате прежний.
+    """
+    selection = asyncio.create_task(_select_task(user, task_service))
+    try:
+        await _send_check_result(message_manager, result)
+    except BaseException:
+        selection.cancel()
+        await asyncio.gather(selection, return_exceptions=True)
+        raise
+    await _send_task(user, await selection, message_manager)
+
+
 @router.callback_query(SubmitAnswerCallbackData.filter())
 async def submit_answer_button(
         callback_query: CallbackQuery,
         user: UserWithExercisesDTO,
         callback_data: SubmitAnswerCallbackData,
         message_manager: MessageManager,
-        session: FromDishka[AsyncSession],
+        uow: FromDishka[UnitOfWork],
         task_service: FromDishka[TaskService],
 ) -> None:
     await message_manager.clear_messages(keep_bot_last=1)
     logger.debug("User {} submitted button answer: '{}'", user.id, callback_data.answer)
     result = await task_service.check_answer(user, callback_data.answer)
-    await _send_check_result(message_manager, result)
-    await send_new_task(user, task_service, message_manager)
-    await session.commit()
+    # Выбор следующего задания должен видеть этот ответ: непросмотренные и расписание SM-2
+    await uow.flush()
+    await _send_result_and_next_task(user, result, task_service, message_manager)
+    await uow.commit()
     await callback_query.answer()
 
 
@@ -86,10 +120,10 @@ async def submit_answer(
         message: Message,
         user: UserWithExercisesDTO,
         message_manager: MessageManager,
-        session: FromDishka[AsyncSession],
+        uow: FromDishka[UnitOfWork],
         task_service: FromDishka[TaskService],
 ) -> None:
-    if not user.current_exercises:
+    if not user.current_exercise_ids:
         await message_manager.send_message(text="У вас нет активных заданий. Выберите категорию, чтобы начать.")
         return
     if message.text is None:
@@ -98,6 +132,6 @@ async def submit_answer(
     await message_manager.clear_messages(keep_bot_last=1)
     logger.debug("User {} submitted text answer: '{}'", user.id, message.text)
     result = await task_service.check_answer(user, message.text)
-    await _send_check_result(message_manager, result)
-    await send_new_task(user, task_service, message_manager)
-    await session.commit()
+    await uow.flush()
+    await _send_result_and_next_task(user, result, task_service, message_manager)
+    await uow.commit()
@@ -1,6 +1,9 @@
 from .category_keyboards import get_categories_keyboard
+from .keyboard_cache import ROOT_CATEGORY_ID, CategoryKeyboards, KeyboardKind
 from .main_keyboards import MAIN_KB, get_back_keyboard
 from .profile_keyboards import (
+    get_ege_task_stats_keyboard,
+    get_leaderboard_keyboard,
     get_profile_keyboard,
     get_stats_back_keyboard,
     get_stats_categories_keyboard,
@@ -9,8 +12,13 @@ from .task_keyboards import get_task_options_keyboard
 
 __all__ = [
     "MAIN_KB",
+    "ROOT_CATEGORY_ID",
+    "CategoryKeyboards",
+    "KeyboardKind",
     "get_back_keyboard",
     "get_categories_keyboard",
+    "get_ege_task_stats_keyboard",
+    "get_leaderboard_keyboard",
     "get_profile_keyboard",
     "get_stats_back_keyboard",
     "get_stats_categories_keyboard",
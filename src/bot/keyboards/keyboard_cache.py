@@ -0,0 +1,64 @@
+"""Клавиатуры навигации по дереву категорий, собранные один раз на версию дерева.
+
+Разметка с упакованными CallbackData зависит только от дерева категорий, а оно меняется лишь
+правками админа. Готовые `InlineKeyboardMarkup` лежат в первом уровне пространства кэша
+`categories` под ключом (category_id, вид, вариант), поэтому `invalidate_cache categories`
+сбрасывает их вместе с деревом. В Redis они не уходят: собрать разметку дешевле, чем прочитать.
+"""
+from collections.abc import Callable
+from enum import StrEnum
+
+from aiogram.types import InlineKeyboardMarkup
+
+from app.cache import Cache, CacheManager
+from app.services.category_service import CATEGORIES_NAMESPACE, CategoryService
+from bot.keyboards.category_keyboards import get_categories_keyboard
+
+# category_id корня дерева: меню «Выберите задание» и обзор статистики
+ROOT_CATEGORY_ID = 0
+
+
+class KeyboardKind(StrEnum):
+    CATEGORIES = "categories"
+    STATS = "stats"
+
+
+class CategoryKeyboards:
+    def __init__(self, category_service: CategoryService, cache_manager: CacheManager) -> None:
+        self._category_service = category_service
+        # Только первый уровень процесса: в Redis клавиатуры не пишутся, сериализатор не нужен
+        self._keyboards: Cache[InlineKeyboardMarkup] = cache_manager.namespace(CATEGORIES_NAMESPACE).cache(
+            "keyboards", None, local_ttl=None, remote_ttl=None,
+        )
+
+    async def get(
+            self,
+            category_id: int,
+            kind: KeyboardKind,
+            build: Callable[[], InlineKeyboardMarkup],
+            variant: str = "",
+    ) -> InlineKeyboardMarkup:
+        """Клавиатура из кэша или build(); build обязан зависеть только от дерева и ключа.
+
+        Разметка общая для всех апдейтов: менять её после получения нельзя.
+        """
+        async def load() -> InlineKeyboardMarkup:
+            return build()
+
+        return await self._keyboards.get_or_load(f"{category_id}:{kind}:{variant}", load)
+
+    async def categories(self, category_id: int = ROOT_CATEGORY_ID) -> InlineKeyboardMarkup:
+        """Подкатегории категории (с «Все», если по ней есть задания) или корневые категории."""
+        return await self._keyboards.get_or_load(
+            f"{category_id}:{KeyboardKind.CATEGORIES}:", lambda: self._build_categories(category_id),
+        )
+
+    async def _build_categories(self, category_id: int) -> InlineKeyboardMarkup:
+        if category_id == ROOT_CATEGORY_ID:
+            return get_categories_keyboard(await self._category_service.get_root_categories())
+        category = await self._category_service.get_by_id_with_children(category_id)
+        return get_categories_keyboard(
+            category.children,
+            current_category_id=category.id if category.handler_type is not None else None,
+            back_category_id=category.parent_id or 0,
+        )
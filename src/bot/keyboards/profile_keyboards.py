@@ -4,13 +4,18 @@ from typing import cast
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.enums import LeaderboardPeriod
 from app.schemas.stats_schemas import CategoryStatItemDTO
-from bot.callback_datas import StatsCategoryCallbackData
+from bot.callback_datas import LeaderboardCallbackData, StatsCategoryCallbackData
 
 
 def get_profile_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="📊 Статистика", callback_data="profile_stats")],
+        [InlineKeyboardButton(
+            text="🏆 Рейтинг",
+            callback_data=LeaderboardCallbackData(period=LeaderboardPeriod.WEEK).pack(),
+        )],
         [InlineKeyboardButton(text="⬅️ Назад", callback_data="main")],
     ])
 
@@ -37,3 +42,31 @@ def get_stats_back_keyboard(back_callback: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="⬅️ Назад", callback_data=back_callback)],
     ])
+
+
+def get_ege_task_stats_keyboard(task_id: int, back_callback: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(
+            text="🏆 Рейтинг по заданию",
+            callback_data=LeaderboardCallbackData(period=LeaderboardPeriod.WEEK, task_id=task_id).pack(),
+        )],
+        [InlineKeyboardButton(text="⬅️ Назад", callback_data=back_callback)],
+    ])
+
+
+def get_leaderboard_keyboard(
+    period: LeaderboardPeriod,
+    task_id: int | None,
+    back_callback: str,
+) -> InlineKeyboardMarkup:
+    if period == LeaderboardPeriod.WEEK:
+        switch_text, switch_period = "🏆 За всё время", LeaderboardPeriod.ALL_TIME
+    else:
+        switch_text, switch_period = "📅 За неделю", LeaderboardPeriod.WEEK
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(
+            text=switch_text,
+            callback_data=LeaderboardCallbackData(period=switch_period, task_id=task_id).pack(),
+        )],
+        [InlineKeyboardButton(text="⬅️ Назад", callback_data=back_callback)],
+    ])
@@ -1,9 +1,13 @@
+from .duplicate_callback_middleware import DuplicateCallbackMiddleware
 from .error_handler_middleware import ErrorHandlerMiddleware
 from .message_manager_middleware import MessageManagerMiddleware
+from .update_scheduler_middleware import UpdateSchedulerMiddleware
 from .user_middleware import UserMiddleware
 
 __all__ = [
+    "DuplicateCallbackMiddleware",
     "ErrorHandlerMiddleware",
     "MessageManagerMiddleware",
+    "UpdateSchedulerMiddleware",
     "UserMiddleware",
 ]
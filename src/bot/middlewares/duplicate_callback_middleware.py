@@ -0,0 +1,83 @@
+"""Отсечение повторных нажатий кнопок ответа до любой работы с базой.
+
+Двойное нажатие кнопки варианта ответа дало бы два `check_answer`: две строки UserAnswer, двойной
+счёт в статистике и два подбора следующего задания. Первое нажатие занимает в Redis ключ
+(чат, сообщение, callback data) через `SET NX PX`; пока ключ жив, то же нажатие — с этого или
+другого воркера — только гасит часики на кнопке. Если обработчик упал, ключ снимается, чтобы юзер
+мог повторить. Middleware стоит раньше UserMiddleware: дубль не доходит даже до загрузки юзера.
+"""
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.exceptions import TelegramAPIError
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import CallbackQuery, TelegramObject
+from loguru import logger
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.metrics import counter
+
+KEY_PREFIX = "dedup"
+
+duplicate_callbacks_suppressed = counter(
+    "duplicate_callbacks_suppressed_total", "Repeated answer taps dropped before any DB work", ("prefix",),
+)
+
+
+class DuplicateCallbackMiddleware(BaseMiddleware):
+    def __init__(self, redis: Redis, callback_types: Iterable[type[CallbackData]], *, ttl_ms: int) -> None:
+        super().__init__()
+        self._redis = redis
+        self._prefixes = tuple(f"{cb.__prefix__}{cb.__separator__}" for cb in callback_types)
+        self._ttl_ms = ttl_ms
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: dict[str, Any],
+    ) -> Any:  # noqa: ANN401
+        if not isinstance(event, CallbackQuery) or not event.data or not event.data.startswith(self._prefixes):
+            return await handler(event, data)
+
+        key = self._key(event)
+        try:
+            acquired = await self._redis.set(key, 1, nx=True, px=self._ttl_ms)
+        except RedisError as e:
+            # Без Redis лучше рискнуть дублем, чем не принять ответ
+            logger.warning("Duplicate callback guard unavailable: {}", e)
+            return await handler(event, data)
+        if not acquired:
+            duplicate_callbacks_suppressed.inc(prefix=event.data.split(":", 1)[0])
+            logger.debug("Suppressed duplicate callback {!r} from chat {}", event.data, self._chat_id(event))
+            await self._answer(data["bot"], event)
+            return None
+
+        try:
+            return await handler(event, data)
+        except BaseException:
+            await self._release(key)
+            raise
+
+    def _key(self, event: CallbackQuery) -> str:
+        message_id = event.message.message_id if event.message else event.inline_message_id
+        return f"{KEY_PREFIX}:{self._chat_id(event)}:{message_id}:{event.data}"
+
+    @staticmethod
+    def _chat_id(event: CallbackQuery) -> int:
+        return event.message.chat.id if event.message else event.from_user.id
+
+    async def _release(self, key: str) -> None:
+        try:
+            await self._redis.delete(key)
+        except RedisError as e:
+            logger.warning("Could not release duplicate callback guard {}: {}", key, e)
+
+    @staticmethod
+    async def _answer(bot: Bot, event: CallbackQuery) -> None:
+        try:
+            await bot.answer_callback_query(event.id)
+        except TelegramAPIError as e:
+            logger.debug("Could not answer a duplicate callback query: {}", e)
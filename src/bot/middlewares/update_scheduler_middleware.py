@@ -0,0 +1,133 @@
+"""Очередь апдейтов по чатам поверх polling aiogram.
+
+aiogram запускает задачу на каждый апдейт без ограничений: десяток быстрых нажатий одного юзера
+обрабатываются одновременно и вперемешку, а тысяча юзеров разом выстраивается в очередь за
+соединениями пула. Middleware на `dp.update` (outer, до dishka — соединение ещё не взято) держит
+FIFO на чат: следующий апдейт чата стартует, только когда закончился предыдущий, а обработчики
+разных чатов идут параллельно, не больше `max_concurrent_chats` сразу. Повторное нажатие той же
+кнопки, пока первое ещё в очереди чата, отбрасывается.
+"""
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, cast
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery, Chat, TelegramObject, Update, User
+from loguru import logger
+
+from app.metrics import counter, gauge
+
+update_queue_depth = gauge("update_queue_depth", "Updates accepted but not yet running a handler")
+updates_in_progress = gauge("updates_in_progress", "Updates running a handler")
+updates_coalesced = counter("updates_coalesced_total", "Repeated button taps dropped while the first was queued")
+
+type CallbackKey = tuple[int | str | None, str]
+
+
+@dataclass(slots=True)
+class _Pending:
+    turn: asyncio.Future[None]
+    callback_key: CallbackKey | None
+
+
+def _callback_key(update: Update) -> CallbackKey | None:
+    callback_query = update.callback_query
+    if callback_query is None or callback_query.data is None:
+        return None
+    message_id = callback_query.message.message_id if callback_query.message else callback_query.inline_message_id
+    return message_id, callback_query.data
+
+
+class UpdateSchedulerMiddleware(BaseMiddleware):
+    def __init__(self, max_concurrent_chats: int, *, coalesce_callbacks: bool = True) -> None:
+        super().__init__()
+        self._semaphore = asyncio.Semaphore(max_concurrent_chats)
+        self._coalesce_callbacks = coalesce_callbacks
+        self._queues: dict[int, deque[_Pending]] = {}
+        self._waiting = 0
+
+    @property
+    def depth(self) -> int:
+        """Апдейты, которые ждут своей очереди в чате или свободного слота."""
+        return self._waiting
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: dict[str, Any],
+    ) -> Any:  # noqa: ANN401
+        chat: Chat | None = data.get("event_chat")
+        user: User | None = data.get("event_from_user")
+        chat_id = chat.id if chat is not None else user.id if user is not None else None
+        if chat_id is None or not isinstance(event, Update):
+            return await self._run(handler, event, data)
+
+        queue = self._queues.setdefault(chat_id, deque())
+        callback_key = _callback_key(event) if self._coalesce_callbacks else None
+        if callback_key is not None and any(pending.callback_key == callback_key for pending in queue):
+            updates_coalesced.inc()
+            logger.debug("Dropping repeated tap in chat {}: {}", chat_id, callback_key[1])
+            await self._answer_dropped(event, data)
+            return None
+
+        pending = _Pending(asyncio.get_running_loop().create_future(), callback_key)
+        queue.append(pending)
+        if len(queue) == 1:
+            pending.turn.set_result(None)
+        try:
+            await self._wait_turn(pending.turn)
+            return await self._run(handler, event, data, acquired=True)
+        finally:
+            self._leave(chat_id, queue, pending)
+
+    async def _wait_turn(self, turn: asyncio.Future[None]) -> None:
+        """Ждёт, пока закончатся апдейты чата перед этим, и занимает слот семафора."""
+        self._set_waiting(1)
+        try:
+            await turn
+            await self._semaphore.acquire()
+        finally:
+            self._set_waiting(-1)
+
+    async def _run(
+            self,
+            handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: dict[str, Any],
+            *,
+            acquired: bool = False,
+    ) -> Any:  # noqa: ANN401
+        if not acquired:
+            await self._semaphore.acquire()
+        updates_in_progress.inc()
+        try:
+            return await handler(event, data)
+        finally:
+            updates_in_progress.dec()
+            self._semaphore.release()
+
+    def _leave(self, chat_id: int, queue: deque[_Pending], pending: _Pending) -> None:
+        was_head = queue[0] is pending
+        queue.remove(pending)
+        if not queue:
+            del self._queues[chat_id]
+        elif was_head:
+            queue[0].turn.set_result(None)
+
+    def _set_waiting(self, delta: int) -> None:
+        self._waiting += delta
+        update_queue_depth.set(self._waiting)
+
+    @staticmethod
+    async def _answer_dropped(update: Update, data: dict[str, Any]) -> None:
+        # Без ответа на кнопке юзера до таймаута крутятся часики
+        bot: Bot = data["bot"]
+        callback_query = cast("CallbackQuery", update.callback_query)
+        try:
+            await bot.answer_callback_query(callback_query.id)
+        except TelegramAPIError as e:
+            logger.debug("Could not answer a dropped callback query: {}", e)
@@ -10,6 +10,9 @@ from aiogram.types import CallbackQuery, InputRichMessage, Message, ReplyMarkupU
 
 _user_locks = defaultdict(asyncio.Lock)
 
+BOT_MESSAGES_KEY = "bot_messages"
+USER_MESSAGES_KEY = "user_messages"
+
 
 class MessageManager:
     def __init__(self, bot: Bot, chat_id: int, state: FSMContext, message: Message) -> None:
@@ -19,8 +22,8 @@ class MessageManager:
         self.message = message
         self._lock = _user_locks[chat_id]
 
-        self._bot_messages_key = "bot_messages"
-        self._user_messages_key = "user_messages"
+        self._bot_messages_key = BOT_MESSAGES_KEY
+        self._user_messages_key = USER_MESSAGES_KEY
 
     @classmethod
     async def from_message(cls, bot: Bot, message: Message, state: FSMContext) -> Self:
@@ -154,14 +157,15 @@ class MessageManager:
     async def _load_data(self) -> dict:
         return await self.state.get_data()
 
-    async def _save_data(self, data: dict) -> None:
-        await self.state.update_data(data)
+    async def _save_data(self, data: dict, *keys: str) -> None:
+        """Сохраняет data; с keys — только эти поля (хранилище пишет их по отдельности)."""
+        await self.state.update_data({key: data[key] for key in keys} if keys else data)
 
     async def add_bot_message(self, message_id: int) -> None:
         async with self._lock:
             data = await self._load_data()
             self._add_bot_message(message_id, data)
-            await self._save_data(data)
+            await self._save_data(data, self._bot_messages_key)
 
     def _add_bot_message(self, message_id: int, data: dict) -> None:
         bot_messages = self._get_bot_messages(data)
@@ -172,7 +176,7 @@ class MessageManager:
         async with self._lock:
             data = await self._load_data()
             self._add_user_message(message_id, data)
-            await self._save_data(data)
+            await self._save_data(data, self._user_messages_key)
 
     def _add_user_message(self, message_id: int, data: dict) -> None:
         user_messages = self._get_user_messages(data)
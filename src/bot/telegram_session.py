@@ -0,0 +1,317 @@
+"""Сессия Bot API с ограничением частоты запросов и приоритетами.
+
+Под нагрузкой цепочки вида «удалить старые сообщения по одному + send_rich + edit» упираются
+в лимиты Telegram, и 429 роняет апдейт целиком. `RateLimitedSession` оборачивает обычную
+сессию aiogram: запрос к чату сначала берёт токен из ведра бота и ведра своего чата (у групп
+своё, более медленное), а ждущие токена запросы выходят по полосам — ответы юзеру раньше
+удалений, удаления раньше рассылок. На 429 ведро чата замирает на retry_after, и запрос
+повторяется сам. Запросы без чата (getUpdates, answerCallbackQuery) идут мимо очереди.
+"""
+import asyncio
+import math
+import time
+from collections.abc import AsyncGenerator, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import DeleteMessage, DeleteMessages, TelegramMethod
+from aiogram.methods.base import TelegramType
+from loguru import logger
+
+from app.config import telegram_session_settings
+from app.metrics import counter, gauge
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+type ChatId = int | str
+
+# Сколько вёдер чатов держать, прежде чем выбросить полные (простаивающие)
+MAX_IDLE_BUCKETS = 10_000
+
+telegram_requests = counter("telegram_requests_total", "Bot API requests that passed the rate limiter", ("lane",))
+telegram_queue_wait = counter(
+    "telegram_queue_wait_seconds_total", "Time requests spent waiting for a rate limit token", ("lane",),
+)
+telegram_queue_depth = gauge("telegram_queue_depth", "Requests waiting for a rate limit token", ("lane",))
+telegram_retry_after = counter("telegram_retry_after_total", "429 responses that paused a bucket", ("method",))
+
+
+class Lane(IntEnum):
+    """Полосы очереди: меньшее значение выходит раньше."""
+    INTERACTIVE = 0
+    CLEANUP = 1
+    BULK = 2
+
+
+_lane: ContextVar[Lane | None] = ContextVar("telegram_lane", default=None)
+
+
+@contextmanager
+def send_lane(lane: Lane) -> Iterator[None]:
+    """Запросы внутри блока идут по полосе `lane`, например рассылка — по BULK."""
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def lane_of(method: TelegramMethod[Any]) -> Lane:
+    lane = _lane.get()
+    if lane is not None:
+        return lane
+    if isinstance(method, DeleteMessage | DeleteMessages):
+        return Lane.CLEANUP
+    return Lane.INTERACTIVE
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "paused_until", "rate", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: int, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+        self.paused_until = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Через сколько секунд будет токен; 0 — есть сейчас."""
+        if self.paused_until > now:
+            return self.paused_until - now
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def pause(self, until: float) -> None:
+        self.paused_until = max(self.paused_until, until)
+
+    def is_idle(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity and self.paused_until <= now
+
+
+@dataclass(order=True)
+class _Waiter:
+    lane: Lane
+    seq: int
+    chat_id: ChatId = field(compare=False)
+    future: asyncio.Future[None] = field(compare=False)
+
+
+class RateLimiter:
+    """Ведро на бота и по ведру на чат; ждущие запросы выходят в порядке (полоса, очередь).
+
+    Очередь не блокируется головой: если первому ждущему не хватает токена его чата, токен бота
+    достаётся следующему, чей чат свободен.
+    """
+
+    def __init__(
+            self,
+            *,
+            global_rate: float,
+            global_burst: int,
+            chat_rate: float,
+            chat_burst: int,
+            group_rate: float,
+            group_burst: int,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._global = TokenBucket(global_rate, global_burst, clock())
+        self._chat_limits = (chat_rate, chat_burst)
+        self._group_limits = (group_rate, group_burst)
+        self._chats: dict[ChatId, TokenBucket] = {}
+        self._waiters: list[_Waiter] = []
+        self._depth = dict.fromkeys(Lane, 0)
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._pump: asyncio.Task[None] | None = None
+
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        settings = telegram_session_settings
+        return cls(
+            global_rate=settings.GLOBAL_RATE,
+            global_burst=settings.GLOBAL_BURST,
+            chat_rate=settings.CHAT_RATE,
+            chat_burst=settings.CHAT_BURST,
+            group_rate=settings.GROUP_RATE,
+            group_burst=settings.GROUP_BURST,
+        )
+
+    def _bucket(self, chat_id: ChatId, now: float) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= MAX_IDLE_BUCKETS:
+                self._chats = {key: b for key, b in self._chats.items() if not b.is_idle(now)}
+            # Отрицательные id и @username — группы и каналы
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            rate, burst = self._group_limits if is_group else self._chat_limits
+            bucket = self._chats[chat_id] = TokenBucket(rate, burst, now)
+        return bucket
+
+    def depth(self, lane: Lane | None = None) -> int:
+        return sum(self._depth.values()) if lane is None else self._depth[lane]
+
+    async def acquire(self, chat_id: ChatId, lane: Lane) -> float:
+        """Ждёт токены бота и чата; возвращает, сколько секунд ждал."""
+        started = self._clock()
+        if not self._waiters and self._try_take(chat_id, started):
+            return 0.0
+        self._seq += 1
+        waiter = _Waiter(lane, self._seq, chat_id, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self._set_depth(lane, 1)
+        self._wake()
+        try:
+            await waiter.future
+        finally:
+            self._set_depth(lane, -1)
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return self._clock() - started
+
+    def pause(self, chat_id: ChatId | None, seconds: float) -> None:
+        """retry_after от Telegram: ведро чата (или всего бота) замирает на `seconds`."""
+        now = self._clock()
+        bucket = self._global if chat_id is None else self._bucket(chat_id, now)
+        bucket.pause(now + seconds)
+        self._wake()
+
+    async def close(self) -> None:
+        if self._pump is not None:
+            self._pump.cancel()
+            await asyncio.gather(self._pump, return_exceptions=True)
+            self._pump = None
+
+    def _try_take(self, chat_id: ChatId, now: float) -> bool:
+        chat = self._bucket(chat_id, now)
+        if self._global.wait_time(now) > 0 or chat.wait_time(now) > 0:
+            return False
+        self._global.take(now)
+        chat.take(now)
+        return True
+
+    def _set_depth(self, lane: Lane, delta: int) -> None:
+        self._depth[lane] += delta
+        telegram_queue_depth.set(self._depth[lane], lane=lane.name.lower())
+
+    def _wake(self) -> None:
+        self._wakeup.set()
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.create_task(self._run(), name="telegram-rate-limiter")
+
+    def _grant(self) -> float:
+        """Выпускает всех, кому хватает токенов; возвращает, через сколько проверить снова."""
+        now = self._clock()
+        next_check = math.inf
+        for waiter in sorted(self._waiters):
+            if waiter.future.done():
+                self._waiters.remove(waiter)
+                continue
+            global_wait = self._global.wait_time(now)
+            if global_wait > 0:
+                return min(next_check, global_wait)
+            chat = self._bucket(waiter.chat_id, now)
+            chat_wait = chat.wait_time(now)
+            if chat_wait > 0:
+                next_check = min(next_check, chat_wait)
+                continue
+            self._global.take(now)
+            chat.take(now)
+            self._waiters.remove(waiter)
+            waiter.future.set_result(None)
+        return next_check
+
+    async def _run(self) -> None:
+        while self._waiters:
+            self._wakeup.clear()
+            next_check = self._grant()
+            if not self._waiters:
+                break
+            try:
+                async with asyncio.timeout(None if math.isinf(next_check) else next_check):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+
+
+class RateLimitedSession(BaseSession):
+    """Обёртка над сессией aiogram: лимиты и повтор после 429 до запроса во внутреннюю сессию."""
+
+    def __init__(
+            self,
+            session: BaseSession | None = None,
+            limiter: RateLimiter | None = None,
+            *,
+            max_retries: int = telegram_session_settings.MAX_RETRIES,
+            max_retry_after: float = telegram_session_settings.MAX_RETRY_AFTER,
+    ) -> None:
+        self.session = session or AiohttpSession()
+        super().__init__(
+            api=self.session.api,
+            json_loads=self.session.json_loads,
+            json_dumps=self.session.json_dumps,
+            timeout=self.session.timeout,
+        )
+        self.limiter = limiter or RateLimiter.from_settings()
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+
+    async def make_request(
+            self,
+            bot: "Bot",
+            method: TelegramMethod[TelegramType],
+            timeout: int | None = None,  # noqa: ASYNC109
+    ) -> TelegramType:
+        chat_id: ChatId | None = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await self.session.make_request(bot, method, timeout)
+        lane = lane_of(method)
+        label = lane.name.lower()
+        attempt = 0
+        while True:
+            waited = await self.limiter.acquire(chat_id, lane)
+            telegram_requests.inc(lane=label)
+            telegram_queue_wait.inc(waited, lane=label)
+            try:
+                return await self.session.make_request(bot, method, timeout)
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries or e.retry_after > self.max_retry_after:
+                    raise
+                attempt += 1
+                telegram_retry_after.inc(method=type(method).__name__)
+                logger.warning(
+                    "Flood control on {} in chat {}: retrying in {}s", type(method).__name__, chat_id, e.retry_after,
+                )
+                self.limiter.pause(chat_id, e.retry_after)
+
+    async def stream_content(
+            self,
+            url: str,
+            headers: dict[str, Any] | None = None,
+            timeout: int = 30,  # noqa: ASYNC109
+            chunk_size: int = 65536,
+            raise_for_status: bool = True,  # noqa: FBT001, FBT002
+    ) -> AsyncGenerator[bytes]:
+        async for chunk in self.session.stream_content(url, headers, timeout, chunk_size, raise_for_status):
+            yield chunk
+
+    async def close(self) -> None:
+        await self.limiter.close()
+        await self.session.close()
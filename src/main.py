@@ -1,20 +1,40 @@
 import asyncio
 
 from dishka import make_async_container
+from dishka.integrations.aiogram import AiogramProvider
 from loguru import logger
 
-from app.config import setup_logging
+from app.config import settings, setup_logging
 from app.di import AppProvider
+from app.metrics import start_metrics_server
+from app.warmup import Readiness, warm_up
 from bot import start_bot
+from bot.di import BotProvider
 
 
 async def main() -> None:
     setup_logging()
     logger.info("Application starting...")
 
-    container = make_async_container(AppProvider())
-
-    await start_bot(app_container=container)
+    readiness = Readiness(settings.READY_FILE)
+    # маркер мог остаться от прошлого запуска, упавшего без finally
+    readiness.mark_not_ready()
+
+    container = make_async_container(AppProvider(), BotProvider(), AiogramProvider())
+    metrics_runner = None
+    if settings.METRICS_PORT is not None:
+        metrics_runner = await start_metrics_server(
+            settings.METRICS_HOST, settings.METRICS_PORT, lambda: readiness.is_ready,
+        )
+
+    try:
+        await warm_up(container)
+        readiness.mark_ready()
+        await start_bot(app_container=container)
+    finally:
+        readiness.mark_not_ready()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
 
 
 if __name__ == "__main__":
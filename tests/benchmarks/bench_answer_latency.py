@@ -0,0 +1,98 @@
+"""Задержка ответа на задание: результат и выбор следующего задания по очереди против параллельно.
+
+Запуск:
+    PYTHONPATH=src python -m tests.benchmarks.bench_answer_latency [telegram_ms] [db_ms]
+
+Отправка сообщения и выбор задания в базе заменены ожиданием заданной длительности, так что
+цифры показывают только выигрыш от перекрытия. «до» — прежняя последовательность обработчика:
+`_send_check_result`, затем `send_new_task`; «после» — `_send_result_and_next_task`. Время —
+от проверки ответа до отправки следующего задания, среднее по ANSWERS ответам.
+"""
+import asyncio
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+os.environ.setdefault("BOT_TOKEN", "bench")
+os.environ.setdefault("DB_NAME", "bench")
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASS", "bench")
+os.environ.setdefault("REDIS_PASSWORD", "bench")
+
+from aiogram.types import InlineKeyboardMarkup
+
+from app.enums import HandlerType
+from app.schemas import CategoryDTO, CheckResult, ResultView, TaskOption, TaskUI, TaskView, UserWithExercisesDTO
+from bot.handlers.task_handler import _send_check_result, _send_result_and_next_task, send_new_task
+
+ANSWERS = 20
+TELEGRAM_MS = 150
+DB_MS = 60
+
+USER = UserWithExercisesDTO(
+    id=1, telegram_id=1, username=None, full_name="Bench", exercise_started_at=None,
+    current_category=CategoryDTO(id=2, name="Задание 1", handler_type=HandlerType.TASK_1_DRILL, parent_id=1),
+)
+RESULT = CheckResult(is_correct=True, result_view=ResultView(correct=True))
+TASK = TaskUI(
+    view=TaskView(heading="Задание 1", instruction="Выберите ответ"),
+    options=[TaskOption(text=str(n), value=str(n)) for n in range(1, 6)],
+)
+
+
+class FakeMessageManager:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def send_rich(
+            self,
+            markdown: str,
+            *, reply_markup: InlineKeyboardMarkup | None = None,
+            clear_previous: bool = True,
+    ) -> int:
+        await asyncio.sleep(self.latency)
+        return 1
+
+
+class FakeTaskService:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def start_task(self, _user: UserWithExercisesDTO) -> TaskUI:
+        await asyncio.sleep(self.latency)
+        return TASK
+
+
+async def _sequential(task_service: FakeTaskService, message_manager: FakeMessageManager) -> None:
+    await _send_check_result(message_manager, RESULT)
+    await send_new_task(USER, task_service, message_manager)
+
+
+async def _overlapped(task_service: FakeTaskService, message_manager: FakeMessageManager) -> None:
+    await _send_result_and_next_task(USER, RESULT, task_service, message_manager)
+
+
+async def _ms_per_answer(answer: Callable[[], Awaitable[None]]) -> float:
+    started = time.perf_counter()
+    for _ in range(ANSWERS):
+        await answer()
+    return (time.perf_counter() - started) / ANSWERS * 1000
+
+
+async def main() -> None:
+    telegram_ms = float(sys.argv[1]) if len(sys.argv) > 1 else TELEGRAM_MS
+    db_ms = float(sys.argv[2]) if len(sys.argv) > 2 else DB_MS
+    task_service = FakeTaskService(db_ms / 1000)
+    message_manager = FakeMessageManager(telegram_ms / 1000)
+
+    before = await _ms_per_answer(lambda: _sequential(task_service, message_manager))
+    after = await _ms_per_answer(lambda: _overlapped(task_service, message_manager))
+
+    print(f"Telegram {telegram_ms:.0f} ms per send, task selection {db_ms:.0f} ms")  # noqa: T201
+    print(f"{'до (по очереди)':<24} {before:>7.1f} ms/answer")  # noqa: T201
+    print(f"{'после (параллельно)':<24} {after:>7.1f} ms/answer")  # noqa: T201
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""CPU процесса на вызов: ORM-реализация горячих выборок против быстрого пути на asyncpg.
+
+Запуск (нужна тестовая база, данные откатываются):
+    TEST_DATABASE_URL=postgresql+asyncpg://... PYTHONPATH=src python -m tests.benchmarks.bench_fast_selection
+
+Меряется time.process_time(): работа Postgres идёт в другом процессе, так что в цифры попадает
+только клиентская часть — компиляция, сборка строк, identity map.
+"""
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+
+os.environ.setdefault("BOT_TOKEN", "bench")
+os.environ.setdefault("DB_NAME", "bench")
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASS", "bench")
+os.environ.setdefault("REDIS_PASSWORD", "bench")
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import BaseDBModel, ReadSession
+from app.models import Category, Exercise, User, UserAnswer
+from app.repositories import (
+    ExerciseRepository,
+    FastExerciseRepository,
+    FastUserAnswerRepository,
+    UserAnswerRepository,
+)
+
+EXERCISES = 400
+ANSWERED = 300
+ANSWERS_PER_EXERCISE = 6
+CALLS = 300
+
+
+async def _seed(session: AsyncSession) -> tuple[int, int]:
+    category = Category(name="bench")
+    user = User(telegram_id=1, username="bench", full_name="Bench")
+    session.add_all([category, user])
+    await session.flush()
+    exercises = [
+        Exercise(category_id=category.id, content={"text": f"q{i}", "words": ["a", "b"]}, answer=str(i % 12))
+        for i in range(EXERCISES)
+    ]
+    session.add_all(exercises)
+    await session.flush()
+    session.add_all([
+        UserAnswer(
+            user_id=user.id, exercise_id=exercise.id, category_id=category.id,
+            is_correct=(attempt + exercise.id) % 3 != 0, user_response="x", solve_time=5 + attempt,
+        )
+        for exercise in exercises[:ANSWERED]
+        for attempt in range(ANSWERS_PER_EXERCISE)
+    ])
+    await session.flush()
+    session.expunge_all()
+    return category.id, user.id
+
+
+async def _cpu_per_call(call: Callable[[], Awaitable[object]], session: AsyncSession) -> float:
+    await call()
+    started = time.process_time()
+    for _ in range(CALLS):
+        await call()
+        session.expunge_all()
+    return (time.process_time() - started) / CALLS
+
+
+async def main() -> None:
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        await connection.run_sync(BaseDBModel.metadata.create_all)
+        session = AsyncSession(bind=connection, join_transaction_mode="rollback_only")
+        category_id, user_id = await _seed(session)
+
+        read_session = ReadSession(session)
+        orm_exercises, fast_exercises = ExerciseRepository(read_session), FastExerciseRepository(read_session)
+        orm_answers, fast_answers = UserAnswerRepository(session), FastUserAnswerRepository(session)
+        cases = {
+            "get_random_unseen(limit=20)": (
+                lambda repo: lambda: repo.get_random_unseen(category_id, user_id, 20),
+                orm_exercises, fast_exercises,
+            ),
+            "get_exercise_stats": (
+                lambda repo: lambda: repo.get_exercise_stats(user_id, category_id),
+                orm_answers, fast_answers,
+            ),
+            "get_answer_group_stats": (
+                lambda repo: lambda: repo.get_answer_group_stats(user_id, category_id, min_group_size=4),
+                orm_answers, fast_answers,
+            ),
+        }
+        print(f"{'query':<30}{'orm, µs':>12}{'fast, µs':>12}{'saving':>10}")  # noqa: T201
+        for name, (make_call, orm_repo, fast_repo) in cases.items():
+            orm = await _cpu_per_call(make_call(orm_repo), session)
+            fast = await _cpu_per_call(make_call(fast_repo), session)
+            print(f"{name:<30}{orm * 1e6:>12.0f}{fast * 1e6:>12.0f}{1 - fast / orm:>10.0%}")  # noqa: T201
+
+        await session.close()
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""Память Redis под FSM миллиона юзеров: RedisStorage (JSON-строки) против RedisHashStorage.
+
+Запуск (нужен настоящий Redis: used_memory у fakeredis не считается; база очищается):
+    REDIS_URL=redis://localhost:6379/15 PYTHONPATH=src python -m tests.benchmarks.bench_fsm_storage_memory [users]
+
+Каждому юзеру пишется то, что держит MessageManager: пара id сообщений бота и юзера, у части —
+состояние. Для каждого варианта хранилища база очищается, данные пишутся через само хранилище,
+в отчёт идёт прирост used_memory и байт на юзера.
+"""
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("BOT_TOKEN", "bench")
+os.environ.setdefault("DB_NAME", "bench")
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASS", "bench")
+os.environ.setdefault("REDIS_PASSWORD", "bench")
+
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio.client import Redis
+
+from bot.fsm_storage import CompactKeyBuilder, RedisHashStorage
+from bot.services.message_manager import BOT_MESSAGES_KEY, USER_MESSAGES_KEY
+
+USERS = 1_000_000
+CONCURRENCY = 200
+BOT_ID = 7_123_456_789
+# Каждый десятый юзер — посреди задания с состоянием
+STATE_EVERY = 10
+
+
+def _storages(redis: Redis) -> dict[str, BaseStorage]:
+    default_keys = DefaultKeyBuilder(with_destiny=True, with_bot_id=True)
+    return {
+        "RedisStorage (json)": RedisStorage(redis, key_builder=default_keys),
+        "hash + msgpack": RedisHashStorage(redis, default_keys, idle_ttl=30 * 24 * 3600),
+        "hash + msgpack, compact keys": RedisHashStorage(
+            redis, CompactKeyBuilder(), idle_ttl=30 * 24 * 3600,
+            field_aliases={BOT_MESSAGES_KEY: "b", USER_MESSAGES_KEY: "u"},
+        ),
+    }
+
+
+async def _write_user(storage: BaseStorage, n: int) -> None:
+    telegram_id = 400_000_000 + n * 37
+    key = StorageKey(bot_id=BOT_ID, chat_id=telegram_id, user_id=telegram_id)
+    message_id = 1_000 + n % 50_000
+    await storage.update_data(key, {BOT_MESSAGES_KEY: [message_id], USER_MESSAGES_KEY: [message_id + 1]})
+    if n % STATE_EVERY == 0:
+        await storage.set_state(key, "TaskStates:waiting_answer")
+
+
+async def _used_memory(redis: Redis) -> int:
+    return int((await redis.info("memory"))["used_memory"])
+
+
+async def _measure(redis: Redis, name: str, storage: BaseStorage, users: int) -> None:
+    await redis.flushdb()
+    baseline = await _used_memory(redis)
+    started = time.perf_counter()
+    for start in range(0, users, CONCURRENCY):
+        await asyncio.gather(*(_write_user(storage, n) for n in range(start, min(start + CONCURRENCY, users))))
+    elapsed = time.perf_counter() - started
+    used = await _used_memory(redis) - baseline
+    print(
+        f"{name:<30} {used / 2**20:>9.1f} MiB  {used / users:>7.1f} B/user  "
+        f"{await redis.dbsize():>9} keys  {elapsed:>6.1f}s",
+    )
+
+
+async def main() -> None:
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else USERS
+    redis = Redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/15"))
+    print(f"{users} users, every {STATE_EVERY}th with a state")
+    try:
+        for name, storage in _storages(redis).items():
+            await _measure(redis, name, storage, users)
+        await redis.flushdb()
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
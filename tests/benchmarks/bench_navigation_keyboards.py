@@ -0,0 +1,136 @@
+"""CPU обработчика на клик по меню категорий: сборка клавиатуры на каждый клик против кэша клавиатур.
+
+Запуск (нужна тестовая база, данные откатываются):
+    TEST_DATABASE_URL=postgresql+asyncpg://... PYTHONPATH=src python -m tests.benchmarks.bench_navigation_keyboards
+
+«до» — тело обработчиков до кэша: дерево из базы, DTO и `get_categories_keyboard` на каждый клик;
+«после» — сами обработчики `back_to_main_menu` и `category_callback` с прогретым кэшем. Меряется
+time.process_time(): работа Postgres идёт в другом процессе, в цифры попадает только клиентская часть.
+"""
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+
+os.environ.setdefault("BOT_TOKEN", "bench")
+os.environ.setdefault("DB_NAME", "bench")
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASS", "bench")
+os.environ.setdefault("REDIS_PASSWORD", "bench")
+
+import fakeredis
+from aiogram.types import InlineKeyboardMarkup
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.cache import CacheManager
+from app.database import BaseDBModel, ReadSession
+from app.enums import HandlerType
+from app.models import Category
+from app.repositories import CategoryRepository
+from app.schemas import CategoryDTO, CategoryWithChildrenDTO, UserWithExercisesDTO
+from app.services.category_service import CategoryService
+from bot.callback_datas import CategoryCallbackData
+from bot.handlers.category_handler import back_to_main_menu, category_callback
+from bot.keyboards import CategoryKeyboards, get_categories_keyboard
+
+# Как в боте: 27 заданий ЕГЭ в корне, у задания — подкатегории
+ROOTS = 27
+CHILDREN = 8
+CALLS = 2_000
+
+
+class FakeCallbackQuery:
+    async def answer(self) -> None:
+        pass
+
+
+class FakeMessageManager:
+    async def edit_message(self, text: str, reply_markup: InlineKeyboardMarkup | None = None) -> None:
+        pass
+
+
+USER = UserWithExercisesDTO(
+    id=1, telegram_id=1, username=None, full_name="Bench", exercise_started_at=None, current_category=None,
+)
+
+
+async def _seed(session: AsyncSession) -> int:
+    roots = [Category(name=f"Задание {n}", handler_type=HandlerType.TASK_5_EXAM) for n in range(1, ROOTS + 1)]
+    session.add_all(roots)
+    await session.flush()
+    session.add_all([Category(name=f"Подкатегория {n}", parent_id=roots[0].id) for n in range(CHILDREN)])
+    await session.flush()
+    session.expunge_all()
+    return roots[0].id
+
+
+async def _cpu_per_call(call: Callable[[], Awaitable[object]], session: AsyncSession) -> float:
+    await call()
+    started = time.process_time()
+    for _ in range(CALLS):
+        await call()
+        session.expunge_all()
+    return (time.process_time() - started) / CALLS
+
+
+async def main() -> None:
+    # debug-лог обработчика на каждый клик мерил бы вывод в консоль
+    logger.remove()
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+    redis = fakeredis.FakeAsyncRedis()
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        await connection.run_sync(BaseDBModel.metadata.create_all)
+        session = AsyncSession(bind=connection, join_transaction_mode="rollback_only")
+        parent_id = await _seed(session)
+
+        repository = CategoryRepository(ReadSession(session))
+        cache_manager = CacheManager(redis)
+        category_service = CategoryService(session, repository, cache_manager)
+        keyboards = CategoryKeyboards(category_service, cache_manager)
+        query, message_manager = FakeCallbackQuery(), FakeMessageManager()
+        callback_data = CategoryCallbackData(category_id=parent_id)
+
+        async def menu_before() -> None:
+            categories = [CategoryDTO.from_orm_obj(category) for category in await repository.get_roots()]
+            await message_manager.edit_message(text="Выберите задание", reply_markup=get_categories_keyboard(categories))
+            await query.answer()
+
+        async def category_before() -> None:
+            orm_category = await repository.get_by_id_with_children(parent_id)
+            category = CategoryWithChildrenDTO.from_orm_obj(orm_category)  # type: ignore[arg-type]
+            await message_manager.edit_message(
+                text="Выберите подкатегорию",
+                reply_markup=get_categories_keyboard(
+                    category.children, current_category_id=category.id, back_category_id=category.parent_id or 0,
+                ),
+            )
+            await query.answer()
+
+        cases = {
+            "back_to_main_menu": (
+                menu_before,
+                lambda: back_to_main_menu(query, message_manager, keyboards),  # type: ignore[arg-type]
+            ),
+            "category_callback (node)": (
+                category_before,
+                lambda: category_callback(  # type: ignore[arg-type]
+                    query, USER, message_manager, callback_data, None, category_service, keyboards, None, None,
+                ),
+            ),
+        }
+        print(f"{'handler':<28}{'before, µs':>12}{'after, µs':>12}{'saving':>10}")  # noqa: T201
+        for name, (before, after) in cases.items():
+            old = await _cpu_per_call(before, session)
+            new = await _cpu_per_call(after, session)
+            print(f"{name:<28}{old * 1e6:>12.0f}{new * 1e6:>12.0f}{1 - new / old:>10.0%}")  # noqa: T201
+
+        await session.close()
+        await transaction.rollback()
+    await redis.aclose()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
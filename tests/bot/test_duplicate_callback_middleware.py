@@ -0,0 +1,82 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.types import CallbackQuery, Chat, Message, User
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from bot.callback_datas import CategoryCallbackData, SubmitAnswerCallbackData
+from bot.middlewares import DuplicateCallbackMiddleware
+from bot.middlewares.duplicate_callback_middleware import duplicate_callbacks_suppressed
+
+
+def make_callback(data: str, *, query_id: str = "1", message_id: int = 10, chat_id: int = 5) -> CallbackQuery:
+    return CallbackQuery(
+        id=query_id,
+        from_user=User(id=chat_id, is_bot=False, first_name="Test"),
+        chat_instance="ci",
+        data=data,
+        message=Message(message_id=message_id, date=datetime.now(UTC), chat=Chat(id=chat_id, type="private")),
+    )
+
+
+ANSWER = SubmitAnswerCallbackData(answer="true").pack()
+
+
+@pytest.fixture
+def middleware(redis):
+    return DuplicateCallbackMiddleware(redis, [SubmitAnswerCallbackData], ttl_ms=60_000)
+
+
+@pytest.fixture
+def handler():
+    return AsyncMock(return_value="handled")
+
+
+@pytest.fixture
+def bot():
+    return AsyncMock()
+
+
+class TestDuplicateCallbackMiddleware:
+    async def test_second_tap_is_dropped_before_handler(self, middleware, handler, bot, redis):
+        suppressed = duplicate_callbacks_suppressed.value(prefix="submit_answer")
+
+        assert await middleware(handler, make_callback(ANSWER, query_id="1"), {"bot": bot}) == "handled"
+        assert await middleware(handler, make_callback(ANSWER, query_id="2"), {"bot": bot}) is None
+
+        handler.assert_awaited_once()
+        bot.answer_callback_query.assert_awaited_once_with("2")
+        assert duplicate_callbacks_suppressed.value(prefix="submit_answer") == suppressed + 1
+        assert 0 < await redis.pttl(f"dedup:5:10:{ANSWER}") <= 60_000
+
+    async def test_other_message_or_answer_passes(self, middleware, handler, bot):
+        await middleware(handler, make_callback(ANSWER), {"bot": bot})
+        await middleware(handler, make_callback(ANSWER, message_id=11), {"bot": bot})
+        await middleware(handler, make_callback(SubmitAnswerCallbackData(answer="false").pack()), {"bot": bot})
+        await middleware(handler, make_callback(ANSWER, chat_id=6), {"bot": bot})
+
+        assert handler.await_count == 4
+
+    async def test_unguarded_callbacks_are_not_tracked(self, middleware, handler, bot, redis):
+        data = CategoryCallbackData(category_id=1).pack()
+
+        await middleware(handler, make_callback(data), {"bot": bot})
+        await middleware(handler, make_callback(data), {"bot": bot})
+
+        assert handler.await_count == 2
+        assert await redis.keys("dedup:*") == []
+
+    async def test_failed_handler_releases_guard(self, middleware, bot):
+        failing = AsyncMock(side_effect=RuntimeError("db down"))
+        with pytest.raises(RuntimeError):
+            await middleware(failing, make_callback(ANSWER), {"bot": bot})
+
+        retry = AsyncMock(return_value="handled")
+        assert await middleware(retry, make_callback(ANSWER), {"bot": bot}) == "handled"
+
+    async def test_redis_outage_lets_answer_through(self, middleware, handler, bot, redis, monkeypatch):
+        monkeypatch.setattr(redis, "set", AsyncMock(side_effect=RedisConnectionError("down")))
+
+        assert await middleware(handler, make_callback(ANSWER), {"bot": bot}) == "handled"
+        assert await middleware(handler, make_callback(ANSWER), {"bot": bot}) == "handled"
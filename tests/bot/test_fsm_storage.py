@@ -0,0 +1,125 @@
+import msgpack
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import DefaultKeyBuilder, StorageKey
+
+from bot.fsm_storage import STATE_FIELD, CompactKeyBuilder, RedisHashStorage
+from bot.services.message_manager import MessageManager
+
+from .conftest import make_message
+
+KEY = StorageKey(bot_id=42, chat_id=123456789, user_id=123456789)
+
+
+class Form(StatesGroup):
+    answer = State()
+
+
+@pytest.fixture
+def storage(redis):
+    return RedisHashStorage(
+        redis, CompactKeyBuilder(), idle_ttl=3600, field_aliases={"bot_messages": "b", "user_messages": "u"},
+    )
+
+
+class TestCompactKeyBuilder:
+    def test_base36_ids(self):
+        assert CompactKeyBuilder().build(KEY) == "f:16:21i3v9:21i3v9"
+
+    def test_group_chat_thread_and_destiny(self):
+        key = StorageKey(bot_id=1, chat_id=-1001, user_id=36, thread_id=7, destiny="quiz")
+        assert CompactKeyBuilder().build(key) == "f:1:-rt:7:10:quiz"
+
+    def test_lock_part_is_separate_key(self):
+        assert CompactKeyBuilder().build(KEY, "lock") == "f:16:21i3v9:21i3v9:lock"
+        assert CompactKeyBuilder().build(KEY, "data") == CompactKeyBuilder().build(KEY, "state")
+
+
+class TestRedisHashStorage:
+    async def test_state_and_data_share_one_hash(self, storage, redis):
+        await storage.set_state(KEY, Form.answer)
+        await storage.set_data(KEY, {"bot_messages": [1, 2], "step": "x"})
+
+        raw = await redis.hgetall("f:16:21i3v9:21i3v9")
+        assert raw[STATE_FIELD.encode()] == b"Form:answer"
+        assert msgpack.unpackb(raw[b"b"]) == [1, 2]
+        assert msgpack.unpackb(raw[b"step"]) == "x"
+        assert await storage.get_state(KEY) == "Form:answer"
+        assert await storage.get_data(KEY) == {"bot_messages": [1, 2], "step": "x"}
+
+    async def test_update_data_writes_only_given_fields(self, storage, redis):
+        await storage.set_data(KEY, {"bot_messages": [1], "user_messages": [5]})
+        # Запись другого воркера в соседнее поле не затирается
+        await redis.hset("f:16:21i3v9:21i3v9", "b", msgpack.packb([1, 2]))
+
+        result = await storage.update_data(KEY, {"user_messages": [5, 6]})
+
+        assert result == {"bot_messages": [1, 2], "user_messages": [5, 6]}
+
+    async def test_set_data_replaces_data_and_keeps_state(self, storage):
+        await storage.set_state(KEY, "s")
+        await storage.set_data(KEY, {"a": 1, "b_old": 2})
+
+        await storage.set_data(KEY, {"a": 3})
+
+        assert await storage.get_data(KEY) == {"a": 3}
+        assert await storage.get_state(KEY) == "s"
+
+    async def test_clearing_everything_removes_key(self, storage, redis):
+        await storage.set_state(KEY, "s")
+        await storage.set_data(KEY, {"a": 1})
+
+        await storage.set_state(KEY, None)
+        await storage.set_data(KEY, {})
+
+        assert await redis.exists("f:16:21i3v9:21i3v9") == 0
+        assert await storage.get_state(KEY) is None
+        assert await storage.get_data(KEY) == {}
+
+    async def test_writes_refresh_idle_ttl(self, storage, redis):
+        await storage.update_data(KEY, {"a": 1})
+        await redis.expire("f:16:21i3v9:21i3v9", 10)
+
+        await storage.set_state(KEY, "s")
+
+        assert 3590 < await redis.ttl("f:16:21i3v9:21i3v9") <= 3600
+
+    async def test_without_ttl_keys_do_not_expire(self, redis):
+        storage = RedisHashStorage(redis, DefaultKeyBuilder(with_bot_id=True))
+        await storage.update_data(KEY, {"a": 1})
+
+        assert await redis.ttl("fsm:42:123456789:123456789") == -1
+
+    async def test_get_value(self, storage):
+        await storage.update_data(KEY, {"bot_messages": [7]})
+
+        assert await storage.get_value(KEY, "bot_messages") == [7]
+        assert await storage.get_value(KEY, "missing", 0) == 0
+
+    async def test_rejects_clashing_aliases(self, redis):
+        with pytest.raises(ValueError, match="aliases"):
+            RedisHashStorage(redis, CompactKeyBuilder(), field_aliases={"a": "x", "b": "x"})
+        with pytest.raises(ValueError, match="aliases"):
+            RedisHashStorage(redis, CompactKeyBuilder(), field_aliases={"a": STATE_FIELD})
+
+
+class TestWithFSMContext:
+    async def test_context_round_trip(self, storage):
+        context = FSMContext(storage=storage, key=KEY)
+
+        await context.set_state(Form.answer)
+        await context.update_data(hint=True)
+        await context.clear()
+
+        assert await context.get_state() is None
+        assert await context.get_data() == {}
+
+    async def test_message_manager_saves_single_field(self, storage, redis, mock_bot):
+        context = FSMContext(storage=storage, key=KEY)
+        await context.update_data(bot_messages=[10])
+        await redis.hset("f:16:21i3v9:21i3v9", "b", msgpack.packb([10, 11]))
+
+        await MessageManager.from_message(mock_bot, make_message(message_id=3, chat_id=123456789), context)
+
+        assert await context.get_data() == {"bot_messages": [10, 11], "user_messages": [3]}
@@ -0,0 +1,77 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.enums import HandlerType
+from app.services.category_service import CATEGORIES_NAMESPACE, CategoryService
+from bot.callback_datas import CategoryCallbackData, GetTaskCallbackData
+from bot.handlers.category_handler import back_to_main_menu
+from bot.keyboards import CategoryKeyboards, KeyboardKind, get_stats_back_keyboard
+
+
+@pytest.fixture
+def keyboards(db_session, category_repository, cache_manager):
+    return CategoryKeyboards(CategoryService(db_session, category_repository, cache_manager), cache_manager)
+
+
+def _callbacks(keyboard):
+    return [button.callback_data for row in keyboard.inline_keyboard for button in row]
+
+
+class TestCategoryKeyboards:
+    async def test_root_keyboard(self, keyboards, category_factory):
+        root = await category_factory(name="Задание 5")
+
+        keyboard = await keyboards.categories()
+
+        assert _callbacks(keyboard) == [CategoryCallbackData(category_id=root.id).pack(), "main"]
+
+    async def test_children_keyboard_with_all_button(self, keyboards, category_factory):
+        parent = await category_factory(name="Задание 5", handler_type=HandlerType.TASK_5_EXAM)
+        child = await category_factory(name="Паронимы", parent_id=parent.id)
+
+        keyboard = await keyboards.categories(parent.id)
+
+        assert _callbacks(keyboard) == [
+            CategoryCallbackData(category_id=child.id).pack(),
+            GetTaskCallbackData(category_id=parent.id).pack(),
+            "categories",
+        ]
+
+    async def test_keyboard_is_built_once_per_tree_version(self, keyboards, category_factory, cache_manager):
+        await category_factory(name="Root 1")
+        first = await keyboards.categories()
+        await category_factory(name="Root 2")
+
+        assert await keyboards.categories() is first
+
+        await cache_manager.invalidate(CATEGORIES_NAMESPACE)
+        rebuilt = await keyboards.categories()
+        assert rebuilt is not first
+        assert len(rebuilt.inline_keyboard) == 3
+
+    async def test_kinds_and_variants_are_separate_keys(self, keyboards):
+        builds = []
+
+        def build(back):
+            builds.append(back)
+            return get_stats_back_keyboard(back)
+
+        first = await keyboards.get(7, KeyboardKind.STATS, lambda: build("a"))
+        assert await keyboards.get(7, KeyboardKind.STATS, lambda: build("b")) is first
+        await keyboards.get(7, KeyboardKind.STATS, lambda: build("c"), variant="other")
+        await keyboards.get(8, KeyboardKind.STATS, lambda: build("d"))
+
+        assert builds == ["a", "c", "d"]
+
+
+class TestNavigationHandlers:
+    async def test_back_to_main_menu_reuses_cached_keyboard(self, keyboards, category_factory):
+        await category_factory(name="Root")
+        message_manager = AsyncMock()
+
+        await back_to_main_menu(AsyncMock(), message_manager, keyboards)
+        await back_to_main_menu(AsyncMock(), message_manager, keyboards)
+
+        first, second = (call.kwargs["reply_markup"] for call in message_manager.edit_message.await_args_list)
+        assert first is second
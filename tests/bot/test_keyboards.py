@@ -1,9 +1,11 @@
 from aiogram.types import InlineKeyboardMarkup
 
+from app.enums import LeaderboardPeriod
 from app.schemas import CategoryDTO, TaskOption
-from bot.callback_datas import CategoryCallbackData
+from bot.callback_datas import CategoryCallbackData, LeaderboardCallbackData
 from bot.keyboards.back_button import add_back_button
 from bot.keyboards.category_keyboards import get_categories_keyboard
+from bot.keyboards.profile_keyboards import get_leaderboard_keyboard
 from bot.keyboards.task_keyboards import get_task_options_keyboard
 
 
@@ -67,3 +69,21 @@ class TestTaskOptionsKeyboard:
         assert option_buttons[0].text == "Yes"
         assert option_buttons[1].text == "No"
         assert option_buttons[2].text == "Maybe"
+
+
+# ── get_leaderboard_keyboard ────────────────────────────────────────────────
+
+
+class TestLeaderboardKeyboard:
+    def test_week_switches_to_all_time(self):
+        kb = get_leaderboard_keyboard(LeaderboardPeriod.WEEK, None, "profile")
+        data = LeaderboardCallbackData.unpack(kb.inline_keyboard[0][0].callback_data)
+        assert data.period == LeaderboardPeriod.ALL_TIME
+        assert data.task_id is None
+        assert kb.inline_keyboard[-1][0].callback_data == "profile"
+
+    def test_all_time_switches_to_week_keeping_task(self):
+        kb = get_leaderboard_keyboard(LeaderboardPeriod.ALL_TIME, 7, "sc:7")
+        data = LeaderboardCallbackData.unpack(kb.inline_keyboard[0][0].callback_data)
+        assert data.period == LeaderboardPeriod.WEEK
+        assert data.task_id == 7
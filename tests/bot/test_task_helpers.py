@@ -1,11 +1,12 @@
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
 
 from app.enums.category_enums import HandlerType
-from app.exceptions import NoCategoryError, NoHandlerTypeError
-from app.schemas import CategoryDTO, TaskOption, TaskUI, TaskView, UserWithExercisesDTO
-from bot.handlers.task_handler import send_new_task
+from app.exceptions import NoCategoryError, NoHandlerTypeError, TaskForUserNotFoundError
+from app.schemas import CategoryDTO, CheckResult, ResultView, TaskOption, TaskUI, TaskView, UserWithExercisesDTO
+from bot.handlers.task_handler import _send_result_and_next_task, send_new_task
 
 
 @pytest.fixture
@@ -55,3 +56,87 @@ class TestSendNewTask:
         assert result == 1
         mock_mm.send_rich.assert_called_once()
         mock_mm.send_message.assert_not_called()
+
+
+class TestSendResultAndNextTask:
+    """Выбор следующего задания идёт параллельно с отправкой результата, сообщения — по порядку."""
+
+    @pytest.fixture
+    def user(self):
+        return _make_user(category=CategoryDTO(id=1, name="Cat", handler_type=HandlerType.TASK_1_DRILL, parent_id=5))
+
+    @pytest.fixture
+    def result(self):
+        return CheckResult(is_correct=True, result_view=ResultView(correct=True))
+
+    @staticmethod
+    def _task_service(events: list[str], release: asyncio.Event | None = None) -> AsyncMock:
+        async def start_task(_user):
+            events.append("select")
+            if release is not None:
+                await release.wait()
+            events.append("selected")
+            return TaskUI(view=TaskView(heading="Задание 1", instruction="Вопрос?"))
+
+        return AsyncMock(start_task=start_task)
+
+    async def test_selection_overlaps_result_send(self, user, result):
+        events: list[str] = []
+        sent = asyncio.Event()
+        mm = AsyncMock()
+
+        async def send_rich(markdown, **_kwargs):
+            events.append(f"send:{markdown.splitlines()[0]}")
+            if markdown.startswith("**"):
+                await sent.wait()
+            return 1
+
+        mm.send_rich.side_effect = send_rich
+        handler = asyncio.create_task(_send_result_and_next_task(user, result, self._task_service(events), mm))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        # Результат ещё в пути, а задание уже выбрано
+        assert events == ["send:**✅ Верно**", "select", "selected"]
+        sent.set()
+        await handler
+        assert events == ["send:**✅ Верно**", "select", "selected", "send:### Задание 1"]
+
+    async def test_task_waits_for_result(self, user, result, mock_mm):
+        events: list[str] = []
+        release = asyncio.Event()
+        handler = asyncio.create_task(
+            _send_result_and_next_task(user, result, self._task_service(events, release), mock_mm),
+        )
+        await asyncio.sleep(0)
+
+        assert mock_mm.send_rich.await_count == 1
+        release.set()
+        await handler
+        assert mock_mm.send_rich.await_count == 2
+        assert mock_mm.send_rich.await_args_list[0].kwargs == {"clear_previous": True}
+
+    async def test_send_failure_cancels_selection(self, user, result, mock_mm):
+        events: list[str] = []
+        release = asyncio.Event()
+
+        async def send_rich(*_args, **_kwargs):
+            await asyncio.sleep(0)
+            raise RuntimeError("telegram down")
+
+        mock_mm.send_rich.side_effect = send_rich
+
+        with pytest.raises(RuntimeError, match="telegram down"):
+            await _send_result_and_next_task(user, result, self._task_service(events, release), mock_mm)
+        release.set()
+        await asyncio.sleep(0)
+        assert events == ["select"]
+        assert mock_mm.send_rich.await_count == 1
+
+    async def test_selection_error_after_result(self, user, result, mock_mm):
+        task_service = AsyncMock()
+        task_service.start_task.side_effect = TaskForUserNotFoundError(1)
+
+        with pytest.raises(TaskForUserNotFoundError):
+            await _send_result_and_next_task(user, result, task_service, mock_mm)
+        mock_mm.send_rich.assert_awaited_once()
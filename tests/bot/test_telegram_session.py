@@ -0,0 +1,221 @@
+import asyncio
+import time
+
+import pytest
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import DeleteMessages, SendMessage
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.telegram_session import (
+    Lane,
+    RateLimitedSession,
+    RateLimiter,
+    lane_of,
+    send_lane,
+    telegram_requests,
+    telegram_retry_after,
+)
+
+
+class FakeBotAPI:
+    """Локальный Bot API: запоминает вызовы и отдаёт заранее заданные 429."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str | None]] = []
+        self.flood: list[int] = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        form = await request.post()
+        chat_id = form.get("chat_id")
+        self.calls.append((method, chat_id if isinstance(chat_id, str) else None))
+        if self.flood:
+            retry_after = self.flood.pop(0)
+            return web.json_response({
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {retry_after}",
+                "parameters": {"retry_after": retry_after},
+            })
+        if method == "sendMessage":
+            result = {"message_id": 1, "date": 0, "chat": {"id": int(chat_id), "type": "private"}, "text": "ok"}
+            return web.json_response({"ok": True, "result": result})
+        return web.json_response({"ok": True, "result": True})
+
+
+def make_limiter(**overrides) -> RateLimiter:
+    limits = {
+        "global_rate": 1000.0, "global_burst": 1000, "chat_rate": 1000.0, "chat_burst": 1000,
+        "group_rate": 1000.0, "group_burst": 1000,
+    }
+    return RateLimiter(**(limits | overrides))
+
+
+@pytest.fixture
+async def api():
+    fake = FakeBotAPI()
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", fake.handle)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    fake.url = str(server.make_url("")).rstrip("/")
+    yield fake
+    await server.close()
+
+
+@pytest.fixture
+async def make_bot(api):
+    bots = []
+
+    def factory(limiter: RateLimiter | None = None, **kwargs) -> Bot:
+        inner = AiohttpSession(api=TelegramAPIServer.from_base(api.url))
+        session = RateLimitedSession(inner, limiter or make_limiter(), **kwargs)
+        bot = Bot(token="42:TEST", session=session)
+        bots.append(bot)
+        return bot
+
+    yield factory
+    for bot in bots:
+        await bot.session.close()
+
+
+class TestRateLimitedSession:
+    async def test_request_goes_through(self, api, make_bot):
+        bot = make_bot()
+        before = telegram_requests.value(lane="interactive")
+
+        message = await bot.send_message(123, "hi")
+
+        assert message.chat.id == 123
+        assert api.calls == [("sendMessage", "123")]
+        assert telegram_requests.value(lane="interactive") == before + 1
+
+    async def test_retry_after_pauses_and_retries(self, api, make_bot):
+        bot = make_bot()
+        api.flood = [1]
+        before = telegram_retry_after.value(method="SendMessage")
+
+        started = time.monotonic()
+        message = await bot.send_message(123, "hi")
+
+        assert message.message_id == 1
+        assert time.monotonic() - started >= 0.9
+        assert api.calls == [("sendMessage", "123"), ("sendMessage", "123")]
+        assert telegram_retry_after.value(method="SendMessage") == before + 1
+
+    async def test_long_retry_after_is_raised(self, api, make_bot):
+        bot = make_bot(max_retry_after=0.5)
+        api.flood = [5]
+
+        with pytest.raises(TelegramRetryAfter):
+            await bot.send_message(123, "hi")
+        assert len(api.calls) == 1
+
+    async def test_retries_are_capped(self, api, make_bot):
+        bot = make_bot(max_retries=0)
+        api.flood = [1]
+
+        with pytest.raises(TelegramRetryAfter):
+            await bot.send_message(123, "hi")
+
+    async def test_methods_without_chat_bypass_limiter(self, api, make_bot):
+        limiter = make_limiter()
+        bot = make_bot(limiter)
+        # Ведро бота на паузе, но запросу без chat_id это не мешает
+        limiter.pause(None, 60)
+        before = telegram_requests.value(lane="interactive")
+
+        assert await bot.answer_callback_query("cb") is True
+
+        assert api.calls == [("answerCallbackQuery", None)]
+        assert telegram_requests.value(lane="interactive") == before
+
+
+class TestRateLimiter:
+    async def test_chat_bucket_limits_one_chat_only(self):
+        limiter = make_limiter(chat_rate=0.1, chat_burst=1)
+        await limiter.acquire(1, Lane.INTERACTIVE)
+
+        blocked = asyncio.create_task(limiter.acquire(1, Lane.INTERACTIVE))
+        await asyncio.sleep(0.05)
+        waited = await asyncio.wait_for(limiter.acquire(2, Lane.INTERACTIVE), 0.5)
+
+        assert not blocked.done()
+        assert waited < 0.1
+        blocked.cancel()
+        await limiter.close()
+
+    async def test_groups_use_group_bucket(self):
+        limiter = make_limiter(chat_burst=5, group_burst=1)
+        for _ in range(5):
+            await limiter.acquire(1, Lane.INTERACTIVE)
+        await limiter.acquire(-100, Lane.INTERACTIVE)
+
+        assert limiter.depth() == 0
+        group = asyncio.create_task(limiter.acquire(-100, Lane.INTERACTIVE))
+        await asyncio.sleep(0)
+        assert limiter.depth(Lane.INTERACTIVE) == 1
+        await asyncio.wait_for(group, 0.5)
+        await limiter.close()
+
+    async def test_global_bucket_paces_requests(self):
+        limiter = make_limiter(global_rate=20.0, global_burst=1)
+
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(chat, Lane.INTERACTIVE) for chat in range(4)))
+
+        # Первый по запасу, остальные по одному раз в 50 мс
+        assert time.monotonic() - started >= 0.14
+        await limiter.close()
+
+    async def test_interactive_lane_goes_first(self):
+        limiter = make_limiter(global_rate=20.0, global_burst=1)
+        await limiter.acquire(0, Lane.INTERACTIVE)
+        order: list[Lane] = []
+
+        async def request(chat_id: int, lane: Lane) -> None:
+            await limiter.acquire(chat_id, lane)
+            order.append(lane)
+
+        tasks = [
+            asyncio.create_task(request(1, Lane.BULK)),
+            asyncio.create_task(request(2, Lane.CLEANUP)),
+            asyncio.create_task(request(3, Lane.INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.depth() == 3
+        await asyncio.gather(*tasks)
+
+        assert order == [Lane.INTERACTIVE, Lane.CLEANUP, Lane.BULK]
+        assert limiter.depth() == 0
+        await limiter.close()
+
+    async def test_paused_chat_does_not_block_others(self):
+        limiter = make_limiter(global_rate=20.0, global_burst=1)
+        await limiter.acquire(0, Lane.INTERACTIVE)
+        limiter.pause(1, 60)
+
+        paused = asyncio.create_task(limiter.acquire(1, Lane.INTERACTIVE))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(limiter.acquire(2, Lane.BULK), 0.5)
+
+        assert not paused.done()
+        paused.cancel()
+        await asyncio.gather(paused, return_exceptions=True)
+        assert limiter.depth() == 0
+        await limiter.close()
+
+
+class TestLanes:
+    def test_deletes_go_to_cleanup_lane(self):
+        assert lane_of(DeleteMessages(chat_id=1, message_ids=[1])) == Lane.CLEANUP
+        assert lane_of(SendMessage(chat_id=1, text="x")) == Lane.INTERACTIVE
+
+    def test_send_lane_overrides(self):
+        with send_lane(Lane.BULK):
+            assert lane_of(SendMessage(chat_id=1, text="x")) == Lane.BULK
+        assert lane_of(SendMessage(chat_id=1, text="x")) == Lane.INTERACTIVE
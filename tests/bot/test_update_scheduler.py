@@ -0,0 +1,172 @@
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from bot.middlewares import UpdateSchedulerMiddleware
+from bot.middlewares.update_scheduler_middleware import update_queue_depth, updates_coalesced
+
+
+def make_update(chat_id: int, update_id: int, callback: str | None = None, message_id: int = 1) -> Update:
+    chat = Chat(id=chat_id, type="private")
+    user = User(id=chat_id, is_bot=False, first_name="Test")
+    message = Message(message_id=message_id, date=datetime.now(UTC), chat=chat)
+    if callback is None:
+        return Update(update_id=update_id, message=message)
+    return Update(
+        update_id=update_id,
+        callback_query=CallbackQuery(
+            id=str(update_id), from_user=user, chat_instance="ci", data=callback, message=message,
+        ),
+    )
+
+
+def make_data(update: Update, bot) -> dict:
+    chat = update.message.chat if update.message else update.callback_query.message.chat
+    return {"event_chat": chat, "bot": bot}
+
+
+class Recorder:
+    """Обработчик, который запоминает порядок и параллельность и ждёт сигнала на выход."""
+
+    def __init__(self):
+        self.started: list[int] = []
+        self.finished: list[int] = []
+        self.running = 0
+        self.max_running = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, update, data):
+        self.started.append(update.update_id)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await self.release.wait()
+        self.running -= 1
+        self.finished.append(update.update_id)
+        return update.update_id
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def bot():
+    return AsyncMock()
+
+
+class TestUpdateScheduler:
+    async def test_updates_of_one_chat_run_in_order(self, bot):
+        middleware = UpdateSchedulerMiddleware(10)
+        recorder = Recorder()
+        updates = [make_update(1, n) for n in range(5)]
+
+        tasks = [asyncio.create_task(middleware(recorder, u, make_data(u, bot))) for u in updates]
+        await settle()
+        assert recorder.started == [0]
+        assert middleware.depth == 4
+
+        recorder.release.set()
+        assert await asyncio.gather(*tasks) == [0, 1, 2, 3, 4]
+        assert recorder.finished == [0, 1, 2, 3, 4]
+        assert recorder.max_running == 1
+        assert middleware.depth == 0
+        assert update_queue_depth.value() == 0
+
+    async def test_chats_run_concurrently_up_to_limit(self, bot):
+        middleware = UpdateSchedulerMiddleware(3)
+        recorder = Recorder()
+        updates = [make_update(chat_id, chat_id) for chat_id in range(1, 9)]
+
+        tasks = [asyncio.create_task(middleware(recorder, u, make_data(u, bot))) for u in updates]
+        await settle()
+        assert recorder.running == 3
+        assert middleware.depth == 5
+
+        recorder.release.set()
+        await asyncio.gather(*tasks)
+        assert recorder.max_running == 3
+        assert sorted(recorder.finished) == list(range(1, 9))
+
+    async def test_repeated_tap_is_coalesced(self, bot):
+        middleware = UpdateSchedulerMiddleware(10)
+        recorder = Recorder()
+        first, repeat, other = make_update(1, 1, "submit:a"), make_update(1, 2, "submit:a"), make_update(1, 3, "submit:b")
+        coalesced = updates_coalesced.value()
+
+        tasks = [asyncio.create_task(middleware(recorder, u, make_data(u, bot))) for u in (first, repeat, other)]
+        await settle()
+        recorder.release.set()
+
+        assert await asyncio.gather(*tasks) == [1, None, 3]
+        assert recorder.started == [1, 3]
+        assert updates_coalesced.value() == coalesced + 1
+        bot.answer_callback_query.assert_awaited_once_with("2")
+
+    async def test_same_button_after_completion_is_processed(self, bot):
+        middleware = UpdateSchedulerMiddleware(10)
+        recorder = Recorder()
+        recorder.release.set()
+
+        for update_id in (1, 2):
+            update = make_update(1, update_id, "categories")
+            assert await middleware(recorder, update, make_data(update, bot)) == update_id
+
+    async def test_coalescing_can_be_disabled(self, bot):
+        middleware = UpdateSchedulerMiddleware(10, coalesce_callbacks=False)
+        recorder = Recorder()
+        updates = [make_update(1, 1, "x"), make_update(1, 2, "x")]
+
+        tasks = [asyncio.create_task(middleware(recorder, u, make_data(u, bot))) for u in updates]
+        recorder.release.set()
+
+        assert await asyncio.gather(*tasks) == [1, 2]
+
+    async def test_failed_handler_hands_turn_to_next_update(self, bot):
+        middleware = UpdateSchedulerMiddleware(1)
+        calls = []
+
+        async def handler(update, data):
+            calls.append(update.update_id)
+            if update.update_id == 1:
+                raise RuntimeError("boom")
+            return update.update_id
+
+        first, second = make_update(1, 1), make_update(1, 2)
+        results = await asyncio.gather(
+            middleware(handler, first, make_data(first, bot)),
+            middleware(handler, second, make_data(second, bot)),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] == 2
+        assert calls == [1, 2]
+
+    async def test_cancelled_waiter_leaves_queue(self, bot):
+        middleware = UpdateSchedulerMiddleware(10)
+        recorder = Recorder()
+        updates = [make_update(1, n) for n in range(3)]
+        tasks = [asyncio.create_task(middleware(recorder, u, make_data(u, bot))) for u in updates]
+        await settle()
+
+        tasks[1].cancel()
+        recorder.release.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert recorder.finished == [0, 2]
+        assert middleware.depth == 0
+
+    async def test_update_without_chat_still_limited(self, bot):
+        middleware = UpdateSchedulerMiddleware(1)
+        recorder = Recorder()
+        update = Update(update_id=1)
+
+        task = asyncio.create_task(middleware(recorder, update, {"bot": bot}))
+        await settle()
+        recorder.release.set()
+
+        assert await task == 1
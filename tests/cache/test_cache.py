@@ -0,0 +1,205 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.cache import (
+    CacheManager,
+    JsonSerializer,
+    MsgpackSerializer,
+    PydanticSerializer,
+    cached,
+)
+from app.cache.namespace import cache_coalesced, cache_errors, cache_hit_ratio, cache_loads, cache_requests
+from app.schemas import CategoryDTO
+
+
+async def eventually(predicate, timeout=2.0):
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def manager(redis):
+    return CacheManager(redis, version_check_interval=60)
+
+
+class Loader:
+    def __init__(self, value="v"):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.value
+
+
+class TestSerializers:
+    @pytest.mark.parametrize("serializer", [JsonSerializer(), MsgpackSerializer()])
+    def test_plain_values_round_trip(self, serializer):
+        value = {"ids": [1, 2], "name": "Паронимы", "flag": None}
+
+        assert serializer.loads(serializer.dumps(value)) == value
+
+    def test_pydantic_round_trip(self):
+        serializer = PydanticSerializer(list[CategoryDTO])
+        value = [CategoryDTO(id=1, name="Задание 5", handler_type=None, parent_id=None)]
+
+        assert serializer.loads(serializer.dumps(value)) == value
+
+
+class TestCache:
+    async def test_miss_then_l1_hit(self, manager):
+        cache = manager.namespace("t_l1").cache("kind", JsonSerializer())
+        loader = Loader()
+
+        assert await cache.get_or_load(1, loader) == "v"
+        assert await cache.get_or_load(1, loader) == "v"
+
+        assert loader.calls == 1
+        assert cache_requests.value(namespace="t_l1", result="miss") == 1
+        assert cache_requests.value(namespace="t_l1", result="l1_hit") == 1
+        assert cache_hit_ratio.value(namespace="t_l1") == 0.5
+
+    async def test_other_manager_hits_l2(self, redis, manager):
+        await manager.namespace("t_l2").cache("kind", JsonSerializer()).get_or_load("k", Loader([1, 2]))
+        other = CacheManager(redis).namespace("t_l2").cache("kind", JsonSerializer())
+        loader = Loader()
+
+        assert await other.get_or_load("k", loader) == [1, 2]
+        assert loader.calls == 0
+        assert cache_requests.value(namespace="t_l2", result="l2_hit") == 1
+
+    async def test_hundred_concurrent_misses_load_once(self, manager):
+        cache = manager.namespace("t_flight").cache("kind", JsonSerializer())
+        loader = Loader()
+
+        results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(100)))
+
+        assert results == ["v"] * 100
+        assert loader.calls == 1
+        assert cache_loads.value(namespace="t_flight") == 1
+        assert cache_coalesced.value(namespace="t_flight") == 99
+
+    async def test_none_is_not_cached(self, manager):
+        cache = manager.namespace("t_none").cache("kind", JsonSerializer())
+        loader = Loader(None)
+
+        assert await cache.get_or_load("k", loader) is None
+        assert await cache.get_or_load("k", loader) is None
+        assert loader.calls == 2
+
+    async def test_local_only_cache_skips_redis(self, manager, redis):
+        cache = manager.namespace("t_local").cache("kind", JsonSerializer(), remote_ttl=None)
+
+        await cache.set("k", 1)
+
+        assert await cache.get("k") == 1
+        assert await redis.keys("cache:t_local:0:*") == []
+
+    async def test_remote_entries_expire(self, manager, redis):
+        await manager.namespace("t_ttl").cache("kind", JsonSerializer(), remote_ttl=30).set("k", 1)
+
+        assert 0 < await redis.ttl("cache:t_ttl:0:kind:k") <= 30
+
+    async def test_cache_is_idempotent_per_kind(self, manager):
+        namespace = manager.namespace("t_kind")
+
+        assert namespace.cache("a", JsonSerializer()) is namespace.cache("a", JsonSerializer())
+        assert namespace.cache("a", JsonSerializer()) is not namespace.cache("b", JsonSerializer())
+
+    async def test_redis_failure_falls_back_to_loader(self, manager, redis, monkeypatch):
+        cache = manager.namespace("t_down").cache("kind", JsonSerializer())
+
+        async def broken(*args, **kwargs):
+            raise RedisConnectionError("down")
+
+        monkeypatch.setattr(redis, "get", broken)
+        monkeypatch.setattr(redis, "set", broken)
+        loader = Loader()
+
+        assert await cache.get_or_load("k", loader) == "v"
+        assert loader.calls == 1
+        assert cache_errors.value(namespace="t_down") >= 2
+
+
+class TestInvalidation:
+    async def test_invalidate_hides_old_entries(self, redis, manager):
+        cache = manager.namespace("t_inv").cache("kind", JsonSerializer())
+        await cache.set("k", "old")
+
+        assert await manager.namespace("t_inv").invalidate() == 1
+
+        assert await cache.get("k") is None
+        assert await cache.get_or_load("k", Loader("new")) == "new"
+        assert await redis.get("cache:t_inv:1:kind:k") == b'"new"'
+
+    async def test_worker_without_listener_catches_up_on_version_check(self, redis, manager):
+        other = CacheManager(redis, version_check_interval=0)
+        cache = other.namespace("t_poll").cache("kind", JsonSerializer(), remote_ttl=None)
+        await cache.set("k", "old")
+
+        await manager.invalidate("t_poll")
+
+        assert await cache.get("k") is None
+
+    async def test_pubsub_fans_out_to_other_workers(self, redis, manager):
+        other = CacheManager(redis, version_check_interval=60)
+        await other.start()
+        try:
+            mine = manager.namespace("t_fan").cache("kind", JsonSerializer(), remote_ttl=None)
+            theirs = other.namespace("t_fan").cache("kind", JsonSerializer(), remote_ttl=None)
+            await theirs.set("a", 1)
+            await theirs.set("b", 2)
+            await mine.set("a", 1)
+
+            await mine.delete("a")
+            await eventually(lambda: len(other.namespace("t_fan").local) == 1)
+            assert await theirs.get("b") == 2
+
+            await manager.namespace("t_fan").invalidate()
+            await eventually(lambda: other.namespace("t_fan").version == 1)
+            assert len(other.namespace("t_fan").local) == 0
+        finally:
+            await other.stop()
+
+    async def test_stale_version_message_is_ignored(self, manager):
+        namespace = manager.namespace("t_stale")
+        namespace.apply_version(3)
+
+        manager.apply({"ns": "t_stale", "version": 2, "origin": "other"})
+
+        assert namespace.version == 3
+
+
+class TestCachedDecorator:
+    async def test_function_keyed_by_arguments(self, manager):
+        calls = []
+
+        @cached(manager.namespace("t_dec").cache("square", JsonSerializer()))
+        async def square(x: int) -> int:
+            calls.append(x)
+            return x * x
+
+        assert [await square(2), await square(3), await square(2)] == [4, 9, 4]
+        assert calls == [2, 3]
+
+    async def test_method_resolves_cache_from_self(self, manager):
+        class Service:
+            def __init__(self, cache_manager):
+                self.calls = 0
+                self._names = cache_manager.namespace("t_method").cache("name", JsonSerializer())
+
+            @cached(lambda self: self._names, key=lambda self, user_id: f"user-{user_id}")
+            async def name(self, user_id: int) -> str:
+                self.calls += 1
+                return f"user {user_id}"
+
+        first, second = Service(manager), Service(manager)
+
+        assert await first.name(7) == "user 7"
+        assert await second.name(7) == "user 7"
+        assert first.calls + second.calls == 1
+        assert manager.namespace("t_method").local.get(("name", "user-7")) == "user 7"
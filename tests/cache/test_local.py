@@ -0,0 +1,52 @@
+import time
+
+from app.cache.local import MISSING, LocalCache
+
+
+class TestLocalCache:
+    def test_missing_vs_cached_none(self):
+        cache = LocalCache(maxsize=10, ttl=None)
+        cache.put("none", None)
+
+        assert cache.get("absent") is MISSING
+        assert cache.get("none") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = LocalCache(maxsize=2, ttl=None)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+
+        cache.put("c", 3)
+
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_expires_after_ttl(self, monkeypatch):
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        cache = LocalCache(maxsize=10, ttl=5)
+        cache.put("default", 1)
+        cache.put("short", 2, ttl=1)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+        assert cache.get("short") is MISSING
+        assert cache.get("default") == 1
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+        assert cache.get("default") is MISSING
+        assert len(cache) == 0
+
+    def test_pop_and_clear(self):
+        cache = LocalCache(maxsize=10, ttl=None)
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        cache.pop("a")
+        cache.pop("absent")
+        assert cache.get("a") is MISSING
+
+        cache.clear()
+        assert len(cache) == 0
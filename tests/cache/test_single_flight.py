@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.cache import SingleFlight
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_load(self):
+        flights = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "value"
+
+        waiters = [asyncio.create_task(flights.do("k", load)) for _ in range(100)]
+        await asyncio.sleep(0)
+        assert flights.is_loading("k")
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["value"] * 100
+        assert calls == 1
+        assert len(flights) == 0
+
+    async def test_error_reaches_every_waiter_and_is_not_remembered(self):
+        flights = SingleFlight()
+        attempts = 0
+
+        async def load():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(*(flights.do("k", load) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        with pytest.raises(RuntimeError):
+            await flights.do("k", load)
+        assert attempts == 2
+
+    async def test_cancelled_waiter_does_not_cancel_load(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 42
+
+        first = asyncio.create_task(flights.do("k", load))
+        second = asyncio.create_task(flights.do("k", load))
+        await asyncio.sleep(0)
+        second.cancel()
+        release.set()
+
+        assert await first == 42
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        assert calls == 1
+
+    async def test_load_runs_in_first_caller_task(self):
+        flights = SingleFlight()
+        loaders = []
+
+        async def load():
+            loaders.append(asyncio.current_task())
+            await asyncio.sleep(0)
+            return 1
+
+        first = asyncio.create_task(flights.do("k", load))
+        second = asyncio.create_task(flights.do("k", load))
+        await asyncio.gather(first, second)
+
+        assert loaders == [first]
+
+    async def test_cancelled_loader_hands_load_to_waiter(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+        loaders = []
+
+        async def load():
+            loaders.append(asyncio.current_task())
+            await release.wait()
+            return 42
+
+        first = asyncio.create_task(flights.do("k", load))
+        second = asyncio.create_task(flights.do("k", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == 42
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert loaders == [first, second]
+        assert len(flights) == 0
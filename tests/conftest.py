@@ -7,14 +7,26 @@ os.environ.setdefault("DB_USER", "test")
 os.environ.setdefault("DB_PASS", "test")
 os.environ.setdefault("REDIS_PASSWORD", "test")
 
+import fakeredis
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.cache import CacheManager
+from app.database import ConcurrentReads, ReadSession, ReadSlots
 from app.database.base_model import BaseDBModel
 from app.models import Category, Exercise, User, UserAnswer
 from app.processors import ProcessorFactory
-from app.repositories import CategoryRepository, ExerciseRepository, UserAnswerRepository, UserRepository
+from app.repositories import (
+    CategoryRepository,
+    ExerciseRepository,
+    UserAnswerRepository,
+    UserExerciseScheduleRepository,
+    UserRepository,
+)
+from app.services.catalog_service import CatalogService
+from app.services.exam_variant_pool import ExamVariantPool
 from app.services.exercise_selector import ExerciseSelector
+from app.services.recent_exercises_service import RecentExercisesService
 
 
 # ---------------------------------------------------------------------------
@@ -60,13 +72,20 @@ async def db_session(async_engine):
     await conn.close()
 
 
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis()
+    yield client
+    await client.aclose()
+
+
 # ---------------------------------------------------------------------------
 # Repository fixtures
 # ---------------------------------------------------------------------------
 
 @pytest.fixture
 def category_repository(db_session):
-    return CategoryRepository(session=db_session)
+    return CategoryRepository(session=ReadSession(db_session))
 
 
 @pytest.fixture
@@ -76,7 +95,7 @@ def user_repository(db_session):
 
 @pytest.fixture
 def exercise_repository(db_session):
-    return ExerciseRepository(session=db_session)
+    return ExerciseRepository(session=ReadSession(db_session))
 
 
 @pytest.fixture
@@ -85,16 +104,61 @@ def user_answer_repository(db_session):
 
 
 @pytest.fixture
-def exercise_selector(exercise_repository, user_answer_repository):
-    return ExerciseSelector(exercise_repository, user_answer_repository)
+def user_exercise_schedule_repository(db_session):
+    return UserExerciseScheduleRepository(session=db_session, read_session=ReadSession(db_session))
+
+
+@pytest.fixture
+def recent_exercises(redis):
+    return RecentExercisesService(redis)
+
+
+@pytest.fixture
+def concurrent_reads(db_session):
+    """Параллельные чтения на соединении теста: данные теста не закоммичены, поэтому по одному."""
+    factory = async_sessionmaker(
+        bind=db_session.bind, expire_on_commit=False, join_transaction_mode="rollback_only",
+    )
+    return ConcurrentReads(factory, ReadSlots(1), per_update=1)
+
+
+@pytest.fixture
+def exercise_selector(
+    exercise_repository, user_answer_repository, user_exercise_schedule_repository, category_repository,
+    recent_exercises, concurrent_reads,
+):
+    return ExerciseSelector(
+        exercise_repository=exercise_repository,
+        answer_repository=user_answer_repository,
+        schedule_repository=user_exercise_schedule_repository,
+        category_repository=category_repository,
+        recent_exercises=recent_exercises,
+        concurrent_reads=concurrent_reads,
+    )
+
+
+@pytest.fixture
+def cache_manager(redis):
+    return CacheManager(redis)
+
+
+@pytest.fixture
+def catalog_service(cache_manager):
+    return CatalogService(cache_manager)
+
+
+@pytest.fixture
+def exam_variant_pool(redis, catalog_service, exercise_repository, user_answer_repository, recent_exercises):
+    return ExamVariantPool(redis, catalog_service, exercise_repository, user_answer_repository, recent_exercises)
 
 
 @pytest.fixture
-def processor_factory(exercise_repository, user_answer_repository, exercise_selector):
+def processor_factory(exercise_repository, user_answer_repository, exercise_selector, catalog_service):
     return ProcessorFactory(
         exercise_repository=exercise_repository,
         answer_repository=user_answer_repository,
         exercise_selector=exercise_selector,
+        catalog_service=catalog_service,
     )
 
 
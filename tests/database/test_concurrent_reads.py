@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import ConcurrentReads, ReadSession, ReadSlots
+from app.models import User
+
+
+@pytest.fixture
+def session_factory(async_engine):
+    return async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class _InFlight:
+    def __init__(self) -> None:
+        self.current = 0
+        self.peak = 0
+
+    async def call(self, _session) -> None:
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+        await asyncio.sleep(0.01)
+        self.current -= 1
+
+
+class TestConcurrentReads:
+    async def test_reads_run_in_parallel_on_separate_sessions(self, session_factory):
+        reads = ConcurrentReads(session_factory, ReadSlots(3), per_update=3)
+        sessions = []
+
+        async def sleepy(session):
+            sessions.append(session.primary)
+            result = await session.execute(text("SELECT pg_backend_pid() FROM pg_sleep(0.2)"))
+            return result.scalar_one()
+
+        started = time.monotonic()
+        results = await reads.gather(sleepy, sleepy, sleepy)
+
+        assert time.monotonic() - started < 0.5
+        assert len({id(s) for s in sessions}) == 3
+        assert len(set(results)) == 3
+
+    async def test_results_keep_call_order(self, session_factory):
+        reads = ConcurrentReads(session_factory, ReadSlots(2), per_update=2)
+
+        async def slow(_session):
+            await asyncio.sleep(0.02)
+            return "slow"
+
+        async def fast(_session):
+            return "fast"
+
+        assert await reads.gather(slow, fast) == ("slow", "fast")
+
+    async def test_per_update_limit(self, session_factory):
+        reads = ConcurrentReads(session_factory, ReadSlots(10), per_update=2)
+        in_flight = _InFlight()
+
+        await reads.gather(*[in_flight.call] * 5)
+
+        assert in_flight.peak == 2
+
+    async def test_slots_are_shared_between_updates(self, session_factory):
+        slots = ReadSlots(1)
+        first = ConcurrentReads(session_factory, slots, per_update=2)
+        second = ConcurrentReads(session_factory, slots, per_update=2)
+        in_flight = _InFlight()
+
+        await asyncio.gather(
+            first.gather(in_flight.call, in_flight.call),
+            second.gather(in_flight.call, in_flight.call),
+        )
+
+        assert in_flight.peak == 1
+
+    async def test_error_is_raised_unwrapped_and_cancels_siblings(self, session_factory):
+        reads = ConcurrentReads(session_factory, ReadSlots(2), per_update=2)
+        finished = []
+
+        async def failing(_session):
+            msg = "boom"
+            raise ValueError(msg)
+
+        async def long(_session):
+            await asyncio.sleep(1)
+            finished.append(True)
+
+        with pytest.raises(ValueError, match="boom"):
+            await reads.gather(failing, long)
+        assert finished == []
+
+    async def test_reads_use_update_session_after_its_flush(self, session_factory, db_session):
+        update_session = ReadSession(db_session)
+        reads = ConcurrentReads(session_factory, ReadSlots(2), per_update=2, update_session=update_session)
+        sessions = []
+
+        async def read(session):
+            sessions.append(session)
+
+        await reads.gather(read, read)
+        assert update_session not in sessions
+
+        db_session.add(User(telegram_id=1, username="u", full_name="U"))
+        await db_session.flush()
+        sessions.clear()
+
+        await reads.gather(read, read)
+        # Записи апдейта не закоммичены: отдельные сессии их бы не увидели
+        assert sessions == [update_session, update_session]
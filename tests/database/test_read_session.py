@@ -0,0 +1,89 @@
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import ReadSession, StickyPrimary, has_writes
+from app.models import Category
+
+
+@pytest.fixture
+def replica_factory(async_engine):
+    return async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class TestReadSessionRouting:
+    async def test_without_replica_uses_primary(self, db_session):
+        read_session = ReadSession(db_session)
+        assert read_session.current is db_session
+
+    async def test_clean_request_uses_replica(self, db_session, replica_factory):
+        read_session = ReadSession(db_session, replica_factory)
+        try:
+            assert read_session.current is not db_session
+            assert read_session.current is read_session.current
+        finally:
+            await read_session.close()
+
+    async def test_sticky_user_uses_primary(self, db_session, replica_factory):
+        read_session = ReadSession(db_session, replica_factory, sticky=True)
+        assert read_session.current is db_session
+
+    async def test_pending_write_switches_to_primary(self, db_session, replica_factory):
+        read_session = ReadSession(db_session, replica_factory)
+        try:
+            db_session.add(Category(name="New"))
+            assert read_session.current is db_session
+        finally:
+            await read_session.close()
+
+    async def test_flushed_write_keeps_primary(self, db_session, replica_factory, category_factory):
+        read_session = ReadSession(db_session, replica_factory)
+        await category_factory(name="Flushed")
+        assert not db_session.new
+        assert has_writes(db_session)
+        assert read_session.current is db_session
+
+    async def test_writes_always_go_to_primary(self, db_session, replica_factory):
+        read_session = ReadSession(db_session, replica_factory)
+        category = Category(name="Via read session")
+        read_session.add(category)
+        await read_session.flush([category])
+        assert category.id is not None
+        assert category in db_session
+
+
+class TestStickyPrimary:
+    async def test_not_sticky_by_default(self, redis):
+        assert not await StickyPrimary(redis, window=5).is_sticky(1)
+
+    async def test_mark_makes_sticky(self, redis):
+        sticky = StickyPrimary(redis, window=5)
+        await sticky.mark(1)
+        assert await sticky.is_sticky(1)
+        assert not await sticky.is_sticky(2)
+
+    async def test_window_shared_between_workers(self, redis):
+        await StickyPrimary(redis, window=5).mark(1)
+        assert await StickyPrimary(redis, window=5).is_sticky(1)
+
+    async def test_window_expires(self, redis):
+        await StickyPrimary(redis, window=5).mark(1)
+        assert 0 < await redis.pttl("sticky:1") <= 5000
+
+    async def test_none_key_ignored(self, redis):
+        sticky = StickyPrimary(redis, window=5)
+        await sticky.mark(None)
+        assert not await sticky.is_sticky(None)
+        assert await redis.dbsize() == 0
+
+    async def test_zero_window_disables(self, redis):
+        sticky = StickyPrimary(redis, window=0)
+        await sticky.mark(1)
+        assert not await sticky.is_sticky(1)
+
+    async def test_redis_failure_routes_to_primary(self, redis):
+        sticky = StickyPrimary(redis, window=5)
+        with patch.object(redis, "exists", side_effect=RedisError("down")):
+            assert await sticky.is_sticky(1)
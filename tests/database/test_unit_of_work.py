@@ -0,0 +1,266 @@
+"""Бюджет SQL на апдейт: пачки flush и фиксированное число запросов на каждый тип апдейта.
+
+Сессия переключается в режим продовой (autoflush=False), сервисы собираются как в AppProvider.
+Если тест упал на числе запросов — кто-то добавил flush/чтение в горячий путь; проверьте,
+что это осознанно, и обновите бюджет.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.database import ReadSession, UnitOfWork
+from app.enums import HandlerType, SelectionStrategy
+from app.processors import ProcessorFactory
+from app.repositories import (
+    CategoryRepository,
+    ExerciseRepository,
+    UserAnswerRepository,
+    UserCategoryStatRepository,
+    UserExerciseScheduleRepository,
+    UserRepository,
+    UserStatRepository,
+)
+from app.schemas import CategoryDTO
+from app.services.catalog_service import CatalogService
+from app.services.category_service import CategoryService
+from app.services.exam_variant_pool import ExamVariantPool
+from app.services.exercise_selector import ExerciseSelector
+from app.services.leaderboard_service import LeaderboardService
+from app.services.recent_exercises_service import RecentExercisesService
+from app.services.stats_service import StatsService
+from app.services.task_service import TaskService
+from app.services.user_service import UserService
+
+_DML_PREFIXES = ("INSERT", "UPDATE", "DELETE")
+
+
+@dataclass
+class _StatementLog:
+    statements: list[str] = field(default_factory=list)
+    flushes: int = 0
+
+    @property
+    def dml(self) -> Counter[str]:
+        """DML по таблицам; порядок внутри flush у несвязанных таблиц не фиксирован."""
+        return Counter(" ".join(s.split()[:3]) for s in self.statements if s.startswith(_DML_PREFIXES))
+
+    def reset(self) -> None:
+        self.statements.clear()
+        self.flushes = 0
+
+
+@pytest.fixture
+async def statement_log(db_session):
+    db_session.sync_session.autoflush = False
+    log = _StatementLog()
+    connection = (await db_session.connection()).sync_connection
+
+    def _on_execute(_conn, _cursor, statement, _params, _context, _executemany):
+        log.statements.append(statement.lstrip())
+
+    def _on_flush(_session, _flush_context):
+        log.flushes += 1
+
+    event.listen(connection, "before_cursor_execute", _on_execute)
+    event.listen(db_session.sync_session, "after_flush", _on_flush)
+    yield log
+    event.remove(connection, "before_cursor_execute", _on_execute)
+    event.remove(db_session.sync_session, "after_flush", _on_flush)
+
+
+@pytest.fixture
+def make_update(db_session, redis, concurrent_reads, cache_manager):
+    """Собирает сервисы одного апдейта, как REQUEST-скоуп AppProvider: кэши сервисов не переживают апдейт."""
+    def _make() -> tuple[UserService, TaskService, UnitOfWork]:
+        read_session = ReadSession(db_session)
+        user_repository = UserRepository(db_session)
+        category_repository = CategoryRepository(read_session)
+        exercise_repository = ExerciseRepository(read_session)
+        user_answer_repository = UserAnswerRepository(db_session)
+        user_stat_repository = UserStatRepository(db_session, read_session)
+        user_category_stat_repository = UserCategoryStatRepository(db_session, read_session)
+        recent_exercises = RecentExercisesService(redis)
+        exercise_selector = ExerciseSelector(
+            exercise_repository=exercise_repository,
+            answer_repository=user_answer_repository,
+            schedule_repository=UserExerciseScheduleRepository(db_session, read_session),
+            category_repository=category_repository,
+            recent_exercises=recent_exercises,
+            concurrent_reads=concurrent_reads,
+        )
+        catalog_service = CatalogService(cache_manager)
+        processor_factory = ProcessorFactory(exercise_repository, user_answer_repository, exercise_selector, catalog_service)
+        variant_pool = ExamVariantPool(
+            redis, catalog_service, exercise_repository, user_answer_repository, recent_exercises,
+        )
+        uow = UnitOfWork(db_session)
+        leaderboard_service = LeaderboardService(
+            redis=redis,
+            category_repository=category_repository,
+            user_repository=user_repository,
+            user_stat_repository=user_stat_repository,
+            user_category_stat_repository=user_category_stat_repository,
+            user_answer_repository=user_answer_repository,
+            category_service=CategoryService(db_session, category_repository, cache_manager),
+            unit_of_work=uow,
+        )
+        stats_service = StatsService(
+            user_stat_repository=user_stat_repository,
+            user_category_stat_repository=user_category_stat_repository,
+            category_repository=category_repository,
+            user_answer_repository=user_answer_repository,
+            leaderboard_service=leaderboard_service,
+            concurrent_reads=concurrent_reads,
+        )
+        return (
+            UserService(db_session, user_repository, category_repository),
+            TaskService(
+                processor_factory=processor_factory,
+                user_repository=user_repository,
+                exercise_repository=exercise_repository,
+                stats_service=stats_service,
+                recent_exercises=recent_exercises,
+                variant_pool=variant_pool,
+            ),
+            uow,
+        )
+
+    return _make
+
+
+@pytest.fixture
+async def exam_category(category_factory, exercise_factory):
+    parent = await category_factory(name="P4", handler_type=HandlerType.TASK_4_EXAM)
+    child = await category_factory(name="C4", handler_type=HandlerType.TASK_4_EXAM, parent_id=parent.id)
+    for i in range(10):
+        await exercise_factory(
+            category_id=parent.id,
+            content={"word": f"слово{i}", "incorrect_stress": 2},
+            answer="1",
+            explanation=f"Объяснение {i}",
+        )
+    return CategoryDTO(id=child.id, name=child.name, handler_type=child.handler_type, parent_id=child.parent_id)
+
+
+async def _load_user(db_session, user_service, telegram_id):
+    """Начало апдейта: новая identity map и загрузка юзера, как в UserMiddleware."""
+    db_session.expunge_all()
+    return await user_service.get_user_by_telegram(telegram_id, "testuser", "Test User")
+
+
+async def _click_category(db_session, make_update, telegram_id, category):
+    user_service, task_service, uow = make_update()
+    user = await _load_user(db_session, user_service, telegram_id)
+    await user_service.select_category(user, category)
+    await task_service.start_task(user)
+    await uow.commit()
+
+
+class TestUpdateStatementBudget:
+    async def test_category_click(self, db_session, make_update, statement_log, user_factory, exam_category):
+        tg_user = await user_factory()
+        statement_log.reset()
+
+        await _click_category(db_session, make_update, tg_user.telegram_id, exam_category)
+
+        assert statement_log.flushes == 1
+        assert statement_log.dml == Counter({
+            "UPDATE users SET": 1,
+        })
+        # юзер с категорией, стратегия категории, кандидаты, заглушки победителей, UPDATE users
+        assert len(statement_log.statements) == 5
+
+    async def test_exam_answer(
+        self, db_session, make_update, statement_log, user_factory, exam_category, cache_manager,
+    ):
+        tg_user = await user_factory()
+        await _click_category(db_session, make_update, tg_user.telegram_id, exam_category)
+        # Карта заданий ЕГЭ у рабочего процесса уже в кэше; без прогрева бюджет зависел бы от верности ответа
+        await CategoryService(db_session, CategoryRepository(ReadSession(db_session)), cache_manager).get_ege_task_map()
+        statement_log.reset()
+
+        user_service, task_service, uow = make_update()
+        user = await _load_user(db_session, user_service, tg_user.telegram_id)
+
+        await task_service.check_answer(user, "135")
+        await uow.flush()
+        await task_service.start_task(user)
+        await uow.commit()
+
+        # Ответы уходят до выбора следующего задания, UPDATE users — на коммите
+        assert statement_log.flushes == 2
+        # Пять ответов экзаменационного задания — один INSERT (insertmanyvalues)
+        assert statement_log.dml == Counter({
+            "INSERT INTO user_answers": 1,
+            "INSERT INTO user_stats": 1,
+            "INSERT INTO user_category_stats": 1,
+            "UPDATE users SET": 1,
+        })
+        # юзер, текущие упражнения, стратегия категории, 3 чтения статистики, выборка следующего задания (2)
+        assert len(statement_log.statements) == 12
+
+
+async def _answer(db_session, make_update, telegram_id, answer):
+    """Апдейт ответа, как в submit_answer: проверка, flush, выбор следующего задания, commit."""
+    user_service, task_service, uow = make_update()
+    user = await _load_user(db_session, user_service, telegram_id)
+    answered_ids = list(user.current_exercise_ids)
+    await task_service.check_answer(user, answer)
+    await uow.flush()
+    await task_service.start_task(user)
+    await uow.commit()
+    return answered_ids, (await _load_user(db_session, user_service, telegram_id)).current_exercise_ids
+
+
+@pytest.fixture
+async def drill_category(category_factory, exercise_factory):
+    parent = await category_factory(name="P4", handler_type=HandlerType.TASK_4_DRILL)
+    child = await category_factory(name="C4", handler_type=HandlerType.TASK_4_DRILL, parent_id=parent.id)
+    exercises = [
+        await exercise_factory(category_id=parent.id, content={"word": f"слово{i}", "incorrect_stress": 2}, answer="1")
+        for i in range(3)
+    ]
+    dto = CategoryDTO(id=child.id, name=child.name, handler_type=child.handler_type, parent_id=child.parent_id)
+    return parent, dto, exercises
+
+
+class TestAnswerSeesOwnWrites:
+    """Выбор после ответа видит этот ответ, хотя сессия апдейта работает без autoflush."""
+
+    async def test_last_unseen_exercise_is_not_served_again(
+        self, db_session, make_update, statement_log, user_factory, user_answer_factory, drill_category,
+    ):
+        parent, category, exercises = drill_category
+        tg_user = await user_factory()
+        for exercise in exercises[1:]:
+            await user_answer_factory(tg_user.id, exercise.id, parent.id)
+        await _click_category(db_session, make_update, tg_user.telegram_id, category)
+
+        answered, next_ids = await _answer(db_session, make_update, tg_user.telegram_id, "1")
+
+        assert answered == [exercises[0].id]
+        assert next_ids != answered
+
+    async def test_reviewed_sm2_item_is_not_served_again(
+        self, db_session, make_update, statement_log, user_factory, user_exercise_schedule_repository,
+        drill_category,
+    ):
+        parent, category, exercises = drill_category
+        parent.selection_strategy = SelectionStrategy.SPACED_REPETITION
+        tg_user = await user_factory()
+        now = datetime.now(UTC)
+        # Оба просрочены; первое сильнее, его и выдаст клик по категории
+        for days, exercise in ((3, exercises[0]), (2, exercises[1])):
+            await user_exercise_schedule_repository.record_review(
+                tg_user.id, exercise.id, parent.id, now - timedelta(days=days), is_correct=True,
+            )
+        await db_session.flush()
+        await _click_category(db_session, make_update, tg_user.telegram_id, category)
+
+        answered, next_ids = await _answer(db_session, make_update, tg_user.telegram_id, "1")
+
+        assert answered == [exercises[0].id]
+        assert next_ids == [exercises[1].id]
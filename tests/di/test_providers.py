@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.types import TelegramObject
+from dishka import make_async_container
+from dishka.integrations.aiogram import AiogramProvider
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import ReadSession
+from app.di import AppProvider
+
+USER_ID = 42
+
+
+@pytest.fixture
+def redis_spy(monkeypatch):
+    redis = AsyncMock(spec=Redis)
+    # Команды redis-py объявлены синхронными и возвращают awaitable
+    redis.exists = AsyncMock(return_value=0)
+    redis.set = AsyncMock()
+    monkeypatch.setattr("app.di.providers.redis_client", redis)
+    return redis
+
+
+async def _write_update(replica_factory, monkeypatch) -> ReadSession:
+    """Апдейт юзера с записью: сессия отмечена как писавшая до выхода из REQUEST-скоупа."""
+    monkeypatch.setattr("app.di.providers.replica_session_factory", replica_factory)
+    container = make_async_container(AppProvider(), AiogramProvider())
+    event = SimpleNamespace(from_user=SimpleNamespace(id=USER_ID))
+    try:
+        async with container(context={TelegramObject: event}) as request_container:
+            read_session = await request_container.get(ReadSession)
+            (await request_container.get(AsyncSession)).info["has_writes"] = True
+    finally:
+        await container.close()
+    return read_session
+
+
+class TestStickyPrimaryRouting:
+    async def test_no_replica_skips_redis(self, redis_spy, monkeypatch):
+        read_session = await _write_update(None, monkeypatch)
+
+        assert not read_session.sticky
+        assert redis_spy.method_calls == []
+
+    async def test_replica_checks_and_marks_window(self, redis_spy, monkeypatch, async_engine):
+        await _write_update(lambda: AsyncSession(async_engine), monkeypatch)
+
+        redis_spy.exists.assert_awaited_once_with(f"sticky:{USER_ID}")
+        redis_spy.set.assert_awaited_once()
@@ -0,0 +1,200 @@
+"""Свёртка холодной истории не должна менять ничего, что читают выборка и статистика."""
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import answer_compaction_settings
+from app.jobs.compact_answers import compact_answers
+from app.models import UserAnswer, UserAnswerSummary, UserCategoryStat
+from app.repositories import FastUserAnswerRepository, UserCategoryStatRepository, answer_eq
+from app.services.exercise_selector import STATS_WINDOW_SIZE
+from app.utils.dates import week_start_msk
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+BEFORE = NOW - timedelta(days=30)
+
+
+@pytest.fixture
+async def long_history(db_session, category_factory, exercise_factory, user_factory, user_answer_factory):
+    """Годовая история: старые серии ответов, ответы из второй категории, группа и свежие ответы."""
+    category = await category_factory()
+    other = await category_factory(name="Other")
+    group = uuid.uuid4()
+    exercises = [
+        await exercise_factory(category_id=category.id, answer=str(i % 3), group_id=group if i < 2 else None)
+        for i in range(6)
+    ]
+    shared = await exercise_factory(category_id=other.id, answer="0", group_id=group)
+
+    user, bystander = await user_factory(), await user_factory()
+    answers = []
+    for i, exercise in enumerate(exercises):
+        for attempt in range(4 + i * 2):
+            answers.append((user, exercise, category, (attempt + i) % 3 != 0, 300 - attempt * 7 - i))
+        # Экзамены пишут ответ под другой категорией: «решал ли в категории» обязано сохраниться
+        answers.append((user, exercise, other, i % 2 == 0, 250 - i))
+    for attempt in range(9):
+        answers.append((user, shared, other, attempt % 2 == 0, 200 - attempt * 5))
+        answers.append((bystander, exercises[0], category, attempt % 3 == 0, 200 - attempt * 5))
+    # Свежие ответы: часть внутри текущей недели
+    answers.append((user, exercises[5], category, True, 3))
+    answers.append((user, exercises[1], category, False, 20))
+
+    created = []
+    for n, (who, exercise, answer_category, is_correct, days_ago) in enumerate(answers):
+        answer = await user_answer_factory(
+            who.id, exercise.id, answer_category.id, is_correct=is_correct, solve_time=5 + n % 11,
+        )
+        answer.created_at = NOW - timedelta(days=days_ago, minutes=n)
+        created.append(answer)
+    # Одна проверка — общая группа ответов и общий момент создания
+    check = uuid.uuid4()
+    for exercise in exercises[:2]:
+        answer = await user_answer_factory(user.id, exercise.id, category.id, is_correct=True)
+        answer.group_id, answer.created_at = check, NOW - timedelta(hours=1)
+
+    db_session.add_all([
+        UserCategoryStat(user_id=user.id, category_id=category.id, total_answered=40, total_correct=25,
+                         distinct_answered=6),
+        UserCategoryStat(user_id=user.id, category_id=other.id, total_answered=15, total_correct=8,
+                         distinct_answered=7),
+    ])
+    await db_session.flush()
+    return category, other, user, bystander, exercises
+
+
+async def _snapshot(db_session, user_answer_repository, long_history):
+    category, other, user, bystander, exercises = long_history
+    fast = FastUserAnswerRepository(db_session)
+    stats_repository = UserCategoryStatRepository(db_session, db_session)
+    snapshot = {}
+    for who in (user, bystander):
+        for cat in (category, other):
+            snapshot[who.id, cat.id] = (
+                sorted(await user_answer_repository.get_exercise_stats(who.id, cat.id, STATS_WINDOW_SIZE)),
+                sorted(await user_answer_repository.get_exercise_stats(
+                    who.id, cat.id, STATS_WINDOW_SIZE, filters=[answer_eq("0")],
+                )),
+                sorted(await fast.get_exercise_stats(who.id, cat.id, STATS_WINDOW_SIZE)),
+                sorted(await user_answer_repository.get_group_stats(who.id, cat.id, STATS_WINDOW_SIZE)),
+                sorted(await user_answer_repository.get_answer_group_stats(who.id, cat.id, 1, STATS_WINDOW_SIZE)),
+                sorted(await fast.get_answer_group_stats(who.id, cat.id, 1, STATS_WINDOW_SIZE)),
+                await user_answer_repository.get_answered_exercise_ids(who.id, cat.id),
+                await user_answer_repository.get_recent_results(who.id, [cat.id], limit=STATS_WINDOW_SIZE),
+            )
+        snapshot[who.id] = await user_answer_repository.get_answered_among(who.id, [ex.id for ex in exercises])
+    snapshot["week"] = sorted([
+        tuple(row) async for batch in user_answer_repository.stream_correct_checks(since=week_start_msk(NOW))
+        for row in batch
+    ])
+    snapshot["category_stats"] = [
+        (stat.category_id, stat.total_answered, stat.total_correct, stat.distinct_answered)
+        for stat in await stats_repository.get_all_by_user(user.id)
+    ]
+    return snapshot
+
+
+async def _answer_totals(db_session):
+    """Полные счётчики по (user, exercise, category): сырые ответы плюс свёртки."""
+    totals: dict[tuple[int, int, int], list[int]] = {}
+    raw = await db_session.execute(
+        select(
+            UserAnswer.user_id, UserAnswer.exercise_id, UserAnswer.category_id,
+            func.count().filter(UserAnswer.is_correct), func.count().filter(~UserAnswer.is_correct),
+            func.sum(UserAnswer.solve_time),
+        ).group_by(UserAnswer.user_id, UserAnswer.exercise_id, UserAnswer.category_id),
+    )
+    summaries = await db_session.execute(select(
+        UserAnswerSummary.user_id, UserAnswerSummary.exercise_id, UserAnswerSummary.category_id,
+        UserAnswerSummary.n_correct, UserAnswerSummary.n_wrong, UserAnswerSummary.total_solve_time,
+    ))
+    for user_id, exercise_id, category_id, *counts in [*raw.all(), *summaries.all()]:
+        current = totals.setdefault((user_id, exercise_id, category_id), [0, 0, 0])
+        for i, value in enumerate(counts):
+            current[i] += value
+    return totals
+
+
+class TestCompactHistory:
+    async def test_reads_are_unchanged(self, db_session, user_answer_repository, long_history):
+        _, _, user, bystander, _ = long_history
+        before = await _snapshot(db_session, user_answer_repository, long_history)
+
+        folded = await user_answer_repository.compact_history([user.id, bystander.id], BEFORE, STATS_WINDOW_SIZE)
+
+        assert folded > 0
+        assert await _snapshot(db_session, user_answer_repository, long_history) == before
+
+    async def test_summaries_keep_totals(self, db_session, user_answer_repository, long_history):
+        _, _, user, bystander, _ = long_history
+        before = await _answer_totals(db_session)
+
+        await user_answer_repository.compact_history([user.id, bystander.id], BEFORE, STATS_WINDOW_SIZE)
+
+        assert await _answer_totals(db_session) == before
+
+    async def test_only_cold_answers_are_folded(self, db_session, user_answer_repository, long_history):
+        category, _, user, _, exercises = long_history
+        await user_answer_repository.compact_history([user.id], BEFORE, STATS_WINDOW_SIZE)
+
+        remaining = (await db_session.execute(
+            select(UserAnswer.created_at).where(
+                UserAnswer.user_id == user.id,
+                UserAnswer.exercise_id == exercises[5].id,
+                UserAnswer.category_id == category.id,
+            ),
+        )).scalars().all()
+        summary = (await db_session.execute(
+            select(UserAnswerSummary).where(
+                UserAnswerSummary.user_id == user.id, UserAnswerSummary.exercise_id == exercises[5].id,
+            ),
+        )).scalar_one()
+
+        assert len(remaining) == STATS_WINDOW_SIZE
+        assert summary.n_correct + summary.n_wrong == 4 + 5 * 2 + 1 - STATS_WINDOW_SIZE
+        assert summary.first_answered_at < summary.last_answered_at < min(remaining)
+        assert summary.last_answered_at < BEFORE
+
+    async def test_repeated_runs_accumulate(self, db_session, user_answer_repository, user_answer_factory,
+                                            long_history):
+        category, _, user, _, exercises = long_history
+        await user_answer_repository.compact_history([user.id], BEFORE, STATS_WINDOW_SIZE)
+        for n in range(3):
+            answer = await user_answer_factory(user.id, exercises[5].id, category.id, is_correct=False)
+            answer.created_at = NOW - timedelta(days=35, minutes=n)
+        # Новые ответы вытесняют из окна те, что были свежими при первом проходе
+        await db_session.flush()
+        before = await _answer_totals(db_session)
+
+        folded = await user_answer_repository.compact_history([user.id], NOW, STATS_WINDOW_SIZE)
+
+        assert folded > 0
+        assert await _answer_totals(db_session) == before
+
+    async def test_other_users_untouched(self, db_session, user_answer_repository, long_history):
+        _, _, user, bystander, _ = long_history
+
+        await user_answer_repository.compact_history([user.id], BEFORE, STATS_WINDOW_SIZE)
+
+        summaries = (await db_session.execute(select(UserAnswerSummary.user_id).distinct())).scalars().all()
+        assert summaries == [user.id]
+        assert await user_answer_repository.compact_history([], BEFORE, STATS_WINDOW_SIZE) == 0
+
+
+class TestCompactAnswersJob:
+    async def test_walks_all_users_in_batches(self, db_session, user_answer_repository, long_history, monkeypatch):
+        monkeypatch.setattr(answer_compaction_settings, "USERS_PER_BATCH", 1)
+        factory = async_sessionmaker(bind=db_session.bind, expire_on_commit=False,
+                                     join_transaction_mode="rollback_only")
+        expected = await _answer_totals(db_session)
+
+        folded = await compact_answers(factory, now=NOW)
+
+        assert folded > 0
+        assert await compact_answers(factory, now=NOW) == 0
+        assert await _answer_totals(db_session) == expected
+        users = (await db_session.execute(select(UserAnswerSummary.user_id).distinct())).scalars().all()
+        assert len(users) == 2
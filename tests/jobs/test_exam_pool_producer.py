@@ -0,0 +1,83 @@
+import pytest
+
+from app.config import exam_pool_settings
+from app.enums import HandlerType
+from app.jobs.exam_pool_producer import POOL_USER_ID, pool_user, refill_category, variant_of
+from app.processors import POOLED_HANDLER_TYPES
+from app.schemas import CategoryDTO
+from app.services.exam_variant_pool import pool_depth, pool_generation_errors
+
+LETTERS = ["а", "о", "е", "и"]
+
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    monkeypatch.setattr(exam_pool_settings, "DEPTH", 3)
+    monkeypatch.setattr(exam_pool_settings, "REFILL_BATCH", 2)
+
+
+async def _exam_category(category_factory, exercise_factory, words_per_letter):
+    parent = await category_factory(name="P9", handler_type=HandlerType.TASK_9_EXAM)
+    child = await category_factory(name="C9", handler_type=HandlerType.TASK_9_EXAM, parent_id=parent.id)
+    for li, letter in enumerate(LETTERS):
+        for i in range(words_per_letter):
+            await exercise_factory(
+                category_id=parent.id,
+                content={"word": f"сл{{letter}}во{li}{i}", "incorrect_letter": LETTERS[(li + 1) % 4]},
+                answer=letter,
+            )
+    return CategoryDTO.from_orm_obj(child)
+
+
+def test_pooled_handler_types():
+    assert {HandlerType.TASK_8_EXAM, HandlerType.TASK_9_EXAM, HandlerType.TASK_12_EXAM,
+            HandlerType.TASK_13_EXAM, HandlerType.TASK_22_EXAM} <= POOLED_HANDLER_TYPES
+    assert HandlerType.TASK_4_EXAM not in POOLED_HANDLER_TYPES
+    assert HandlerType.TASK_9_DRILL not in POOLED_HANDLER_TYPES
+
+
+def test_pool_user_has_no_history():
+    category = CategoryDTO(id=5, name="C", handler_type=HandlerType.TASK_9_EXAM, parent_id=4)
+    user = pool_user(category)
+
+    assert user.id == POOL_USER_ID
+    assert user.current_category == category
+
+
+@pytest.mark.usefixtures("small_pool")
+async def test_refill_tops_up_to_depth(
+    processor_factory, exam_variant_pool, category_factory, exercise_factory,
+):
+    category = await _exam_category(category_factory, exercise_factory, words_per_letter=6)
+
+    assert await refill_category(category, processor_factory, exam_variant_pool) == 2
+    assert await refill_category(category, processor_factory, exam_variant_pool) == 1
+    assert await refill_category(category, processor_factory, exam_variant_pool) == 0
+    assert await exam_variant_pool.depth(category.id) == 3
+    assert pool_depth.value(category=category.id) == 3
+
+
+@pytest.mark.usefixtures("small_pool")
+async def test_stored_variant_restores(
+    processor_factory, exam_variant_pool, category_factory, exercise_factory, user_factory,
+):
+    category = await _exam_category(category_factory, exercise_factory, words_per_letter=6)
+    await refill_category(category, processor_factory, exam_variant_pool)
+    user = (await user_factory()).id
+
+    response = await exam_variant_pool.take(
+        pool_user(category).model_copy(update={"id": user}), processor_factory.get_processor(HandlerType.TASK_9_EXAM),
+    )
+
+    assert response is not None
+    assert len(variant_of(response).exercise_ids) == 15
+
+
+@pytest.mark.usefixtures("small_pool")
+async def test_small_bank_counts_error(processor_factory, exam_variant_pool, category_factory, exercise_factory):
+    category = await _exam_category(category_factory, exercise_factory, words_per_letter=1)
+    before = pool_generation_errors.value(category=category.id)
+
+    assert await refill_category(category, processor_factory, exam_variant_pool) == 0
+    assert pool_generation_errors.value(category=category.id) == before + 1
+    assert await exam_variant_pool.depth(category.id) == 0
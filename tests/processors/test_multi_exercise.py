@@ -5,6 +5,7 @@ from datetime import UTC, datetime
 import pytest
 
 from app.enums import HandlerType
+from app.exceptions import TaskForUserNotFoundError
 from app.rendering.rich_renderer import RichRenderer
 from app.schemas import CategoryDTO, ExerciseDTO, UserWithExercisesDTO
 from app.schemas.user_schemas import UserWithCategoryDTO
@@ -317,6 +318,41 @@ class TestTask5ExamProcessor:
             exercises.append(ex)
         return cat, exercises
 
+    async def test_create_task_small_category_without_overlap(
+        self, processor_factory, user_factory, category_factory, exercise_factory,
+    ):
+        parent, exercises = await self._make_exercises(category_factory, exercise_factory)
+        child = await category_factory(handler_type=HandlerType.TASK_5_EXAM, parent_id=parent.id)
+        for i in range(3):
+            await exercise_factory(
+                category_id=parent.id,
+                content={**exercises[i].content, "sentence": f"Повтор {{word}} {i}."},
+                answer="2",
+            )
+        user = await user_factory()
+
+        processor = processor_factory.get_processor(HandlerType.TASK_5_EXAM)
+        for _ in range(5):
+            result = await processor.create_task(_user_dto(user, child))
+
+            picked = await processor._exercise_repository.get_by_ids(result.task_config.exercise_ids)
+            words = [word for ex in picked for word in ex.content["words"]]
+            assert len(picked) == 5
+            assert len(words) == len(set(words))
+
+    async def test_create_task_not_enough_disjoint(
+        self, processor_factory, user_factory, category_factory, exercise_factory, db_session,
+    ):
+        parent, exercises = await self._make_exercises(category_factory, exercise_factory)
+        child = await category_factory(handler_type=HandlerType.TASK_5_EXAM, parent_id=parent.id)
+        await db_session.delete(exercises[0])
+        await db_session.flush()
+        user = await user_factory()
+
+        processor = processor_factory.get_processor(HandlerType.TASK_5_EXAM)
+        with pytest.raises(TaskForUserNotFoundError):
+            await processor.create_task(_user_dto(user, child))
+
     async def test_process_answer_correct(self, processor_factory, user_factory, category_factory, exercise_factory):
         cat, exercises = await self._make_exercises(category_factory, exercise_factory)
         user = await user_factory()
@@ -481,6 +517,61 @@ class TestTask9ExamProcessor:
         assert result.is_correct is False
 
 
+# ===================================================================
+# Task9/11 Exam — create_task (wrong rows from the confusion index)
+# ===================================================================
+
+class TestTaskN9N12ExamCreateTask:
+    @staticmethod
+    async def _fill(category_id, exercise_factory):
+        letters = ["а", "о", "е", "и"]
+        for li, letter in enumerate(letters):
+            for i in range(6):
+                await exercise_factory(
+                    category_id=category_id,
+                    content={"word": f"сл{{letter}}во{li}{i}", "incorrect_letter": letters[(li + 1) % 4]},
+                    answer=letter,
+                    explanation="Объяснение",
+                )
+
+    @pytest.mark.parametrize(("handler_type", "wpr"), [
+        (HandlerType.TASK_9_EXAM, 3),
+        (HandlerType.TASK_11_EXAM, 2),
+    ])
+    async def test_create_task(
+        self, processor_factory, user_factory, category_factory, exercise_factory, handler_type, wpr,
+    ):
+        parent = await category_factory(name="P9", handler_type=handler_type)
+        child = await category_factory(name="C9", handler_type=handler_type, parent_id=parent.id)
+        await self._fill(parent.id, exercise_factory)
+        user = await user_factory()
+
+        processor = processor_factory.get_processor(handler_type)
+        result = await processor.create_task(_user_dto(user, child))
+
+        config = result.task_config
+        assert len(config.exercise_ids) == len(set(config.exercise_ids)) == 5 * wpr
+        assert 2 <= len(config.correct_row_indices) <= 4
+
+    async def test_wrong_rows_mix_answers(
+        self, processor_factory, user_factory, category_factory, exercise_factory, db_session,
+    ):
+        parent = await category_factory(name="P9", handler_type=HandlerType.TASK_9_EXAM)
+        child = await category_factory(name="C9", handler_type=HandlerType.TASK_9_EXAM, parent_id=parent.id)
+        await self._fill(parent.id, exercise_factory)
+        user = await user_factory()
+
+        processor = processor_factory.get_processor(HandlerType.TASK_9_EXAM)
+        result = await processor.create_task(_user_dto(user, child))
+
+        config = result.task_config
+        answers = {ex.id: ex.answer for ex in await processor._exercise_repository.get_by_ids(config.exercise_ids)}
+        for row_idx in range(5):
+            row = config.exercise_ids[row_idx * 3:(row_idx + 1) * 3]
+            row_answers = {answers[eid] for eid in row}
+            assert (len(row_answers) == 1) == (row_idx in config.correct_row_indices)
+
+
 # ===================================================================
 # Task11 Exam — process_answer (10 exercises: 5 rows × 2 words)
 # ===================================================================
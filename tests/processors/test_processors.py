@@ -62,8 +62,8 @@ def _user_with_exercises_dto(user_orm, cat_orm, exercise_orms):
 @pytest.mark.parametrize("processor_cls", [SkipProcessor, SoonProcessor])
 class TestGenericProcessors:
     async def test_create_task(self, processor_cls, exercise_repository, user_answer_repository, exercise_selector,
-                               user_factory, category_factory):
-        processor = processor_cls(exercise_repository, user_answer_repository, exercise_selector)
+                               catalog_service, user_factory, category_factory):
+        processor = processor_cls(exercise_repository, user_answer_repository, exercise_selector, catalog_service)
         user = await user_factory()
         cat = await category_factory()
         dto = _user_dto(user, cat)
@@ -72,8 +72,8 @@ class TestGenericProcessors:
         assert result.task_ui.view is not None
 
     async def test_process_answer(self, processor_cls, exercise_repository, user_answer_repository, exercise_selector,
-                                  user_factory, category_factory):
-        processor = processor_cls(exercise_repository, user_answer_repository, exercise_selector)
+                                  catalog_service, user_factory, category_factory):
+        processor = processor_cls(exercise_repository, user_answer_repository, exercise_selector, catalog_service)
         user = await user_factory()
         cat = await category_factory()
         dto = _user_with_exercises_dto(user, cat, [])
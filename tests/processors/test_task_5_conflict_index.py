@@ -0,0 +1,70 @@
+from app.processors.tasks.task_05 import WordConflictIndex
+
+# (id, words)
+ENTRIES = [
+    (1, ["эффектный", "эффективный"]),
+    (2, ["эффективный", "эффектный"]),
+    (3, ["абонент", "абонемент"]),
+    (4, ["дипломат", "дипломант"]),
+    (5, ["гуманный", "гуманистический"]),
+    (6, ["гуманистический", "гуманитарный"]),
+    (7, ["болотный", "болотистый"]),
+]
+
+
+def _words_disjoint(index: WordConflictIndex, ids: list[int]) -> bool:
+    seen: set[str] = set()
+    for eid in ids:
+        if index.words[eid] & seen:
+            return False
+        seen |= index.words[eid]
+    return True
+
+
+class TestBuild:
+    def test_maps(self):
+        index = WordConflictIndex.build(ENTRIES)
+
+        assert index.words[3] == frozenset({"абонент", "абонемент"})
+        assert set(index.by_word["эффектный"]) == {1, 2}
+        assert index.by_word["гуманистический"] == (5, 6)
+
+
+class TestSample:
+    def test_picks_disjoint_exercises(self):
+        index = WordConflictIndex.build(ENTRIES)
+
+        for _ in range(50):
+            ids = index.sample(5, {})
+            assert ids is not None
+            assert len(set(ids)) == 5
+            assert _words_disjoint(index, ids)
+
+    def test_small_category_with_exact_solution(self):
+        index = WordConflictIndex.build(ENTRIES)
+
+        for _ in range(50):
+            assert index.sample(5, {}) is not None
+
+    def test_not_enough_disjoint(self):
+        index = WordConflictIndex.build(ENTRIES[:2] + ENTRIES[4:6])
+
+        assert index.sample(3, {}) is None
+
+    def test_unseen_before_seen(self):
+        entries = [(i, [f"слово{i}"]) for i in range(1, 11)]
+        index = WordConflictIndex.build(entries)
+        weights = {i: 0.5 for i in range(1, 6)}
+
+        ids = index.sample(5, weights)
+
+        assert ids is not None
+        assert set(ids) == {6, 7, 8, 9, 10}
+
+    def test_weaker_seen_first(self):
+        entries = [(i, [f"слово{i}"]) for i in range(1, 5)]
+        index = WordConflictIndex.build(entries)
+
+        ids = index.sample(2, {1: 0.1, 2: 0.9, 3: 0.8, 4: 0.2})
+
+        assert ids == [2, 3]
@@ -0,0 +1,77 @@
+import pytest
+
+from app.processors.tasks.task_09_12 import ConfusionIndex
+
+# (id, answer, incorrect_letter)
+ENTRIES = [
+    (1, "а", "о"), (2, "а", "о"), (3, "а", "е"),
+    (4, "о", "а"), (5, "о", "а"),
+    (6, "е", "и"), (7, "и", "е"),
+]
+
+
+class TestBuild:
+    def test_maps(self):
+        index = ConfusionIndex.build(ENTRIES)
+
+        assert index.pairs[("а", "о")] == (1, 2)
+        assert set(index.by_answer["а"]) == {1, 2, 3}
+        assert set(index.confusers["а"]) == {4, 5}
+        assert set(index.confusers["е"]) == {3, 7}
+        assert index.answers[6] == "е"
+
+    def test_same_letter_pair_is_not_confuser(self):
+        index = ConfusionIndex.build([(1, "а", "а")])
+
+        assert "а" not in index.confusers
+
+
+class TestBuildWrongRows:
+    @pytest.mark.parametrize("wpr", [2, 3])
+    def test_rows_have_mixed_answers_and_unique_ids(self, wpr):
+        index = ConfusionIndex.build(ENTRIES)
+
+        rows = index.build_wrong_rows(2, wpr, {}, set())
+
+        assert len(rows) == 2
+        ids = [eid for row in rows for eid in row]
+        assert len(ids) == len(set(ids)) == 2 * wpr
+        for row in rows:
+            assert len({index.answers[eid] for eid in row}) > 1
+
+    def test_two_word_row_is_confusing_pair(self):
+        index = ConfusionIndex.build([(1, "а", "е"), (2, "о", "а"), (3, "и", "у")])
+
+        for _ in range(20):
+            row = index.build_wrong_rows(1, 2, {}, set())[0]
+            assert set(row) == {1, 2}
+
+    def test_respects_used_ids(self):
+        index = ConfusionIndex.build(ENTRIES)
+        used = {1, 2, 3, 4}
+
+        rows = index.build_wrong_rows(1, 2, {}, used)
+
+        assert not set(rows[0]) & {1, 2, 3, 4}
+        assert set(rows[0]) <= used
+
+    def test_unseen_preferred_over_seen(self):
+        entries = [(i, "а", "о") for i in range(1, 6)] + [(10, "о", "а")]
+        index = ConfusionIndex.build(entries)
+        weights = {1: 0.9, 2: 0.8, 3: 0.7, 4: 0.6}
+
+        row = index.build_wrong_rows(1, 2, weights, set())[0]
+
+        assert set(row) == {5, 10}
+
+    def test_falls_back_without_confusing_pairs(self):
+        index = ConfusionIndex.build([(1, "а", "у"), (2, "о", "ы"), (3, "е", "э")])
+
+        rows = index.build_wrong_rows(1, 3, {}, set())
+
+        assert sorted(rows[0]) == [1, 2, 3]
+
+    def test_stops_when_exhausted(self):
+        index = ConfusionIndex.build([(1, "а", "о"), (2, "о", "а")])
+
+        assert len(index.build_wrong_rows(3, 2, {}, set())) == 1
@@ -0,0 +1,141 @@
+"""Фильтры по content идут в generated columns и используют индексы.
+
+Тесты перехватывают SQL, который выполняют процессоры, и прогоняют его через EXPLAIN
+после ANALYZE и с выключенным seq scan: на маленькой тестовой базе планировщик иначе
+всегда выбирает полный скан.
+"""
+import pytest
+from sqlalchemy import event, select
+
+from app.enums import HandlerType
+from app.models import Exercise
+from app.repositories import content_eq, content_exists
+from app.schemas import CategoryDTO
+from app.schemas.user_schemas import UserWithCategoryDTO
+
+
+@pytest.fixture
+def captured_sql(async_engine):
+    statements: list[tuple[str, object]] = []
+
+    def _capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", _capture)
+
+
+def _user_dto(user_orm, cat_orm):
+    return UserWithCategoryDTO(
+        id=user_orm.id, telegram_id=user_orm.telegram_id,
+        username=user_orm.username, full_name=user_orm.full_name,
+        exercise_started_at=None,
+        current_category=CategoryDTO(
+            id=cat_orm.id, name=cat_orm.name, handler_type=cat_orm.handler_type, parent_id=cat_orm.parent_id,
+        ),
+    )
+
+
+async def _plans_for(db_session, statements, marker: str) -> list[str]:
+    conn = await db_session.connection()
+    await conn.exec_driver_sql("ANALYZE exercises")
+    await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plans = []
+    for statement, parameters in list(statements):
+        if marker not in statement:
+            continue
+        result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        plans.append("\n".join(row[0] for row in result))
+    return plans
+
+
+class TestContentFilters:
+    async def test_content_eq_uses_generated_column(self, db_session, exercise_factory, category_factory):
+        cat = await category_factory()
+        ne = await exercise_factory(category_id=cat.id, content={"sentence": "s", "particle": "НЕ"})
+        await exercise_factory(category_id=cat.id, content={"sentence": "s", "particle": "НИ"})
+
+        result = await db_session.execute(select(Exercise.id).where(content_eq("particle", "НЕ")))
+
+        assert result.scalars().all() == [ne.id]
+        assert "exercises.particle" in str(content_eq("particle", "НЕ"))
+
+    async def test_content_exists_uses_presence_column(self, db_session, exercise_factory, category_factory):
+        cat = await category_factory()
+        with_field = await exercise_factory(
+            category_id=cat.id, content={"sentence": "s", "corrected_sentence": "c"},
+        )
+        await exercise_factory(category_id=cat.id, content={"sentence": "s", "corrected_sentence": None})
+
+        result = await db_session.execute(select(Exercise.id).where(content_exists("corrected_sentence")))
+
+        assert result.scalars().all() == [with_field.id]
+
+    async def test_unknown_field_falls_back_to_jsonb(self, db_session, exercise_factory, category_factory):
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id, content={"word": "ключ"})
+
+        result = await db_session.execute(select(Exercise.id).where(content_eq("word", "ключ")))
+
+        assert result.scalars().all() == [ex.id]
+
+    async def test_generated_columns_follow_content_updates(self, db_session, exercise_factory, category_factory):
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id, content={"sentence": "s", "particle": "НЕ"})
+
+        ex.content = {"sentence": "s", "particle": "НИ"}
+        await db_session.flush()
+
+        result = await db_session.execute(select(Exercise.id).where(content_eq("particle", "НИ")))
+        assert result.scalars().all() == [ex.id]
+
+
+class TestFilterIndexUsage:
+    async def test_task13_exam_filters_use_particle_index(
+        self, db_session, processor_factory, user_factory, category_factory, exercise_factory, captured_sql,
+    ):
+        parent = await category_factory(name="P13e", handler_type=HandlerType.TASK_13_EXAM)
+        child = await category_factory(name="C13e", handler_type=HandlerType.TASK_13_EXAM, parent_id=parent.id)
+        for particle in ("НЕ", "НИ"):
+            for answer in ("TOGETHER", "SEPARATE"):
+                for i in range(5):
+                    await exercise_factory(
+                        category_id=parent.id,
+                        content={"sentence": f"({particle})слово {answer} {i}", "particle": particle},
+                        answer=answer,
+                    )
+        user = await user_factory()
+        captured_sql.clear()
+
+        await processor_factory.get_processor(HandlerType.TASK_13_EXAM).create_task(_user_dto(user, child))
+
+        plans = await _plans_for(db_session, captured_sql, "exercises.particle")
+        assert plans
+        for plan in plans:
+            assert "ix_exercises_category_particle_answer" in plan, plan
+
+    async def test_task8_drill_filter_uses_partial_index(
+        self, db_session, processor_factory, user_factory, category_factory, exercise_factory, captured_sql,
+    ):
+        parent = await category_factory(name="P8", handler_type=HandlerType.TASK_8_DRILL)
+        child = await category_factory(name="C8", handler_type=HandlerType.TASK_8_DRILL, parent_id=parent.id)
+        await exercise_factory(
+            category_id=parent.id,
+            content={"sentence": "Предложение с ошибкой", "corrected_sentence": "Исправленное предложение"},
+            answer="participial_clause_error",
+        )
+        # без непрошедших фильтр строк любой индекс по category_id стоит столько же, сколько частичный
+        for i in range(30):
+            await exercise_factory(
+                category_id=parent.id, content={"sentence": f"Верное предложение {i}"}, answer="correct",
+            )
+        user = await user_factory()
+        captured_sql.clear()
+
+        await processor_factory.get_processor(HandlerType.TASK_8_DRILL).create_task(_user_dto(user, child))
+
+        plans = await _plans_for(db_session, captured_sql, "exercises.has_corrected_sentence")
+        assert plans
+        for plan in plans:
+            assert "ix_exercises_category_corrected_sentence" in plan, plan
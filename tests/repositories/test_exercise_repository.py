@@ -1,3 +1,5 @@
+from sqlalchemy import inspect
+
 from app.repositories.exercise_filters import answer_eq, answer_ne, content_eq, content_exists
 
 
@@ -682,6 +684,125 @@ class TestGetRandomByGroupIds:
         assert result[0].category_id == cat1.id
 
 
+class TestGetStubsAndExplanations:
+    async def test_stubs_skip_heavy_columns(self, db_session, exercise_repository, category_factory, exercise_factory):
+        category = await category_factory()
+        ex = await exercise_factory(category_id=category.id, answer="A", explanation="Разбор")
+        db_session.expunge_all()
+
+        stubs = await exercise_repository.get_stubs_by_ids([ex.id])
+
+        assert stubs[0].answer == "A"
+        assert {"content", "explanation"} <= inspect(stubs[0]).unloaded
+
+    async def test_get_by_ids_hydrates_stub_without_explanation(
+        self, db_session, exercise_repository, category_factory, exercise_factory,
+    ):
+        category = await category_factory()
+        ex = await exercise_factory(category_id=category.id, content={"word": "ключ"}, explanation="Разбор")
+        db_session.expunge_all()
+        await exercise_repository.get_stubs_by_ids([ex.id])
+
+        (full,) = await exercise_repository.get_by_ids([ex.id])
+
+        assert full.content == {"word": "ключ"}
+        assert "explanation" in inspect(full).unloaded
+
+    async def test_answer_check_keeps_order_and_skips_missing(
+        self, exercise_repository, category_factory, exercise_factory,
+    ):
+        category = await category_factory()
+        ex1 = await exercise_factory(category_id=category.id)
+        ex2 = await exercise_factory(category_id=category.id)
+
+        result = await exercise_repository.get_for_answer_check([ex2.id, 999_999, ex1.id], with_explanations=False)
+
+        assert [ex.id for ex in result] == [ex2.id, ex1.id]
+
+    async def test_answer_check_explanations_on_request(
+        self, db_session, exercise_repository, category_factory, exercise_factory,
+    ):
+        category = await category_factory()
+        ex = await exercise_factory(category_id=category.id, explanation="Разбор")
+        db_session.expunge_all()
+
+        (without,) = await exercise_repository.get_for_answer_check([ex.id], with_explanations=False)
+        assert "explanation" in inspect(without).unloaded
+
+        (with_explanation,) = await exercise_repository.get_for_answer_check([ex.id], with_explanations=True)
+        assert with_explanation.explanation == "Разбор"
+
+
+class TestGetGroupCandidates:
+    async def test_one_per_group_with_seen_flag(
+        self, exercise_repository, user_factory, category_factory, exercise_factory, user_answer_factory,
+    ):
+        user = await user_factory()
+        category = await category_factory()
+        g1 = "11111111-1111-1111-1111-111111111111"
+        g2 = "22222222-2222-2222-2222-222222222222"
+        ex1 = await exercise_factory(category_id=category.id, group_id=g1)
+        await exercise_factory(category_id=category.id, group_id=g1)
+        await exercise_factory(category_id=category.id, group_id=g2)
+        await exercise_factory(category_id=category.id, group_id=None)
+        await user_answer_factory(user_id=user.id, exercise_id=ex1.id, category_id=category.id, is_correct=False)
+
+        rows = await exercise_repository.get_group_candidates(category.id, user.id)
+
+        by_group = {str(row.exercise_id): row for row in rows}
+        assert set(by_group) == {g1, g2}
+        assert by_group[g1].seen is True
+        assert (by_group[g1].n_correct, by_group[g1].n_wrong) == (0, 1)
+        assert by_group[g2].seen is False
+        assert by_group[g2].last_attempt_at is None
+
+    async def test_seen_in_other_category(
+        self, exercise_repository, user_factory, category_factory, exercise_factory, user_answer_factory,
+    ):
+        user = await user_factory()
+        drill = await category_factory(name="Drill")
+        exam = await category_factory(name="Exam")
+        g1 = "11111111-1111-1111-1111-111111111111"
+        drill_ex = await exercise_factory(category_id=drill.id, group_id=g1)
+        exam_ex = await exercise_factory(category_id=exam.id, group_id=g1)
+        await user_answer_factory(user_id=user.id, exercise_id=drill_ex.id, category_id=drill.id)
+
+        rows = await exercise_repository.get_group_candidates(exam.id, user.id)
+
+        assert len(rows) == 1
+        assert rows[0].Exercise.id == exam_ex.id
+        assert rows[0].seen is True
+        assert rows[0].n_correct == 1
+
+    async def test_other_user_answers_ignored(
+        self, exercise_repository, user_factory, category_factory, exercise_factory, user_answer_factory,
+    ):
+        user = await user_factory()
+        other = await user_factory()
+        category = await category_factory()
+        ex = await exercise_factory(category_id=category.id, group_id="11111111-1111-1111-1111-111111111111")
+        await user_answer_factory(user_id=other.id, exercise_id=ex.id, category_id=category.id)
+
+        rows = await exercise_repository.get_group_candidates(category.id, user.id)
+
+        assert rows[0].seen is False
+
+    async def test_filters_and_inactive(
+        self, exercise_repository, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        category = await category_factory()
+        await exercise_factory(category_id=category.id, group_id="11111111-1111-1111-1111-111111111111", answer="yes")
+        await exercise_factory(category_id=category.id, group_id="22222222-2222-2222-2222-222222222222", answer="no")
+        await exercise_factory(
+            category_id=category.id, group_id="33333333-3333-3333-3333-333333333333", answer="yes", is_active=False,
+        )
+
+        rows = await exercise_repository.get_group_candidates(category.id, user.id, filters=[answer_eq("yes")])
+
+        assert [row.Exercise.answer for row in rows] == ["yes"]
+
+
 class TestGetExercisesByAnswersUnseenFirst:
     async def test_returns_exercises_for_given_answers(
         self,
@@ -0,0 +1,175 @@
+"""Быстрый путь обязан возвращать то же, что ORM-реализация, на одних и тех же данных."""
+import uuid
+
+import pytest
+
+from app.models import Exercise
+from app.repositories import FastExerciseRepository, FastUserAnswerRepository, answer_eq
+from app.repositories.fast_selection_repository import ExerciseRecord
+from app.services.exercise_selector import ExerciseSelector
+
+EXERCISE_COLUMNS = ("id", "category_id", "group_id", "order_index", "content", "answer", "is_active")
+
+
+@pytest.fixture
+def fast_exercise_repository(exercise_repository):
+    return FastExerciseRepository(exercise_repository.session)
+
+
+@pytest.fixture
+def fast_answer_repository(db_session):
+    return FastUserAnswerRepository(db_session)
+
+
+@pytest.fixture
+async def history(category_factory, exercise_factory, user_factory, user_answer_factory):
+    """Категория с повторяющимися ответами, группами, неактивным упражнением и историей ответов."""
+    category = await category_factory()
+    other = await category_factory(name="Other")
+    group = uuid.uuid4()
+    exercises = [
+        await exercise_factory(
+            category_id=category.id,
+            answer=str(i % 3),
+            content={"text": f"q{i}", "n": i},
+            group_id=group if i < 2 else None,
+            order_index=i if i < 2 else None,
+        )
+        for i in range(9)
+    ]
+    await exercise_factory(category_id=category.id, answer="0", is_active=False)
+    await exercise_factory(category_id=other.id, answer="0")
+
+    user = await user_factory()
+    outcomes = [True, False, True, True, False, False, True]
+    for i, exercise in enumerate(exercises[:5]):
+        for attempt, is_correct in enumerate(outcomes[: i + 2]):
+            await user_answer_factory(
+                user.id, exercise.id, category.id, is_correct=is_correct, solve_time=5 + i * 3 + attempt,
+            )
+    return category, user, exercises
+
+
+def _columns(exercise):
+    return tuple(getattr(exercise, column) for column in EXERCISE_COLUMNS)
+
+
+class TestExerciseStats:
+    @pytest.mark.parametrize("window_size", [1, 3, 5])
+    async def test_matches_orm(self, history, user_answer_repository, fast_answer_repository, window_size):
+        category, user, _ = history
+
+        expected = await user_answer_repository.get_exercise_stats(user.id, category.id, window_size)
+        actual = await fast_answer_repository.get_exercise_stats(user.id, category.id, window_size)
+
+        assert sorted(tuple(row) for row in actual) == sorted(tuple(row) for row in expected)
+        assert all(row.n_correct + row.n_wrong <= window_size for row in actual)
+
+    async def test_unknown_user_is_empty(self, history, fast_answer_repository):
+        category, _, _ = history
+        assert await fast_answer_repository.get_exercise_stats(0, category.id) == []
+
+    async def test_filters_use_orm(self, history, user_answer_repository, fast_answer_repository):
+        category, user, _ = history
+
+        expected = await user_answer_repository.get_exercise_stats(user.id, category.id, filters=[answer_eq("1")])
+        actual = await fast_answer_repository.get_exercise_stats(user.id, category.id, filters=[answer_eq("1")])
+
+        assert sorted(tuple(row) for row in actual) == sorted(tuple(row) for row in expected)
+
+
+class TestAnswerGroupStats:
+    @pytest.mark.parametrize(("min_group_size", "window_size"), [(1, 5), (3, 2), (4, 5)])
+    async def test_matches_orm(
+        self, history, user_answer_repository, fast_answer_repository, min_group_size, window_size,
+    ):
+        category, user, _ = history
+
+        expected = await user_answer_repository.get_answer_group_stats(
+            user.id, category.id, min_group_size, window_size,
+        )
+        actual = await fast_answer_repository.get_answer_group_stats(
+            user.id, category.id, min_group_size, window_size,
+        )
+
+        assert sorted(tuple(row) for row in actual) == sorted(tuple(row) for row in expected)
+
+
+class TestRandomUnseen:
+    async def test_matches_orm(self, history, exercise_repository, fast_exercise_repository):
+        category, user, _ = history
+
+        expected = await exercise_repository.get_random_unseen(category.id, user.id, limit=100)
+        actual = await fast_exercise_repository.get_random_unseen(category.id, user.id, limit=100)
+
+        assert all(isinstance(ex, ExerciseRecord) for ex in actual)
+        assert sorted(map(_columns, actual)) == sorted(map(_columns, expected))
+
+    async def test_respects_limit(self, history, fast_exercise_repository):
+        category, user, _ = history
+        assert len(await fast_exercise_repository.get_random_unseen(category.id, user.id, limit=2)) == 2
+
+    async def test_distinct_on_answer_matches_orm(self, history, exercise_repository, fast_exercise_repository):
+        category, user, exercises = history
+        unseen_ids = {ex.id for ex in exercises[5:]}
+
+        expected = await exercise_repository.get_random_unseen(
+            category.id, user.id, limit=100, distinct_on_answer=True,
+        )
+        actual = await fast_exercise_repository.get_random_unseen(
+            category.id, user.id, limit=100, distinct_on_answer=True,
+        )
+
+        assert sorted(ex.answer for ex in actual) == sorted(ex.answer for ex in expected)
+        assert {ex.id for ex in actual} <= unseen_ids
+
+    async def test_filters_use_orm(self, history, fast_exercise_repository):
+        category, user, _ = history
+
+        result = await fast_exercise_repository.get_random_unseen(
+            category.id, user.id, limit=100, filters=[answer_eq("2")],
+        )
+
+        assert result
+        assert all(isinstance(ex, Exercise) and ex.answer == "2" for ex in result)
+
+    async def test_served_records_found_in_cache(self, history, db_session, fast_exercise_repository):
+        category, user, _ = history
+        db_session.expunge_all()
+
+        served = await fast_exercise_repository.get_random_unseen(category.id, user.id, limit=2)
+        ids = [ex.id for ex in served]
+
+        assert fast_exercise_repository.get_many_from_cache([*reversed(ids), 0]) == list(reversed(served))
+
+
+class TestSelectorOnFastPath:
+    @pytest.fixture
+    def selector(
+        self, fast_exercise_repository, fast_answer_repository, user_exercise_schedule_repository,
+        category_repository, recent_exercises, concurrent_reads,
+    ):
+        return ExerciseSelector(
+            exercise_repository=fast_exercise_repository,
+            answer_repository=fast_answer_repository,
+            schedule_repository=user_exercise_schedule_repository,
+            category_repository=category_repository,
+            recent_exercises=recent_exercises,
+            concurrent_reads=concurrent_reads,
+        )
+
+    async def test_select_smart_mixes_unseen_and_thompson(self, history, selector):
+        category, user, exercises = history
+
+        selected = await selector.select_smart(category.id, user.id, limit=6)
+
+        assert len({ex.id for ex in selected}) == 6
+        assert {ex.id for ex in selected} >= {ex.id for ex in exercises[5:]}
+
+    async def test_same_answer_groups(self, history, selector):
+        category, user, _ = history
+
+        groups = await selector.select_smart_same_answer_groups(category.id, user.id, group_size=2, num_groups=2)
+
+        assert len(groups) == 2
+        assert all(len({ex.answer for ex in group}) == 1 for group in groups)
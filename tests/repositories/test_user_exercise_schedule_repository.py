@@ -0,0 +1,141 @@
+from datetime import UTC, datetime, timedelta
+
+from app.utils.spaced_repetition import FIRST_INTERVAL_DAYS, RELEARN_INTERVAL
+
+
+class TestRecordReview:
+    async def test_creates_schedule_on_first_review(
+        self, user_exercise_schedule_repository, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id)
+        now = datetime.now(UTC)
+
+        schedule = await user_exercise_schedule_repository.record_review(
+            user.id, ex.id, cat.id, now, is_correct=True,
+        )
+        await user_exercise_schedule_repository.flush(schedule)
+
+        assert schedule.id is not None
+        assert schedule.repetitions == 1
+        assert schedule.due_at == now + timedelta(days=FIRST_INTERVAL_DAYS)
+
+    async def test_updates_existing_schedule(
+        self, user_exercise_schedule_repository, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id)
+        now = datetime.now(UTC)
+
+        first = await user_exercise_schedule_repository.record_review(user.id, ex.id, cat.id, now, is_correct=True)
+        second = await user_exercise_schedule_repository.record_review(user.id, ex.id, cat.id, now, is_correct=False)
+
+        assert second.id == first.id
+        assert second.repetitions == 0
+        assert second.lapses == 1
+        assert second.due_at == now + RELEARN_INTERVAL
+
+
+class TestGetScheduled:
+    async def test_due_by_returns_only_overdue_in_due_order(
+        self, user_exercise_schedule_repository, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        recent = await exercise_factory(category_id=cat.id)
+        older = await exercise_factory(category_id=cat.id)
+        future = await exercise_factory(category_id=cat.id)
+        now = datetime.now(UTC)
+        await user_exercise_schedule_repository.record_review(
+            user.id, older.id, cat.id, now - timedelta(days=3), is_correct=True,
+        )
+        await user_exercise_schedule_repository.record_review(
+            user.id, recent.id, cat.id, now - timedelta(days=2), is_correct=True,
+        )
+        await user_exercise_schedule_repository.record_review(user.id, future.id, cat.id, now, is_correct=True)
+
+        result = await user_exercise_schedule_repository.get_scheduled(user.id, cat.id, 10, due_by=now)
+
+        assert [ex.id for ex in result] == [older.id, recent.id]
+
+    async def test_without_due_by_includes_upcoming(
+        self, user_exercise_schedule_repository, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id)
+        await user_exercise_schedule_repository.record_review(
+            user.id, ex.id, cat.id, datetime.now(UTC), is_correct=True,
+        )
+
+        result = await user_exercise_schedule_repository.get_scheduled(user.id, cat.id, 10)
+
+        assert [e.id for e in result] == [ex.id]
+
+    async def test_excludes_inactive(
+        self, user_exercise_schedule_repository, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id, is_active=False)
+        await user_exercise_schedule_repository.record_review(
+            user.id, ex.id, cat.id, datetime.now(UTC) - timedelta(days=5), is_correct=True,
+        )
+
+        result = await user_exercise_schedule_repository.get_scheduled(user.id, cat.id, 10, due_by=datetime.now(UTC))
+
+        assert result == []
+
+
+class TestGetRandomUnscheduled:
+    async def test_skips_scheduled_exercises(
+        self, user_exercise_schedule_repository, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        scheduled = await exercise_factory(category_id=cat.id)
+        fresh = await exercise_factory(category_id=cat.id)
+        await user_exercise_schedule_repository.record_review(
+            user.id, scheduled.id, cat.id, datetime.now(UTC), is_correct=True,
+        )
+
+        result = await user_exercise_schedule_repository.get_random_unscheduled(user.id, cat.id, 10)
+
+        assert [ex.id for ex in result] == [fresh.id]
+
+    async def test_other_users_schedule_ignored(
+        self, user_exercise_schedule_repository, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        other = await user_factory()
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id)
+        await user_exercise_schedule_repository.record_review(
+            other.id, ex.id, cat.id, datetime.now(UTC), is_correct=True,
+        )
+
+        result = await user_exercise_schedule_repository.get_random_unscheduled(user.id, cat.id, 10)
+
+        assert [e.id for e in result] == [ex.id]
+
+
+class TestGetForExercises:
+    async def test_returns_only_scheduled_exercises(
+        self, user_exercise_schedule_repository, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        other = await user_factory()
+        cat = await category_factory()
+        scheduled = await exercise_factory(category_id=cat.id)
+        unscheduled = await exercise_factory(category_id=cat.id)
+        now = datetime.now(UTC)
+        await user_exercise_schedule_repository.record_review(user.id, scheduled.id, cat.id, now, is_correct=True)
+        await user_exercise_schedule_repository.record_review(other.id, unscheduled.id, cat.id, now, is_correct=True)
+        await user_exercise_schedule_repository.flush()
+
+        result = await user_exercise_schedule_repository.get_for_exercises(user.id, [scheduled.id, unscheduled.id])
+
+        assert list(result) == [scheduled.id]
+        assert await user_exercise_schedule_repository.get_for_exercises(user.id, []) == {}
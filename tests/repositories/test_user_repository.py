@@ -1,27 +1,27 @@
 import pytest
 
 
-class TestGetByTelegramIdWithExercises:
+class TestGetByTelegramIdWithCategory:
     async def test_returns_user(self, user_repository, user_factory):
         user = await user_factory(telegram_id=111)
 
-        result = await user_repository.get_by_telegram_id_with_exercises(111)
+        result = await user_repository.get_by_telegram_id_with_category(111)
 
         assert result is not None
         assert result.id == user.id
         assert result.telegram_id == 111
 
     async def test_nonexistent_telegram_id(self, user_repository):
-        result = await user_repository.get_by_telegram_id_with_exercises(999_999)
+        result = await user_repository.get_by_telegram_id_with_category(999_999)
         assert result is None
 
-    async def test_loads_empty_exercises(self, user_repository, user_factory):
+    async def test_loads_empty_exercise_ids(self, user_repository, user_factory):
         await user_factory(telegram_id=222)
 
-        result = await user_repository.get_by_telegram_id_with_exercises(222)
+        result = await user_repository.get_by_telegram_id_with_category(222)
 
         assert result is not None
-        assert result.current_exercises == []
+        assert result.current_exercise_ids == []
 
     async def test_loads_current_category(
         self, user_repository, user_factory, category_factory, db_session,
@@ -31,7 +31,7 @@ class TestGetByTelegramIdWithExercises:
         user.current_category_id = category.id
         await db_session.flush()
 
-        result = await user_repository.get_by_telegram_id_with_exercises(333)
+        result = await user_repository.get_by_telegram_id_with_category(333)
 
         assert result is not None
         assert result.current_category is not None
@@ -40,39 +40,23 @@ class TestGetByTelegramIdWithExercises:
     async def test_null_current_category(self, user_repository, user_factory):
         await user_factory(telegram_id=444)
 
-        result = await user_repository.get_by_telegram_id_with_exercises(444)
+        result = await user_repository.get_by_telegram_id_with_category(444)
 
         assert result is not None
         assert result.current_category is None
 
 
-class TestGetByIdWithExercises:
-    async def test_returns_user(self, user_repository, user_factory):
+class TestCurrentExerciseIds:
+    async def test_keeps_show_order(self, user_repository, user_factory, db_session):
         user = await user_factory(telegram_id=555)
-
-        result = await user_repository.get_by_id_with_exercises(user.id)
-
-        assert result is not None
-        assert result.telegram_id == 555
-
-    async def test_nonexistent_id(self, user_repository):
-        result = await user_repository.get_by_id_with_exercises(999_999)
-        assert result is None
-
-    async def test_loads_exercises_and_category(
-        self, user_repository, user_factory, category_factory, db_session,
-    ):
-        category = await category_factory(name="Physics")
-        user = await user_factory(telegram_id=666)
-        user.current_category_id = category.id
+        user.current_exercise_ids = [30, 10, 20]
         await db_session.flush()
+        db_session.expunge_all()
 
-        result = await user_repository.get_by_id_with_exercises(user.id)
+        result = await user_repository.get_by_telegram_id_with_category(555)
 
         assert result is not None
-        assert result.current_category is not None
-        assert result.current_category.name == "Physics"
-        assert result.current_exercises == []
+        assert result.current_exercise_ids == [30, 10, 20]
 
 
 class TestBaseUserMethods:
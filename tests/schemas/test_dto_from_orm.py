@@ -1,8 +1,5 @@
 import pytest
-from sqlalchemy import insert
-
 from app.enums import HandlerType
-from app.models.user_model import user_current_exercises
 from app.schemas.category_schemas import CategoryDTO, CategoryWithChildrenDTO
 from app.schemas.exercise_schemas import ExerciseDTO
 from app.schemas.user_schemas import UserDTO, UserWithCategoryDTO, UserWithExercisesDTO
@@ -96,7 +93,7 @@ class TestUserWithCategoryDTO:
         user.current_category_id = cat.id
         await db_session.flush()
 
-        loaded = await user_repository.get_by_id_with_exercises(user.id)
+        loaded = await user_repository.get_by_telegram_id_with_category(user.telegram_id)
         dto = UserWithCategoryDTO.from_orm_obj(loaded, load_category=True)
         assert dto.current_category is not None
         assert dto.current_category.name == "Категория"
@@ -112,62 +109,38 @@ class TestUserWithCategoryDTO:
         user.current_category_id = cat.id
         await db_session.flush()
 
-        loaded = await user_repository.get_by_id_with_exercises(user.id)
+        loaded = await user_repository.get_by_telegram_id_with_category(user.telegram_id)
         dto = UserWithCategoryDTO.from_orm_obj(loaded, load_category=False)
         assert dto.current_category is None
 
 
 class TestUserWithExercisesDTO:
-    async def _link_exercises(self, db_session, user_id, exercise_ids):
-        for eid in exercise_ids:
-            await db_session.execute(
-                insert(user_current_exercises).values(user_id=user_id, exercise_id=eid)
-            )
-        await db_session.flush()
-
-    async def test_from_orm_obj_with_exercises(
-        self, user_factory, category_factory, exercise_factory, user_repository, db_session,
-    ):
+    async def test_from_orm_obj_carries_ids_only(self, user_factory, category_factory, user_repository, db_session):
         cat = await category_factory()
-        ex1 = await exercise_factory(category_id=cat.id, answer="1")
-        ex2 = await exercise_factory(category_id=cat.id, answer="2")
         user = await user_factory()
         user.current_category_id = cat.id
+        user.current_exercise_ids = [7, 3]
         await db_session.flush()
-        await self._link_exercises(db_session, user.id, [ex1.id, ex2.id])
 
-        loaded = await user_repository.get_by_id_with_exercises(user.id)
+        loaded = await user_repository.get_by_telegram_id_with_category(user.telegram_id)
         dto = UserWithExercisesDTO.from_orm_obj(loaded)
-        assert dto.current_exercises is not None
-        assert len(dto.current_exercises) == 2
-        assert all(isinstance(e, ExerciseDTO) for e in dto.current_exercises)
+        assert dto.current_exercise_ids == [7, 3]
+        assert dto.current_exercises is None
 
     async def test_from_orm_obj_no_exercises(self, user_factory, user_repository):
         user = await user_factory()
-        loaded = await user_repository.get_by_id_with_exercises(user.id)
+        loaded = await user_repository.get_by_telegram_id_with_category(user.telegram_id)
         dto = UserWithExercisesDTO.from_orm_obj(loaded)
+        assert dto.current_exercise_ids == []
         assert dto.current_exercises is None
 
-    async def test_from_orm_obj_load_exercises_false(
-        self, user_factory, category_factory, exercise_factory, user_repository, db_session,
-    ):
-        cat = await category_factory()
-        ex = await exercise_factory(category_id=cat.id)
-        user = await user_factory()
-        await db_session.flush()
-        await self._link_exercises(db_session, user.id, [ex.id])
-
-        loaded = await user_repository.get_by_id_with_exercises(user.id)
-        dto = UserWithExercisesDTO.from_orm_obj(loaded, load_exercises=False)
-        assert dto.current_exercises is None
-
-    async def test_from_orm_obj_load_both_false(self, user_factory, category_factory, user_repository, db_session):
+    async def test_from_orm_obj_load_category_false(self, user_factory, category_factory, user_repository, db_session):
         cat = await category_factory(name="Cat")
         user = await user_factory()
         user.current_category_id = cat.id
         await db_session.flush()
 
-        loaded = await user_repository.get_by_id_with_exercises(user.id)
-        dto = UserWithExercisesDTO.from_orm_obj(loaded, load_exercises=False, load_category=False)
+        loaded = await user_repository.get_by_telegram_id_with_category(user.telegram_id)
+        dto = UserWithExercisesDTO.from_orm_obj(loaded, load_category=False)
         assert dto.current_category is None
         assert dto.current_exercises is None
@@ -0,0 +1,80 @@
+import importlib
+
+import pytest
+
+from app.cache import CacheManager
+from app.services.catalog_service import CATALOG_NAMESPACE, CatalogService
+
+
+@pytest.fixture
+def service(cache_manager):
+    return CatalogService(cache_manager)
+
+
+class TestVersion:
+    async def test_starts_at_zero_and_bumps(self, service):
+        assert await service.get_version() == 0
+        assert await service.bump_version() == 1
+        assert await service.get_version() == 1
+        assert await service.cached_version() == 1
+
+
+class TestGetOrBuild:
+    async def test_builds_once(self, service):
+        calls = []
+
+        async def build():
+            calls.append(1)
+            return {"value": len(calls)}
+
+        first = await service.get_or_build("key", build)
+        second = await service.get_or_build("key", build)
+
+        assert first is second
+        assert len(calls) == 1
+
+    async def test_rebuilds_after_version_bump(self, service):
+        calls = []
+
+        async def build():
+            calls.append(1)
+            return len(calls)
+
+        assert await service.get_or_build("key", build) == 1
+        await service.bump_version()
+
+        assert await service.get_or_build("key", build) == 2
+
+    async def test_other_worker_sees_bump_lazily(self, redis):
+        worker = CatalogService(CacheManager(redis, version_check_interval=60))
+
+        async def build():
+            return "old"
+
+        await worker.get_or_build("key", build)
+        await CatalogService(CacheManager(redis)).bump_version()
+
+        assert await worker.get_or_build("key", build) == "old"
+
+    async def test_invalidate_cache_job_resets_catalog(self, redis, monkeypatch):
+        job = importlib.import_module("app.jobs.invalidate_cache")
+        monkeypatch.setattr(job, "redis_client", redis)
+        worker = CatalogService(CacheManager(redis, version_check_interval=0))
+        calls = []
+
+        async def build():
+            calls.append(1)
+            return len(calls)
+
+        assert await worker.get_or_build("key", build) == 1
+        await job.invalidate_cache(CATALOG_NAMESPACE)
+
+        assert await worker.get_or_build("key", build) == 2
+
+    async def test_cache_shared_between_services(self, cache_manager):
+        async def build():
+            return object()
+
+        value = await CatalogService(cache_manager).get_or_build("key", build)
+
+        assert await CatalogService(cache_manager).get_or_build("key", build) is value
@@ -1,13 +1,15 @@
 import pytest
 
+from app.cache import CacheManager
+from app.cache.namespace import cache_requests
 from app.exceptions import CategoryNotFoundError
 from app.repositories import CategoryRepository
-from app.services.category_service import CategoryService
+from app.services.category_service import CATEGORIES_NAMESPACE, CategoryService
 
 
 @pytest.fixture
-def category_service(db_session, category_repository):
-    return CategoryService(session=db_session, category_repository=category_repository)
+def category_service(db_session, category_repository, cache_manager):
+    return CategoryService(session=db_session, category_repository=category_repository, cache_manager=cache_manager)
 
 
 class TestGetRootCategories:
@@ -62,3 +64,37 @@ class TestGetByIdWithTree:
     async def test_not_found(self, category_service):
         with pytest.raises(CategoryNotFoundError):
             await category_service.get_by_id_with_tree(999_999)
+
+
+class TestCaching:
+    async def test_tree_is_served_from_cache_until_invalidated(
+        self, category_service, category_factory, cache_manager,
+    ):
+        await category_factory(name="Root 1")
+        assert [c.name for c in await category_service.get_root_categories()] == ["Root 1"]
+        await category_factory(name="Root 2")
+
+        assert [c.name for c in await category_service.get_root_categories()] == ["Root 1"]
+
+        await cache_manager.invalidate(CATEGORIES_NAMESPACE)
+        assert {c.name for c in await category_service.get_root_categories()} == {"Root 1", "Root 2"}
+
+    async def test_second_worker_reads_redis_tier(
+        self, db_session, category_repository, category_service, category_factory, redis,
+    ):
+        parent = await category_factory(name="Parent")
+        await category_factory(name="Child", parent_id=parent.id)
+        first = await category_service.get_by_id_with_children(parent.id)
+        l2_hits = cache_requests.value(namespace=CATEGORIES_NAMESPACE, result="l2_hit")
+
+        other_worker = CategoryService(db_session, category_repository, CacheManager(redis))
+        second = await other_worker.get_by_id_with_children(parent.id)
+
+        assert second == first
+        assert cache_requests.value(namespace=CATEGORIES_NAMESPACE, result="l2_hit") == l2_hits + 1
+
+    async def test_not_found_is_not_cached(self, category_service, category_factory):
+        with pytest.raises(CategoryNotFoundError):
+            await category_service.get_by_id_with_tree(999_999)
+        with pytest.raises(CategoryNotFoundError):
+            await category_service.get_by_id_with_tree(999_999)
@@ -0,0 +1,197 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.enums import HandlerType
+from app.jobs.exam_pool_producer import variant_of
+from app.processors import PooledExamProcessor
+from app.schemas import CategoryDTO, ExamVariant
+from app.schemas.user_schemas import UserWithCategoryDTO
+from app.services.exam_variant_pool import pool_requests
+from app.services.task_service import TaskService
+
+LETTERS = ["а", "о", "е", "и"]
+
+
+def _user_dto(user, category):
+    return UserWithCategoryDTO(
+        id=user.id, telegram_id=user.telegram_id, username=user.username, full_name=user.full_name,
+        exercise_started_at=None, current_category_id=category.id,
+        current_category=CategoryDTO(
+            id=category.id, name=category.name, handler_type=category.handler_type, parent_id=category.parent_id,
+        ),
+    )
+
+
+@pytest.fixture
+async def task9(category_factory, exercise_factory):
+    parent = await category_factory(name="P9", handler_type=HandlerType.TASK_9_EXAM)
+    child = await category_factory(name="C9", handler_type=HandlerType.TASK_9_EXAM, parent_id=parent.id)
+    exercises = [
+        await exercise_factory(
+            category_id=parent.id,
+            content={"word": f"сл{{letter}}во{li}{i}", "incorrect_letter": LETTERS[(li + 1) % 4]},
+            answer=letter,
+            explanation="Объяснение",
+        )
+        for li, letter in enumerate(LETTERS)
+        for i in range(6)
+    ]
+    return child, exercises
+
+
+@pytest.fixture
+async def task8(category_factory, exercise_factory):
+    parent = await category_factory(name="P8", handler_type=HandlerType.TASK_8_EXAM)
+    child = await category_factory(name="C8", handler_type=HandlerType.TASK_8_EXAM, parent_id=parent.id)
+    for i, error_type in enumerate(["participial", "homogeneous", "adverbial", "prepositional", "agreement"]):
+        await exercise_factory(
+            category_id=parent.id,
+            content={"sentence": f"Ошибочное {i}", "corrected_sentence": f"Исправленное {i}"},
+            answer=error_type,
+        )
+    for i in range(4):
+        await exercise_factory(category_id=parent.id, content={"sentence": f"Правильное {i}"}, answer="no_error")
+    return child
+
+
+def _variant(exercises, count=15):
+    return ExamVariant(
+        exercise_ids=[ex.id for ex in exercises[:count]],
+        task_config={"exercise_ids": [ex.id for ex in exercises[:count]], "correct_row_indices": [0, 2],
+                     "words_per_row": 3},
+    )
+
+
+def _requests(result):
+    return sum(value for (_, outcome), value in pool_requests.samples().items() if outcome == result)
+
+
+class TestRestoreVariant:
+    @staticmethod
+    async def _round_trip(processor_factory, exercise_repository, user, category):
+        processor = processor_factory.get_processor(category.handler_type)
+        live = await processor.create_task(_user_dto(user, category))
+        variant = variant_of(live)
+        by_id = {ex.id: ex for ex in await exercise_repository.get_by_ids(variant.exercise_ids)}
+        restored = processor.restore_variant([by_id[eid] for eid in variant.exercise_ids], variant.task_config)
+        return live, restored
+
+    async def test_task9_matches_live_task(self, processor_factory, exercise_repository, task9, user_factory):
+        category, _ = task9
+        live, restored = await self._round_trip(processor_factory, exercise_repository, await user_factory(), category)
+
+        assert restored.exercise_ids == live.exercise_ids
+        assert restored.task_config == live.task_config
+        assert restored.task_ui == live.task_ui
+
+    async def test_task8_matches_live_task(self, processor_factory, exercise_repository, task8, user_factory):
+        live, restored = await self._round_trip(processor_factory, exercise_repository, await user_factory(), task8)
+
+        assert restored.exercise_ids == live.exercise_ids
+        assert restored.task_config == live.task_config
+        assert restored.task_ui == live.task_ui
+
+    def test_not_pooled_processor_has_no_restore(self, processor_factory):
+        processor = processor_factory.get_processor(HandlerType.TASK_4_EXAM)
+        assert not isinstance(processor, PooledExamProcessor)
+        assert not hasattr(processor, "restore_variant")
+
+
+class TestTake:
+    async def test_empty_pool(self, exam_variant_pool, processor_factory, task9, user_factory):
+        category, _ = task9
+        user = await user_factory()
+        before = _requests("empty")
+
+        result = await exam_variant_pool.take(
+            _user_dto(user, category), processor_factory.get_processor(HandlerType.TASK_9_EXAM),
+        )
+
+        assert result is None
+        assert _requests("empty") == before + 1
+
+    async def test_prefers_least_seen_variant(
+        self, exam_variant_pool, processor_factory, task9, user_factory, user_answer_factory,
+    ):
+        category, exercises = task9
+        user = await user_factory()
+        seen_variant, fresh_variant = _variant(exercises[:15]), _variant(exercises[9:])
+        await user_answer_factory(user.id, exercises[0].id, category.parent_id)
+        await exam_variant_pool.put(category.id, [seen_variant, fresh_variant])
+
+        result = await exam_variant_pool.take(
+            _user_dto(user, category), processor_factory.get_processor(HandlerType.TASK_9_EXAM),
+        )
+
+        assert result is not None
+        assert result.exercise_ids == fresh_variant.exercise_ids
+        # Отвергнутый кандидат вернулся в пул для других юзеров
+        assert await exam_variant_pool.depth(category.id) == 1
+
+    async def test_recent_exercises_count_as_seen(
+        self, exam_variant_pool, processor_factory, task9, user_factory, recent_exercises,
+    ):
+        category, exercises = task9
+        user = await user_factory()
+        await recent_exercises.push(user.id, category.parent_id, [exercises[3].id])
+        await exam_variant_pool.put(category.id, [_variant(exercises)])
+        before = _requests("seen")
+
+        result = await exam_variant_pool.take(
+            _user_dto(user, category), processor_factory.get_processor(HandlerType.TASK_9_EXAM),
+        )
+
+        assert result is None
+        assert _requests("seen") == before + 1
+        assert await exam_variant_pool.depth(category.id) == 1
+
+    async def test_deactivated_exercise_is_stale(
+        self, exam_variant_pool, processor_factory, task9, user_factory, db_session,
+    ):
+        category, exercises = task9
+        user = await user_factory()
+        await exam_variant_pool.put(category.id, [_variant(exercises)])
+        exercises[5].is_active = False
+        await db_session.flush()
+
+        result = await exam_variant_pool.take(
+            _user_dto(user, category), processor_factory.get_processor(HandlerType.TASK_9_EXAM),
+        )
+
+        assert result is None
+        assert await exam_variant_pool.depth(category.id) == 0
+
+    async def test_catalog_bump_retires_pool(self, exam_variant_pool, catalog_service, task9):
+        category, exercises = task9
+        await exam_variant_pool.put(category.id, [_variant(exercises)])
+
+        await catalog_service.bump_version()
+
+        assert await exam_variant_pool.depth(category.id) == 0
+
+
+class TestStartTaskFromPool:
+    async def test_start_task_serves_pooled_variant(
+        self, processor_factory, user_repository, exercise_repository, recent_exercises, exam_variant_pool,
+        task9, user_factory,
+    ):
+        category, exercises = task9
+        user = await user_factory()
+        variant = _variant(exercises)
+        await exam_variant_pool.put(category.id, [variant])
+        service = TaskService(
+            processor_factory=processor_factory,
+            user_repository=user_repository,
+            exercise_repository=exercise_repository,
+            stats_service=AsyncMock(),
+            recent_exercises=recent_exercises,
+            variant_pool=exam_variant_pool,
+        )
+        dto = _user_dto(user, category)
+
+        await service.start_task(dto)
+
+        assert dto.current_exercise_ids == variant.exercise_ids
+        assert user.current_task_config == variant.task_config
+        assert set(await recent_exercises.get(user.id, category.parent_id)) == set(variant.exercise_ids)
@@ -0,0 +1,197 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.enums import HandlerType
+from app.models import Exercise
+from app.repositories import ExerciseImportRepository
+from app.services.exercise_import_service import ExerciseImportService, validate_lines
+
+
+@pytest.fixture
+def import_service(db_session, category_repository, catalog_service):
+    return ExerciseImportService(
+        import_repository=ExerciseImportRepository(db_session),
+        category_repository=category_repository,
+        catalog_service=catalog_service,
+    )
+
+
+@pytest.fixture
+async def task26(category_factory):
+    return await category_factory(name="Задание 26", handler_type=HandlerType.TASK_26_EXAM)
+
+
+@pytest.fixture
+def write_jsonl(tmp_path):
+    def _write(*records: dict | str):
+        path = tmp_path / "bank.jsonl"
+        lines = [r if isinstance(r, str) else json.dumps(r, ensure_ascii=False) for r in records]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    return _write
+
+
+def _record(category_id: int, task: str = "Найдите средства связи", answer: str = "3", **extra) -> dict:
+    return {
+        "category_id": category_id,
+        "content": {"task": task, "sentences": "(1) Первое. (2) Второе. (3) Третье."},
+        "answer": answer,
+        **extra,
+    }
+
+
+async def _exercises(db_session, category_id: int) -> list[Exercise]:
+    result = await db_session.execute(
+        select(Exercise).where(Exercise.category_id == category_id).order_by(Exercise.id),
+    )
+    return list(result.scalars().all())
+
+
+class TestValidateLines:
+    def test_valid_line(self):
+        rows, issues = validate_lines(
+            [(1, json.dumps(_record(7, explanation="Лексический повтор")))],
+            {7: {HandlerType.TASK_26_EXAM}},
+        )
+
+        assert issues == []
+        assert rows[0].line_no == 1
+        assert rows[0].category_id == 7
+        assert rows[0].explanation == "Лексический повтор"
+        assert rows[0].is_active is True
+
+    def test_reports_line_numbers(self):
+        lines = [
+            (1, "{not json"),
+            (2, json.dumps(_record(99))),
+            (3, json.dumps({"category_id": 7, "content": {"task": "без предложений"}})),
+            (4, json.dumps(_record(7, unknown_field=1))),
+        ]
+
+        rows, issues = validate_lines(lines, {7: {HandlerType.TASK_26_EXAM}})
+
+        assert rows == []
+        assert [issue.line_no for issue in issues] == [1, 2, 3, 4]
+        assert "category 99" in issues[1].message
+        assert "Task26Content" in issues[2].message
+        assert "sentences" in issues[2].message
+
+    def test_content_checked_against_all_handler_types(self):
+        record = {"category_id": 7, "content": {"sentence": "(НЕ)СМОТРЯ на дождь"}, "answer": "несмотря"}
+
+        _, drill_only = validate_lines([(1, json.dumps(record))], {7: {HandlerType.TASK_14_DRILL}})
+        _, drill_and_exam = validate_lines(
+            [(1, json.dumps(record))], {7: {HandlerType.TASK_14_DRILL, HandlerType.TASK_14_EXAM}},
+        )
+
+        assert drill_only == []
+        assert "Task14ExamContent" in drill_and_exam[0].message
+
+    def test_category_without_schema(self):
+        _, issues = validate_lines([(1, json.dumps(_record(7)))], {7: {HandlerType.SKIP}})
+
+        assert "no content schema" in issues[0].message
+
+
+class TestImportFile:
+    async def test_inserts_and_bumps_catalog_version(
+        self, import_service, catalog_service, db_session, task26, write_jsonl,
+    ):
+        path = write_jsonl(_record(task26.id, "A"), _record(task26.id, "B", answer="12"))
+
+        report = await import_service.import_file(path, workers=0)
+
+        exercises = await _exercises(db_session, task26.id)
+        assert [ex.answer for ex in exercises] == ["3", "12"]
+        assert all(ex.content_hash for ex in exercises)
+        assert (report.read, report.inserted, report.updated, report.invalid) == (2, 2, 0, 0)
+        assert report.catalog_version == await catalog_service.get_version() == 1
+
+    async def test_duplicates_in_file_last_wins(self, import_service, db_session, task26, write_jsonl):
+        path = write_jsonl(_record(task26.id, answer="1"), "", _record(task26.id, answer="2"))
+
+        report = await import_service.import_file(path, workers=0, batch_size=10)
+
+        exercises = await _exercises(db_session, task26.id)
+        assert [ex.answer for ex in exercises] == ["2"]
+        assert report.skipped == 1
+
+    async def test_duplicates_across_batches(self, import_service, db_session, task26, write_jsonl):
+        path = write_jsonl(_record(task26.id, answer="1"), _record(task26.id, "B"), _record(task26.id, answer="2"))
+
+        await import_service.import_file(path, workers=0, batch_size=1)
+
+        exercises = await _exercises(db_session, task26.id)
+        assert sorted(ex.answer for ex in exercises) == ["2", "3"]
+
+    async def test_reimport_updates_changed_only(
+        self, import_service, catalog_service, db_session, task26, write_jsonl,
+    ):
+        await import_service.import_file(write_jsonl(_record(task26.id, "A"), _record(task26.id, "B")), workers=0)
+
+        report = await import_service.import_file(
+            write_jsonl(_record(task26.id, "A"), _record(task26.id, "B", answer="45")), workers=0,
+        )
+
+        exercises = await _exercises(db_session, task26.id)
+        assert [ex.answer for ex in exercises] == ["3", "45"]
+        assert (report.inserted, report.updated, report.skipped) == (0, 1, 1)
+        assert await catalog_service.get_version() == 2
+
+    async def test_unchanged_reimport_keeps_catalog_version(
+        self, import_service, catalog_service, task26, write_jsonl,
+    ):
+        path = write_jsonl(_record(task26.id))
+        await import_service.import_file(path, workers=0)
+
+        report = await import_service.import_file(path, workers=0)
+
+        assert report.catalog_version is None
+        assert await catalog_service.get_version() == 1
+
+    async def test_same_content_in_other_category_is_separate(
+        self, import_service, db_session, category_factory, task26, write_jsonl,
+    ):
+        other = await category_factory(name="Задание 26 (архив)", handler_type=HandlerType.TASK_26_EXAM)
+
+        await import_service.import_file(write_jsonl(_record(task26.id), _record(other.id)), workers=0)
+
+        assert len(await _exercises(db_session, task26.id)) == 1
+        assert len(await _exercises(db_session, other.id)) == 1
+
+    async def test_parent_category_uses_children_schemas(
+        self, import_service, db_session, category_factory, write_jsonl,
+    ):
+        parent = await category_factory(name="Задание 26", handler_type=HandlerType.SKIP)
+        await category_factory(name="Экзамен", handler_type=HandlerType.TASK_26_EXAM, parent_id=parent.id)
+
+        report = await import_service.import_file(write_jsonl(_record(parent.id)), workers=0)
+
+        assert report.inserted == 1
+        assert len(await _exercises(db_session, parent.id)) == 1
+
+    async def test_invalid_lines_skipped(self, import_service, db_session, task26, write_jsonl):
+        path = write_jsonl(_record(task26.id), '{"category_id": "x"}')
+
+        report = await import_service.import_file(path, workers=0)
+
+        assert (report.inserted, report.invalid) == (1, 1)
+        assert report.issues[0].line_no == 2
+
+    async def test_dry_run_writes_nothing(self, import_service, catalog_service, db_session, task26, write_jsonl):
+        report = await import_service.import_file(write_jsonl(_record(task26.id)), workers=0, dry_run=True)
+
+        assert report.read == 1
+        assert await _exercises(db_session, task26.id) == []
+        assert await catalog_service.get_version() == 0
+
+    async def test_process_pool(self, import_service, db_session, task26, write_jsonl):
+        path = write_jsonl(*(_record(task26.id, f"Задание {i}") for i in range(5)))
+
+        report = await import_service.import_file(path, workers=2, batch_size=2)
+
+        assert report.inserted == 5
+        assert len(await _exercises(db_session, task26.id)) == 5
@@ -2,6 +2,9 @@ import random
 from collections import namedtuple
 from datetime import UTC, datetime, timedelta
 
+from sqlalchemy import inspect
+
+from app.enums import SelectionStrategy
 from app.repositories.exercise_filters import answer_eq
 from app.services.exercise_selector import ExerciseSelector
 
@@ -595,6 +598,79 @@ class TestSelectSmartByGroup:
 # select_smart_distinct_answer  (integration tests — real DB)
 # ===================================================================
 
+class TestSelectConcurrently:
+    async def test_returns_each_selection_in_order(
+        self, exercise_selector, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        first = await exercise_factory(category_id=cat.id, answer="a")
+        second = await exercise_factory(category_id=cat.id, answer="b")
+
+        by_a, by_b = await exercise_selector.select_concurrently(
+            lambda selector: selector.select_by_answer(cat.id, user.id, answer="a", limit=1),
+            lambda selector: selector.select_by_answer(cat.id, user.id, answer="b", limit=1),
+        )
+
+        assert [ex.id for ex in by_a] == [first.id]
+        assert [ex.id for ex in by_b] == [second.id]
+
+
+class TestRecentExercises:
+    async def test_thompson_puts_recent_last(
+        self, exercise_selector, recent_exercises, user_factory, category_factory, exercise_factory,
+        user_answer_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        hard = await exercise_factory(category_id=cat.id)
+        easy = await exercise_factory(category_id=cat.id)
+        for _ in range(5):
+            await user_answer_factory(user_id=user.id, exercise_id=hard.id, category_id=cat.id, is_correct=False)
+        await user_answer_factory(user_id=user.id, exercise_id=easy.id, category_id=cat.id, is_correct=True)
+        await recent_exercises.push(user.id, cat.id, [hard.id])
+
+        result = await exercise_selector.select_smart(cat.id, user.id, limit=1)
+
+        assert [ex.id for ex in result] == [easy.id]
+
+    async def test_recent_still_returned_when_nothing_else(
+        self, exercise_selector, recent_exercises, user_factory, category_factory, exercise_factory,
+        user_answer_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id)
+        await user_answer_factory(user_id=user.id, exercise_id=ex.id, category_id=cat.id)
+        await recent_exercises.push(user.id, cat.id, [ex.id])
+
+        result = await exercise_selector.select_smart(cat.id, user.id, limit=1)
+
+        assert [e.id for e in result] == [ex.id]
+
+    async def test_weights_rank_recent_below_seen(
+        self, exercise_selector, recent_exercises, user_factory, category_factory, exercise_factory,
+        user_answer_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        seen = await exercise_factory(category_id=cat.id)
+        older = await exercise_factory(category_id=cat.id)
+        newest = await exercise_factory(category_id=cat.id)
+        await user_answer_factory(user_id=user.id, exercise_id=seen.id, category_id=cat.id)
+        await recent_exercises.push(user.id, cat.id, [older.id])
+        await recent_exercises.push(user.id, cat.id, [newest.id])
+
+        weights = await exercise_selector.get_thompson_weights(cat.id, user.id)
+
+        assert weights[seen.id] >= 0 > weights[older.id] > weights[newest.id]
+
+    def test_demote_recent_keeps_order_and_oldest_first(self):
+        result = ExerciseSelector._demote_recent([1, 2, 3, 4], recent=[3, 1])
+
+        assert result == [2, 4, 1, 3]
+
+
 class TestSelectSmartDistinctAnswer:
     async def test_all_unseen_returns_distinct_answers(
         self, exercise_selector, user_factory, category_factory, exercise_factory,
@@ -666,6 +742,23 @@ class TestSelectSmartDistinctAnswer:
 # ===================================================================
 
 class TestSelectSmartSameAnswerGroups:
+    async def test_picked_exercises_are_hydrated(
+        self, db_session, exercise_selector, user_factory, category_factory, exercise_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        for i in range(6):
+            await exercise_factory(category_id=cat.id, answer="A", content={"word": f"слово{i}"})
+        db_session.expunge_all()
+
+        result = await exercise_selector.select_smart_same_answer_groups(
+            cat.id, user.id, group_size=2, num_groups=2,
+        )
+
+        for ex in (ex for group in result for ex in group):
+            assert ex.content["word"].startswith("слово")
+            assert "explanation" in inspect(ex).unloaded
+
     async def test_returns_groups_with_same_answer(
         self, exercise_selector, user_factory, category_factory, exercise_factory,
     ):
@@ -898,3 +991,104 @@ class TestSelectSmartSameAnswerGroupsEdgeCases:
         assert len(result) <= 1
         for group in result:
             assert len(group) == 3
+
+
+# ===================================================================
+# Spaced repetition strategy (DB)
+# ===================================================================
+
+class TestSelectSmartSpacedRepetition:
+    @staticmethod
+    async def _spaced_category(category_factory, db_session):
+        cat = await category_factory()
+        cat.selection_strategy = SelectionStrategy.SPACED_REPETITION
+        await db_session.flush()
+        return cat
+
+    async def test_due_reviews_come_first(
+        self, exercise_selector, user_exercise_schedule_repository, user_factory, category_factory,
+        exercise_factory, db_session,
+    ):
+        user = await user_factory()
+        cat = await self._spaced_category(category_factory, db_session)
+        due = await exercise_factory(category_id=cat.id)
+        await exercise_factory(category_id=cat.id)
+        await user_exercise_schedule_repository.record_review(
+            user.id, due.id, cat.id, datetime.now(UTC) - timedelta(days=2), is_correct=True,
+        )
+
+        result = await exercise_selector.select_smart(cat.id, user.id, limit=1)
+
+        assert [ex.id for ex in result] == [due.id]
+
+    async def test_new_exercises_before_upcoming(
+        self, exercise_selector, user_exercise_schedule_repository, user_factory, category_factory,
+        exercise_factory, db_session,
+    ):
+        user = await user_factory()
+        cat = await self._spaced_category(category_factory, db_session)
+        upcoming = await exercise_factory(category_id=cat.id)
+        fresh = await exercise_factory(category_id=cat.id)
+        await user_exercise_schedule_repository.record_review(
+            user.id, upcoming.id, cat.id, datetime.now(UTC), is_correct=True,
+        )
+
+        result = await exercise_selector.select_smart(cat.id, user.id, limit=2)
+
+        assert [ex.id for ex in result] == [fresh.id, upcoming.id]
+
+    async def test_record_review_updates_spaced_category(
+        self, exercise_selector, user_exercise_schedule_repository, user_factory, category_factory,
+        exercise_factory, db_session,
+    ):
+        user = await user_factory()
+        cat = await self._spaced_category(category_factory, db_session)
+        ex = await exercise_factory(category_id=cat.id)
+
+        await exercise_selector.record_review(user.id, ex.id, cat.id, is_correct=True)
+
+        scheduled = await user_exercise_schedule_repository.get_scheduled(user.id, cat.id, 10)
+        assert [e.id for e in scheduled] == [ex.id]
+
+    async def test_record_review_skips_thompson_category(
+        self, exercise_selector, user_exercise_schedule_repository, user_factory, category_factory,
+        exercise_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id)
+
+        await exercise_selector.record_review(user.id, ex.id, cat.id, is_correct=True)
+
+        assert await user_exercise_schedule_repository.get_scheduled(user.id, cat.id, 10) == []
+
+    async def test_exam_reviews_load_schedules_once(
+        self, exercise_selector, user_exercise_schedule_repository, user_factory, category_factory,
+        exercise_factory, db_session, monkeypatch,
+    ):
+        user = await user_factory()
+        cat = await self._spaced_category(category_factory, db_session)
+        exercises = [await exercise_factory(category_id=cat.id) for _ in range(3)]
+        await user_exercise_schedule_repository.record_review(
+            user.id, exercises[0].id, cat.id, datetime.now(UTC) - timedelta(days=2), is_correct=True,
+        )
+        await db_session.flush()
+        calls = []
+        load = user_exercise_schedule_repository.get_for_exercises
+
+        async def spy(user_id, exercise_ids):
+            calls.append(set(exercise_ids))
+            return await load(user_id, exercise_ids)
+
+        monkeypatch.setattr(user_exercise_schedule_repository, "get_for_exercises", spy)
+        answered_ids = [ex.id for ex in exercises]
+
+        for ex in exercises:
+            await exercise_selector.record_review(user.id, ex.id, cat.id, is_correct=False, answered_ids=answered_ids)
+        await db_session.flush()
+
+        assert calls == [set(answered_ids)]
+        schedules = await load(user.id, answered_ids)
+        assert set(schedules) == set(answered_ids)
+        # Уже бывшее в расписании упражнение обновлено, а не продублировано
+        assert schedules[exercises[0].id].lapses == 1
@@ -0,0 +1,242 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from app.database import ReadSession, UnitOfWork
+from app.enums import LeaderboardPeriod
+from app.models import UserCategoryStat, UserStat
+from app.repositories import UserCategoryStatRepository, UserStatRepository
+from app.services.category_service import CategoryService
+from app.services.leaderboard_service import LeaderboardService, leaderboard_key
+from app.utils.dates import MSK
+
+
+@pytest.fixture
+def uow(db_session):
+    return UnitOfWork(db_session)
+
+
+@pytest.fixture
+def leaderboard_service(
+    redis, db_session, category_repository, user_repository, user_answer_repository, cache_manager, uow,
+):
+    read_session = ReadSession(db_session)
+    return LeaderboardService(
+        redis=redis,
+        category_repository=category_repository,
+        user_repository=user_repository,
+        user_stat_repository=UserStatRepository(db_session, read_session),
+        user_category_stat_repository=UserCategoryStatRepository(db_session, read_session),
+        user_answer_repository=user_answer_repository,
+        category_service=CategoryService(db_session, category_repository, cache_manager),
+        unit_of_work=uow,
+    )
+
+
+@pytest.fixture
+async def ege_task(category_factory, db_session):
+    """Задание ЕГЭ с листовой категорией-тренировкой внутри."""
+    task = await category_factory(name="Задание 9")
+    task.is_ege_task = True
+    leaf = await category_factory(name="Тренировка", parent_id=task.id)
+    await db_session.flush()
+    return task, leaf
+
+
+async def _score(redis, key: str, user_id: int) -> float | None:
+    return await redis.zscore(key, user_id)
+
+
+class TestLeaderboardKey:
+    def test_all_time_keys(self):
+        now = datetime(2026, 10, 19, tzinfo=UTC)
+        assert leaderboard_key(LeaderboardPeriod.ALL_TIME, None, now) == "lb:all:global"
+        assert leaderboard_key(LeaderboardPeriod.ALL_TIME, 9, now) == "lb:all:task:9"
+
+    def test_week_key_uses_msk_week(self):
+        # Воскресенье 22:00 UTC — уже понедельник по МСК
+        now = datetime(2026, 10, 18, 22, 0, tzinfo=UTC)
+        assert leaderboard_key(LeaderboardPeriod.WEEK, None, now) == "lb:week:2026-W43:global"
+
+
+class TestRecordAnswer:
+    async def test_correct_increments_all_boards(self, leaderboard_service, uow, redis, user_factory, ege_task):
+        user = await user_factory()
+        task, leaf = ege_task
+        now = datetime.now(UTC)
+
+        await leaderboard_service.record_answer(user.id, leaf.id, is_correct=True)
+        await leaderboard_service.record_answer(user.id, leaf.id, is_correct=True)
+        await uow.commit()
+
+        for period in LeaderboardPeriod:
+            assert await _score(redis, leaderboard_key(period, None, now), user.id) == 2
+            assert await _score(redis, leaderboard_key(period, task.id, now), user.id) == 2
+
+    async def test_wrong_answer_ignored(self, leaderboard_service, redis, user_factory, ege_task):
+        user = await user_factory()
+        _, leaf = ege_task
+
+        await leaderboard_service.record_answer(user.id, leaf.id, is_correct=False)
+
+        assert await redis.dbsize() == 0
+
+    async def test_applied_only_after_commit(self, leaderboard_service, uow, redis, user_factory, ege_task):
+        user = await user_factory()
+        _, leaf = ege_task
+
+        await leaderboard_service.record_answer(user.id, leaf.id, is_correct=True)
+        assert await redis.keys("lb:*") == []
+
+        await uow.commit()
+        assert await _score(redis, leaderboard_key(LeaderboardPeriod.ALL_TIME, None, datetime.now(UTC)), user.id) == 1
+
+    async def test_failed_commit_drops_scores(
+        self, leaderboard_service, uow, redis, db_session, user_factory, ege_task, monkeypatch,
+    ):
+        user = await user_factory()
+        _, leaf = ege_task
+        await leaderboard_service.record_answer(user.id, leaf.id, is_correct=True)
+        monkeypatch.setattr(db_session, "commit", AsyncMock(side_effect=DBAPIError("COMMIT", None, Exception())))
+
+        with pytest.raises(DBAPIError):
+            await uow.commit()
+
+        assert await redis.keys("lb:*") == []
+
+    async def test_category_outside_ege_task_only_global(
+        self, leaderboard_service, uow, redis, user_factory, category_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+
+        await leaderboard_service.record_answer(user.id, cat.id, is_correct=True)
+        await uow.commit()
+
+        keys = {key.decode() for key in await redis.keys("lb:*")}
+        now = datetime.now(UTC)
+        assert keys == {
+            leaderboard_key(LeaderboardPeriod.ALL_TIME, None, now),
+            leaderboard_key(LeaderboardPeriod.WEEK, None, now),
+        }
+
+    async def test_weekly_key_expires_after_week(self, leaderboard_service, uow, redis, user_factory, ege_task):
+        user = await user_factory()
+        _, leaf = ege_task
+
+        await leaderboard_service.record_answer(user.id, leaf.id, is_correct=True)
+        await uow.commit()
+
+        now = datetime.now(UTC)
+        assert await redis.ttl(leaderboard_key(LeaderboardPeriod.ALL_TIME, None, now)) == -1
+        week_ttl = await redis.ttl(leaderboard_key(LeaderboardPeriod.WEEK, None, now))
+        assert 0 < week_ttl <= timedelta(days=8).total_seconds()
+
+
+class TestGetLeaderboard:
+    async def test_top_and_user_rank(self, leaderboard_service, uow, user_factory, ege_task):
+        _, leaf = ege_task
+        leader = await user_factory(full_name="Leader")
+        runner = await user_factory(full_name="Runner")
+        for _ in range(3):
+            await leaderboard_service.record_answer(leader.id, leaf.id, is_correct=True)
+        await leaderboard_service.record_answer(runner.id, leaf.id, is_correct=True)
+        await uow.commit()
+
+        board = await leaderboard_service.get_leaderboard(runner.id, LeaderboardPeriod.WEEK)
+
+        assert [(e.rank, e.full_name, e.score) for e in board.entries] == [(1, "Leader", 3), (2, "Runner", 1)]
+        assert board.user_rank == 2
+        assert board.user_score == 1
+
+    async def test_task_board_has_task_name(self, leaderboard_service, uow, user_factory, ege_task):
+        task, leaf = ege_task
+        user = await user_factory()
+        await leaderboard_service.record_answer(user.id, leaf.id, is_correct=True)
+        await uow.commit()
+
+        board = await leaderboard_service.get_leaderboard(user.id, LeaderboardPeriod.ALL_TIME, task.id)
+
+        assert board.task_name == "Задание 9"
+        assert board.user_rank == 1
+
+    async def test_user_not_ranked(self, leaderboard_service, user_factory):
+        user = await user_factory()
+
+        board = await leaderboard_service.get_leaderboard(user.id, LeaderboardPeriod.WEEK)
+
+        assert board.entries == []
+        assert board.user_rank is None
+        assert board.user_score == 0
+
+
+class TestRebuild:
+    async def test_rebuild_from_db(
+        self, leaderboard_service, redis, db_session, user_factory, exercise_factory, user_answer_factory,
+        ege_task,
+    ):
+        task, leaf = ege_task
+        user = await user_factory()
+        ex = await exercise_factory(category_id=task.id)
+        db_session.add(UserStat(user_id=user.id, total_answered=5, total_correct=4))
+        db_session.add(UserCategoryStat(user_id=user.id, category_id=leaf.id, total_answered=5, total_correct=4))
+        await user_answer_factory(user.id, ex.id, leaf.id, is_correct=True)
+        await user_answer_factory(user.id, ex.id, leaf.id, is_correct=False)
+        await db_session.flush()
+
+        now = datetime.now(UTC)
+        await leaderboard_service.rebuild(now)
+
+        assert await _score(redis, leaderboard_key(LeaderboardPeriod.ALL_TIME, None, now), user.id) == 4
+        assert await _score(redis, leaderboard_key(LeaderboardPeriod.ALL_TIME, task.id, now), user.id) == 4
+        assert await _score(redis, leaderboard_key(LeaderboardPeriod.WEEK, None, now), user.id) == 1
+        assert await _score(redis, leaderboard_key(LeaderboardPeriod.WEEK, task.id, now), user.id) == 1
+        assert await redis.ttl(leaderboard_key(LeaderboardPeriod.WEEK, None, now)) > 0
+        assert await redis.keys("*:rebuild") == []
+
+    async def test_group_counts_as_one_check(
+        self, leaderboard_service, redis, db_session, user_factory, exercise_factory, user_answer_factory,
+        ege_task,
+    ):
+        task, leaf = ege_task
+        user = await user_factory()
+        ex = await exercise_factory(category_id=task.id)
+        group_id = uuid.uuid4()
+        for _ in range(3):
+            answer = await user_answer_factory(user.id, ex.id, leaf.id, is_correct=True)
+            answer.group_id = group_id
+        await db_session.flush()
+
+        now = datetime.now(UTC)
+        await leaderboard_service.rebuild(now)
+
+        assert await _score(redis, leaderboard_key(LeaderboardPeriod.WEEK, None, now), user.id) == 1
+
+    async def test_rebuild_drops_stale_scores(self, leaderboard_service, redis, user_factory):
+        user = await user_factory()
+        now = datetime.now(UTC)
+        await redis.zadd(leaderboard_key(LeaderboardPeriod.ALL_TIME, None, now), {str(user.id): 100})
+        await redis.zadd(leaderboard_key(LeaderboardPeriod.WEEK, 3, now), {str(user.id): 7})
+
+        await leaderboard_service.rebuild(now)
+
+        assert await redis.dbsize() == 0
+
+    async def test_answers_before_week_start_excluded(
+        self, leaderboard_service, redis, db_session, user_factory, exercise_factory, user_answer_factory,
+        ege_task,
+    ):
+        task, leaf = ege_task
+        user = await user_factory()
+        ex = await exercise_factory(category_id=task.id)
+        answer = await user_answer_factory(user.id, ex.id, leaf.id, is_correct=True)
+        answer.created_at = datetime(2026, 10, 18, 20, 0, tzinfo=MSK)
+        await db_session.flush()
+
+        now = datetime(2026, 10, 19, 12, 0, tzinfo=MSK)
+        await leaderboard_service.rebuild(now)
+
+        assert await _score(redis, leaderboard_key(LeaderboardPeriod.WEEK, None, now), user.id) is None
@@ -0,0 +1,45 @@
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.recent_exercises_service import (
+    RECENT_EXERCISES_LIMIT,
+    RecentExercisesService,
+    recent_exercises_key,
+)
+
+
+class _BrokenRedis:
+    def pipeline(self, **_kwargs):
+        raise RedisConnectionError("down")
+
+    async def lrange(self, *_args):
+        raise RedisConnectionError("down")
+
+
+class TestRecentExercises:
+    async def test_newest_first(self, recent_exercises):
+        await recent_exercises.push(1, 10, [5])
+        await recent_exercises.push(1, 10, [6, 7])
+
+        assert await recent_exercises.get(1, 10) == [7, 6, 5]
+
+    async def test_capped_at_limit(self, recent_exercises, redis):
+        await recent_exercises.push(1, 10, range(RECENT_EXERCISES_LIMIT + 5))
+
+        ids = await recent_exercises.get(1, 10)
+
+        assert len(ids) == RECENT_EXERCISES_LIMIT
+        assert ids[0] == RECENT_EXERCISES_LIMIT + 4
+        assert await redis.ttl(recent_exercises_key(1, 10)) > 0
+
+    async def test_scoped_by_user_and_category(self, recent_exercises):
+        await recent_exercises.push(1, 10, [5])
+
+        assert await recent_exercises.get(1, 11) == []
+        assert await recent_exercises.get(2, 10) == []
+
+    async def test_redis_errors_are_swallowed(self):
+        service = RecentExercisesService(_BrokenRedis())
+
+        await service.push(1, 10, [5])
+
+        assert await service.get(1, 10) == []
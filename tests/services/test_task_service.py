@@ -4,7 +4,7 @@ import pytest
 
 from app.enums import HandlerType
 from app.exceptions import NoCategoryError, NoHandlerTypeError
-from app.schemas import CategoryDTO
+from app.schemas import CategoryDTO, ExerciseDTO
 from app.schemas.user_schemas import UserWithCategoryDTO, UserWithExercisesDTO
 from app.services.task_service import TaskService
 
@@ -17,12 +17,16 @@ def mock_stats_service():
 
 
 @pytest.fixture
-def task_service(processor_factory, user_repository, exercise_repository, mock_stats_service):
+def task_service(
+    processor_factory, user_repository, exercise_repository, mock_stats_service, recent_exercises, exam_variant_pool,
+):
     return TaskService(
         processor_factory=processor_factory,
         user_repository=user_repository,
         exercise_repository=exercise_repository,
         stats_service=mock_stats_service,
+        recent_exercises=recent_exercises,
+        variant_pool=exam_variant_pool,
     )
 
 
@@ -62,6 +66,26 @@ class TestStartTask:
         task_ui = await task_service.start_task(user_dto)
         assert task_ui.view is not None
 
+    async def test_records_shown_exercise(
+        self, task_service, recent_exercises, user_factory, category_factory, exercise_factory,
+    ):
+        cat = await category_factory(name="Task 1", handler_type=HandlerType.TASK_1_DRILL)
+        ex = await exercise_factory(
+            category_id=cat.id,
+            content={"text": "Прочитайте текст", "instruction": "Выберите ответ"},
+            answer="42",
+        )
+        user = await user_factory()
+        user_dto = UserWithCategoryDTO(
+            id=user.id, telegram_id=user.telegram_id, username=None, full_name="U",
+            exercise_started_at=None,
+            current_category=CategoryDTO(id=cat.id, name="Task 1", handler_type=HandlerType.TASK_1_DRILL, parent_id=None),
+        )
+
+        await task_service.start_task(user_dto)
+
+        assert await recent_exercises.get(user.id, cat.id) == [ex.id]
+
 
 class TestCheckAnswer:
     async def test_no_category_raises(self, task_service):
@@ -81,3 +105,41 @@ class TestCheckAnswer:
         )
         with pytest.raises(NoHandlerTypeError):
             await task_service.check_answer(user, "42")
+
+
+class TestCheckAnswerExplanations:
+    async def _user(self, user_factory, category_factory, exercise_factory, handler_type, content):
+        cat = await category_factory(name="Cat", handler_type=handler_type)
+        ex = await exercise_factory(category_id=cat.id, content=content, answer="1", explanation="Разбор")
+        user = await user_factory()
+        return UserWithExercisesDTO(
+            id=user.id, telegram_id=user.telegram_id, username=None, full_name="U",
+            exercise_started_at=None,
+            current_category=CategoryDTO(id=cat.id, name="Cat", handler_type=handler_type, parent_id=None),
+            current_category_id=cat.id,
+            current_exercise_ids=[ex.id],
+        )
+
+    async def test_loads_explanations_before_processing(
+        self, task_service, user_factory, category_factory, exercise_factory,
+    ):
+        user = await self._user(
+            user_factory, category_factory, exercise_factory,
+            HandlerType.TASK_4_DRILL, {"word": "банты", "incorrect_stress": 2},
+        )
+
+        await task_service.check_answer(user, "1")
+
+        assert user.current_exercises[0].explanation == "Разбор"
+
+    async def test_skipped_when_processor_does_not_use_them(
+        self, task_service, user_factory, category_factory, exercise_factory,
+    ):
+        user = await self._user(
+            user_factory, category_factory, exercise_factory,
+            HandlerType.TASK_1_DRILL, {"text": "Прочитайте текст", "instruction": "Выберите ответ"},
+        )
+
+        await task_service.check_answer(user, "1")
+
+        assert user.current_exercises[0].explanation is None
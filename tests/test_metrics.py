@@ -0,0 +1,69 @@
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from app.metrics import Counter, Gauge, MetricsRegistry, metrics_app
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestMetrics:
+    def test_counter_by_labels(self, registry):
+        requests = registry.register(Counter("requests_total", "Requests", ("result",)))
+        requests.inc(result="hit")
+        requests.inc(2, result="hit")
+        requests.inc(result="miss")
+
+        assert requests.value(result="hit") == 3
+        assert requests.value(result="miss") == 1
+        assert requests.value(result="other") == 0
+
+    def test_wrong_labels_rejected(self, registry):
+        requests = registry.register(Counter("requests_total", "Requests", ("result",)))
+        with pytest.raises(ValueError, match="expects labels"):
+            requests.inc(outcome="hit")
+
+    def test_gauge(self, registry):
+        depth = registry.register(Gauge("depth", "Depth"))
+        depth.set(5)
+        depth.dec(2)
+        depth.inc()
+
+        assert depth.value() == 4
+
+    def test_register_is_idempotent(self, registry):
+        first = registry.register(Counter("x_total", "X"))
+
+        assert registry.register(Counter("x_total", "X")) is first
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register(Gauge("x_total", "X"))
+
+    def test_render_prometheus_text(self, registry):
+        registry.register(Counter("requests_total", "Requests", ("result",))).inc(result='a"b')
+        registry.register(Gauge("depth", "Depth")).set(1.5)
+
+        assert registry.render() == (
+            "# HELP requests_total Requests\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{result="a\\"b"} 1\n'
+            "# HELP depth Depth\n"
+            "# TYPE depth gauge\n"
+            "depth 1.5\n"
+        )
+
+
+class TestMetricsApp:
+    async def test_endpoints(self, registry):
+        ready = False
+        registry.register(Counter("hits_total", "Hits")).inc()
+
+        async with TestClient(TestServer(metrics_app(lambda: ready, registry))) as client:
+            metrics = await client.get("/metrics")
+            assert metrics.status == 200
+            assert "hits_total 1" in await metrics.text()
+
+            assert (await client.get("/health")).status == 503
+            ready = True
+            assert (await client.get("/health")).status == 200
@@ -1,3 +1,8 @@
+from sqlalchemy import select
+
+from app.models import UserSeenGroup
+
+
 class TestModelRepr:
     async def test_user_repr(self, user_factory):
         user = await user_factory(telegram_id=123, username="ivan")
@@ -23,3 +28,34 @@ class TestModelRepr:
         ans = await user_answer_factory(user.id, ex.id, cat.id, is_correct=True)
         r = repr(ans)
         assert "True" in r
+
+
+class TestUserSeenGroupProjection:
+    async def _seen(self, db_session, user_id):
+        result = await db_session.execute(select(UserSeenGroup.group_id).where(UserSeenGroup.user_id == user_id))
+        return [str(group_id) for group_id in result.scalars().all()]
+
+    async def test_answer_insert_marks_group_seen_once(
+        self, db_session, user_factory, category_factory, exercise_factory, user_answer_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        g1 = "11111111-1111-1111-1111-111111111111"
+        ex1 = await exercise_factory(category_id=cat.id, group_id=g1)
+        ex2 = await exercise_factory(category_id=cat.id, group_id=g1)
+
+        await user_answer_factory(user.id, ex1.id, cat.id)
+        await user_answer_factory(user.id, ex2.id, cat.id)
+
+        assert await self._seen(db_session, user.id) == [g1]
+
+    async def test_exercise_without_group_not_tracked(
+        self, db_session, user_factory, category_factory, exercise_factory, user_answer_factory,
+    ):
+        user = await user_factory()
+        cat = await category_factory()
+        ex = await exercise_factory(category_id=cat.id, group_id=None)
+
+        await user_answer_factory(user.id, ex.id, cat.id)
+
+        assert await self._seen(db_session, user.id) == []
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.scheduler import LEASE_KEY_PREFIX, Cron, Interval, Job, Scheduler, job_runs
+
+
+def _at(*args):
+    return datetime(*args, tzinfo=UTC)
+
+
+class TestCron:
+    @pytest.mark.parametrize(("expression", "after", "expected"), [
+        ("* * * * *", _at(2026, 3, 1, 10, 15, 30), _at(2026, 3, 1, 10, 16)),
+        ("30 1 * * *", _at(2026, 3, 1, 1, 30), _at(2026, 3, 2, 1, 30)),
+        ("30 1 * * *", _at(2026, 3, 1, 0, 0), _at(2026, 3, 1, 1, 30)),
+        ("*/15 * * * *", _at(2026, 3, 1, 10, 31), _at(2026, 3, 1, 10, 45)),
+        ("0 9-17/4 * * *", _at(2026, 3, 1, 13, 0), _at(2026, 3, 1, 17, 0)),
+        ("0 0 1 * *", _at(2026, 12, 15), _at(2027, 1, 1)),
+        ("0 0 29 2 *", _at(2026, 3, 1), _at(2028, 2, 29)),
+        # 2026-03-01 — воскресенье; 0 и 7 оба означают воскресенье
+        ("0 12 * * 1", _at(2026, 3, 1), _at(2026, 3, 2, 12)),
+        ("0 12 * * 7", _at(2026, 3, 1, 13), _at(2026, 3, 8, 12)),
+        # Заданы и день месяца, и день недели: срабатывает любой из них
+        ("0 0 10 * 1", _at(2026, 3, 3), _at(2026, 3, 9)),
+    ])
+    def test_next_run(self, expression, after, expected):
+        assert Cron(expression).next_run(after) == expected
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *", "a * * * *"])
+    def test_invalid_expression(self, expression):
+        with pytest.raises(ValueError):  # noqa: PT011
+            Cron(expression)
+
+    def test_never_fires(self):
+        with pytest.raises(ValueError, match="never fires"):
+            Cron("0 0 30 2 *").next_run(_at(2026, 1, 1))
+
+
+def test_interval():
+    assert Interval(90).next_run(_at(2026, 3, 1, 10)) == _at(2026, 3, 1, 10, 1, 30)
+
+
+def _job(name, func, **kwargs):
+    return Job(name=name, func=func, schedule=Interval(3600), **kwargs)
+
+
+class TestRunOnce:
+    async def test_outcomes_are_counted(self):
+        scheduler = Scheduler()
+
+        async def ok():
+            pass
+
+        async def fail():
+            raise RuntimeError
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        before = {result: job_runs.value(job="t", result=result) for result in ("ok", "error", "timeout")}
+        assert await scheduler.run_once(_job("t", ok)) == "ok"
+        assert await scheduler.run_once(_job("t", fail)) == "error"
+        assert await scheduler.run_once(_job("t", slow, timeout=0.01)) == "timeout"
+
+        for result, value in before.items():
+            assert job_runs.value(job="t", result=result) == value + 1
+
+    async def test_lease_is_single_flight(self, redis):
+        calls = []
+
+        async def work():
+            calls.append(1)
+
+        job = _job("lease", work, lease=60)
+        first, second = Scheduler(redis, owner="a"), Scheduler(redis, owner="b")
+
+        assert await first.run_once(job) == "ok"
+        assert await second.run_once(job) == "skipped"
+        # Держатель lease продлевает его и продолжает запускать задачу
+        assert await first.run_once(job) == "ok"
+        assert len(calls) == 2
+        assert await redis.pttl(f"{LEASE_KEY_PREFIX}:lease") > 0
+
+        await redis.delete(f"{LEASE_KEY_PREFIX}:lease")
+        assert await second.run_once(job) == "ok"
+
+    async def test_lease_skipped_without_redis(self, redis, monkeypatch):
+        async def unavailable(*_args, **_kwargs):
+            raise RedisConnectionError
+
+        monkeypatch.setattr(redis, "set", unavailable)
+
+        assert await Scheduler(redis).run_once(_job("down", lambda: asyncio.sleep(0), lease=5)) == "skipped"
+
+    def test_lease_requires_redis(self):
+        with pytest.raises(ValueError, match="no Redis"):
+            Scheduler().add(_job("x", lambda: asyncio.sleep(0), lease=5))
+
+    def test_duplicate_name(self):
+        scheduler = Scheduler()
+        scheduler.add(_job("x", lambda: asyncio.sleep(0)))
+        with pytest.raises(ValueError, match="already scheduled"):
+            scheduler.add(_job("x", lambda: asyncio.sleep(0)))
+
+
+async def test_start_and_stop():
+    runs = asyncio.Event()
+    count = 0
+
+    async def tick():
+        nonlocal count
+        count += 1
+        if count >= 3:
+            runs.set()
+
+    scheduler = Scheduler()
+    scheduler.add(Job(name="tick", func=tick, schedule=Interval(0.01), run_on_start=True))
+    scheduler.start()
+    await asyncio.wait_for(runs.wait(), timeout=2)
+    await scheduler.stop()
+    stopped_at = count
+    await asyncio.sleep(0.05)
+
+    assert count == stopped_at >= 3
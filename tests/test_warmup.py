@@ -0,0 +1,107 @@
+import sys
+
+import pytest
+from dishka import make_async_container
+from dishka.integrations.aiogram import AiogramProvider
+
+from app.database import has_writes
+from app.di import AppProvider, background_request
+from app.enums import HandlerType
+from app.processors import ProcessorFactory
+from app.services.catalog_service import CATALOG_NAMESPACE, CatalogService
+from app.services.category_service import CategoryService
+from app.warmup import (
+    Readiness,
+    WarmupReport,
+    import_processor_modules,
+    load_category_tree,
+    prime_statements,
+    warm_up_catalog,
+)
+
+
+class TestReadiness:
+    def test_marker_follows_flag(self, tmp_path):
+        marker = tmp_path / "run" / "bot.ready"
+        readiness = Readiness(marker)
+        assert not readiness.is_ready
+
+        readiness.mark_ready()
+        assert readiness.is_ready
+        assert marker.exists()
+
+        readiness.mark_not_ready()
+        assert not readiness.is_ready
+        assert not marker.exists()
+
+    def test_not_ready_without_marker(self, tmp_path):
+        Readiness(tmp_path / "bot.ready").mark_not_ready()
+
+
+class TestWarmupReport:
+    def test_records_stage_timings(self):
+        report = WarmupReport()
+        with report.stage("pool"):
+            pass
+        with pytest.raises(RuntimeError), report.stage("catalog"):
+            raise RuntimeError
+
+        assert set(report.timings) == {"pool", "catalog"}
+        assert report.total == sum(report.timings.values())
+
+
+def test_import_processor_modules():
+    assert import_processor_modules() > 0
+    assert "app.processors.tasks.task_05.conflict_index" in sys.modules
+    assert "app.processors.tasks.task_09_12.formatter" in sys.modules
+
+
+async def test_prime_statements_is_read_only(db_session):
+    await prime_statements(db_session)
+
+    assert not has_writes(db_session)
+
+
+async def test_load_category_tree(db_session, category_factory, category_repository, cache_manager):
+    root = await category_factory(name="Root")
+    child = await category_factory(name="Child", parent_id=root.id)
+    leaf = await category_factory(name="Leaf", handler_type=HandlerType.TASK_5_EXAM, parent_id=child.id)
+    other_root = await category_factory(name="Other")
+
+    categories = await load_category_tree(CategoryService(db_session, category_repository, cache_manager))
+
+    assert sorted(c.id for c in categories) == sorted([root.id, child.id, leaf.id, other_root.id])
+
+
+async def test_warm_up_catalog_builds_indexes(
+    db_session, category_factory, category_repository, exercise_repository, user_answer_repository,
+    exercise_selector, cache_manager,
+):
+    words = await category_factory(name="Паронимы")
+    exam = await category_factory(name="Экзамен", handler_type=HandlerType.TASK_5_EXAM, parent_id=words.id)
+    n9 = await category_factory(name="Корни")
+    n9_exam = await category_factory(name="Экзамен 9", handler_type=HandlerType.TASK_9_EXAM, parent_id=n9.id)
+    factory = ProcessorFactory(
+        exercise_repository=exercise_repository,
+        answer_repository=user_answer_repository,
+        exercise_selector=exercise_selector,
+        catalog_service=CatalogService(cache_manager),
+    )
+    categories = await load_category_tree(CategoryService(db_session, category_repository, cache_manager))
+    assert {exam.id, n9_exam.id} <= {c.id for c in categories}
+
+    await warm_up_catalog(factory, categories)
+
+    derived = cache_manager.namespace(CATALOG_NAMESPACE).cache("derived", None, local_ttl=None, remote_ttl=None)
+    assert await derived.get(("task5_word_conflicts", words.id)) is not None
+    assert await derived.get(("n9n12_confusion", n9.id)) is not None
+
+
+async def test_background_request_resolves_update_services():
+    container = make_async_container(AppProvider(), AiogramProvider())
+    try:
+        async with background_request(container) as request_container:
+            assert isinstance(await request_container.get(ProcessorFactory), ProcessorFactory)
+            assert isinstance(await request_container.get(CategoryService), CategoryService)
+    finally:
+        await container.close()
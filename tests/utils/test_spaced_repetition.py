@@ -0,0 +1,63 @@
+from datetime import UTC, datetime, timedelta
+
+from app.utils.spaced_repetition import (
+    DEFAULT_EASE_FACTOR,
+    FIRST_INTERVAL_DAYS,
+    MIN_EASE_FACTOR,
+    RELEARN_INTERVAL,
+    SECOND_INTERVAL_DAYS,
+    ReviewState,
+    next_due_at,
+    review,
+)
+
+
+class TestReview:
+    def test_first_correct_schedules_one_day(self):
+        state = review(ReviewState(), is_correct=True)
+
+        assert state.repetitions == 1
+        assert state.interval_days == FIRST_INTERVAL_DAYS
+
+    def test_second_correct_schedules_six_days(self):
+        state = review(review(ReviewState(), is_correct=True), is_correct=True)
+
+        assert state.repetitions == 2
+        assert state.interval_days == SECOND_INTERVAL_DAYS
+
+    def test_further_correct_multiplies_by_ease(self):
+        state = ReviewState(repetitions=2, ease_factor=2.5, interval_days=6.0)
+
+        new_state = review(state, is_correct=True)
+
+        assert new_state.repetitions == 3
+        assert new_state.interval_days == 15.0
+
+    def test_correct_keeps_ease(self):
+        state = review(ReviewState(), is_correct=True)
+
+        assert state.ease_factor == DEFAULT_EASE_FACTOR
+
+    def test_wrong_resets_and_counts_lapse(self):
+        state = ReviewState(repetitions=4, ease_factor=2.5, interval_days=30.0)
+
+        new_state = review(state, is_correct=False)
+
+        assert new_state.repetitions == 0
+        assert new_state.lapses == 1
+        assert new_state.interval_days == RELEARN_INTERVAL / timedelta(days=1)
+        assert new_state.ease_factor < state.ease_factor
+
+    def test_ease_never_below_minimum(self):
+        state = ReviewState()
+        for _ in range(20):
+            state = review(state, is_correct=False)
+
+        assert state.ease_factor == MIN_EASE_FACTOR
+
+
+class TestNextDueAt:
+    def test_adds_interval(self):
+        now = datetime(2026, 1, 1, tzinfo=UTC)
+
+        assert next_due_at(ReviewState(interval_days=6.0), now) == now + timedelta(days=6)